@@ -1,9 +1,16 @@
 from .plow import *
+from . import cache
+from . import livelog
 
 def _init():
     import conf
     from . import plow
 
+    plow.set_pool_size(conf.POOL_SIZE, conf.POOL_IDLE_TIMEOUT)
+
+    if conf.CACHE_ENABLED:
+        cache.enable()
+
     # Split the host name list and set it on the client module
     hosts = (h.split(":") for h in conf.PLOW_HOSTS)
     hosts = [(h[0], int(h[1])) for h in hosts if h[1].isdigit()]
@@ -0,0 +1,126 @@
+"""
+Asynchronous variants of the plow.client query functions.
+
+Each function takes the same arguments as its plow.client
+counterpart, but returns a :class:`concurrent.futures.Future`
+right away instead of blocking on the server. The calls are
+run by a shared pool of worker threads. The Thrift calls
+release the GIL and every worker checks out its own pooled
+connection, so many requests can be in flight at once::
+
+    futures = [aio.get_layers(job) for job in plow.client.get_jobs()]
+    for f in aio.as_completed(futures):
+        print f.result()
+
+"""
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+from . import conf
+from . import plow as _plow
+
+__all__ = [
+    "submit",
+    "set_max_workers",
+    "shutdown",
+    "as_completed",
+    "wait",
+]
+
+LOGGER = logging.getLogger("client.aio")
+
+# The query functions that get an async variant
+_QUERIES = (
+    "get_plow_time",
+    "get_project", "get_project_by_code", "get_projects", "get_active_projects", "get_job_board",
+    "get_job_board_delta",
+    "get_folder", "get_folders",
+    "get_job", "get_active_job", "get_jobs", "get_jobs_by_ids", "get_job_spec",
+    "get_job_outputs", "get_outputs_for_jobs",
+    "get_layer", "get_layer_by_id", "get_layers", "get_layers_for_jobs", "get_layer_outputs",
+    "get_task", "get_tasks", "get_task_log_path", "get_task_stats", "get_task_stats_bulk",
+    "get_node", "get_nodes", "get_proc", "get_procs",
+    "get_cluster", "get_clusters", "get_clusters_by_tag",
+    "get_quota", "get_quotas",
+    "get_filter", "get_filters", "get_matcher", "get_matchers", "get_action", "get_actions",
+    "get_depends_on_job", "get_job_depends_on", "get_depends_on_layer",
+    "get_layer_depends_on", "get_depends_on_task", "get_task_depends_on",
+    "get_output_attrs",
+)
+
+_EXECUTOR = None
+_MAX_WORKERS = conf.POOL_SIZE
+_LOCK = threading.Lock()
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            LOGGER.debug("Starting %d async workers", _MAX_WORKERS)
+            _EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+        return _EXECUTOR
+
+
+def submit(func, *args, **kwargs):
+    """
+    Run any callable in the async worker pool.
+
+    :param func: callable - usually a plow.client function
+    :returns: :class:`concurrent.futures.Future`
+    """
+    return _get_executor().submit(func, *args, **kwargs)
+
+
+def set_max_workers(num):
+    """
+    Set the number of worker threads running async calls.
+    More workers than the connection pool size will just
+    wait on each other for a connection. Calls already
+    submitted finish on the old workers.
+
+    :param num: int - number of worker threads
+    """
+    global _EXECUTOR, _MAX_WORKERS
+    with _LOCK:
+        _MAX_WORKERS = max(int(num), 1)
+        old, _EXECUTOR = _EXECUTOR, None
+
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def shutdown(wait=True):
+    """
+    Stop the async worker threads. A new pool is started
+    by the next async call.
+
+    :param wait: bool - block until pending calls are done
+    """
+    global _EXECUTOR
+    with _LOCK:
+        old, _EXECUTOR = _EXECUTOR, None
+
+    if old is not None:
+        old.shutdown(wait=wait)
+
+
+def _make_async(name):
+    func = getattr(_plow, name)
+
+    def wrapper(*args, **kwargs):
+        # looked up per call, to pick up the plow.client.cache wrappers
+        return submit(getattr(_plow, name), *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = "Async :func:`plow.client.%s`. Returns a Future.\n%s" % (name, func.__doc__ or "")
+    return wrapper
+
+
+for _name in _QUERIES:
+    globals()[_name] = _make_async(_name)
+    __all__.append(_name)
+
+del _name
@@ -0,0 +1,375 @@
+"""
+An opt-in cache for the read-mostly plow.client queries.
+
+Projects, clusters, services, folders and layers change rarely
+compared to how often tools ask for them. Once enabled, the
+query functions for those entities return cached results until
+the entity's TTL expires, the cache fills up and evicts the
+least recently used result, or a plow.client call that changes
+the entity invalidates it::
+
+    import plow.client
+    plow.client.cache.enable()
+
+    plow.client.get_projects()  # fetched from the server
+    plow.client.get_projects()  # cached
+    plow.client.cache.get_stats()
+
+The cache can also be turned on for every client with the
+``cache_enabled`` option of the plow.cfg file.
+"""
+import sys
+import time
+import logging
+import threading
+
+from collections import OrderedDict
+from functools import wraps
+
+from . import conf
+from . import plow as _plow
+
+__all__ = [
+    "enable",
+    "disable",
+    "is_enabled",
+    "invalidate",
+    "clear",
+    "set_ttl",
+    "get_stats",
+]
+
+LOGGER = logging.getLogger("client.cache")
+
+# Default seconds that each entity is cached for
+TTLS = {
+    "project": 300,
+    "cluster": 60,
+    "service": 300,
+    "folder": 30,
+    "layer": 10,
+}
+
+# The cached query functions, and the entity they return
+_QUERIES = {
+    "get_project": "project",
+    "get_project_by_code": "project",
+    "get_projects": "project",
+    "get_active_projects": "project",
+    "get_cluster": "cluster",
+    "get_clusters": "cluster",
+    "get_clusters_by_tag": "cluster",
+    "get_services": "service",
+    "get_folder": "folder",
+    "get_folders": "folder",
+    "get_layer": "layer",
+    "get_layer_by_id": "layer",
+    "get_layers": "layer",
+}
+
+# The functions that change cached entities
+_MUTATIONS = {
+    "create_project": ("project",),
+    "set_project_active": ("project",),
+    "create_cluster": ("cluster",),
+    "delete_cluster": ("cluster",),
+    "lock_cluster": ("cluster",),
+    "set_cluster_tags": ("cluster",),
+    "set_cluster_name": ("cluster",),
+    "set_default_cluster": ("cluster",),
+    "set_node_cluster": ("cluster",),
+    "create_service": ("service",),
+    "delete_service": ("service",),
+    "update_service": ("service",),
+    "create_folder": ("folder",),
+    "delete_folder": ("folder",),
+    "set_folder_name": ("folder",),
+    "set_folder_min_cores": ("folder",),
+    "set_folder_max_cores": ("folder",),
+    "launch_job": ("folder",),
+    "kill_job": ("folder", "layer"),
+    "set_layer_tags": ("layer",),
+    "set_layer_min_cores_per_task": ("layer",),
+    "set_layer_max_cores_per_task": ("layer",),
+    "set_layer_min_ram_per_task": ("layer",),
+    "set_layer_threadable": ("layer",),
+    "retry_tasks": ("layer",),
+    "eat_tasks": ("layer",),
+    "kill_tasks": ("layer",),
+}
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+class TTLCache(object):
+    """
+    A thread safe, size bounded LRU mapping whose
+    entries expire after a per-entry number of seconds.
+    Keys are (entity, ...) tuples.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = max(int(maxsize), 1)
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__stats = {}
+        self.evictions = 0
+        self.invalidations = 0
+        # bumped by every invalidation, see set()
+        self.generation = 0
+
+    def __len__(self):
+        return len(self.__data)
+
+    def get(self, key):
+        """
+        Return (True, value) for a live entry,
+        otherwise (False, None)
+        """
+        now = time.time()
+        with self.__lock:
+            entry = self.__data.pop(key, None)
+            if entry is not None and entry[0] > now:
+                # re-insert as the most recently used
+                self.__data[key] = entry
+                self.__count(key[0], 0)
+                return True, entry[1]
+
+            self.__count(key[0], 1)
+            return False, None
+
+    def set(self, key, value, ttl, generation=None):
+        """
+        Store a value for ttl seconds. If a generation is given
+        and the cache was invalidated since, the value may be stale
+        and is not stored.
+        """
+        if ttl <= 0:
+            return
+
+        with self.__lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.__data.pop(key, None)
+            self.__data[key] = (time.time() + ttl, value)
+            while len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, entities=None):
+        """
+        Drop the entries of the given entities, or all
+        entries if no entities are given.
+        """
+        with self.__lock:
+            self.generation += 1
+            if entities is None:
+                self.invalidations += len(self.__data)
+                self.__data.clear()
+                return
+
+            for key in [k for k in self.__data if k[0] in entities]:
+                del self.__data[key]
+                self.invalidations += 1
+
+    def stats(self):
+        with self.__lock:
+            hits = sum(s[0] for s in self.__stats.itervalues())
+            misses = sum(s[1] for s in self.__stats.itervalues())
+            return {
+                "size": len(self.__data),
+                "maxSize": self.maxsize,
+                "hits": hits,
+                "misses": misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entities": dict((e, {"hits": s[0], "misses": s[1]})
+                                    for e, s in self.__stats.iteritems()),
+            }
+
+    def __count(self, entity, idx):
+        counts = self.__stats.get(entity)
+        if counts is None:
+            counts = self.__stats[entity] = [0, 0]
+        counts[idx] += 1
+
+
+_CACHE = None
+_ORIGINALS = {}
+_LOCK = threading.Lock()
+
+
+def _freeze(value):
+    """
+    Convert query arguments to something hashable.
+    Plow objects are keyed by their id.
+    """
+    if isinstance(value, _plow.PlowBase):
+        return (value.__class__.__name__, value.id)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.iteritems()))
+    try:
+        hash(value)
+    except TypeError:
+        raise _Uncacheable()
+    return value
+
+
+def _copy(value):
+    # Hand out copies of containers so callers can't change the cached one
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _make_cached(name, func, entity):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _CACHE
+        if cache is None:
+            return func(*args, **kwargs)
+
+        try:
+            key = (entity, name, _freeze(args), _freeze(kwargs))
+        except _Uncacheable:
+            return func(*args, **kwargs)
+
+        hit, value = cache.get(key)
+        if not hit:
+            generation = cache.generation
+            value = func(*args, **kwargs)
+            cache.set(key, value, TTLS.get(entity, 0), generation)
+
+        return _copy(value)
+
+    return wrapper
+
+
+def _make_invalidating(name, func, entities):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            cache = _CACHE
+            if cache is not None:
+                cache.invalidate(entities)
+
+    return wrapper
+
+
+def _get_client_module():
+    # The plow.client package, which may still be importing
+    return sys.modules[__name__.rpartition('.')[0]]
+
+
+def enable(size=None, ttls=None):
+    """
+    Start caching the read-mostly plow.client queries.
+    Calling it again resizes the cache and updates the TTLs.
+
+    :param size: int - max number of cached results (conf.CACHE_SIZE)
+    :param ttls: dict - entity name => seconds to cache it for
+    """
+    global _CACHE
+    _client = _get_client_module()
+
+    with _LOCK:
+        if ttls:
+            TTLS.update(ttls)
+
+        size = conf.CACHE_SIZE if size is None else size
+        if _CACHE is None or _CACHE.maxsize != size:
+            _CACHE = TTLCache(size)
+
+        if _ORIGINALS:
+            return
+
+        # Module functions are looked up at call time, so patching
+        # the extension module also covers object methods such as
+        # Layer.set_tags or Project.get_folders.
+        for table, maker in ((_QUERIES, _make_cached), (_MUTATIONS, _make_invalidating)):
+            for name, arg in table.iteritems():
+                func = getattr(_plow, name)
+                _ORIGINALS[name] = func
+                wrapper = maker(name, func, arg)
+                setattr(_plow, name, wrapper)
+                setattr(_client, name, wrapper)
+
+    LOGGER.debug("Enabled the client cache, size %d", _CACHE.maxsize)
+
+
+def disable():
+    """
+    Stop caching and drop all cached results
+    """
+    global _CACHE
+    _client = _get_client_module()
+
+    with _LOCK:
+        for name, func in _ORIGINALS.iteritems():
+            setattr(_plow, name, func)
+            setattr(_client, name, func)
+
+        _ORIGINALS.clear()
+        _CACHE = None
+
+
+def is_enabled():
+    """
+    :returns: bool - True if the cache is enabled
+    """
+    return _CACHE is not None
+
+
+def invalidate(*entities):
+    """
+    Drop the cached results for the given entities,
+    i.e. invalidate("layer", "folder"), or all results
+    if none are given. Use this after changing things
+    outside of plow.client.
+
+    :param entities: str - "project", "cluster", "service", "folder" or "layer"
+    """
+    cache = _CACHE
+    if cache is not None:
+        cache.invalidate(entities or None)
+
+
+def clear():
+    """
+    Drop all cached results
+    """
+    invalidate()
+
+
+def set_ttl(entity, seconds):
+    """
+    Set how long results for an entity are cached.
+    Applies to results cached from now on.
+
+    :param entity: str - "project", "cluster", "service", "folder" or "layer"
+    :param seconds: float - 0 disables caching the entity
+    """
+    TTLS[entity] = float(seconds)
+
+
+def get_stats():
+    """
+    Return the cache counters, with per entity hits and misses::
+
+        {'size': 12, 'maxSize': 1024, 'hits': 310, 'misses': 14,
+         'evictions': 0, 'invalidations': 2,
+         'entities': {'layer': {'hits': 120, 'misses': 10}, ...}}
+
+    :returns: dict
+    """
+    cache = _CACHE
+    if cache is None:
+        return {}
+    return cache.stats()
@@ -27,6 +27,12 @@ def _init():
 
     setattr(mod, 'PLOW_HOSTS', host_list or ["localhost:11336"])
 
+    setattr(mod, 'POOL_SIZE', int(get('plow', 'pool_size', 16)))
+    setattr(mod, 'POOL_IDLE_TIMEOUT', int(get('plow', 'pool_idle_timeout', 60)))
+
+    setattr(mod, 'CACHE_ENABLED', get('plow', 'cache_enabled', 'false').lower() in ('1', 'true', 'yes', 'on'))
+    setattr(mod, 'CACHE_SIZE', int(get('plow', 'cache_size', 1024)))
+
 
 def get(section, key, default=None):
     """
@@ -0,0 +1,83 @@
+"""
+Live logs of running tasks, read from the rndaemon on the
+node running the task.
+
+The log file of a running task can lag behind its output
+when the log directory is on a network filesystem. These
+helpers follow the log through the node instead::
+
+    for data in livelog.tail_task_log(task):
+        sys.stdout.write(data)
+
+Once the task has finished, the whole log is in its log file.
+"""
+import time
+import logging
+
+from . import plow as _plow
+
+__all__ = [
+    "open_task_log",
+    "tail_task_log",
+]
+
+LOGGER = logging.getLogger("client.livelog")
+
+
+def open_task_log(task, offset=0, port=None):
+    """
+    Open the live log of a running task, from the given byte 
+    offset. A negative offset counts back from the end.
+
+    Returns None if the task is not running, or its node 
+    can not be reached.
+
+    :param task: :class:`.Task`
+    :param offset: int
+    :param port: int rndaemon port, or None for the default
+    :returns: :class:`plow.rndaemon.client.TaskLogReader`
+    """
+    if task.state != _plow.TaskState.RUNNING:
+        return None
+
+    host = task.stats.lastNode
+    if not host:
+        return None
+
+    try:
+        from plow.rndaemon.client import TaskLogReader
+    except ImportError, e:
+        LOGGER.debug("Live task logs are not available: %s", e)
+        return None
+
+    try:
+        return TaskLogReader(host, taskId=task.id, port=port, offset=offset)
+    except Exception, e:
+        LOGGER.warn("Failed to open the live log of task %s on %s: %s", task.id, host, e)
+        return None
+
+
+def tail_task_log(task, interval=1.0, offset=0, port=None):
+    """
+    Yield the log of a running task as it is written, every 
+    interval seconds, until the task is no longer running. 
+    Yields nothing if the live log can not be opened.
+
+    :param task: :class:`.Task`
+    :param interval: float
+    :param offset: int
+    :param port: int
+    """
+    reader = open_task_log(task, offset, port)
+    if reader is None:
+        return
+
+    try:
+        while reader.isRunning:
+            data = reader.read()
+            if data:
+                yield data
+            else:
+                time.sleep(interval)
+    finally:
+        reader.close()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""
+bench_threads.py
+
+Measures how well concurrent plow.client queries scale
+across Python threads. Every Thrift round trip in the
+client is run without holding the GIL, so N threads issuing
+queries against a live server should complete well ahead
+of N times the single threaded wall time.
+
+A "ticker" thread also runs in the background, counting
+how often it gets scheduled while the queries are in flight.
+A low tick rate means the queries are starving other Python
+threads (i.e. a GUI event loop).
+"""
+
+import sys
+import time
+import threading
+
+import manifest
+import plow.client
+
+
+QUERIES = {
+    'get_jobs': lambda: plow.client.get_jobs(),
+    'get_nodes': lambda: plow.client.get_nodes(),
+    'get_projects': lambda: plow.client.get_projects(),
+    'get_clusters': lambda: plow.client.get_clusters(),
+}
+
+
+def run_queries(func, num):
+    for _ in xrange(num):
+        func()
+
+
+def ticker(evt, counter):
+    while not evt.is_set():
+        counter[0] += 1
+        time.sleep(.001)
+
+
+def bench(func, threads, calls):
+    """
+    bench(callable func, int threads, int calls) -> (float secs, int ticks)
+
+    Run `calls` queries in each of `threads` threads and
+    return the total wall time, along with the number of times
+    an unrelated Python thread was able to run in that time.
+    """
+    stop = threading.Event()
+    ticks = [0]
+
+    tick_thread = threading.Thread(target=ticker, args=(stop, ticks))
+    tick_thread.daemon = True
+    tick_thread.start()
+
+    workers = [threading.Thread(target=run_queries, args=(func, calls))
+                for _ in xrange(threads)]
+
+    start = time.time()
+
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    elapsed = time.time() - start
+
+    stop.set()
+    tick_thread.join()
+
+    return elapsed, ticks[0]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark concurrent plow.client queries',
+        usage='%(prog)s [opts]',
+    )
+
+    parser.add_argument("-query", default="get_jobs", choices=sorted(QUERIES),
+        help="The client query to run in each thread")
+
+    parser.add_argument("-calls", type=int, default=50,
+        help="Number of queries each thread should run")
+
+    parser.add_argument("-threads", type=int, nargs='+', default=[1, 2, 4, 8],
+        help="Thread counts to benchmark")
+
+    args = parser.parse_args()
+
+    func = QUERIES[args.query]
+
+    # warm up the connection pool
+    func()
+
+    baseline = None
+
+    print "%-8s %-10s %-10s %-10s %-10s" % ("threads", "secs", "queries/s", "speedup", "ticks/s")
+
+    for num in args.threads:
+        elapsed, ticks = bench(func, num, args.calls)
+        qps = (num * args.calls) / elapsed
+
+        if baseline is None:
+            baseline = qps
+
+        print "%-8d %-10.3f %-10.1f %-10.2f %-10.1f" % (
+            num, elapsed, qps, qps / baseline, ticks / elapsed)
+
+    print
+    print "pool:", plow.client.get_pool_stats()
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -82,6 +82,53 @@ class ApiModuleTests(unittest.TestCase):
             if job1:
                 plow.client.kill_job(job1)
 
+    def test_get_layers_for_jobs(self):
+        clear_job("test_job_5")
+        job = None
+        try:
+            job = launch_test_job("test_job_5")
+            layers = plow.client.get_layers_for_jobs([job])
+            self.assertEquals([job.id], layers.keys())
+            self.assertEquals("test_layer", layers[job.id][0].name)
+            self.assertEquals([job.id], [j.id for j in plow.client.get_jobs_by_ids([job.id])])
+        finally:
+            if job:
+                plow.client.kill_job(job)
+
+    def test_get_job_board_delta(self):
+        clear_job("test_job_6")
+        job = None
+        try:
+            project = plow.client.get_project_by_code("test")
+            since = plow.client.get_job_board_delta(project).updateTime
+
+            job = launch_test_job("test_job_6")
+            delta = plow.client.get_job_board_delta(project, since)
+            self.assertTrue(job.id in [j.id for f in delta.folders for j in f.jobs])
+
+            plow.client.kill_job(job)
+            delta = plow.client.get_job_board_delta(project, delta.updateTime)
+            self.assertTrue(job.id in delta.removedJobs)
+            job = None
+        finally:
+            if job:
+                plow.client.kill_job(job)
+
+    def test_get_events(self):
+        clear_job("test_job_7")
+        job = None
+        try:
+            events, lastEventId = plow.client.get_events()
+            self.assertEquals([], events)
+
+            job = launch_test_job("test_job_7")
+            events, lastEventId = plow.client.get_events(lastEventId, 5000)
+            launched = [e.objectId for e in events if e.type == plow.client.EventType.JOB_LAUNCHED]
+            self.assertTrue(job.id in launched)
+        finally:
+            if job:
+                plow.client.kill_job(job)
+
     def test_get_active_job(self):
         clear_job("test_job_3")
         job1 = None
@@ -116,6 +163,59 @@ class ApiModuleTests(unittest.TestCase):
         except Exception, e:
             pass
 
+    def test_pool_reuse(self):
+        import threading
+
+        plow.client.get_clusters()
+        before = plow.client.get_pool_stats()
+
+        threads = [threading.Thread(target=plow.client.get_clusters) for _ in xrange(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        after = plow.client.get_pool_stats()
+        self.assertEquals(0, after["active"])
+        self.assertTrue(after["reused"] > before["reused"])
+        self.assertTrue(after["idle"] <= after["maxSize"])
+
+    def test_cache(self):
+        plow.client.cache.enable()
+        try:
+            plow.client.cache.clear()
+            stats = plow.client.cache.get_stats()
+
+            projects = plow.client.get_projects()
+            self.assertEquals([p.id for p in projects],
+                              [p.id for p in plow.client.get_projects()])
+
+            after = plow.client.cache.get_stats()
+            self.assertEquals(stats["misses"] + 1, after["misses"])
+            self.assertEquals(stats["hits"] + 1, after["hits"])
+
+            # creating a cluster invalidates the cached cluster list
+            plow.client.get_clusters()
+            c = plow.client.create_cluster(str(uuid.uuid4()), ["linux"])
+            self.assertTrue(c.id in [cl.id for cl in plow.client.get_clusters()])
+        finally:
+            plow.client.cache.disable()
+
+    def test_aio_get_job(self):
+        import plow.client.aio as aio
+
+        clear_job("test_job_4")
+        job1 = None
+        try:
+            job1 = launch_test_job("test_job_4")
+            futures = [aio.get_job(job1.id) for _ in xrange(8)]
+            for f in aio.as_completed(futures):
+                self.assertEquals(job1.id, f.result().id)
+            self.assertEquals(1, len(aio.get_layers(job1).result()))
+        finally:
+            if job1:
+                plow.client.kill_job(job1)
+
 if __name__ == "__main__":
     suite = unittest.TestLoader().loadTestsFromTestCase(ApiModuleTests)
     unittest.TextTestRunner(verbosity=2).run(suite)
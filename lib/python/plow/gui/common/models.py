@@ -81,7 +81,6 @@ class PlowTableModel(QtCore.QAbstractTableModel):
         to_add = set()
         object_ids = set()
 
-        rows = self._index
         columnCount = self.columnCount()
         parent = QtCore.QModelIndex()
 
@@ -113,16 +112,40 @@ class PlowTableModel(QtCore.QAbstractTableModel):
         # Remove missing
         if self.refreshShouldRemove:
             to_remove = set(self._index.iterkeys()).difference(object_ids)
-            if to_remove:
-                row_ids = ((rows[old_id], old_id) for old_id in to_remove)
-                
-                for row, old_id in sorted(row_ids, reverse=True):
+        else:
+            to_remove = self.fetchRemovedIds()
+
+        self.removeItems(to_remove)
+
+    def fetchRemovedIds(self):
+        """
+        Method that can be defined in subclasses that refresh
+        incrementally (refreshShouldRemove is False), to fetch the 
+        ids of objects removed since the last refresh. 
+
+        Should return a list of ids
+        """
+        return []
+
+    def removeItems(self, ids):
+        """
+        Remove the items with the given ids from the model.
+        Ids that are not in the model are ignored. 
+
+        :param ids: list of ids
+        """
+        rows = self._index
+        parent = QtCore.QModelIndex()
+
+        row_ids = [(rows[old_id], old_id) for old_id in ids if old_id in rows]
+        
+        for row, old_id in sorted(row_ids, reverse=True):
 
-                    self.beginRemoveRows(parent, row, row)
-                    obj = self._items.pop(row)
-                    self.endRemoveRows()
+            self.beginRemoveRows(parent, row, row)
+            obj = self._items.pop(row)
+            self.endRemoveRows()
 
-                    LOGGER.debug("removing %s %s", old_id, obj.name)
+            LOGGER.debug("removing %s %s", old_id, obj.name)
 
         # reindex the items
         self._index = dict(((item.id, i) for i, item in enumerate(self._items)))
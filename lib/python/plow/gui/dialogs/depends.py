@@ -425,9 +425,11 @@ class ConfirmApplyPage(BaseDepPage):
             else:
                 jobIds.add(d.jobId)
 
-        for job in client.get_jobs(jobIds=jobIds):
+        for job in client.get_jobs_by_ids(jobIds):
             jobs[job.id] = job
-            for layer in job.get_layers():
+
+        for jobLayers in client.get_layers_for_jobs(jobs.keys()).itervalues():
+            for layer in jobLayers:
                 layers[layer.id] = layer
 
         # init a list allocated with the size of
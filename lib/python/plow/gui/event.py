@@ -1,6 +1,13 @@
 
+import time
+import logging
+
 from manifest import QtCore
 
+import plow.client
+
+LOGGER = logging.getLogger(__name__)
+
 
 class _EventManager(QtCore.QObject):
 
@@ -15,5 +22,128 @@ class _EventManager(QtCore.QObject):
     ClusterOfInterest = QtCore.Signal(str)
     NodeOfInterest = QtCore.Signal(str)
 
+    # Changes pushed by the server, see EventStream
+    JobLaunched = QtCore.Signal(str)
+    JobUpdated = QtCore.Signal(str)
+    JobFinished = QtCore.Signal(str)
+    TaskUpdated = QtCore.Signal(str, str) # taskId, jobId
+    NodeUpdated = QtCore.Signal(str)
+
+    def isStreaming(self):
+        """
+        Return True if server change events are being
+        received, so panels don't need to poll.
+        """
+        return _STREAM is not None and _STREAM.isConnected()
+
 
 EventManager = _EventManager()
+
+
+class EventStream(QtCore.QThread):
+    """
+    Long-polls the server for job, task and node change
+    events and re-emits them as EventManager signals.
+    """
+
+    # msec the server holds each request open
+    POLL_TIMEOUT = 10000
+
+    # seconds to wait before reconnecting after an error
+    RETRY_SECONDS = 5
+
+    def __init__(self, parent=None):
+        super(EventStream, self).__init__(parent)
+        self.__running = False
+        self.__connected = False
+
+        self.__signals = {
+            plow.client.EventType.JOB_LAUNCHED: lambda e: EventManager.JobLaunched.emit(e.objectId),
+            plow.client.EventType.JOB_UPDATED: lambda e: EventManager.JobUpdated.emit(e.objectId),
+            plow.client.EventType.JOB_FINISHED: lambda e: EventManager.JobFinished.emit(e.objectId),
+            plow.client.EventType.TASK_UPDATED: lambda e: EventManager.TaskUpdated.emit(e.objectId, e.jobId),
+            plow.client.EventType.NODE_UPDATED: lambda e: EventManager.NodeUpdated.emit(e.objectId),
+        }
+
+    def isConnected(self):
+        return self.__running and self.__connected
+
+    def stop(self):
+        self.__running = False
+
+    def run(self):
+        self.__running = True
+        lastEventId = -1
+        lost = False
+
+        while self.__running:
+            since = lastEventId
+            start = time.time()
+            try:
+                events, lastEventId = plow.client.get_events(lastEventId, self.POLL_TIMEOUT)
+
+            except Exception, e:
+                LOGGER.warn("Lost the event stream, retrying in %ds: %s", self.RETRY_SECONDS, e)
+                self.__connected = False
+                lost = True
+                lastEventId = -1
+                self.sleep(self.RETRY_SECONDS)
+                continue
+
+            if not self.__connected:
+                self.__connected = True
+                if lost:
+                    # Anything could have changed while we were not listening
+                    EventManager.GlobalRefresh.emit()
+
+            self.__emit(events)
+
+            # The server answers right away when too many clients 
+            # are waiting, so back off instead of polling in a loop.
+            if since >= 0 and not events and \
+                time.time() - start < self.POLL_TIMEOUT / 2000.0:
+                self.sleep(self.RETRY_SECONDS)
+
+        self.__connected = False
+
+    def __emit(self, events):
+        # Only signal each object once per batch
+        seen = set()
+
+        for e in events:
+            if e.type == plow.client.EventType.RESYNC:
+                EventManager.GlobalRefresh.emit()
+                return
+
+            key = (e.type, e.objectId)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            emit = self.__signals.get(e.type)
+            if emit:
+                emit(e)
+
+
+_STREAM = None
+
+def startEventStream():
+    """
+    Start receiving server change events in the background.
+    """
+    global _STREAM
+    if _STREAM is None:
+        _STREAM = EventStream()
+        _STREAM.start()
+    return _STREAM
+
+def stopEventStream(wait=True):
+    """
+    Stop receiving server change events.
+    """
+    global _STREAM
+    stream, _STREAM = _STREAM, None
+    if stream is not None:
+        stream.stop()
+        if wait:
+            stream.wait((EventStream.POLL_TIMEOUT + 1000))
@@ -5,8 +5,10 @@ import logging
 
 from manifest import QtCore, QtGui
 from util import loadTheme 
+import event
 from panels import *
 
+import plow.client
 from plow.client import PlowConnectionError
 
 LOGGER = logging.getLogger("plow-wrangler")
@@ -90,15 +92,24 @@ class MainWindow(QtGui.QMainWindow):
 
 
 
-def launch(argv, name, layout=None):
+def launch(argv, name, layout=None, stream=True):
     # Initialize the default configuration files if none exist
     app = QtGui.QApplication(argv)
     app.setAttribute(QtCore.Qt.AA_DontShowIconsInMenus, False)
     loadTheme()
 
+    # Dialogs and panels ask for the same projects, clusters
+    # and layers over and over.
+    plow.client.cache.enable()
+
     try:
         win = MainWindow(name, layout)
         app.lastWindowClosed.connect(win.saveApplicationState)
+
+        if stream:
+            event.startEventStream()
+            app.aboutToQuit.connect(event.stopEventStream)
+
         win.show()
         win.raise_()
         app.exec_()
@@ -119,12 +130,15 @@ def main():
     parser.add_argument("-debug", action="store_true", 
         help="Print more debugging output")
 
+    parser.add_argument("-poll", action="store_true", 
+        help="Poll the server on a timer instead of streaming change events")
+
     args = parser.parse_args()  
 
     logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
 
     signal.signal(signal.SIGINT, signal.SIG_DFL)
-    launch(sys.argv, "Plow Wrangle", "Wrangler")
+    launch(sys.argv, "Plow Wrangle", "Wrangler", stream=not args.poll)
 
 
 if __name__ == "__main__":
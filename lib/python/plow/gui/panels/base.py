@@ -1,5 +1,6 @@
 
 import os
+import time
 import logging
 import traceback 
 
@@ -188,6 +189,7 @@ class WorkspaceManager(QtCore.QObject):
             self.__panels.remove(panel) 
         except ValueError: 
             pass  
+        panel.disconnectEvents()
         self.parent().removeDockWidget(panel)
         panel.widget().deleteLater()
         panel.deleteLater()
@@ -211,6 +213,19 @@ class Panel(QtGui.QDockWidget):
 
     panelClosed = QtCore.Signal(object)
 
+    # Names of the EventManager server change signals that
+    # should refresh this panel. While the event stream is 
+    # connected, these panels stop polling on every tick of
+    # the refresh timer.
+    REFRESH_EVENTS = ()
+
+    # Seconds between refreshes of a panel driven by 
+    # server events, to pick up changes that are not evented.
+    STREAMING_REFRESH_SECONDS = 60
+
+    # msec to collect events for before refreshing 
+    EVENT_REFRESH_DELAY = 500
+
     def __init__(self, name, ptype, parent=None):
         QtGui.QDockWidget.__init__(self, parent)
 
@@ -225,6 +240,15 @@ class Panel(QtGui.QDockWidget):
         self.attrs = { }
 
         self.__refreshTimer = None
+        self.__lastRefresh = 0
+
+        self.__eventTimer = QtCore.QTimer(self)
+        self.__eventTimer.setSingleShot(True)
+        self.__eventTimer.setInterval(self.EVENT_REFRESH_DELAY)
+        self.__eventTimer.timeout.connect(self.__eventRefresh)
+
+        for name in self.REFRESH_EVENTS:
+            getattr(event.EventManager, name).connect(self.__eventSlot(name))
 
         # Note: the widet in the panel adds more buttons
         # to this toolbar.
@@ -305,17 +329,44 @@ class Panel(QtGui.QDockWidget):
         if timer:
             timer.stop()
 
-        self.refresh()
+        # Rely on the server events when they are flowing, 
+        # with an occasional full refresh.
+        if not self.REFRESH_EVENTS or not event.EventManager.isStreaming() \
+            or time.time() - self.__lastRefresh >= self.STREAMING_REFRESH_SECONDS:
+
+            self.__eventTimer.stop()
+            self.__lastRefresh = time.time()
+            self.refresh()
 
         if timer:
             timer.start()
 
+    def __eventRefresh(self):
+        self.__lastRefresh = time.time()
+        self.refresh()
+
+    def __handleChangeEvent(self, name, *args):
+        if self.__eventTimer.isActive() or not self.isInterestingEvent(name, *args):
+            return
+
+        # Never refresh more often than the refresh timer would
+        wait = self.getAttr("refreshSeconds", 0) - (time.time() - self.__lastRefresh)
+        self.__eventTimer.start(max(int(wait * 1000), self.EVENT_REFRESH_DELAY))
+
     def refresh(self):
         """
         Refresh the main widget.
         """
         pass
 
+    def isInterestingEvent(self, name, *ids):
+        """
+        Return True if a server change event in REFRESH_EVENTS
+        should refresh this panel. Receives the signal name and 
+        arguments, for example ("JobUpdated", jobId).
+        """
+        return True
+
     def save(self, settings):
         """
         Called when the application needs the planel to save its configuration.
@@ -352,6 +403,39 @@ class Panel(QtGui.QDockWidget):
     def __close(self):
         self.panelClosed.emit(self)
 
+    def disconnectEvents(self):
+        """
+        Stop refreshing on server change events, once
+        the panel is closed.
+        """
+        self.__eventTimer.stop()
+
+        for name in self.REFRESH_EVENTS:
+            try:
+                getattr(event.EventManager, name).disconnect(self.__eventSlot(name))
+            except (RuntimeError, TypeError):
+                pass
+
+    def __eventSlot(self, name):
+        return getattr(self, "_on%s" % name)
+
+    # One bound method slot per server change signal, so 
+    # that they can be disconnected. 
+    def _onJobLaunched(self, jobId):
+        self.__handleChangeEvent("JobLaunched", jobId)
+
+    def _onJobUpdated(self, jobId):
+        self.__handleChangeEvent("JobUpdated", jobId)
+
+    def _onJobFinished(self, jobId):
+        self.__handleChangeEvent("JobFinished", jobId)
+
+    def _onTaskUpdated(self, taskId, jobId):
+        self.__handleChangeEvent("TaskUpdated", taskId, jobId)
+
+    def _onNodeUpdated(self, nodeId):
+        self.__handleChangeEvent("NodeUpdated", nodeId)
+
     def __floatingChanged(self, value):
         self.setFloating(value)
 
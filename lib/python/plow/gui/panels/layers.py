@@ -16,6 +16,8 @@ LOGGER = logging.getLogger(__name__)
 
 class LayerPanel(Panel):
 
+    REFRESH_EVENTS = ("JobUpdated", "TaskUpdated")
+
     def __init__(self, name="Layers", parent=None):
         Panel.__init__(self, name, "Layers", parent)
 
@@ -31,6 +33,10 @@ class LayerPanel(Panel):
     def refresh(self):
         self.widget().refresh()
 
+    def isInterestingEvent(self, name, *ids):
+        # The jobId is the last argument of both signals
+        return ids[-1] == self.__lastJobId
+
     def __handleJobOfInterestEvent(self, *args, **kwargs):
         jobId = args[0]
         self.widget().setJobId(jobId)
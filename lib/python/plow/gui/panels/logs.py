@@ -1,9 +1,12 @@
 import os
 import re
+import zlib
 import logging
 
 import plow.client
 
+from plow.client import livelog
+from plow.rndaemon import blocklog
 from plow.gui.manifest import QtCore, QtGui
 from plow.gui.panels import Panel
 from plow.gui.event import EventManager
@@ -15,6 +18,9 @@ DEFAULT_FONT_SIZE = 11 # pixels
 MIN_FONT_SIZE = 6
 MAX_FONT_SIZE = 24
 
+# Lines of a compressed log loaded at once
+COMPRESSED_LOG_LINES = 20000
+
 
 class LogsPanel(Panel):
 
@@ -194,10 +200,24 @@ class LogViewerWidget(QtGui.QWidget):
         self.__log_file = QtCore.QFile()
         self.__log_stream = QtCore.QTextStream()
 
+        # Compressed logs are read a window of lines at a time
+        self.__block_log = None
+        self.__block_offset = 0
+
+        # While the task runs, new output is read from its node
+        self.__task_log = None
+        self.__live_log = None
+        self.__live_timer = QtCore.QTimer(self)
+        self.__live_timer.setInterval(1000)
+
         openAction = QtGui.QAction("Open Log File", self)
         openAction.setShortcut(QtGui.QKeySequence.Open)
         self.addAction(openAction)
 
+        gotoAction = QtGui.QAction("Go To Line", self)
+        gotoAction.setShortcut(QtGui.QKeySequence("Ctrl+L"))
+        self.addAction(gotoAction)
+
         self.__searchLine = QtGui.QLineEdit(self)
         self.__chk_tail = QtGui.QAction("Tail log", self)
         self.__chk_tail.setCheckable(True)
@@ -266,6 +286,7 @@ class LogViewerWidget(QtGui.QWidget):
 
         # Connections
         self.__logWatcher.fileChanged.connect(self.__logUpdated)
+        self.__live_timer.timeout.connect(self.__liveLogUpdated)
         self.__chk_tail.toggled.connect(self.__logTailToggled)
         self.__searchLine.textChanged.connect(self.findText)
         self.__searchLine.returnPressed.connect(self.findNext)
@@ -273,6 +294,7 @@ class LogViewerWidget(QtGui.QWidget):
         self.__findNextBtn.triggered.connect(self.findNext)
         self.__logSelector.activated[int].connect(self.__logVersionChanged)
         openAction.triggered.connect(self.openLogFile)
+        gotoAction.triggered.connect(self.__gotoLineTriggered)
 
         # Optional args
         if job:
@@ -319,6 +341,7 @@ class LogViewerWidget(QtGui.QWidget):
 
     def setInterval(self, msec):
         self.__logWatcher.setInterval(msec)
+        self.__live_timer.setInterval(msec)
 
     def fontSize(self):
         return self.__view.font().pixelSize()
@@ -347,9 +370,13 @@ class LogViewerWidget(QtGui.QWidget):
         logPath = task.get_log_path()
         if logPath:
             self._touchLogFile(logPath)
+            logPath = self._findLogFile(logPath)
 
         self.updateLogSelector(task)
 
+        self.__task = task
+        self.__task_log = logPath
+
         if task.retries > -1:
             if logPath != self.logPath:
                 if not os.path.exists(logPath):
@@ -358,13 +385,14 @@ class LogViewerWidget(QtGui.QWidget):
 
                 self.setLogPath(logPath)
 
+            elif self.__live_log is None:
+                self.__openLiveLog()
+
             if self.isTailing(): 
                 self.scrollToBottom()
             else:
                 self.readMore()
 
-        self.__task = task
-
     def updateLogSelector(self, task=None):
         task = task or self.__task
         retries = task.retries
@@ -394,10 +422,18 @@ class LogViewerWidget(QtGui.QWidget):
 
     def setLogPath(self, path):
         self.stopLogTail()
+        self.__closeLiveLog()
 
         f = self.__log_file
         f.close()
         f.setFileName(path)
+        self.__block_log = None
+        self.__block_offset = 0
+
+        if path.endswith(blocklog.SUFFIX):
+            self.__setBlockLogPath(path)
+            return
+
         if not f.open(QtCore.QIODevice.ReadOnly | QtCore.QIODevice.Text):
             LOGGER.warn("Failed to open log file '%s'", path)
             return
@@ -407,9 +443,78 @@ class LogViewerWidget(QtGui.QWidget):
         self.__log_stream.setDevice(f)
         self.__view.setPlainText(self.__log_stream.readAll())
 
+        self.__openLiveLog()
+
         if self.__chk_tail.isChecked():
             self.startLogTail()
 
+    def __setBlockLogPath(self, path):
+        try:
+            log = blocklog.BlockLogReader(path)
+        except (IOError, OSError, zlib.error), e:
+            LOGGER.warn("Failed to open log file '%s': %s", path, e)
+            return
+
+        self.__block_log = log
+        self.__block_offset = log.size
+        self.__view.setPlainText(''.join(log.tail(COMPRESSED_LOG_LINES)))
+
+        self.__openLiveLog()
+
+        if self.__chk_tail.isChecked():
+            self.startLogTail()
+
+    def __openLiveLog(self):
+        """
+        Follow the rest of the current task's log from its node, 
+        from where the log file ended. 
+        """
+        task = self.__task
+        if task is None or self.logPath != self.__task_log:
+            return
+
+        if self.__block_log:
+            offset = self.__block_offset
+        else:
+            offset = self.__log_file.pos()
+
+        if offset is None:
+            return
+
+        self.__live_log = livelog.open_task_log(task, offset=offset)
+
+    def __closeLiveLog(self):
+        self.__live_timer.stop()
+
+        reader, self.__live_log = self.__live_log, None
+        if reader is not None:
+            reader.close()
+
+    def gotoLine(self, lineNo):
+        """
+        Move the cursor to line lineNo, counting from 1. 
+        For a compressed log, the lines around it are loaded 
+        first, and tailing is stopped. 
+        """
+        log = self.__block_log
+        first = 0
+
+        if log:
+            self.__chk_tail.setChecked(False)
+            first = max(lineNo - 1 - COMPRESSED_LOG_LINES / 2, 0)
+            lines = log.readLines(first, COMPRESSED_LOG_LINES)
+            self.__view.setPlainText(''.join(lines))
+            # Only append new data when the window is at the end
+            self.__block_offset = log.size if first + len(lines) >= log.lineCount else None
+
+        block = self.__view.document().findBlockByNumber(lineNo - 1 - first)
+        if not block.isValid():
+            return
+
+        cursor = QtGui.QTextCursor(block)
+        self.__view.setTextCursor(cursor)
+        self.__view.centerCursor()
+
     def setJobName(self, name):
         self.__jobNameLabel.setText(name)
         self.__jobNameLabel.setVisible(bool(name))
@@ -442,9 +547,13 @@ class LogViewerWidget(QtGui.QWidget):
 
     def startLogTail(self):
         self.stopLogTail()
-        self.__logWatcher.addPath(self.__log_file.fileName()) 
+        if self.__live_log is not None:
+            self.__live_timer.start()
+        else:
+            self.__logWatcher.addPath(self.__log_file.fileName()) 
 
     def stopLogTail(self):
+        self.__live_timer.stop()
         paths = self.__logWatcher.files()
         if paths:
             self.__logWatcher.removePaths(paths) 
@@ -453,7 +562,7 @@ class LogViewerWidget(QtGui.QWidget):
         logPath, _ = QtGui.QFileDialog.getOpenFileName(self,
                                                         "Open a log file",
                                                         "",
-                                                        "Logs (*.log *.txt);;All Files (*)")
+                                                        "Logs (*.log *.txt *.gz);;All Files (*)")
 
         if logPath:
             self.setLogPath(logPath)
@@ -477,6 +586,14 @@ class LogViewerWidget(QtGui.QWidget):
         cursor = self.__view.textCursor()
         cursor.movePosition(cursor.End)
 
+        if self.__live_log is not None and self.__block_offset is not None:
+            self.__liveLogUpdated()
+            return
+
+        if self.__block_log:
+            self.__blockLogUpdated(cursor)
+            return
+
         while True:
             line = self.__log_stream.read(1024)
             if not line:
@@ -486,6 +603,55 @@ class LogViewerWidget(QtGui.QWidget):
         if not self.__searchLine.text().strip():
             self.scrollToBottom()
 
+    def __blockLogUpdated(self, cursor):
+        log = self.__block_log
+        offset = self.__block_offset
+
+        if offset is None:
+            # Looking at an earlier window, go back to the end
+            self.setLogPath(log.name)
+            self.scrollToBottom()
+            return
+
+        log.refresh()
+        if log.size > offset:
+            cursor.insertText(log.read(offset, log.size - offset))
+            self.__block_offset = log.size
+
+        if not self.__searchLine.text().strip():
+            self.scrollToBottom()
+
+    def __liveLogUpdated(self):
+        reader = self.__live_log
+        if reader is None:
+            return
+
+        try:
+            data = reader.read()
+        except Exception, e:
+            LOGGER.warn("Failed to read the live log of task %s: %s", reader.procId, e)
+            data = ''
+            reader.isRunning = False
+
+        if data:
+            cursor = self.__view.textCursor()
+            cursor.movePosition(cursor.End)
+            cursor.insertText(data)
+
+            if not self.__searchLine.text().strip():
+                self.scrollToBottom()
+
+        if not reader.isRunning:
+            # The task is done, and its whole log is in the file
+            self.__task_log = None
+            self.setLogPath(self.logPath)
+            self.scrollToBottom()
+
+    def __gotoLineTriggered(self):
+        lineNo, ok = QtGui.QInputDialog.getInt(self, "Go To Line", "Line:", 1, 1)
+        if ok:
+            self.gotoLine(lineNo)
+
     def __logTailToggled(self, checked):
         if checked:
             self.startLogTail()
@@ -493,11 +659,18 @@ class LogViewerWidget(QtGui.QWidget):
             self.stopLogTail()
 
     def __logVersionChanged(self, index):
-        path = self.__logSelector.itemData(index)
+        path = self._findLogFile(self.__logSelector.itemData(index))
         if path != self.logPath:
             self.setLogPath(path)
             self.scrollToBottom()
 
+    @staticmethod
+    def _findLogFile(path):
+        """ The compressed log, if the task wrote one instead """
+        if not os.path.exists(path) and os.path.exists(path + blocklog.SUFFIX):
+            return path + blocklog.SUFFIX
+        return path
+
     @staticmethod
     def _touchLogFile(path):
         try:
@@ -25,11 +25,23 @@ for a in dir(plow.client.NodeState):
 
 LOGGER = logging.getLogger(__name__)
 
+# Nodes are stamped with the start time of the transaction that
+# updated them, which can be earlier than the server time read
+# before a fetch. Overlap each fetch by this much so those
+# updates are not missed.
+DELTA_OVERLAP_MS = 5000
+
 #########################
 # NodePanel
 #########################
 class NodePanel(Panel):
 
+    REFRESH_EVENTS = ("NodeUpdated",)
+
+    # Only state and lock changes are evented, 
+    # poll for the resources reported by pings.
+    STREAMING_REFRESH_SECONDS = 30
+
     def __init__(self, name="Nodes", parent=None):
         Panel.__init__(self, name, "Nodes", parent)
 
@@ -64,6 +76,9 @@ class NodePanel(Panel):
         sel = filt.selectedOptions()
         filt.setOptions(names, selected=sel)
 
+    def isInterestingEvent(self, name, nodeId):
+        return self.widget().isNodeShown(nodeId)
+
     def __setNodesLocked(self, locked):
         try:
             for node in self.widget().getSelectedNodes():
@@ -132,6 +147,16 @@ class NodeWidget(QtGui.QWidget):
             self.__model.refresh()
             self.__view.setSortingEnabled(True)
 
+    def isNodeShown(self, nodeId):
+        """
+        Return False if the node is loaded but hidden by the 
+        cluster filters. Nodes not loaded yet may be new.
+        """
+        row = self.__model.rowForId(nodeId)
+        if row is None:
+            return True
+        return self.__proxy.filterAcceptsRow(row, QtCore.QModelIndex())
+
     def getSelectedNodes(self):
         rows = self.__view.selectionModel().selectedRows()
         return [index.data(self.__model.ObjectRole) for index in rows]
@@ -265,13 +290,31 @@ class NodeModel(models.PlowTableModel):
     def __init__(self, parent=None):
         super(NodeModel, self).__init__(parent)
 
+        self.__lastUpdateTime = 0
+
+        # Nodes are updated incrementally, so don't 
+        # remove missing ones
+        self.refreshShouldRemove = False
+
     def fetchObjects(self):
-        return plow.client.get_nodes()
+        opts = {}
+        if self.__lastUpdateTime:
+            opts["lastUpdateTime"] = self.__lastUpdateTime 
+
+        t = plow.client.get_plow_time() - DELTA_OVERLAP_MS
+        nodes = plow.client.get_nodes(**opts)
+        self.__lastUpdateTime = t
+
+        return nodes
 
     def reload(self):
-        nodes = plow.client.get_nodes()
+        self.__lastUpdateTime = 0
+        nodes = self.fetchObjects()
         self.setItemList(nodes)
 
+    def rowForId(self, nodeId):
+        return self._index.get(nodeId)
+
     def refresh(self):
         if not self._items:
             self.reload()
@@ -15,6 +15,8 @@ from plow.gui.common import models, actions
 
 class TaskPanel(Panel):
 
+    REFRESH_EVENTS = ("TaskUpdated",)
+
     def __init__(self, name="Tasks", parent=None):
         Panel.__init__(self, name, "Tasks", parent)
 
@@ -49,6 +51,9 @@ class TaskPanel(Panel):
     def refresh(self):
         self.widget().refresh()
 
+    def isInterestingEvent(self, name, taskId, jobId):
+        return jobId == self.__lastJobId
+
     def __handleJobOfInterestEvent(self, jobId, *args, **kwargs):
         taskWidget = self.widget()
         taskWidget.setJobId(jobId)
@@ -27,6 +27,8 @@ JOB_ROLE = QtCore.Qt.UserRole + 1
 
 class RenderJobWatchPanel(Panel):
 
+    REFRESH_EVENTS = ("JobLaunched", "JobUpdated", "JobFinished", "TaskUpdated")
+
     def __init__(self, name="Render Watch", parent=None):
         Panel.__init__(self, name, "Render Watch", parent)
 
@@ -89,6 +91,11 @@ class RenderJobWatchPanel(Panel):
     def refresh(self):
         self.widget().refresh()
 
+    def isInterestingEvent(self, name, *ids):
+        # New jobs may match the filters, otherwise only
+        # refresh for the jobs being watched.
+        return name == "JobLaunched" or self.widget().hasJob(ids[-1])
+
     def __fixAttrs(self):
         # Older PySide QSettings may serialize a single item
         # list to just a string
@@ -219,6 +226,9 @@ class RenderJobWatchWidget(QtGui.QWidget):
         idx = self.__tree.indexOfTopLevelItem(item)
         self.__tree.takeTopLevelItem(idx)
 
+    def hasJob(self, jobId):
+        return self.__jobs.has_key(jobId)
+
     def jobs(self):
         tree = self.__tree
         items = tree.findItems("", QtCore.Qt.MatchContains|QtCore.Qt.MatchRecursive)
@@ -1,7 +1,6 @@
 import os
 import logging
 from datetime import datetime 
-from itertools import chain, imap
 from functools import partial
 
 import plow.client
@@ -46,6 +45,8 @@ LOGGER = logging.getLogger(__name__)
 
 class JobWranglerPanel(Panel):
 
+    REFRESH_EVENTS = ("JobLaunched", "JobUpdated", "JobFinished", "TaskUpdated")
+
     def __init__(self, name="Job Wrangler", parent=None):
         Panel.__init__(self, name, "JobWrangler", parent)
 
@@ -62,6 +63,11 @@ class JobWranglerPanel(Panel):
     def refresh(self):
         self.widget().refresh()
 
+    def isInterestingEvent(self, name, *ids):
+        # New jobs may be in the panel's projects, otherwise
+        # only refresh for the jobs on the board.
+        return name == "JobLaunched" or self.widget().hasJob(ids[-1])
+
     def save(self, settings):
         """
         Called when the application needs the planel to save its configuration.
@@ -167,6 +173,9 @@ class JobWranglerWidget(QtGui.QWidget):
     def refresh(self):
         self.__model.refresh()
 
+    def hasJob(self, jobId):
+        return self.__model.hasJob(jobId)
+
     def setProjects(self, projects):
         self.__attrs["projects"] = projects
         self.__model.setProjects(projects)
@@ -233,9 +242,13 @@ class JobModel(tree.TreeModel):
         self.__attrs = attrs
         self.__folders = []
         self.__folder_index = {}
+        self.__folder_jobs = {}
+        self.__job_ids = set()
+        self.__updateTimes = {}
 
     def _getChildren(self):
-        return [FolderNode(f, None, i) for i,f in enumerate(self.__folders)] 
+        return [FolderNode(f, None, i, self.__folder_jobs.get(f.id)) \
+                    for i,f in enumerate(self.__folders)] 
 
     def data(self, index, role=QtCore.Qt.DisplayRole):
         if not index.isValid():
@@ -271,8 +284,15 @@ class JobModel(tree.TreeModel):
             self.reset()
             return 
 
-        folders = chain.from_iterable(imap(plow.client.get_job_board, projects))
-        self.setFolderList(list(folders))
+        folders = []
+        self.__updateTimes = {}
+
+        for project in projects:
+            delta = plow.client.get_job_board_delta(project)
+            self.__updateTimes[project.id] = delta.updateTime
+            folders.extend(delta.folders)
+
+        self.setFolderList(folders)
 
     def refresh(self):
         projects = self.__attrs.get('projects', [])
@@ -289,24 +309,41 @@ class JobModel(tree.TreeModel):
         colCount = self.columnCount()
         parent = QtCore.QModelIndex()
 
-        folder_ids = set()
-        to_add = set()
+        to_add = []
+        changed = []
+        removed_folders = set()
+        removed_jobs = set()
+        job_folders = {}
         folderNodes = dict((f.ref.id, f) for f in self.subnodes)
 
-        # pull the job board
-        folders = chain.from_iterable(imap(plow.client.get_job_board, projects))
+        # pull the job board changes since the last refresh
+        for project in projects:
+            since = self.__updateTimes.get(project.id, 0)
+            delta = plow.client.get_job_board_delta(project, since)
+            self.__updateTimes[project.id] = delta.updateTime
+
+            removed_folders.update(delta.removedFolders)
+            removed_jobs.update(delta.removedJobs)
+
+            for folder in delta.folders:
+                changed.append(folder)
+                for job in folder.jobs:
+                    job_folders[job.id] = folder.id
+
+        # Remove finished jobs, and jobs that moved to another folder
+        if removed_jobs or job_folders:
+            for folderNode in folderNodes.itervalues():
+                self.__removeJobs(folderNode, removed_jobs, job_folders)
 
         # Update
-        for folder in folders:
+        for folder in changed:
 
-            folder_ids.add(folder.id)
             row = rows.get(folder.id)
             
             if row is None:
-                to_add.add(folder)
+                to_add.append(folder)
 
             else:
-                oldFolder = self.__folders[row]
                 folderNode = folderNodes[folder.id]
 
                 self.__updateJobs(folderNode, folder)
@@ -318,6 +355,16 @@ class JobModel(tree.TreeModel):
                 self.dataChanged.emit(start, end)
                 LOGGER.debug("updating %s %s", folder.id, folder.name)
 
+        # Remove deleted folders
+        to_remove = ((rows[f_id], f_id) for f_id in removed_folders.intersection(rows))
+        for row, f_id in sorted(to_remove, reverse=True):
+            self.beginRemoveRows(parent, row, row)
+            folder = self.__folders.pop(row)
+            self.subnodes.remove(folderNodes[f_id])
+            self.__folder_jobs.pop(f_id, None)
+            self.endRemoveRows()
+            LOGGER.debug("removing %s %s", f_id, folder.name)
+
         # Add new
         if to_add:
             size = len(to_add)
@@ -325,21 +372,20 @@ class JobModel(tree.TreeModel):
             end = start + size - 1
             self.beginInsertRows(parent, start, end)
             self.__folders.extend(to_add)
+            self.__folder_jobs.update((f.id, list(f.jobs)) for f in to_add)
             self.invalidate()
             self.endInsertRows()
             LOGGER.debug("adding %d new folders", size)
 
-        # Remove
-        to_remove = ((rows[f_id], f_id) for f_id in set(rows).difference(folder_ids))
-        for row, f_id in sorted(to_remove, reverse=True):
-            self.beginRemoveRows(parent, row, row)
-            folder = self.__folders.pop(row)
-            self.subnodes.remove(folderNodes[f_id])
-            self.endRemoveRows()
-            LOGGER.debug("removing %s %s", f_id, folder.name)
-
         # re-index the rows
         self.__folder_index = dict((f.id, row) for row, f in enumerate(self.__folders))
+        self.__indexJobs()
+
+    def hasJob(self, jobId):
+        return jobId in self.__job_ids
+
+    def __indexJobs(self):
+        self.__job_ids = set(j.id for jobs in self.__folder_jobs.itervalues() for j in jobs)
 
     def itemByFolderId(self, f_id):
         row = self.__folder_index.get(f_id)
@@ -364,51 +410,70 @@ class JobModel(tree.TreeModel):
         self._dummyNodes = set()
 
         self.__folders = folders or []
-        self.__folder_index = dict((f.id, row) for row, f in enumerate(folders))
+        self.__folder_index = dict((f.id, row) for row, f in enumerate(self.__folders))
+        self.__folder_jobs = dict((f.id, list(f.jobs)) for f in self.__folders)
+        self.__indexJobs()
 
         self.endResetModel()
 
     def __updateJobs(self, folderNode, newFolder):
+        """
+        Update or add the changed jobs of a folder delta.
+        Jobs missing from the delta are left alone.
+        """
         folderIndex = self.createIndex(folderNode.row, 0, folderNode)
 
         job_index = dict((j.id, j) for j in newFolder.jobs)
-        oldJobNodes = folderNode.subnodes
+        jobNodes = folderNode.subnodes
         
         colCount = self.columnCount()
-        updated = set()
-        to_remove = set()
 
         # update existing
-        for row, jobNode in enumerate(oldJobNodes):
-            job = jobNode.ref 
-            if job.id in job_index:
-                jobNode.ref = job_index[job.id]
-                updated.add(job.id)
-                start = self.index(row, 0, folderIndex)
-                end = self.index(row, colCount-1, folderIndex)
-                self.dataChanged.emit(start, end)
-                LOGGER.debug("updating job %s %s", job.id, job.name)
-            else:
-                to_remove.add((row, job))
+        for row, jobNode in enumerate(jobNodes):
+            job = job_index.pop(jobNode.ref.id, None)
+            if job is None:
+                continue
+
+            jobNode.ref = job
+            start = self.index(row, 0, folderIndex)
+            end = self.index(row, colCount-1, folderIndex)
+            self.dataChanged.emit(start, end)
+            LOGGER.debug("updating job %s %s", job.id, job.name)
 
         # add new
-        new_jobs = updated.symmetric_difference(job_index)
-        if new_jobs:
-            size = len(new_jobs)
-            start = len(oldJobNodes)
+        if job_index:
+            size = len(job_index)
+            start = len(jobNodes)
             end = start + size - 1
             self.beginInsertRows(folderIndex, start, end)
-            oldJobNodes.extend((JobNode(job_index[j_id], folderNode, i) \
-                                    for i, j_id in enumerate(new_jobs, start)))
+            jobNodes.extend((JobNode(job, folderNode, i) \
+                                for i, job in enumerate(job_index.itervalues(), start)))
             self.endInsertRows()
             LOGGER.debug("adding %d new nodes", size)            
 
-        # remove
-        for row, job in sorted(to_remove, reverse=True):
-            self.beginRemoveRows(folderIndex, row, row)
-            del oldJobNodes[row]
-            self.endRemoveRows()
-            LOGGER.debug("removing %s %s", job.id, job.name)            
+        self.__folder_jobs[newFolder.id] = [n.ref for n in jobNodes]
+
+    def __removeJobs(self, folderNode, removed, jobFolders):
+        """
+        Remove the jobs of a folder that are in the removed set, 
+        or that now belong to a different folder.
+        """
+        folderId = folderNode.ref.id
+        folderIndex = self.createIndex(folderNode.row, 0, folderNode)
+        jobNodes = folderNode.subnodes
+
+        for row in xrange(len(jobNodes)-1, -1, -1):
+            job = jobNodes[row].ref
+            if job.id in removed or jobFolders.get(job.id, folderId) != folderId:
+                self.beginRemoveRows(folderIndex, row, row)
+                del jobNodes[row]
+                self.endRemoveRows()
+                LOGGER.debug("removing %s %s", job.id, job.name)            
+
+        for row, jobNode in enumerate(jobNodes):
+            jobNode.row = row
+
+        self.__folder_jobs[folderId] = [n.ref for n in jobNodes]
 
 
 
@@ -484,10 +549,17 @@ class FolderNode(PlowNode):
 
     DATA_CALLBACKS = DISPLAY_CALLBACKS[:]
 
+    def __init__(self, ref, parent, row, jobs=None):
+        super(FolderNode, self).__init__(ref, parent, row)
+        # A job board delta only carries the changed jobs of a
+        # folder, so the model hands over the full job list.
+        self.jobs = jobs
+
     def _getChildren(self):
         if not self.ref:
             return []
-        return [JobNode(j, self, i) for i,j in enumerate(self.ref.jobs)]
+        jobs = self.ref.jobs if self.jobs is None else self.jobs
+        return [JobNode(j, self, i) for i,j in enumerate(jobs)]
 
 
 class JobNode(PlowNode):
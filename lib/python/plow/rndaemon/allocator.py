@@ -0,0 +1,116 @@
+"""
+Topology aware allocation of cores to tasks.
+
+The cores of a node are split into groups that share memory
+locality, one per NUMA node or cpu socket. A task is packed onto
+a single group where it fits, choosing the group that it fills
+the most (best fit), so that larger groups of free cores are left
+whole for bigger tasks. Only tasks that do not fit in any one
+group are spread, over as few groups as possible.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['CoreAllocator', 'AllocationError']
+
+
+class AllocationError(Exception):
+    pass
+
+
+class CoreAllocator(object):
+    """
+    Hands out core slots from a list of groups of slots,
+    where each group is one NUMA node or socket.
+    """
+
+    def __init__(self, groups):
+        self.groups = [sorted(g) for g in groups if g]
+
+        self.__slotGroup = {}
+        for idx, group in enumerate(self.groups):
+            for slot in group:
+                self.__slotGroup[slot] = idx
+
+        self.__free = [set(g) for g in self.groups]
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return "<%s: %s>" % (self.__class__.__name__,
+                             ', '.join("%d/%d" % (len(f), len(g))
+                                       for f, g in zip(self.__free, self.groups)))
+
+    @property
+    def total(self):
+        return len(self.__slotGroup)
+
+    def getFree(self):
+        """
+        getFree() -> list
+
+        The free slots, in order
+        """
+        with self.__lock:
+            return sorted(s for free in self.__free for s in free)
+
+    def getGroup(self, slot):
+        """
+        getGroup(int slot) -> int
+
+        The index of the group the slot is in
+        """
+        return self.__slotGroup[slot]
+
+    def checkout(self, numCores):
+        """
+        checkout(int numCores) -> list
+
+        Reserve numCores slots, packed into as few groups as
+        possible. Raises AllocationError if not enough are free.
+        """
+        with self.__lock:
+            free = self.__free
+
+            if numCores > sum(len(f) for f in free):
+                raise AllocationError("Not enough free cores for %d" % numCores)
+
+            # Best fit: the group with the fewest free slots that can
+            # still hold the whole task.
+            fits = [(len(f), idx) for idx, f in enumerate(free) if len(f) >= numCores]
+            if fits:
+                order = [min(fits)[1]]
+            else:
+                # Spread over the emptiest groups, so the task
+                # spans as few of them as possible.
+                order = [idx for _, idx in sorted(((len(f), idx) for idx, f in enumerate(free)),
+                                                  reverse=True)]
+
+            result = []
+            for idx in order:
+                take = sorted(free[idx])[:numCores - len(result)]
+                free[idx].difference_update(take)
+                result.extend(take)
+                if len(result) == numCores:
+                    break
+
+        return result
+
+    def checkin(self, slots):
+        """
+        checkin(list slots)
+
+        Release slots from checkout()
+        """
+        with self.__lock:
+            for slot in slots:
+                self.__free[self.__slotGroup[slot]].add(slot)
+
+    def spanned(self, slots):
+        """
+        spanned(list slots) -> set
+
+        The indexes of the groups the slots are in
+        """
+        return set(self.__slotGroup[s] for s in slots)
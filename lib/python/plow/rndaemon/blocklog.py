@@ -0,0 +1,318 @@
+"""
+Block compressed task logs.
+
+A compressed log is a series of independent gzip members, so
+the whole file can still be read with zcat or gzip.open(). Each
+member is one block of the log, cut at a line break where there
+is one. A small sidecar index, <log>.idx, has a line per block:
+
+    compOffset compLength rawOffset rawLength firstLine lineCount
+
+where firstLine is the number of line breaks before the block.
+With the index, a reader can find the block holding any byte
+offset or line, and only decompress that block.
+
+This module has no dependencies on the rest of the rndaemon,
+so that log viewers can use it too.
+"""
+import time
+import zlib
+import bisect
+import logging
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['BlockLogWriter', 'BlockLogReader', 'SUFFIX', 'INDEX_SUFFIX']
+
+
+SUFFIX = '.gz'
+INDEX_SUFFIX = '.idx'
+
+# uncompressed bytes per block
+BLOCK_SIZE = 256 * 1024
+
+
+def _gzip(data, level):
+    # wbits 31 writes a gzip header and trailer
+    c = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return c.compress(data) + c.flush()
+
+
+class BlockLogWriter(object):
+    """
+    A write only file object that compresses what is written
+    to it into blocks.
+
+    A block is written once blockSize bytes are waiting, or by
+    flush() once data has been waiting for maxDelay seconds, and
+    by close(). Frequent flushes do not make for small blocks.
+    """
+
+    def __init__(self, name, blockSize=BLOCK_SIZE, maxDelay=30, level=6):
+        self.name = name
+        self.indexName = name + INDEX_SUFFIX
+        self.blockSize = blockSize
+        self.maxDelay = maxDelay
+        self.level = level
+
+        self.__fh = open(name, 'wb')
+        self.__index = open(self.indexName, 'w')
+
+        self.__buffer = []
+        self.__buffered = 0
+        self.__since = None
+
+        self.__compOffset = 0
+        self.__rawOffset = 0
+        self.__lines = 0
+
+    @property
+    def closed(self):
+        return self.__fh.closed
+
+    def fileno(self):
+        return self.__fh.fileno()
+
+    def write(self, data):
+        if not data:
+            return
+
+        self.__buffer.append(data)
+        self.__buffered += len(data)
+        if self.__since is None:
+            self.__since = time.time()
+
+        if self.__buffered >= self.blockSize:
+            self.__writeBlocks(final=False)
+
+    def flush(self):
+        if self.__buffered and time.time() - self.__since >= self.maxDelay:
+            self.__writeBlocks(final=True)
+
+        self.__fh.flush()
+        self.__index.flush()
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.__writeBlocks(final=True)
+        self.__fh.close()
+        self.__index.close()
+
+    def __writeBlocks(self, final):
+        data = ''.join(self.__buffer)
+
+        while data:
+            if len(data) < self.blockSize and not final:
+                break
+
+            # Cut at the last line break of the block,
+            # unless the block is one long line.
+            cut = min(len(data), self.blockSize)
+            if cut < len(data) or not final:
+                brk = data.rfind('\n', 0, cut)
+                if brk != -1:
+                    cut = brk + 1
+
+            self.__writeBlock(data[:cut])
+            data = data[cut:]
+
+        self.__buffer = [data] if data else []
+        self.__buffered = len(data)
+        self.__since = time.time() if data else None
+
+    def __writeBlock(self, raw):
+        comp = _gzip(raw, self.level)
+        lines = raw.count('\n')
+
+        self.__fh.write(comp)
+        self.__fh.flush()
+
+        # The index never points past what is in the log
+        self.__index.write("%d %d %d %d %d %d\n" % (
+            self.__compOffset, len(comp), self.__rawOffset, len(raw), self.__lines, lines))
+        self.__index.flush()
+
+        self.__compOffset += len(comp)
+        self.__rawOffset += len(raw)
+        self.__lines += lines
+
+
+class BlockLogReader(object):
+    """
+    Random access to a log written by BlockLogWriter, by
+    uncompressed byte offset or by line number.
+
+    Call refresh() to pick up blocks written since the
+    reader was opened.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.indexName = name + INDEX_SUFFIX
+
+        # parallel lists, one entry per block
+        self.__comp = []
+        self.__raw = []
+        self.__lines = []
+
+        self.__cache = (None, None)
+        self.refresh()
+
+    @property
+    def size(self):
+        """ The uncompressed size of the log """
+        if not self.__raw:
+            return 0
+        offset, length = self.__raw[-1]
+        return offset + length
+
+    @property
+    def lineCount(self):
+        """ The number of line breaks in the log """
+        if not self.__lines:
+            return 0
+        first, count = self.__lines[-1]
+        return first + count
+
+    @property
+    def blockCount(self):
+        return len(self.__raw)
+
+    def refresh(self):
+        """
+        refresh() -> int
+
+        Read new entries from the index. Without an index,
+        the blocks are found by reading the whole log once.
+        Returns the number of blocks.
+        """
+        try:
+            with open(self.indexName) as fh:
+                entries = []
+                for line in fh:
+                    # The writer may be part way through a line
+                    if not line.endswith('\n'):
+                        break
+                    entries.append([int(v) for v in line.split()])
+        except IOError:
+            entries = self.__scan()
+
+        self.__comp = [(e[0], e[1]) for e in entries]
+        self.__raw = [(e[2], e[3]) for e in entries]
+        self.__lines = [(e[4], e[5]) for e in entries]
+        self.__rawStarts = [e[2] for e in entries]
+        self.__lineStarts = [e[4] for e in entries]
+
+        return len(entries)
+
+    def __scan(self):
+        logger.debug("No index for %s, reading the whole log", self.name)
+
+        with open(self.name, 'rb') as fh:
+            data = fh.read()
+
+        entries = []
+        comp = raw = lines = 0
+
+        while comp < len(data):
+            d = zlib.decompressobj(31)
+            block = d.decompress(data[comp:])
+            used = len(data) - comp - len(d.unused_data)
+            count = block.count('\n')
+            entries.append([comp, used, raw, len(block), lines, count])
+            comp += used
+            raw += len(block)
+            lines += count
+
+        return entries
+
+    def readBlock(self, i):
+        """
+        readBlock(int i) -> str
+
+        The uncompressed data of block i
+        """
+        if self.__cache[0] == i:
+            return self.__cache[1]
+
+        offset, length = self.__comp[i]
+        with open(self.name, 'rb') as fh:
+            fh.seek(offset)
+            comp = fh.read(length)
+
+        data = zlib.decompress(comp, 31)
+        self.__cache = (i, data)
+        return data
+
+    def read(self, offset, maxBytes):
+        """
+        read(int offset, int maxBytes) -> str
+
+        Up to maxBytes of the uncompressed log, from offset
+        """
+        out = []
+        i = bisect.bisect_right(self.__rawStarts, offset) - 1
+
+        while maxBytes > 0 and 0 <= i < len(self.__raw):
+            start, length = self.__raw[i]
+            skip = offset - start
+            if skip < length:
+                piece = self.readBlock(i)[skip:skip + maxBytes]
+                out.append(piece)
+                maxBytes -= len(piece)
+                offset += len(piece)
+            i += 1
+
+        return ''.join(out)
+
+    def readLines(self, start, count):
+        """
+        readLines(int start, int count) -> list str
+
+        Up to count lines, from line number start (0 based)
+        """
+        if count <= 0 or start < 0:
+            return []
+
+        # The block holding the line break before the line
+        i = max(bisect.bisect_left(self.__lineStarts, start) - 1, 0)
+        if i >= len(self.__raw):
+            return []
+
+        # The end of a line longer than a block
+        # is carried over to the next block.
+        pending = ''
+        lines = []
+        lineNo = self.__lines[i][0]
+
+        while i < len(self.__raw) and len(lines) < count:
+            parts = (pending + self.readBlock(i)).split('\n')
+            pending = parts.pop()
+
+            for line in parts:
+                if lineNo >= start:
+                    lines.append(line + '\n')
+                    if len(lines) == count:
+                        break
+                lineNo += 1
+            i += 1
+
+        # The last line of the log may have no line break
+        if pending and len(lines) < count and lineNo >= start:
+            lines.append(pending)
+
+        return lines
+
+    def tail(self, count):
+        """
+        tail(int count) -> list str
+
+        The last count lines of the log
+        """
+        total = self.lineCount
+        last = self.read(self.size - 1, 1) if self.size else ''
+        if last and last != '\n':
+            total += 1
+        return self.readLines(max(total - count, 0), count)
@@ -1,12 +1,15 @@
+import time
 import random
+import socket
 import logging 
+import threading
 
 from thrift.transport import TSocket
 from thrift.transport import TTransport
 from thrift.protocol import TBinaryProtocol
 
 import conf
-from rpc import RndServiceApi, RndNodeApi
+from rpc import RndServiceApi, RndNodeApi, ttypes
 
 logger = logging.getLogger(__name__)
 
@@ -50,13 +53,274 @@ def getPlowConnection(host=None, port=None):
     return (service, transport)
 
 
+class PlowConnection(object):
+    """
+    A long lived connection to the Plow server, shared by 
+    everything in the daemon that talks to it.
+
+    Calls on the RndServiceApi can be made directly on the
+    connection, such as conn.sendPing(ping), and are run one 
+    at a time. The connection is opened on first use, and 
+    reopened if it breaks. It sticks to the same Plow host 
+    until that host fails, then moves to the next one.
+    """
+
+    # seconds before a call on the socket gives up
+    TIMEOUT_SEC = 30
+
+    # reconnect before using a connection idle this long,
+    # as the server or a firewall may have dropped it
+    MAX_IDLE_SEC = 300
+
+    # seconds to back off between failed connection attempts
+    MIN_BACKOFF_SEC = 1
+    MAX_BACKOFF_SEC = 60
+
+    def __init__(self, hosts=None):
+        hosts = hosts or conf.PLOW_HOSTS
+        self.hosts = [(h, int(p)) for h, p in (h.split(":") for h in hosts)]
+
+        # Spread the farm over the hosts
+        self.__hostIdx = random.randrange(len(self.hosts))
+
+        self.__lock = threading.RLock()
+        self.__service = None
+        self.__transport = None
+        self.__lastUsed = 0
+        self.__backoff = 0
+        self.__nextAttempt = 0
+
+        self.__stats = {
+            'connects': 0,
+            'failures': 0,
+            'calls': 0,
+            'reused': 0,
+        }
+        self.__connCalls = 0
+
+    def __repr__(self):
+        return "<%s: %s:%d>" % ((self.__class__.__name__,) + self.host)
+
+    def __getattr__(self, name):
+        if name.startswith('_') or not hasattr(RndServiceApi.Iface, name):
+            raise AttributeError(name)
+        return lambda *args: self.call(name, *args)
+
+    @property
+    def host(self):
+        return self.hosts[self.__hostIdx]
+
+    def stats(self):
+        """
+        stats() -> dict
+
+        Counters for the connections opened, the connection 
+        attempts that failed, the calls made, and the calls 
+        that reused an open connection.
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+    def call(self, name, *args):
+        """
+        call(str name, *args)
+
+        Call a method on the RndServiceApi. A call on a reused 
+        connection that turns out to be broken is tried once more 
+        on a new connection. 
+        """
+        with self.__lock:
+            for attempt in (0, 1):
+                reused = self.__service is not None and \
+                         time.time() - self.__lastUsed < self.MAX_IDLE_SEC
+
+                if not reused:
+                    self.__connect()
+
+                try:
+                    result = getattr(self.__service, name)(*args)
+                except (TTransport.TTransportException, socket.error, EOFError), e:
+                    self.close()
+                    if not reused or attempt:
+                        raise
+                    logger.debug("Connection to %s:%d was broken, reconnecting: %s", 
+                                 self.host[0], self.host[1], e)
+                    continue
+
+                self.__lastUsed = time.time()
+                self.__connCalls += 1
+                self.__stats['calls'] += 1
+                if reused:
+                    self.__stats['reused'] += 1
+
+                return result
+
+    def close(self):
+        with self.__lock:
+            transport, self.__transport = self.__transport, None
+            self.__service = None
+            if transport is not None:
+                try:
+                    transport.close()
+                except Exception:
+                    pass
+
+    def __connect(self):
+        self.close()
+
+        now = time.time()
+        if now < self.__nextAttempt:
+            raise IOError("Not reconnecting to a Plow host for another %.1f seconds" % 
+                          (self.__nextAttempt - now))
+
+        # Start with the current host, and fail over in order
+        for i in xrange(len(self.hosts)):
+            idx = (self.__hostIdx + i) % len(self.hosts)
+            host, port = self.hosts[idx]
+
+            sock = TSocket.TSocket(host, port)
+            sock.setTimeout(self.TIMEOUT_SEC * 1000)
+            transport = TTransport.TFramedTransport(sock)
+
+            try:
+                transport.open()
+            except TTransport.TTransportException, e:
+                self.__stats['failures'] += 1
+                logger.warn("Failed to connect to Plow server %s:%s: %s", host, port, e)
+                continue
+
+            self.__setKeepAlive(sock.handle)
+            break
+
+        else:
+            self.__backoff = min(max(self.__backoff * 2, self.MIN_BACKOFF_SEC), self.MAX_BACKOFF_SEC)
+            self.__nextAttempt = time.time() + self.__backoff * random.uniform(.5, 1.5)
+            raise IOError("No available Plow host. Connection attempts all failed")
+
+        protocol = TBinaryProtocol.TBinaryProtocolAccelerated(transport)
+
+        self.__hostIdx = idx
+        self.__service = RndServiceApi.Client(protocol)
+        self.__transport = transport
+        self.__backoff = 0
+        self.__nextAttempt = 0
+
+        stats = self.__stats
+        stats['connects'] += 1
+
+        logger.info("Connected to Plow server %s:%s (connection #%d; %d calls on the last one; "
+                    "%d of %d calls reused a connection)", host, port, stats['connects'], 
+                    self.__connCalls, stats['reused'], stats['calls'])
+        self.__connCalls = 0
+
+    @staticmethod
+    def __setKeepAlive(sock):
+        if sock is None:
+            return
+
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        # Notice a dead server in a couple of minutes, not hours
+        for opt, val in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 6)):
+            if hasattr(socket, opt):
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), val)
+                except socket.error:
+                    pass
+
+
+_shared = None
+_sharedLock = threading.Lock()
+
+
+def getSharedConnection():
+    """
+    getSharedConnection() -> PlowConnection
+
+    The daemon's connection to the Plow server
+    """
+    global _shared
+    with _sharedLock:
+        if _shared is None:
+            _shared = PlowConnection()
+        return _shared
+
+
 def getLocalConnection(port=None):
+    return getNodeConnection("localhost", port)
+
+
+def getNodeConnection(host, port=None):
+    """
+    getNodeConnection(str host, int port=None) -> (RndNodeApi.Client, transport)
+
+    Connect to the rndaemon running on a node
+    """
     if port is None:
         port = conf.NETWORK_PORT
-    socket = TSocket.TSocket("localhost", port)
+    socket = TSocket.TSocket(host, port)
     transport = TTransport.TFramedTransport(socket)
     transport.open()
     protocol = TBinaryProtocol.TBinaryProtocolAccelerated(transport)
     service = RndNodeApi.Client(protocol)
     return (service, transport)
 
+
+class TaskLogReader(object):
+    """
+    Follows the log of a task while it runs, reading it from 
+    the rndaemon on the node instead of the log file, which 
+    may be slow to show new data over a network filesystem. 
+
+        reader = TaskLogReader(host, taskId=taskId)
+        while reader.isRunning:
+            sys.stdout.write(reader.read())
+            time.sleep(.5)
+
+    Once the task ends, the rest of the log is in the log file, 
+    from reader.offset onwards.
+    """
+
+    def __init__(self, host, procId=None, taskId=None, port=None, offset=0):
+        self.__service, self.__transport = getNodeConnection(host, port)
+
+        if procId is None:
+            procId = self.__findProc(taskId)
+
+        self.procId = procId
+        self.offset = offset
+        self.size = 0
+        self.isRunning = True
+
+    def __findProc(self, taskId):
+        for task in self.__service.getRunningTasks():
+            if str(task.taskId) == str(taskId):
+                return task.procId
+
+        self.close()
+        raise ValueError("Task %s is not running on this node" % taskId)
+
+    def read(self, maxBytes=256*1024):
+        """
+        read(int maxBytes=256K) -> str
+
+        The log data written since the last read. Returns an 
+        empty string, and sets isRunning to False, once the 
+        task is no longer running.
+        """
+        if not self.isRunning:
+            return ''
+
+        try:
+            chunk = self.__service.getLogBytes(self.procId, self.offset, maxBytes)
+        except ttypes.RndException:
+            self.isRunning = False
+            return ''
+
+        self.offset = chunk.offset + len(chunk.data)
+        self.size = chunk.size
+        return chunk.data
+
+    def close(self):
+        self.__transport.close()
+
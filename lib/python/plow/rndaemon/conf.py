@@ -35,6 +35,13 @@ def _init():
     setattr(mod, 'NETWORK_DISABLED', getboolean('rndaemon', 'network_disabled', False))
     setattr(mod, 'NETWORK_PORT', getint('rndaemon', 'port', 11338))
     setattr(mod, 'NETWORK_PING_INTERVAL', getint('rndaemon', 'ping_interval', 60))
+    setattr(mod, 'NETWORK_PING_MAX_INTERVAL', getint('rndaemon', 'ping_max_interval', 120))
+    setattr(mod, 'SAMPLE_INTERVAL', getint('rndaemon', 'sample_interval', 10))
+    setattr(mod, 'METRICS_SAMPLES', getint('rndaemon', 'metrics_samples', 360))
+    setattr(mod, 'SAMPLER_BATCHED', getboolean('rndaemon', 'batched_sampler', True))
+    setattr(mod, 'TASK_ENGINE', get('rndaemon', 'engine', 'loop'))
+    setattr(mod, 'RAM_RESERVED_MB', getint('rndaemon', 'reserved_ram_mb', -1))
+    setattr(mod, 'RESULT_OUTBOX', get('rndaemon', 'result_journal', '/var/tmp/plow/rndaemon-results.journal'))
 
     hosts_str = get('rndaemon', 'plow_hosts', '')
     if hosts_str:
@@ -49,12 +56,40 @@ def _init():
     # task options
     #
     setattr(mod, 'TASK_PROXY_USER', get('task', 'proxy_user', ''))
+    setattr(mod, 'TASK_CGROUPS', getboolean('task', 'cgroups', False))
+    setattr(mod, 'TASK_CGROUP_PARENT', get('task', 'cgroup_parent', 'plow'))
+    setattr(mod, 'TASK_LAUNCHER', getboolean('task', 'launcher', True))
+    setattr(mod, 'TASK_NUMA_POLICY', get('task', 'numa_policy', 'none'))
+    setattr(mod, 'TASK_SHARE_IDLE_CORES', getboolean('task', 'share_idle_cores', True))
+    setattr(mod, 'TASK_COMPRESS_LOGS', getboolean('task', 'compress_logs', False))
+    setattr(mod, 'TASK_MAX_LOG_MB', getint('task', 'max_log_mb', 0))
+
+    #
+    # memory guard options
+    #
+    setattr(mod, 'OOM_GUARD_FREE_MB', getint('oom_guard', 'free_mb', 0))
+    setattr(mod, 'OOM_GUARD_POLICY', get('oom_guard', 'policy', 'growth'))
+    setattr(mod, 'OOM_GUARD_ACTION', get('oom_guard', 'action', 'kill'))
+
+    rlimits = {}
+    if Config.has_section('task_rlimits'):
+        rlimits = dict(Config.items('task_rlimits'))
+    setattr(mod, 'TASK_RLIMITS', rlimits)
 
     progress_patterns = {}
     if Config.has_section('task_progress_patterns'):
         progress_patterns = dict(Config.items('task_progress_patterns'))
     setattr(mod, 'TASK_PROGRESS_PATTERNS', progress_patterns)
 
+    log_limits = {}
+    if Config.has_section('task_log_limits'):
+        for key, value in Config.items('task_log_limits'):
+            try:
+                log_limits[key] = int(value)
+            except ValueError:
+                logger.warn("Ignoring invalid log limit for task type %r: %r", key, value)
+    setattr(mod, 'TASK_LOG_LIMITS', log_limits)
+
 
 def get(section, key, default=None):
     """
@@ -6,6 +6,12 @@ import time
 import os
 import traceback
 import errno
+import heapq
+import random
+import fcntl
+import select
+import signal
+import Queue
 
 from collections import namedtuple, deque
 from itertools import chain 
@@ -13,11 +19,17 @@ from itertools import chain
 import psutil
 
 import conf
-import client
 import utils
 import rpc.ttypes as ttypes
 
+from launcher import Launcher
+from outbox import ResultOutbox
+from allocator import CoreAllocator, AllocationError
+from memguard import MemoryGuard, TaskSample, STOP, CONT, KILL
+from metrics import MetricsBuffer
+
 from profile import SystemProfiler as _SystemProfiler
+from sampler import ProcSampler
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +37,7 @@ logger = logging.getLogger(__name__)
 __all__ = ['Profiler', 'ResourceMgr', 'ProcessMgr']
 
 
-_RunningProc = namedtuple("RunningProc", "processCmd pthread cpus")
+_RunningProc = namedtuple("RunningProc", "processCmd pthread cpus ramMb")
 
 
 #
@@ -34,48 +46,402 @@ _RunningProc = namedtuple("RunningProc", "processCmd pthread cpus")
 class _ResourceManager(object):
     """
     The ResourceManager keeps track of the bookable resources on the
-    machine.  This is currently just cores, but memory and GPUS
+    machine.  This is currently cores and memory, but GPUS
     in the future.
+
+    Cores are packed onto the NUMA node or socket that 
+    best fits each task. Memory is reserved up to the total
+    ram, less what is held back for the system.
     """
 
     def __init__(self):
-        self.__slots = deque(xrange(Profiler.physicalCpus))
-        self.__slots_all = tuple(self.__slots)
+        total = Profiler.physicalCpus
+        groups = Profiler.getCpuGroups()
+
+        if sorted(chain.from_iterable(groups)) != range(total):
+            logger.warn("Cpu topology %s does not match %d physical cores. "
+                        "Ignoring the topology.", groups, total)
+            groups = [range(total)]
+
+        self.__cores = CoreAllocator(groups)
+        self.__ramReserved = 0
         self.__lock = threading.RLock()
 
-        logger.info("Intializing resource manager with %d physical cores.", 
-                    Profiler.physicalCpus)
+        logger.info("Intializing resource manager with %d physical cores in %d groups, "
+                    "and %d MB of bookable ram.", 
+                    total, len(self.__cores.groups), self.getBookableRam())
 
-    def checkout(self, numCores):
+    def checkout(self, numCores, ramMb=0):
+        """
+        checkout(int numCores, int ramMb=0) -> list
+
+        Reserve cores, and ramMb of memory, for a task.
+        Raises RndException if either is not available.
+        """
         if numCores < 1:
             raise ttypes.RndException(1, "Cannot reserve 0 slots")
 
-        result = []
+        ramMb = max(ramMb or 0, 0)
 
         with self.__lock:
-            open_slots = self.__slots
-            logger.info("Open slots: %s", list(open_slots))
+            logger.info("Open slots: %s", self.__cores.getFree())
+
+            bookable = self.getBookableRam()
+            if self.__ramReserved + ramMb > bookable:
+                raise ttypes.RndException(1, "Not enough memory: %d MB requested, "
+                    "%d of %d MB already reserved" % (ramMb, self.__ramReserved, bookable))
 
-            if numCores > len(open_slots):
+            try:
+                result = self.__cores.checkout(numCores)
+            except AllocationError:
                 raise ttypes.RndException(1, "No more open slots")
 
-            result = [open_slots.pop() for _ in xrange(numCores)]
+            self.__ramReserved += ramMb
     
-        logger.info("Checked out CPUS: %s", result)
+        logger.info("Checked out CPUS: %s, RAM: %d MB", result, ramMb)
         return result
 
-    def checkin(self, cores):
+    def checkin(self, cores, ramMb=0):
+        """
+        checkin(list cores, int ramMb=0)
+
+        Release the cores and memory from checkout()
+        """
+        ramMb = max(ramMb or 0, 0)
+
+        with self.__lock:
+            self.__cores.checkin(cores)
+            self.__ramReserved = max(self.__ramReserved - ramMb, 0)
+            avail, total = len(self.__cores.getFree()), Profiler.physicalCpus
+            ramFree = self.getBookableRam() - self.__ramReserved
+
+        logger.info("Checked in CPUS: %s, RAM: %d MB; Now available: %d / %d, %d MB", 
+                    cores, ramMb, avail, total, ramFree)
+
+    def getBookableRam(self):
+        """
+        getBookableRam() -> int
+
+        The MB of ram that tasks can reserve
+        """
+        total = Profiler.totalRamMb
+        reserve = conf.RAM_RESERVED_MB
+        if reserve < 0:
+            # The same as the server holds back for the system
+            reserve = min(int(total * .05), 384)
+        return max(total - reserve, 0)
+
+    def getReservedRam(self):
+        """
+        getReservedRam() -> int
+
+        The MB of ram reserved by running tasks
+        """
         with self.__lock:
-            self.__slots.extend(cores)
-            avail, total = len(self.__slots), Profiler.physicalCpus
-        logger.info("Checked in CPUS: %s; Now available: %d / %d", cores, avail, total)
+            return self.__ramReserved
 
     def getSlots(self):
         return list(xrange(Profiler.physicalCpus))
 
     def getOpenSlots(self):
         with self.__lock:
-            return list(self.__slots)
+            return self.__cores.getFree()
+
+
+#
+# _EventLoop
+#
+class _EventLoop(threading.Thread):
+    """
+    A single thread that multiplexes reads on many file 
+    descriptors with epoll (or poll), and runs timers and 
+    callbacks passed in from other threads.
+
+    Child exits are signaled through SIGCHLD when the loop is 
+    created in the main thread. Otherwise, or as a safety net, 
+    the child watchers are polled every few seconds.
+    """
+
+    # seconds between child watcher runs, with and without SIGCHLD 
+    CHILD_POLL_SEC = 5
+    CHILD_POLL_NOSIG_SEC = .5
+
+    def __init__(self):
+        threading.Thread.__init__(self, name="EventLoop")
+        self.daemon = True
+
+        if hasattr(select, 'epoll'):
+            self.__poller = select.epoll()
+            self.__pollMask = select.EPOLLIN | select.EPOLLHUP | select.EPOLLERR
+            self.__pollScale = 1
+        else:
+            self.__poller = select.poll()
+            self.__pollMask = select.POLLIN | select.POLLHUP | select.POLLERR
+            self.__pollScale = 1000
+
+        self.__readers = {}
+        self.__watchers = set()
+
+        self.__lock = threading.Lock()
+        self.__calls = deque()
+        self.__timers = []
+        self.__timerSeq = 0
+
+        self.__wakeR, self.__wakeW = os.pipe()
+        for fd in (self.__wakeR, self.__wakeW):
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        self.__poller.register(self.__wakeR, self.__pollMask)
+
+        self.__childPoll = self.CHILD_POLL_NOSIG_SEC
+        try:
+            signal.signal(signal.SIGCHLD, lambda *args: None)
+            signal.siginterrupt(signal.SIGCHLD, False)
+            signal.set_wakeup_fd(self.__wakeW)
+        except ValueError:
+            logger.debug("Not in the main thread; polling for child exits")
+        else:
+            self.__childPoll = self.CHILD_POLL_SEC
+
+    def isLoopThread(self):
+        return threading.current_thread() is self
+
+    def call(self, func, *args):
+        """
+        Run func(*args) on the loop thread. Thread safe. 
+        """
+        with self.__lock:
+            self.__calls.append((func, args))
+        self.__wake()
+
+    def callLater(self, delay, func, *args):
+        """
+        callLater(float delay, callable func, *args) -> _LoopTimer
+
+        Run func(*args) on the loop thread after delay seconds.
+        Thread safe. The returned timer can be cancel()'ed.
+        """
+        timer = _LoopTimer(time.time() + delay, func, args)
+        with self.__lock:
+            self.__timerSeq += 1
+            heapq.heappush(self.__timers, (timer.when, self.__timerSeq, timer))
+        self.__wake()
+        return timer
+
+    def addReader(self, fd, callback):
+        """
+        Call callback(fd) on the loop thread whenever the
+        file descriptor is readable, or has been closed. 
+        """
+        if not self.isLoopThread():
+            return self.call(self.addReader, fd, callback)
+
+        self.__readers[fd] = callback
+        self.__poller.register(fd, self.__pollMask)
+
+    def removeReader(self, fd):
+        if not self.isLoopThread():
+            return self.call(self.removeReader, fd)
+
+        if self.__readers.pop(fd, None) is not None:
+            self.__poller.unregister(fd)
+
+    def addChildWatcher(self, callback):
+        """
+        Call callback() on the loop thread when a child 
+        process may have exited. 
+        """
+        if not self.isLoopThread():
+            return self.call(self.addChildWatcher, callback)
+
+        self.__watchers.add(callback)
+        callback()
+
+    def removeChildWatcher(self, callback):
+        if not self.isLoopThread():
+            return self.call(self.removeChildWatcher, callback)
+
+        self.__watchers.discard(callback)
+
+    def wakeChildWatchers(self, *args):
+        """
+        Run the child watchers soon, as if SIGCHLD was 
+        received. Thread safe. 
+        """
+        try:
+            os.write(self.__wakeW, 'c')
+        except OSError, e:
+            if e.errno != errno.EAGAIN:
+                raise
+
+    def run(self):
+        nextChildPoll = time.time() + self.__childPoll
+
+        while True:
+            now = time.time()
+
+            with self.__lock:
+                timeout = nextChildPoll - now
+                if self.__timers:
+                    timeout = min(timeout, self.__timers[0][0] - now)
+
+            try:
+                events = self.__poller.poll(max(timeout, 0) * self.__pollScale)
+            except (IOError, OSError, select.error), e:
+                if e.args[0] != errno.EINTR:
+                    raise
+                events = ()
+
+            childEvent = False
+
+            for fd, _ in events:
+                if fd == self.__wakeR:
+                    childEvent = self.__drainWake() or childEvent
+                    continue
+
+                callback = self.__readers.get(fd)
+                if callback is not None:
+                    self.__run(callback, fd)
+
+            with self.__lock:
+                calls = self.__calls
+                self.__calls = deque()
+
+            for func, args in calls:
+                self.__run(func, *args)
+
+            now = time.time()
+            if childEvent or now >= nextChildPoll:
+                nextChildPoll = now + self.__childPoll
+                for callback in list(self.__watchers):
+                    self.__run(callback)
+
+            while True:
+                with self.__lock:
+                    if not self.__timers or self.__timers[0][0] > now:
+                        break
+                    _, _, timer = heapq.heappop(self.__timers)
+
+                if not timer.cancelled:
+                    self.__run(timer.func, *timer.args)
+
+    def __run(self, func, *args):
+        try:
+            func(*args)
+        except Exception, e:
+            logger.warn("Error in event loop callback %r: %s", func, e)
+            logger.debug(traceback.format_exc())
+
+    def __wake(self):
+        try:
+            os.write(self.__wakeW, 'w')
+        except OSError, e:
+            if e.errno != errno.EAGAIN:
+                raise
+
+    def __drainWake(self):
+        """
+        Returns True if a signal, such as SIGCHLD, woke the loop
+        """
+        signaled = False
+        while True:
+            try:
+                data = os.read(self.__wakeR, 4096)
+            except OSError, e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+            if not data:
+                break
+            # Signals are written as their number
+            if data.strip('w'):
+                signaled = True
+        return signaled
+
+
+class _LoopTimer(object):
+
+    __slots__ = ('when', 'func', 'args', 'cancelled')
+
+    def __init__(self, when, func, args):
+        self.when = when
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+#
+# _Reporter
+#
+class _Reporter(threading.Thread):
+    """
+    Runs calls that block on the network, such as pings 
+    and task results, one at a time off of the event loop.
+    """
+
+    def __init__(self):
+        threading.Thread.__init__(self, name="Reporter")
+        self.daemon = True
+        self.__queue = Queue.Queue()
+
+    def submit(self, func, *args):
+        self.__queue.put((func, args))
+
+    def run(self):
+        while True:
+            func, args = self.__queue.get()
+            try:
+                func(*args)
+            except Exception, e:
+                logger.warn("Error in reporter call %r: %s", func, e)
+                logger.debug(traceback.format_exc())
+
+
+#
+# _PingScheduler
+#
+class _PingScheduler(object):
+    """
+    Works out the delay until the next regular ping.
+
+    Nodes with running tasks ping at the configured interval. 
+    Idle nodes back off, doubling the interval up to the max 
+    interval, and drop back as soon as they get work. Every 
+    delay is jittered so that nodes started together, such as 
+    after a mass reboot, do not keep pinging in lockstep.
+    """
+
+    # fraction to randomly shorten or lengthen each delay by
+    JITTER = .2
+
+    # minimum seconds between pings, to coalesce bursts of 
+    # task starts and exits into one ping
+    MIN_INTERVAL_SEC = 1
+
+    # change in a task's progress that is worth a ping 
+    PROGRESS_STEP = .1
+
+    def __init__(self, interval, maxInterval):
+        self.interval = interval
+        self.maxInterval = max(maxInterval, interval)
+        self.__current = interval
+
+    def nextDelay(self, idle):
+        """
+        nextDelay(bool idle) -> float
+
+        Return the seconds until the next ping, given whether 
+        the node was idle in the ping just sent.
+        """
+        if idle:
+            self.__current = min(self.__current * 2, self.maxInterval)
+        else:
+            self.__current = self.interval
+
+        return self.__current * random.uniform(1 - self.JITTER, 1 + self.JITTER)
 
 
 #
@@ -83,22 +449,86 @@ class _ResourceManager(object):
 #
 class _ProcessManager(object):
     """
-    The ProcessManager keeps track of the running tasks.  Each task
-    is executed in a separate ProcessThread.
+    The ProcessManager keeps track of the running tasks.  
+
+    With the "loop" engine, the output, exit, sampling and pinging 
+    of every task is driven by a single event loop thread. With the
+    "threads" engine, each task is executed in a separate ProcessThread.
     """
 
-    SAMPLE_INTERVAL_SEC = 10
+    SAMPLE_INTERVAL_SEC = conf.SAMPLE_INTERVAL
+
+    # seconds between checks of the free memory on the node
+    MEMORY_CHECK_SEC = 2
+
+    # threads writing task logs, so that one stalled log
+    # volume does not hold up the logs of every task
+    LOG_WRITER_THREADS = 4
 
     def __init__(self):
         self.__threads = {}
         self.__lock = threading.RLock()
         self.__timer = None 
+        self.__nextPing = 0
+        self.__lastPing = 0
+        self.__pinger = _PingScheduler(conf.NETWORK_PING_INTERVAL, 
+                                       conf.NETWORK_PING_MAX_INTERVAL)
         self.__isReboot = threading.Event()
         self.__isShutdown = threading.Event()
 
-        self.__sampler = threading.Thread(target=self._processSampler)
-        self.__sampler.daemon = True 
-        self.__sampler.start()
+        self.__loop = None
+        self.__sampler = None
+        self.__launcher = None
+        self.__outbox = None
+        self.__guard = None
+
+        if conf.OOM_GUARD_FREE_MB > 0:
+            try:
+                self.__guard = MemoryGuard(conf.OOM_GUARD_FREE_MB, 
+                                           conf.OOM_GUARD_POLICY, 
+                                           conf.OOM_GUARD_ACTION)
+            except ValueError, e:
+                logger.warn("Memory guard disabled: %s", e)
+
+        # Results are handed to the outbox to send, so a task's 
+        # resources are freed whether or not the server is up.
+        if not conf.NETWORK_DISABLED:
+            self.__outbox = ResultOutbox(conf.RESULT_OUTBOX)
+            self.__outbox.start()
+
+        if conf.TASK_ENGINE == 'loop':
+            self.__writer = utils.LogWriter(threads=self.LOG_WRITER_THREADS)
+            self.__writer.start()
+
+            self.__reporter = _Reporter()
+            self.__reporter.start()
+
+            self.__loop = _EventLoop()
+            self.__loop.start()
+            self.__loop.call(self._processSampler)
+
+            if self.__guard is not None:
+                self.__loop.call(self._memoryGuard)
+
+        else:
+            self.__sampler = threading.Thread(target=self._processSampler)
+            self.__sampler.daemon = True 
+            self.__sampler.start()
+
+            if self.__guard is not None:
+                t = threading.Thread(target=self._memoryGuard, name="MemoryGuard")
+                t.daemon = True
+                t.start()
+
+        if conf.TASK_LAUNCHER and os.name == 'posix':
+            # Tasks exit as children of the launcher, so the 
+            # loop does not see a SIGCHLD for them.
+            onExit = self.__loop.wakeChildWatchers if self.__loop else None
+            self.__launcher = Launcher(onExit)
+            try:
+                self.__launcher.start()
+            except Exception, e:
+                logger.warn("Failed to start the task launcher: %s", e)
 
         self.sendPing(True)
 
@@ -115,15 +545,27 @@ class _ProcessManager(object):
         seconds, to wait until the job has fully started, 
         before returning. If wait > -1, return a RunningTask object
         """
-        cpus = ResourceMgr.checkout(processCmd.cores)
-        pthread = _ProcessThread(processCmd, cpus)
+        ramMb = getattr(processCmd, 'reservedRamMb', None) or 0
+        cpus = ResourceMgr.checkout(processCmd.cores, ramMb)
+
+        if self.__loop is not None:
+            pthread = _LoopProcess(processCmd, cpus, 
+                                   self.__loop, self.__writer, self.__reporter,
+                                   launcher=self.__launcher)
+        else:
+            pthread = _ProcessThread(processCmd, cpus, launcher=self.__launcher)
 
         with self.__lock:
-            self.__threads[processCmd.procId] = _RunningProc(processCmd, pthread, cpus)
+            self.__threads[processCmd.procId] = _RunningProc(processCmd, pthread, cpus, ramMb)
+
+        # Take the new task's cores back from any task borrowing them
+        self.rebalanceCores()
 
         pthread.start()
         logger.info("process thread started")
 
+        self.requestPing("task started")
+
         if wait == -1:
             return 
 
@@ -135,26 +577,102 @@ class _ProcessManager(object):
         """
         Callback for when a process has finished running. 
         Receives the RunTaskResult object. 
-        Deallocates the resources.
+        Queues the result for the server, and deallocates 
+        the resources.
         """
+        if self.__outbox is not None:
+            self.__outbox.put(processResult)
+
         with self.__lock:
-            if cpus is None:
-                cpus = self.__threads[processResult.procId].cpus
-            ResourceMgr.checkin(cpus)
-            try:
-                del self.__threads[processResult.procId]
-            except Exception, e:
-                logger.warn("Process %s not found: %s", processResult.procId, e)
+            proc = self.__threads.pop(processResult.procId, None)
+            if proc is None:
+                logger.warn("Process %s not found", processResult.procId)
+            elif cpus is None:
+                cpus = proc.cpus
+
+            ResourceMgr.checkin(cpus or [], proc.ramMb if proc else 0)
+
+        self.rebalanceCores()
+
+        # Let the server know the cores are free
+        self.requestPing("task finished")
+
+    def rebalanceCores(self):
+        """
+        rebalanceCores()
+
+        Let running threadable tasks use the cores that no task
+        has booked, on top of their own, and take those cores back
+        once they are booked. The cores booked for each task, and
+        reported to the server, do not change.
+        """
+        if not conf.TASK_SHARE_IDLE_CORES:
+            return
+
+        with self.__lock:
+            procs = [p for p in self.__threads.itervalues() if p.pthread.isThreadable]
+            if not procs:
+                return
+
+            idle = set(ResourceMgr.getOpenSlots())
+            for proc in procs:
+                try:
+                    proc.pthread.setAffinity(idle.union(proc.cpus))
+                except Exception, e:
+                    logger.warn("Failed to set the affinity of %r: %s", proc.pthread, e)
+
+    def requestPing(self, reason=''):
+        """
+        requestPing(str reason='')
+
+        Ping the server soon, rather than at the next regular ping, 
+        such as when a task starts or ends. Requests that come in 
+        close together are sent as one ping.
+        """
+        if self.__isShutdown.is_set():
+            return
+
+        delay = self.__lastPing + self.__pinger.MIN_INTERVAL_SEC - time.time()
+        logger.debug("Ping requested: %s", reason)
+        self.__schedulePing(max(delay, 0))
+
+    def __schedulePing(self, delay):
+        """
+        Schedule a ping in delay seconds, unless 
+        one is already due sooner than that. 
+        """
+        with self.__lock:
+            when = time.time() + delay
+            if self.__timer is not None:
+                if self.__nextPing <= when:
+                    return
+                self.__timer.cancel()
+
+            self.__nextPing = when
+
+            if self.__loop is not None:
+                self.__timer = self.__loop.callLater(delay, self.__reporter.submit, self.sendPing)
+            else:
+                self.__timer = threading.Timer(delay, self.sendPing)
+                self.__timer.daemon = True
+                self.__timer.start()
 
     def sendPing(self, isReboot=False, repeat=True):
         """
         Ping into the server with current task and resource states.
-        If repeat is True, schedules another ping at an interval defined 
-        by the rndaemon config.
+        If repeat is True, schedules another ping, at the ping interval 
+        defined by the rndaemon config, or longer while the node is idle.
         """
         if self.__isShutdown.is_set():
             repeat = False
 
+        # This ping stands in for any that were scheduled
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            self.__lastPing = time.time()
+
         # TODO: What is the purpose of the isReboot flag?
         # Using the internal flag to determine if we are in a 
         # reboot state.
@@ -179,9 +697,7 @@ class _ProcessManager(object):
                 return
 
         if repeat:
-            self.__timer = threading.Timer(conf.NETWORK_PING_INTERVAL, self.sendPing)
-            self.__timer.daemon = True
-            self.__timer.start()
+            self.__schedulePing(self.__pinger.nextDelay(idle=not tasks))
 
     def killRunningTask(self, procId, reason):
         """
@@ -203,10 +719,38 @@ class _ProcessManager(object):
 
         if not_killed:
             err = "Failed to kill the following pids for prodId %s: %s" % \
-                    (procId, ','.join(not_killed))
+                    (procId, ','.join(map(str, not_killed)))
             logger.warn(err)
             raise ttypes.RndException(1, err)
 
+    def getTaskMetrics(self, procId):
+        """
+        getTaskMetrics(str procId) -> TaskMetrics
+
+        The recent resource samples of a running task
+        """
+        with self.__lock:
+            try:
+                pthread = self.__threads[procId].pthread
+            except KeyError:
+                raise ttypes.RndException(1, "Process %s not found" % procId)
+
+        return pthread.getTaskMetrics()
+
+    def getLogBytes(self, procId, offset, maxBytes):
+        """
+        getLogBytes(str procId, int offset, int maxBytes) -> LogChunk
+
+        Read the log of a running task from a byte offset
+        """
+        with self.__lock:
+            try:
+                pthread = self.__threads[procId].pthread
+            except KeyError:
+                raise ttypes.RndException(1, "Process %s not found" % procId)
+
+        return pthread.readLog(offset, maxBytes)
+
     def getRunningTasks(self):
         """ Get a list of all running task objects """
         with self.__lock:
@@ -229,8 +773,11 @@ class _ProcessManager(object):
 
         logger.debug("Asked %d tasks to quit and report. Waiting for them to complete", len(threads))
 
+        # The tasks are all stopping at the same time, 
+        # so wait on them against the same deadline
+        deadline = time.time() + 10
         for t in threads:
-            if not t.wait(10):
+            if not t.wait(max(deadline - time.time(), 0)):
                 logger.warn("Thread failed to close down after waiting 10 seconds: %r", t) 
 
         self.__threads.clear()
@@ -277,19 +824,106 @@ class _ProcessManager(object):
         else:
             logger.info("*Reboot scheduled at next idle event*")
 
-    def _processSampler(self):
+    def _processSampler(self, sampler=None):
         """
         Loop that updates metrics on every running process 
-        at intervals.
+        at intervals. With the event loop engine, each pass 
+        is a timer on the loop.
+
+        Where /proc is available, all of the process trees
+        are sampled together from a single scan. Otherwise
+        each task samples its own tree with psutil.
         """
+        if sampler is None and conf.SAMPLER_BATCHED and ProcSampler.isSupported():
+            sampler = ProcSampler()
+
+        if self.__loop is not None:
+            if not self.__isShutdown.is_set():
+                self.__sampleProcesses(sampler)
+                self.__loop.callLater(self.SAMPLE_INTERVAL_SEC, self._processSampler, sampler)
+            return
+
         while not self.__isShutdown.is_set():
-            with self.__lock:
-                pthreads = [t.pthread for t in self.__threads.itervalues()]
+            self.__sampleProcesses(sampler)
+            time.sleep(self.SAMPLE_INTERVAL_SEC)
+
+    def _memoryGuard(self):
+        """
+        Loop that checks the free memory on the node at 
+        intervals, and stops or kills tasks when it runs low.
+        With the event loop engine, each pass is a timer 
+        on the loop.
+        """
+        if self.__loop is not None:
+            if not self.__isShutdown.is_set():
+                self.__checkMemory()
+                self.__loop.callLater(self.MEMORY_CHECK_SEC, self._memoryGuard)
+            return
+
+        while not self.__isShutdown.is_set():
+            self.__checkMemory()
+            time.sleep(self.MEMORY_CHECK_SEC)
+
+    def __checkMemory(self):
+        guard = self.__guard
+
+        try:
+            freeMb = psutil.virtual_memory().available / 1024 / 1024
+        except Exception, e:
+            logger.warn("Error reading free memory: %s", e)
+            return
+
+        with self.__lock:
+            pthreads = dict((procId, t.pthread) for procId, t in self.__threads.iteritems())
+
+        samples = [TaskSample(procId, p.rssMb, p.startTime) 
+                   for procId, p in pthreads.iteritems() if p.pid > 0]
+
+        for action, procId in guard.check(freeMb, samples):
+            pthread = pthreads[procId]
+
+            if action == CONT:
+                logger.info("Free memory is back up to %d MB", freeMb)
+                pthread.resume()
+                continue
 
+            logger.warn("Free memory is down to %d MB. Using the %r policy to %s %r (%d MB rss)", 
+                        freeMb, guard.policy, action, pthread, pthread.rssMb)
+
+            if action == STOP:
+                pthread.suspend()
+            elif action == KILL:
+                pthread.killForMemory("Killed by the rndaemon to free up memory, "
+                                      "with %d MB free on the node" % freeMb)
+
+    def __sampleProcesses(self, sampler):
+        with self.__lock:
+            pthreads = [t.pthread for t in self.__threads.itervalues()]
+
+        if sampler is None:
             for pthread in pthreads:
                 pthread.updateMetrics()
 
-            time.sleep(self.SAMPLE_INTERVAL_SEC)
+        elif pthreads:
+            # Tasks in a cgroup read their own counters
+            for pthread in pthreads:
+                if pthread.hasCgroup:
+                    pthread.updateMetrics()
+
+            pids = [p.pid for p in pthreads if p.pid > 0 and not p.hasCgroup]
+            try:
+                samples = sampler.sample(pids, io=_ProcessTask._DO_DISK_IO)
+            except Exception, e:
+                logger.warn("Error sampling running processes: %s", e)
+                logger.debug(traceback.format_exc())
+                samples = {}
+
+            for pthread in pthreads:
+                if pthread.hasCgroup:
+                    continue
+                m = samples.get(pthread.pid)
+                if m is not None:
+                    pthread.setMetrics(m.rss, m.cpuPercent, m.diskIO)
 
 
 #
@@ -314,37 +948,65 @@ class RunningTask(ttypes.RunningTask):
 
 
 #
-# _ProcessThread
+# _ProcessTask
 #
-class _ProcessThread(threading.Thread):
+class _ProcessTask(object):
     """
-    The _ProcessThread wraps a running task.
+    The _ProcessTask wraps a running task. Subclasses drive 
+    the task process, either from its own thread or from 
+    the event loop.
     """
 
     _DO_DISK_IO = hasattr(psutil.Process, "get_io_counters")
 
-    def __init__(self, rtc, cpus=None):
-        threading.Thread.__init__(self)
-        self.daemon = True
+    # bytes read from the task output pipe at a time
+    READ_SIZE = 64 * 1024
 
+    # seconds to wait after asking nicely before killing the task
+    KILL_WAIT_SEC = 5
+
+    # seconds between checks for room in the log writer, 
+    # while reading a task's output is paused
+    LOG_WAIT_SEC = .1
+
+    # exit signal reported for tasks killed by the memory guard
+    OOM_EXIT_SIGNAL = 87
+
+    # least seconds between parsing progress from task output
+    PROGRESS_INTERVAL = .5
+
+    # most log bytes returned by one readLog() call
+    MAX_LOG_READ = 1024 * 1024
+
+    def __init__(self, rtc, cpus=None, launcher=None):
         self.__logfp = None
         self.__cpus = cpus or set()
+        self.__launcher = launcher
 
         self.__rtc = rtc
         self.__pptr = None
         self.__logfp = None
         self.__pid = -1
+        self.__cgroup = None
+        self.__writer = None
+        self.__ownWriter = False
+        self.__output = None
 
         self.__killThread = None
 
         self.__wasKilled = threading.Event()
         self.__hasStarted = threading.Event()
         self.__isShutdown = threading.Event()
+        self.__isDone = threading.Event()
 
         self.__progress = 0.0
+        self.__pingedProgress = 0.0
         self.__lastLog = ""
 
         self.__killReason = ""
+        self.__memoryKilled = False
+        self.__startTime = 0
+        self.__affinity = sorted(self.__cpus)
 
         self.__metrics = {
             'rssMb': 0,
@@ -353,31 +1015,69 @@ class _ProcessThread(threading.Thread):
             'diskIO': ttypes.DiskIO(-1,-1,-1,-1),
         }
 
+        # every sample, up to a fixed number
+        self.__history = MetricsBuffer(conf.METRICS_SAMPLES)
+
     def __repr__(self):
         return "<%s: (procId: %s, pid: %d)>" % (
             self.__class__.__name__, 
             self.__rtc.procId, 
             self.__pid)
 
-    def shutdown(self):
+    @property 
+    def pid(self):
         """
-        Instruct the process to shutdown gracefully.
-        Returns the same output as killProcess()
+        The pid of the root task process, or -1 if
+        it has not started yet.
         """
-        logger.debug("Shutdown request received. Killing %r", self)
-        self.__isShutdown.set()
-        self.killProcess(block=False, reason="rndaemon shutdown request received")
+        return self.__pid
 
-    def wait(self, timeout=None):
+    @property 
+    def hasCgroup(self):
         """
-        Waits for the process to finish. 
+        True if the task is running in its own cgroup
+        """
+        return self.__cgroup is not None
+
+    @property 
+    def isThreadable(self):
+        """
+        True if the task can make use of more cores than it booked
+        """
+        return bool(getattr(self.__rtc, 'threadable', False))
+
+    @property 
+    def rssMb(self):
+        """
+        The rss of the task at its last sample
+        """
+        return self.__metrics['rssMb']
+
+    @property 
+    def startTime(self):
+        """
+        The time the task process started, or 0
+        """
+        return self.__startTime
+
+    def shutdown(self):
+        """
+        Instruct the process to shutdown gracefully.
+        Returns the same output as killProcess()
+        """
+        logger.debug("Shutdown request received. Killing %r", self)
+        self.__isShutdown.set()
+        self.killProcess(block=False, reason="rndaemon shutdown request received")
+
+    def wait(self, timeout=None):
+        """
+        Waits for the process to finish. 
         By default, blocks indefinitely. Specify a
         timeout in float seconds to wait. If the timeout 
         value is exceeded, return False
         Returns True if the task ended. 
         """
-        self.join(timeout)
-        return not self.isAlive()
+        return self.__isDone.wait(timeout)
 
     def getRunningTask(self, wait=-1):
         """
@@ -396,6 +1096,8 @@ class _ProcessThread(threading.Thread):
         if wait > 0:
             self.__hasStarted.wait(wait)
 
+        self.flushProgress(ping=False)
+
         rt = RunningTask()
         rtc = self.__rtc
 
@@ -408,6 +1110,7 @@ class _ProcessThread(threading.Thread):
         metrics = self.__metrics
 
         rt.rssMb = metrics['rssMb']
+        rt.reservedRamMb = getattr(rtc, 'reservedRamMb', None) or 0
         rt.cpuPercent = metrics['cpuPercent']
 
         if self._DO_DISK_IO:
@@ -418,95 +1121,218 @@ class _ProcessThread(threading.Thread):
 
         return rt
 
-    def run(self):
+    def readLog(self, offset, maxBytes):
         """
-        Run method called implicitely by start() 
-        Fires up the process to do the actual task. 
-        Logs output, and records resource metrics.
+        readLog(int offset, int maxBytes) -> LogChunk
+
+        Read up to maxBytes of the task log, starting at offset.
+        A negative offset counts back from the end of the log.
         """
-        rtc = self.__rtc 
-        retcode = 1
+        logfp = self.__logfp
+        if logfp is None:
+            raise ttypes.RndException(1, "The log of %s is not open" % self.__rtc.procId)
+
+        if offset < 0:
+            offset = max(logfp.tail.size + offset, 0)
+        offset = logfp.readableOffset(offset)
+
+        maxBytes = min(max(maxBytes, 0), self.MAX_LOG_READ)
 
         try:
-            uid = self.__rtc.uid
-            cpus = self.__cpus 
-            
-            logger.info("Opening log file: %s", rtc.logFile)
-            self.__logfp = utils.ProcessLog(self.__rtc.logFile, uid=uid, buffering=1)
-            self.__logfp.writeLogHeader(rtc)
-
-            env = os.environ.copy()
-            env.update(rtc.env)
-
-            parser = None
-            if rtc.taskTypes:
-                parser = utils.ProcessLogParser.fromTaskTypes(rtc.taskTypes)
-                if not parser.progress:
-                    parser = None
-
-            opts = {
-                'stdout': subprocess.PIPE, 
-                'stderr': subprocess.STDOUT,
-                'uid': uid,
-                'cpus': cpus,
-                'env': env,
-            }
+            data, size = logfp.readBytes(offset, maxBytes)
+        except (IOError, OSError), e:
+            raise ttypes.RndException(1, "Failed to read the log of %s: %s" % (self.__rtc.procId, e))
+
+        return ttypes.LogChunk(offset=offset, data=data, size=size)
+
+    def getTaskMetrics(self):
+        """
+        getTaskMetrics() -> TaskMetrics
+
+        The samples in the task's metrics history, with 
+        a summary of every sample taken since it started.
+        """
+        history = self.__history
+        summary = history.summary()
+
+        tm = ttypes.TaskMetrics()
+        tm.procId = self.__rtc.procId
+        tm.sampleCount = summary['samples']
+        tm.startTime = int(self.__startTime * 1000)
+        tm.maxRssMb = summary.get('maxRssMb', 0)
+        tm.avgRssMb = summary.get('avgRssMb', 0)
+        tm.maxCpuPercent = min(summary.get('maxCpuPercent', 0), 32767)
+        tm.avgCpuPercent = min(summary.get('avgCpuPercent', 0), 32767)
+        tm.samples = [ttypes.TaskMetricSample(int(t * 1000), rss, cpu, rb, wb) 
+                      for t, rss, cpu, rb, wb in history.samples()]
+        return tm
+
+    def _launch(self, writer=None):
+        """
+        _launch(LogWriter writer=None) -> subprocess.Popen
+
+        Open the log and start the task process, with its 
+        output on a pipe. The output is logged through the 
+        given writer, or a new one for this task.
+
+        The process is started by the launcher, if there is 
+        one, in which case a LaunchedProcess is returned.
+        """
+        rtc = self.__rtc 
+
+        uid = self.__rtc.uid
+        cpus = self.__cpus 
+        
+        logger.info("Opening log file: %s", rtc.logFile)
+        self.__logfp = utils.ProcessLog(self.__rtc.logFile, uid=uid,
+                                          compress=conf.TASK_COMPRESS_LOGS,
+                                          maxBytes=utils.ProcessLog.limitForTaskTypes(rtc.taskTypes))
+        self.__logfp.writeLogHeader(rtc)
+
+        env = os.environ.copy()
+        env.update(rtc.env)
+
+        parser = None
+        if rtc.taskTypes:
+            parser = utils.ProcessLogParser.fromTaskTypes(rtc.taskTypes)
+            if not parser.progress:
+                parser = None
+
+        self.__cgroup = Profiler.createTaskCgroup(rtc.procId, 
+                                                  ramMb=getattr(rtc, 'ramMb', None) or 0)
+
+        opts = {
+            'stdout': subprocess.PIPE, 
+            'stderr': subprocess.STDOUT,
+            'uid': uid,
+            'cpus': cpus,
+            'env': env,
+            'cgroup': self.__cgroup,
+            'launcher': self.__launcher is not None,
+        }
+
+        cmd, opts = Profiler.getSubprocessOpts(rtc.command, **opts)
 
-            cmd, opts = Profiler.getSubprocessOpts(rtc.command, **opts)
+        logger.info("Running command: %s", rtc.command)
+        self.__logfp.write("[%s] Running process" % time.strftime("%Y-%m-%d %H:%M:%S"))
+        self.__logfp.flush()
 
-            logger.info("Running command: %s", rtc.command)
-            self.__logfp.write("[%s] Running process" % time.strftime("%Y-%m-%d %H:%M:%S"))
-            self.__logfp.flush()
+        if self.__launcher is not None:
+            p = self.__launcher.spawn(cmd, **opts)
+        else:
             p = subprocess.Popen(cmd, **opts)
 
-            self.__pptr = p
-            self.__pid = p.pid
+        self.__pptr = p
+        self.__pid = p.pid
 
-            self.__hasStarted.set()
-            logger.info("PID: %d", p.pid)
+        self.__startTime = time.time()
+        self.__hasStarted.set()
+        logger.info("PID: %d", p.pid)
 
-            self.updateMetrics()
+        if self.isThreadable:
+            ProcessMgr.rebalanceCores()
 
-            writeLog = self.__logfp.write
-            r_pipe = self.__pptr.stdout 
+        self.updateMetrics()
 
-            for line in iter(r_pipe.readline, ""):
+        # Output is written to the log from a separate thread, so 
+        # the task is not held up by a slow log filesystem.
+        if writer is None:
+            writer = utils.LogWriter(self.__logfp)
+            writer.start()
+            self.__ownWriter = True
 
-                writeLog(line)
+        self.__writer = writer
+        self.__output = utils.OutputTracker(parser, progressInterval=self.PROGRESS_INTERVAL)
 
-                self.__lastLog = line
+        return p
 
-                if parser:
-                    prog = parser.parseProgress(line)
-                    if prog is not None:
-                        self.__progress = prog 
+    def _feed(self, chunk, block=True):
+        """
+        _feed(str chunk, bool block=True) -> bool
 
-                if self.__isShutdown.is_set():
-                    break
+        Handle the next chunk of task output. With block=False,
+        returns False once the log writer is behind on this 
+        task's log, instead of waiting for it.
+        """
+        hasRoom = self.__writer.write(chunk, self.__logfp, block=block)
 
-            self.__logfp.write("[%s] Process finished" % time.strftime("%Y-%m-%d %H:%M:%S"))
-            self.__logfp.flush()
-            
-            try:
-                retcode = p.wait()
-            except OSError, e:
-                if e.errno != errno.ECHILD:
-                    if not self.__isShutdown.is_set():
-                        raise
+        tracker = self.__output
+        tracker.feed(chunk)
+        self.__lastLog = tracker.lastLog
+        self.__updateProgress(tracker)
 
-            r_pipe.close()
+        return hasRoom
 
-            logger.debug("Return code: %s", retcode)
+    def _logHasRoom(self):
+        """
+        _logHasRoom() -> bool
 
-        except Exception, e:
-            if self.__isShutdown.is_set():
-                logger.debug("Thread detected shutdown request. Leaving gracefully.")
-            else:
-                logger.warn("Failed to execute command: %s", e)
-                logger.debug(traceback.format_exc())
+        True if the log writer can take more of the task output
+        """
+        writer = self.__writer
+        return writer is None or writer.pending(self.__logfp) < writer.maxBuffer
 
-        finally:
+    def __updateProgress(self, tracker, ping=True):
+        if tracker.progress is None:
+            return
+
+        self.__progress = tracker.progress
+
+        if ping and abs(self.__progress - self.__pingedProgress) >= _PingScheduler.PROGRESS_STEP:
+            self.__pingedProgress = self.__progress
+            ProcessMgr.requestPing("task progress")
+
+    def flushProgress(self, ping=True):
+        """
+        flushProgress(bool ping=True)
+
+        Parse progress from output held back by the progress
+        interval, so that a task gone quiet still reports the 
+        last progress it printed.
+        """
+        tracker = self.__output
+        if tracker is not None:
+            tracker.flushProgress()
+            self.__updateProgress(tracker, ping)
+
+    def _endOutput(self):
+        """
+        _endOutput()
+
+        Wait for the task output to be logged once
+        the output pipe has been closed. 
+        """
+        self.__releaseWriter()
+
+        self.flushProgress(ping=False)
+
+        self.__logfp.write("[%s] Process finished" % time.strftime("%Y-%m-%d %H:%M:%S"))
+        self.__logfp.flush()
+
+    def _finish(self, retcode):
+        """
+        _finish(int retcode)
+
+        Report the task as complete, and release its resources
+        """
+        try:
+            self.__releaseWriter()
             self.__completed(retcode)
+        finally:
+            self.__isDone.set()
+
+    def _isShutdown(self):
+        return self.__isShutdown.is_set()
+
+    def __releaseWriter(self):
+        writer, self.__writer = self.__writer, None
+        if writer is None:
+            return
+
+        if self.__ownWriter:
+            writer.close()
+        else:
+            writer.sync(self.__logfp)
 
     def updateMetrics(self):
         """
@@ -519,6 +1345,12 @@ class _ProcessThread(threading.Thread):
         """
         # logger.debug("updateMetrics(): %r", self)
 
+        cgroup = self.__cgroup
+        if cgroup is not None:
+            rss_bytes, cpu_perc, disk_io = cgroup.sample()
+            self.setMetrics(rss_bytes, cpu_perc, disk_io if self._DO_DISK_IO else None)
+            return
+
         rss_bytes = 0
         cpu_perc = 0
 
@@ -534,7 +1366,10 @@ class _ProcessThread(threading.Thread):
 
                 this_pid = proc.pid
 
-                if proc.status == psutil.STATUS_ZOMBIE:
+                try:
+                    if proc.status() == psutil.STATUS_ZOMBIE:
+                        continue
+                except psutil.Error:
                     continue
 
                 try:
@@ -559,13 +1394,24 @@ class _ProcessThread(threading.Thread):
         except psutil.NoSuchProcess, e:
             return
 
+        self.setMetrics(rss_bytes, cpu_perc, disk_io if do_disk_io else None)
+
+    def setMetrics(self, rss_bytes, cpu_perc, disk_io=None):
+        """
+        setMetrics(int rss_bytes, float cpu_perc, tuple disk_io=None)
+
+        Update the metrics of the running process tree 
+        from an outside sample.
+
+        disk_io is a (readCount, writeCount, readBytes, writeBytes) tuple
+        """
         cpu_perc_int = int(round(cpu_perc))
         rssMb = rss_bytes / 1024 / 1024
 
         metrics = self.__metrics
 
         maxRss = max(rssMb, metrics['maxRssMb'])
-        disk_io_t = ttypes.DiskIO(*disk_io) if do_disk_io else None
+        disk_io_t = ttypes.DiskIO(*disk_io) if disk_io is not None else None
 
         metrics.update({
             'rssMb': rssMb,
@@ -573,8 +1419,11 @@ class _ProcessThread(threading.Thread):
             'cpuPercent': cpu_perc_int,
             'diskIO': disk_io_t,
         })
+        self.__history.add(rssMb, cpu_perc_int, disk_io_t)
         logger.debug("metrics: %r", metrics)
 
+        self.flushProgress()
+
     def killProcess(self, block=True, reason=''):
         """
         killProcess(bool block=True, reason='') -> (list killed_pids, list not_killed)
@@ -597,6 +1446,15 @@ class _ProcessThread(threading.Thread):
         if block:
             return self.__killProcess()
 
+        self._killAsync()
+
+    def _killAsync(self):
+        """
+        _killAsync()
+
+        Start killing the process tree without blocking.
+        By default, the blocking kill is run in a new thread.
+        """
         # guards against repeat calls to kill while one async
         # call is already running
         if self.__killThread and self.__killThread.isAlive():
@@ -605,85 +1463,194 @@ class _ProcessThread(threading.Thread):
         t = threading.Thread(target=self.__killProcess)
         t.start()
         self.__killThread = t
-        return
-
 
-    def __killProcess(self):
-        pid = self.__pid
-        if pid == -1:
-            return 
+    def _signalTree(self, sig):
+        """
+        _signalTree(int sig)
 
-        try:
-            p = psutil.Process(pid)
-        except psutil.NoSuchProcess:
+        Send a signal to every process of the task
+        without waiting on them.
+        """
+        if self.__pid == -1:
             return
 
-        children = p.get_children(recursive=True)
-
         self.__wasKilled.set()
+        self.__sendSignal(sig)
+
+    def setAffinity(self, cpus):
+        """
+        setAffinity(list cpus) -> bool
 
-        # kill the top parent
-        self.__killOneProcess(p)
+        Change the core slots the running task may use,
+        without changing the cores booked for it. 
+        Returns True if the affinity was changed.
+        """
+        cpus = sorted(cpus)
+        if self.__pid == -1 or cpus == self.__affinity:
+            return False
 
-        # make sure each process in the tree is really dead
-        killed = []
-        not_killed = []
+        cgroup = self.__cgroup
+        if cgroup is not None:
+            pids = cgroup.pids()
+        else:
+            pids = [p.pid for p in self.__getTree()]
 
-        for child in children:
-            success = self.__killOneProcess(child)
-            if success:
-                killed.append(child.pid)
-            else:
-                not_killed.append(child.pid)
+        if not Profiler.setTaskAffinity(pids, cpus):
+            return False
 
-        return killed, not_killed
+        logger.info("Task %r may now use cores %s (booked %s)", 
+                    self, cpus, sorted(self.__cpus))
+        self.__affinity = cpus
+        return True
 
-    def __killOneProcess(self, p):
+    def suspend(self):
         """
-        __killOneProcess(psutil.Process p) -> bool
+        suspend()
 
-        Try and nicely stop a Process first, then kill it. 
-        Return True if process was killed.
+        Freeze the task with SIGSTOP
         """
-        try:
-            try: 
-                p.wait(0.001)
-            except psutil.TimeoutExpired: 
-                pass
+        logger.info("Suspending %r", self)
+        self.__sendSignal(signal.SIGSTOP)
 
-            if not p.is_running():
-                return True
+    def resume(self):
+        """
+        resume()
 
-            pid = p.pid 
+        Continue a task frozen by suspend()
+        """
+        logger.info("Resuming %r", self)
+        self.__sendSignal(signal.SIGCONT)
 
-            logger.info("Asking nicely for pid %d (%s) to stop", pid, p.name)
-            p.terminate()
-            try: 
-                p.wait(5)
-            except psutil.TimeoutExpired: 
-                pass
+    def killForMemory(self, reason):
+        """
+        killForMemory(str reason)
+
+        Kill the task right away to free up memory on the node.
+        The task reports OOM_EXIT_SIGNAL as its exit signal.
+        """
+        self.__memoryKilled = True
+        self.__killReason = reason
+        self._signalTree(signal.SIGKILL)
 
-            if not p.is_running():
-                return True
+    def __sendSignal(self, sig):
+        if self.__pid == -1:
+            return
 
-            logger.info("Killing pid %d (%s)", pid, p.name)
-            p.kill()
-            try: 
-                p.wait(1)
-            except psutil.TimeoutExpired: 
-                pass
+        cgroup = self.__cgroup
+        if cgroup is not None:
+            cgroup.sendSignal(sig)
+            return
 
-            if p.is_running():
-                logger.warn("Failed to properly kill pid %d (taskId: %s)", pid, self.__rtc.taskId)
-                return False 
+        self.__signalProcs(self.__getTree(), sig)
 
+    def __getTree(self):
+        """
+        __getTree() -> list psutil.Process
+
+        The task process and all of its children
+        """
+        try:
+            p = psutil.Process(self.__pid)
         except psutil.NoSuchProcess:
+            return []
+
+        try:
+            return [p] + p.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+        except psutil.AccessDenied:
+            return [p]
+
+    def __signalProcs(self, procs, sig):
+        # Tasks are started in their own session, so the process 
+        # group also reaches children that have left the tree.
+        pid = self.__pid
+        try:
+            if os.getpgid(pid) == pid:
+                os.killpg(pid, sig)
+        except OSError:
             pass
 
-        return True
+        for proc in procs:
+            try:
+                proc.send_signal(sig)
+            except psutil.Error:
+                pass
+
+    @staticmethod
+    def __waitProcs(procs, timeout):
+        """
+        __waitProcs(list procs, float timeout) -> list
+
+        Wait until all of the processes have exited, or
+        the timeout runs out. Return the ones still running.
+        """
+        deadline = time.time() + timeout
+
+        while True:
+            alive = []
+            for p in procs:
+                try:
+                    if p.is_running() and p.status() != psutil.STATUS_ZOMBIE:
+                        alive.append(p)
+                except psutil.NoSuchProcess:
+                    pass
+
+            procs = alive
+            if not procs or time.time() >= deadline:
+                return procs
+
+            time.sleep(.05)
+
+    def __killProcess(self):
+        pid = self.__pid
+        if pid == -1:
+            return [], []
+
+        cgroup = self.__cgroup
+        if cgroup is not None:
+            self.__wasKilled.set()
+            return cgroup.kill(self.KILL_WAIT_SEC)
+
+        procs = self.__getTree()
+        if not procs:
+            return [], []
+
+        self.__wasKilled.set()
+
+        # Stop the whole tree at once, rather than one process at a time
+        logger.info("Asking nicely for %d processes of %r to stop", len(procs), self)
+        self.__signalProcs(procs, signal.SIGTERM)
+        alive = self.__waitProcs(procs, self.KILL_WAIT_SEC)
+
+        if alive:
+            logger.info("Killing %d processes of %r", len(alive), self)
+            self.__signalProcs(alive, signal.SIGKILL)
+            alive = self.__waitProcs(alive, 1)
+
+        not_killed = [p.pid for p in alive]
+        if not_killed:
+            logger.warn("Failed to properly kill pids %s (taskId: %s)", not_killed, self.__rtc.taskId)
+
+        killed = [p.pid for p in procs if p.pid not in not_killed]
+        return killed, not_killed
 
     def __completed(self, retcode):
         logger.debug("Process completed: %r, (IsShutdown: %r)", self, self.__isShutdown.is_set())
+        cgroup = self.__cgroup
+        if cgroup is not None:
+            # Catch any memory use since the last sample, then 
+            # clean up whatever the task left running.
+            self.updateMetrics()
+
+            if cgroup.oomKills() and not self.__killReason:
+                if cgroup.ramMb > 0:
+                    self.__killReason = "Exceeded the memory limit of %d MB" % cgroup.ramMb
+                else:
+                    self.__killReason = "Killed by the kernel for running out of memory"
+
+            cgroup.destroy()
+
         result = ttypes.RunTaskResult()
         result.maxRssMb = self.__metrics['maxRssMb']
 
@@ -696,6 +1663,10 @@ class _ProcessThread(threading.Thread):
             result.exitSignal = 86
             logger.info("Task closing gracefully from shutdown request")
 
+        elif self.__memoryKilled:
+            result.exitStatus = 1
+            result.exitSignal = self.OOM_EXIT_SIGNAL
+
         elif self.__wasKilled.is_set():
             result.exitStatus = 1
             result.exitSignal = retcode if retcode < 0 else -9
@@ -709,17 +1680,9 @@ class _ProcessThread(threading.Thread):
             result.exitSignal = 0
 
         logger.info("Process result %s", result)
-        if not conf.NETWORK_DISABLED:
-            while True:
-                try:
-                    service, transport = client.getPlowConnection()
-                    service.taskComplete(result)
-                    transport.close()
-                    break
-                except Exception, e:
-                    logger.warn("Error talking to plow server, %s, sleeping for 30 seconds", e)
-                    time.sleep(30)
 
+        # The process tree is gone, so free up the cores now. The
+        # result is sent to the server in the background.
         ProcessMgr.processFinished(result, self.__cpus)
 
         if self.__logfp is not None:
@@ -735,6 +1698,197 @@ class _ProcessThread(threading.Thread):
             self.__logfp.writeLogFooterAndClose(result, attrs)
             self.__logfp = None
 
+            path = self.__rtc.logFile + '.metrics'
+            try:
+                self.__history.dump(path, procId=str(self.__rtc.procId), 
+                                    interval=ProcessMgr.SAMPLE_INTERVAL_SEC)
+            except (IOError, OSError, ValueError), e:
+                logger.warn("Failed to write task metrics to %s: %s", path, e)
+
+
+
+#
+# _ProcessThread
+#
+class _ProcessThread(threading.Thread, _ProcessTask):
+    """
+    The _ProcessThread runs a task from its own thread,
+    blocking on the task output.
+    """
+
+    def __init__(self, rtc, cpus=None, launcher=None):
+        threading.Thread.__init__(self)
+        _ProcessTask.__init__(self, rtc, cpus, launcher)
+        self.daemon = True
+
+    __repr__ = _ProcessTask.__repr__
+
+    def run(self):
+        """
+        Run method called implicitely by start() 
+        Fires up the process to do the actual task. 
+        Logs output, and records resource metrics.
+        """
+        retcode = 1
+
+        try:
+            p = self._launch()
+
+            r_pipe = p.stdout 
+            fd = r_pipe.fileno()
+
+            while True:
+                try:
+                    chunk = os.read(fd, self.READ_SIZE)
+                except OSError, e:
+                    if e.errno == errno.EINTR:
+                        continue
+                    raise
+
+                if not chunk:
+                    break
+
+                self._feed(chunk)
+
+                if self._isShutdown():
+                    break
+
+            self._endOutput()
+            
+            try:
+                retcode = p.wait()
+            except OSError, e:
+                if e.errno != errno.ECHILD:
+                    if not self._isShutdown():
+                        raise
+
+            r_pipe.close()
+
+            logger.debug("Return code: %s", retcode)
+
+        except Exception, e:
+            if self._isShutdown():
+                logger.debug("Thread detected shutdown request. Leaving gracefully.")
+            else:
+                logger.warn("Failed to execute command: %s", e)
+                logger.debug(traceback.format_exc())
+
+        finally:
+            self._finish(retcode)
+
+
+#
+# _LoopProcess
+#
+class _LoopProcess(_ProcessTask):
+    """
+    The _LoopProcess runs a task from the shared event loop.
+    Its output is read when the loop finds the pipe readable,
+    and its exit is picked up from SIGCHLD. Results are sent
+    to the server by the reporter thread.
+    """
+
+    def __init__(self, rtc, cpus, loop, writer, reporter, launcher=None):
+        _ProcessTask.__init__(self, rtc, cpus, launcher)
+
+        self.__loop = loop
+        self.__writer = writer
+        self.__reporter = reporter
+
+        self.__pptr = None
+        self.__killTimer = None
+        self.__terminating = False
+
+    def start(self):
+        """
+        Start the task process and hand it to the event loop
+        """
+        try:
+            p = self._launch(self.__writer)
+
+            fd = p.stdout.fileno()
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+        except Exception, e:
+            logger.warn("Failed to execute command: %s", e)
+            logger.debug(traceback.format_exc())
+            self.__reporter.submit(self._finish, 1)
+            return
+
+        self.__pptr = p
+        self.__loop.addReader(fd, self.__onRead)
+
+    def _killAsync(self):
+        self.__loop.call(self.__terminate)
+
+    def __onRead(self, fd):
+        try:
+            chunk = os.read(fd, self.READ_SIZE)
+        except OSError, e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return
+            logger.warn("Error reading output of %r: %s", self, e)
+            chunk = ''
+
+        if not chunk or self._isShutdown():
+            if chunk:
+                self._feed(chunk, block=False)
+            self.__loop.removeReader(fd)
+            self.__loop.addChildWatcher(self.__reap)
+            return
+
+        # Never wait on the log writer from the loop. Stop reading 
+        # until it catches up, so only this task is held up.
+        if not self._feed(chunk, block=False):
+            logger.debug("Log of %r is behind, pausing its output", self)
+            self.__loop.removeReader(fd)
+            self.__loop.callLater(self.LOG_WAIT_SEC, self.__waitForLog, fd)
+
+    def __waitForLog(self, fd):
+        if self._logHasRoom() or self._isShutdown():
+            self.__loop.addReader(fd, self.__onRead)
+        else:
+            self.__loop.callLater(self.LOG_WAIT_SEC, self.__waitForLog, fd)
+
+    def __reap(self):
+        p = self.__pptr
+
+        try:
+            retcode = p.poll()
+        except OSError, e:
+            if e.errno != errno.ECHILD:
+                raise
+            retcode = 1
+
+        if retcode is None:
+            return
+
+        self.__loop.removeChildWatcher(self.__reap)
+        p.stdout.close()
+
+        # The pid could be reused by now
+        if self.__killTimer is not None:
+            self.__killTimer.cancel()
+
+        logger.debug("Return code: %s", retcode)
+        self.__reporter.submit(self.__complete, retcode)
+
+    def __complete(self, retcode):
+        try:
+            self._endOutput()
+        except Exception, e:
+            logger.warn("Failed to finish the log of %r: %s", self, e)
+        self._finish(retcode)
+
+    def __terminate(self):
+        if self.__terminating:
+            return
+        self.__terminating = True
+
+        self._signalTree(signal.SIGTERM)
+        self.__killTimer = self.__loop.callLater(self.KILL_WAIT_SEC, 
+                                                 self._signalTree, signal.SIGKILL)
 
 
 #
@@ -0,0 +1,556 @@
+"""
+Task launcher process.
+
+Forking the rndaemon itself to start a task gets slower as the
+daemon grows, and running python code between fork and exec in a
+process with many threads is unsafe. Instead, a small launcher
+process is started once, and the daemon sends it launch requests
+over a unix socket. The launcher forks from its own small, single
+threaded process, and switches user, groups, cpu affinity, cgroup,
+rlimits, cwd and environment before exec'ing the task command.
+
+The read end of the task output pipe stays in the daemon, and the
+write end is passed to the launcher along with the request. The
+launcher reaps its children and reports their exit status back.
+
+Run as a script, this module is the launcher itself, and must
+only import from the standard library.
+"""
+import os
+import sys
+import errno
+import fcntl
+import signal
+import select
+import socket
+import struct
+import ctypes
+import ctypes.util
+import logging
+import resource
+import threading
+import traceback
+import subprocess
+import cPickle
+
+from functools import partial
+
+import _multiprocessing
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['Launcher', 'LaunchedProcess', 'LauncherError']
+
+
+PIPE = subprocess.PIPE
+STDOUT = subprocess.STDOUT
+
+_HEADER = struct.Struct('!I')
+
+
+class LauncherError(Exception):
+    pass
+
+
+def _setCloexec(fd):
+    flags = fcntl.fcntl(fd, fcntl.F_GETFD)
+    fcntl.fcntl(fd, fcntl.F_SETFD, flags | fcntl.FD_CLOEXEC)
+
+
+def _recvExact(sock, size):
+    chunks = []
+    while size:
+        try:
+            data = sock.recv(size)
+        except socket.error, e:
+            if e.args[0] == errno.EINTR:
+                continue
+            raise
+        if not data:
+            return None
+        chunks.append(data)
+        size -= len(data)
+    return ''.join(chunks)
+
+
+def _sendMsg(sock, msg):
+    data = cPickle.dumps(msg, cPickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recvMsg(sock):
+    """
+    _recvMsg(socket sock) -> object
+
+    Read the next message, or return None if the other
+    end has closed the socket. Never reads past the end of
+    the message, so that a passed fd can follow it.
+    """
+    header = _recvExact(sock, _HEADER.size)
+    if header is None:
+        return None
+    data = _recvExact(sock, _HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return cPickle.loads(data)
+
+
+#
+# Daemon side
+#
+class LaunchedProcess(object):
+    """
+    A task process started by the launcher.
+
+    Stands in for a subprocess.Popen object, with the
+    pid, stdout and returncode attributes, and the
+    poll() and wait() methods.
+    """
+
+    def __init__(self, pid, stdout=None):
+        self.pid = pid
+        self.stdout = stdout
+        self.returncode = None
+        self.__exited = threading.Event()
+
+    def __repr__(self):
+        return "<%s: %d>" % (self.__class__.__name__, self.pid)
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        """
+        wait(float timeout=None) -> int
+
+        Wait for the process to exit and return its
+        returncode, or None if the timeout ran out.
+        """
+        self.__exited.wait(timeout)
+        return self.returncode
+
+    def _setExited(self, returncode):
+        self.returncode = returncode
+        self.__exited.set()
+
+
+class Launcher(object):
+    """
+    Starts and talks to the launcher process.
+
+    onExit, if given, is called from a background thread
+    each time a launched process exits.
+    """
+
+    # seconds to wait on the launcher to start a process
+    SPAWN_TIMEOUT_SEC = 30
+
+    def __init__(self, onExit=None):
+        self.__onExit = onExit
+
+        self.__lock = threading.Lock()
+        self.__sendLock = threading.Lock()
+
+        self.__sock = None
+        self.__proc = None
+        self.__reqId = 0
+        self.__pending = {}
+        self.__procs = {}
+
+    def __repr__(self):
+        pid = self.__proc.pid if self.__proc else None
+        return "<%s: %s>" % (self.__class__.__name__, pid)
+
+    def isAlive(self):
+        return self.__sock is not None
+
+    def start(self):
+        """
+        start()
+
+        Start the launcher process, if it is not already running.
+        """
+        with self.__lock:
+            if self.__sock is not None:
+                return
+
+            parentSock, childSock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+            _setCloexec(parentSock.fileno())
+
+            # The launcher must be able to import this module,
+            # however the daemon found it.
+            pkgRoot = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            env = os.environ.copy()
+            env['PYTHONPATH'] = os.pathsep.join(filter(None, [pkgRoot, env.get('PYTHONPATH')]))
+
+            cmd = [sys.executable, '-m', 'plow.rndaemon.launcher', str(childSock.fileno())]
+
+            try:
+                with open(os.devnull) as devnull:
+                    proc = subprocess.Popen(cmd, stdin=devnull, env=env, close_fds=False)
+            finally:
+                childSock.close()
+
+            self.__sock = parentSock
+            self.__proc = proc
+
+            t = threading.Thread(target=self.__readReplies, args=(parentSock, proc),
+                                 name="LauncherReader")
+            t.daemon = True
+            t.start()
+
+        logger.info("Started task launcher, pid %d", proc.pid)
+
+    def stop(self):
+        """
+        stop()
+
+        Stop the launcher. Processes it has started keep running.
+        """
+        with self.__lock:
+            sock, self.__sock = self.__sock, None
+
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            sock.close()
+
+    def spawn(self, cmd, stdout=None, stderr=None, env=None, cwd=None,
+              uid=None, gid=None, user=None, cpus=None, cgroup=None,
+              rlimits=None, shell=False, **kwargs):
+        """
+        spawn(list cmd, ...) -> LaunchedProcess
+
+        Start a process from the launcher. Takes the same
+        stdout (None or PIPE), stderr (None or STDOUT), env
+        and cwd options as subprocess.Popen, plus:
+
+            uid, gid, user  - switch to this user and their groups
+            cpus            - logical cpu ids to lock the process to
+            cgroup          - TaskCgroup to start the process in
+            rlimits         - list of (resource, soft, hard) limits
+
+        Raises OSError if the command could not be started,
+        and LauncherError if the launcher could not be reached.
+        """
+        if shell:
+            raise ValueError("The launcher does not support shell=True")
+        if stdout not in (None, PIPE):
+            raise ValueError("stdout must be None or PIPE")
+        if stderr not in (None, STDOUT):
+            raise ValueError("stderr must be None or STDOUT")
+
+        if isinstance(cmd, basestring):
+            cmd = [cmd]
+
+        self.start()
+
+        request = {
+            'cmd': list(cmd),
+            'env': env,
+            'cwd': cwd,
+            'uid': uid,
+            'gid': gid,
+            'user': user,
+            'cpus': sorted(cpus) if cpus else None,
+            'cgroup': list(cgroup.paths) if cgroup is not None else None,
+            'rlimits': rlimits,
+            'stderr': stderr == STDOUT,
+            'pipe': stdout == PIPE,
+        }
+
+        r_pipe = w_pipe = None
+        if stdout == PIPE:
+            r_pipe, w_pipe = os.pipe()
+            _setCloexec(r_pipe)
+            _setCloexec(w_pipe)
+
+        try:
+            reply = self.__request(request, w_pipe)
+        except:
+            if r_pipe is not None:
+                os.close(r_pipe)
+            raise
+        finally:
+            if w_pipe is not None:
+                os.close(w_pipe)
+
+        proc, err = reply
+        if err is not None:
+            if r_pipe is not None:
+                os.close(r_pipe)
+            raise OSError(*err)
+
+        if r_pipe is not None:
+            proc.stdout = os.fdopen(r_pipe, 'rb', 0)
+
+        return proc
+
+    def __request(self, request, fd=None):
+        with self.__sendLock:
+            sock = self.__sock
+            if sock is None:
+                raise LauncherError("The launcher is not running")
+
+            waiter = [threading.Event(), None, sock]
+
+            self.__reqId += 1
+            request['id'] = reqId = self.__reqId
+            self.__pending[reqId] = waiter
+
+            try:
+                _sendMsg(sock, request)
+                if fd is not None:
+                    _multiprocessing.sendfd(sock.fileno(), fd)
+            except (socket.error, OSError), e:
+                self.__pending.pop(reqId, None)
+                raise LauncherError("Failed to send request to the launcher: %s" % e)
+
+        if not waiter[0].wait(self.SPAWN_TIMEOUT_SEC):
+            self.__pending.pop(reqId, None)
+            raise LauncherError("Timed out waiting on the launcher")
+
+        if waiter[1] is None:
+            raise LauncherError("The launcher exited")
+
+        return waiter[1]
+
+    def __readReplies(self, sock, proc):
+        # pids started by this launcher
+        started = set()
+
+        while True:
+            try:
+                msg = _recvMsg(sock)
+            except (socket.error, EOFError, cPickle.UnpicklingError), e:
+                logger.warn("Error reading from the launcher: %s", e)
+                msg = None
+
+            if msg is None:
+                break
+
+            kind = msg[0]
+
+            if kind == 'spawned':
+                _, reqId, pid, err = msg
+                launched = None
+                if err is None:
+                    # The exit can be reported before the 
+                    # caller of spawn() has woken up.
+                    launched = self.__procs[pid] = LaunchedProcess(pid)
+                    started.add(pid)
+                waiter = self.__pending.pop(reqId, None)
+                if waiter is not None:
+                    waiter[1] = (launched, err)
+                    waiter[0].set()
+
+            elif kind == 'exit':
+                _, pid, returncode = msg
+                started.discard(pid)
+                self.__exited(pid, returncode)
+
+        with self.__lock:
+            if self.__sock is sock:
+                self.__sock = None
+                logger.warn("The task launcher exited unexpectedly")
+
+        sock.close()
+        proc.wait()
+
+        # Nobody is left to report on the processes it launched.
+        # A launcher started since then has its own requests.
+        for reqId, waiter in self.__pending.items():
+            if waiter[2] is sock and self.__pending.pop(reqId, None) is not None:
+                waiter[0].set()
+
+        for pid in started:
+            if pid in self.__procs:
+                logger.warn("Lost the exit status of pid %d", pid)
+                self.__exited(pid, 1)
+
+    def __exited(self, pid, returncode):
+        proc = self.__procs.pop(pid, None)
+        if proc is None:
+            return
+
+        proc._setExited(returncode)
+
+        if self.__onExit is not None:
+            try:
+                self.__onExit(proc)
+            except Exception, e:
+                logger.warn("Error in launcher exit callback: %s", e)
+
+
+#
+# Launcher side
+#
+def _setAffinity(cpus):
+    """
+    Lock the calling process to the given logical cpus,
+    where the platform supports it.
+    """
+    libc = _setAffinity.libc
+    if libc is None or not cpus:
+        return
+
+    # cpu_set_t is a bitmask of 1024 cpus
+    mask = (ctypes.c_ulong * (1024 / (8 * ctypes.sizeof(ctypes.c_ulong))))()
+    bits = 8 * ctypes.sizeof(ctypes.c_ulong)
+    for cpu in cpus:
+        mask[cpu / bits] |= 1 << (cpu % bits)
+
+    if libc.sched_setaffinity(0, ctypes.sizeof(mask), ctypes.byref(mask)) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+_setAffinity.libc = None
+
+
+def _preexec(request):
+    """
+    Run in the forked task process, before exec
+    """
+    for sig in (signal.SIGINT, signal.SIGPIPE, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+
+    # Its own session and process group, so the 
+    # whole task can be signaled at once
+    os.setsid()
+
+    # Must happen before dropping privileges
+    for path in request['cgroup'] or ():
+        with open(os.path.join(path, 'cgroup.procs'), 'w') as fh:
+            fh.write(str(os.getpid()))
+
+    _setAffinity(request['cpus'])
+
+    for res, soft, hard in request['rlimits'] or ():
+        resource.setrlimit(res, (soft, hard))
+
+    uid, gid = request['uid'], request['gid']
+    if gid is not None:
+        if request['user']:
+            os.initgroups(request['user'], gid)
+        else:
+            os.setgroups([gid])
+        os.setgid(gid)
+    if uid is not None:
+        os.setuid(uid)
+
+
+def _spawn(request, fd):
+    """
+    _spawn(dict request, int fd) -> subprocess.Popen
+    """
+    opts = {
+        'env': request['env'],
+        'cwd': request['cwd'],
+        'preexec_fn': partial(_preexec, request),
+    }
+
+    if fd is not None:
+        opts['stdout'] = fd
+        if request['stderr']:
+            opts['stderr'] = subprocess.STDOUT
+
+    # The launcher's own descriptors are all close-on-exec,
+    # so skip the slow close_fds loop over every possible fd.
+    return subprocess.Popen(request['cmd'], close_fds=False, **opts)
+
+
+def _serve(sock):
+    children = {}
+
+    wakeR, wakeW = os.pipe()
+    for fd in (wakeR, wakeW):
+        _setCloexec(fd)
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGCHLD, lambda *args: None)
+    signal.siginterrupt(signal.SIGCHLD, False)
+    signal.set_wakeup_fd(wakeW)
+
+    def reap():
+        for pid, p in children.items():
+            if p.poll() is not None:
+                del children[pid]
+                _sendMsg(sock, ('exit', pid, p.returncode))
+
+    while True:
+        try:
+            readable, _, _ = select.select([sock, wakeR], [], [])
+        except select.error, e:
+            if e.args[0] == errno.EINTR:
+                continue
+            raise
+
+        if wakeR in readable:
+            try:
+                while os.read(wakeR, 4096):
+                    pass
+            except OSError, e:
+                if e.errno != errno.EAGAIN:
+                    raise
+
+        if sock in readable:
+            request = _recvMsg(sock)
+            if request is None:
+                break
+
+            fd = None
+            if request['pipe']:
+                fd = _multiprocessing.recvfd(sock.fileno())
+
+            try:
+                p = _spawn(request, fd)
+            except (OSError, ValueError), e:
+                err = (getattr(e, 'errno', None) or errno.EINVAL, str(e))
+                _sendMsg(sock, ('spawned', request['id'], None, err))
+            else:
+                children[p.pid] = p
+                _sendMsg(sock, ('spawned', request['id'], p.pid, None))
+            finally:
+                if fd is not None:
+                    os.close(fd)
+
+        reap()
+
+
+def main(argv):
+    sockFd = int(argv[1])
+
+    # Drop anything inherited from the daemon
+    maxFd = os.sysconf('SC_OPEN_MAX')
+    os.closerange(3, sockFd)
+    os.closerange(sockFd + 1, maxFd)
+
+    sock = socket.fromfd(sockFd, socket.AF_UNIX, socket.SOCK_STREAM)
+    os.close(sockFd)
+    _setCloexec(sock.fileno())
+
+    try:
+        _serve(sock)
+    except KeyboardInterrupt:
+        pass
+    except socket.error, e:
+        # The daemon went away
+        if e.args[0] not in (errno.EPIPE, errno.ECONNRESET):
+            traceback.print_exc()
+            return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    if sys.platform.startswith('linux'):
+        _setAffinity.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+    sys.exit(main(sys.argv))
@@ -0,0 +1,118 @@
+"""
+Node-local guard against running out of memory.
+
+When free memory on the node falls below a threshold, one task
+is picked as the victim and either stopped (SIGSTOP) or killed,
+before the kernel OOM killer picks one of its own, which may be
+any task on the node or the rndaemon itself.
+
+Stopped tasks are resumed once free memory has recovered. If
+memory is still low and every task is already stopped, the
+stopped tasks are killed.
+"""
+import logging
+
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['MemoryGuard', 'TaskSample', 'STOP', 'CONT', 'KILL']
+
+
+# actions
+STOP = 'stop'
+CONT = 'cont'
+KILL = 'kill'
+
+
+TaskSample = namedtuple("TaskSample", "key rssMb started")
+
+
+class MemoryGuard(object):
+    """
+    Decides which tasks to stop, resume or kill, from samples
+    of the free memory on the node and the rss of each task.
+
+    policy is one of:
+
+        growth      the task whose rss grew the most between its
+                    last two samples
+        newest      the task started last
+        largest     the task with the largest rss
+    """
+
+    POLICIES = ('growth', 'newest', 'largest')
+    ACTIONS = (STOP, KILL)
+
+    # Stopped tasks are resumed once free memory
+    # is back above this multiple of the threshold.
+    RESUME_FACTOR = 2
+
+    def __init__(self, thresholdMb, policy='growth', action=KILL):
+        if policy not in self.POLICIES:
+            raise ValueError("Unknown memory guard policy %r, expected one of %s"
+                             % (policy, ', '.join(self.POLICIES)))
+        if action not in self.ACTIONS:
+            raise ValueError("Unknown memory guard action %r, expected one of %s"
+                             % (action, ', '.join(self.ACTIONS)))
+
+        self.thresholdMb = thresholdMb
+        self.policy = policy
+        self.action = action
+
+        # key -> (previous rss, current rss)
+        self.__rss = {}
+        self.__stopped = set()
+
+    @property
+    def stopped(self):
+        return set(self.__stopped)
+
+    def check(self, freeMb, tasks):
+        """
+        check(int freeMb, list TaskSample tasks) -> list (action, key)
+
+        Returns what should be done to which tasks.
+        At most one task is stopped or killed per check,
+        so that the next check sees the memory it freed.
+        """
+        keys = set(t.key for t in tasks)
+        self.__stopped &= keys
+
+        # Tasks are sampled less often than they are checked,
+        # so growth is measured between samples that differ.
+        rss = {}
+        for t in tasks:
+            prev, cur = self.__rss.get(t.key, (t.rssMb, t.rssMb))
+            rss[t.key] = (cur, t.rssMb) if t.rssMb != cur else (prev, cur)
+        self.__rss = rss
+        growth = dict((key, cur - prev) for key, (prev, cur) in rss.iteritems())
+
+        if freeMb >= self.thresholdMb:
+            if self.__stopped and freeMb >= self.thresholdMb * self.RESUME_FACTOR:
+                resumed, self.__stopped = self.__stopped, set()
+                return [(CONT, key) for key in sorted(resumed)]
+            return []
+
+        running = [t for t in tasks if t.key not in self.__stopped]
+
+        if not running:
+            # Stopping them was not enough
+            stopped = [t for t in tasks if t.key in self.__stopped]
+            if not stopped:
+                return []
+            victim = max(stopped, key=lambda t: t.rssMb)
+            self.__stopped.discard(victim.key)
+            return [(KILL, victim.key)]
+
+        if self.policy == 'growth':
+            victim = max(running, key=lambda t: (growth[t.key], t.rssMb))
+        elif self.policy == 'newest':
+            victim = max(running, key=lambda t: t.started)
+        else:
+            victim = max(running, key=lambda t: t.rssMb)
+
+        if self.action == STOP:
+            self.__stopped.add(victim.key)
+
+        return [(self.action, victim.key)]
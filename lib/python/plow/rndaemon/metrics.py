@@ -0,0 +1,134 @@
+"""
+Bounded history of the resource use of a running task.
+
+Every sample of a task's rss, cpu and disk io is kept in a ring
+buffer of fixed size, backed by flat arrays, so that a task holds
+at most `capacity` samples however long it runs. Once the buffer
+is full the oldest samples are overwritten, while running totals
+keep a summary of the whole life of the task.
+"""
+import json
+import time
+import array
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['MetricsBuffer']
+
+
+class MetricsBuffer(object):
+    """
+    A ring buffer of (time, rssMb, cpuPercent, readBytes, writeBytes)
+    samples. Missing io counters are stored as -1.
+    """
+
+    def __init__(self, capacity=360):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+
+        self.__time = array.array('d', [0.0] * capacity)
+        self.__rss = array.array('l', [0] * capacity)
+        self.__cpu = array.array('h', [0] * capacity)
+        self.__read = array.array('d', [0.0] * capacity)
+        self.__write = array.array('d', [0.0] * capacity)
+
+        self.__next = 0
+        self.__len = 0
+        self.__lock = threading.Lock()
+
+        # whole life totals
+        self.__count = 0
+        self.__first = None
+        self.__maxRss = 0
+        self.__sumRss = 0
+        self.__maxCpu = 0
+        self.__sumCpu = 0
+
+    def __len__(self):
+        return self.__len
+
+    def add(self, rssMb, cpuPercent, diskIO=None, when=None):
+        """
+        add(int rssMb, int cpuPercent, DiskIO diskIO=None, float when=None)
+
+        Record a sample, taken now unless `when` is given.
+        """
+        when = time.time() if when is None else when
+
+        readBytes = writeBytes = -1
+        if diskIO is not None:
+            readBytes, writeBytes = diskIO.readBytes, diskIO.writeBytes
+
+        with self.__lock:
+            i = self.__next
+            self.__time[i] = when
+            self.__rss[i] = rssMb
+            self.__cpu[i] = min(cpuPercent, 32767)
+            self.__read[i] = readBytes
+            self.__write[i] = writeBytes
+
+            self.__next = (i + 1) % self.capacity
+            self.__len = min(self.__len + 1, self.capacity)
+
+            if self.__first is None:
+                self.__first = when
+            self.__count += 1
+            self.__maxRss = max(self.__maxRss, rssMb)
+            self.__sumRss += rssMb
+            self.__maxCpu = max(self.__maxCpu, cpuPercent)
+            self.__sumCpu += cpuPercent
+
+    def samples(self):
+        """
+        samples() -> list of (time, rssMb, cpuPercent, readBytes, writeBytes)
+
+        The samples still in the buffer, oldest first
+        """
+        with self.__lock:
+            start = (self.__next - self.__len) % self.capacity
+            idx = [(start + n) % self.capacity for n in xrange(self.__len)]
+            return [(self.__time[i], self.__rss[i], self.__cpu[i],
+                     int(self.__read[i]), int(self.__write[i])) for i in idx]
+
+    def summary(self):
+        """
+        summary() -> dict
+
+        Totals over every sample ever added, not only
+        those still in the buffer.
+        """
+        with self.__lock:
+            count = self.__count
+            if not count:
+                return {'samples': 0}
+
+            last = self.__time[(self.__next - 1) % self.capacity]
+            return {
+                'samples': count,
+                'start': self.__first,
+                'end': last,
+                'maxRssMb': self.__maxRss,
+                'avgRssMb': self.__sumRss / count,
+                'maxCpuPercent': self.__maxCpu,
+                'avgCpuPercent': self.__sumCpu / count,
+            }
+
+    def dump(self, path, **extra):
+        """
+        dump(str path, **extra)
+
+        Write the summary, and the samples still in the buffer as
+        columns, to a json file. Extra keywords are added as is.
+        """
+        samples = self.samples()
+        names = ('time', 'rssMb', 'cpuPercent', 'readBytes', 'writeBytes')
+
+        data = dict(extra)
+        data['summary'] = self.summary()
+        data['samples'] = dict((name, [s[n] for s in samples])
+                               for n, name in enumerate(names))
+
+        with open(path, 'w') as fh:
+            json.dump(data, fh, separators=(',', ':'))
@@ -0,0 +1,239 @@
+"""
+Durable delivery of task results to the Plow server.
+
+Results are appended to a journal on local disk before they are
+sent, and marked off once the server has taken them. A background
+thread sends them in order over the shared server connection, with
+one taskComplete call per result, backing off while the server
+cannot be reached. Whatever is left in the journal when the
+rndaemon starts up is sent again.
+"""
+import os
+import json
+import time
+import errno
+import random
+import logging
+import threading
+
+from collections import deque
+
+import client
+import rpc.ttypes as ttypes
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['ResultOutbox']
+
+
+class ResultOutbox(threading.Thread):
+    """
+    Queues RunTaskResult objects for the server.
+
+    The journal is a file of json lines. Each result is written
+    as {"seq": N, "result": {...}}, and {"ack": N} is added once
+    it has been delivered. With no path, results are only kept
+    in memory.
+    """
+
+    # most results sent per attempt, one call each, before
+    # checking the queue again. There is no batched RPC, so
+    # replaying a backlog still costs a round trip per result.
+    MAX_BATCH = 50
+
+    # seconds to back off between failed attempts
+    MIN_BACKOFF_SEC = 1
+    MAX_BACKOFF_SEC = 60
+
+    # rewrite the journal once it grows past this size
+    COMPACT_BYTES = 1024 * 1024
+
+    def __init__(self, path=None, service=None):
+        threading.Thread.__init__(self, name="ResultOutbox")
+        self.daemon = True
+
+        self.path = path
+        self.__service = service or client.getSharedConnection()
+
+        self.__lock = threading.Condition(threading.Lock())
+        self.__pending = deque()
+        self.__seq = 0
+        self.__journal = None
+
+        if path:
+            try:
+                self.__openJournal()
+            except (IOError, OSError), e:
+                logger.warn("Failed to open result journal %s, results will not "
+                            "survive a restart: %s", path, e)
+                self.__journal = None
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__pending)
+
+    def put(self, result):
+        """
+        put(RunTaskResult result)
+
+        Journal a result and queue it for the server
+        """
+        with self.__lock:
+            self.__seq += 1
+            seq = self.__seq
+            self.__append({'seq': seq, 'result': self.__toDict(result)}, sync=True)
+            self.__pending.append((seq, result))
+            self.__lock.notify()
+
+    def flush(self, timeout=None):
+        """
+        flush(float timeout=None) -> bool
+
+        Wait until every queued result has been sent.
+        Returns False if the timeout ran out first.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self.__lock:
+            while self.__pending:
+                if deadline is None:
+                    self.__lock.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                    self.__lock.wait(remaining)
+        return True
+
+    def run(self):
+        backoff = self.MIN_BACKOFF_SEC
+
+        while True:
+            with self.__lock:
+                while not self.__pending:
+                    self.__lock.wait()
+                batch = list(self.__pending)[:self.MAX_BATCH]
+
+            try:
+                self.__send(batch)
+            except Exception, e:
+                logger.warn("Failed to send %d task results to the Plow server, "
+                            "retrying in %g seconds: %s", len(batch), backoff, e)
+                time.sleep(backoff * random.uniform(1, 1.5))
+                backoff = min(backoff * 2, self.MAX_BACKOFF_SEC)
+            else:
+                backoff = self.MIN_BACKOFF_SEC
+
+    def __send(self, batch):
+        service = self.__service
+        for seq, result in batch:
+            service.taskComplete(result)
+            self.__ack(seq)
+
+    def __ack(self, seq):
+        with self.__lock:
+            if self.__pending and self.__pending[0][0] == seq:
+                self.__pending.popleft()
+
+            self.__append({'ack': seq})
+
+            if not self.__pending:
+                self.__lock.notify_all()
+                if self.__journal is not None and self.__journal.tell() > self.COMPACT_BYTES:
+                    try:
+                        self.__rewrite()
+                    except (IOError, OSError), e:
+                        logger.warn("Failed to compact result journal %s: %s", self.path, e)
+
+    #
+    # Journal
+    #
+    @staticmethod
+    def __toDict(result):
+        return dict((k, v) for k, v in vars(result).iteritems() if v is not None)
+
+    @staticmethod
+    def __fromDict(d):
+        d = dict((str(k), v.encode('utf-8') if isinstance(v, unicode) else v)
+                 for k, v in d.iteritems())
+        return ttypes.RunTaskResult(**d)
+
+    def __openJournal(self):
+        dirname = os.path.dirname(self.path)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        pending = self.__replay()
+        for seq, result in pending:
+            self.__pending.append((seq, result))
+            self.__seq = max(self.__seq, seq)
+
+        if pending:
+            logger.info("Resending %d task results from %s", len(pending), self.path)
+
+        self.__rewrite()
+
+    def __replay(self):
+        """
+        __replay() -> list
+
+        Read the (seq, result) pairs in the journal
+        that were never marked as delivered.
+        """
+        results = {}
+
+        try:
+            fh = open(self.path)
+        except IOError, e:
+            if e.errno == errno.ENOENT:
+                return []
+            raise
+
+        with fh:
+            for line in fh:
+                # The last line may be cut short by a crash
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+
+                if 'ack' in record:
+                    results.pop(record['ack'], None)
+                elif 'seq' in record:
+                    try:
+                        results[record['seq']] = self.__fromDict(record['result'])
+                    except (KeyError, TypeError), e:
+                        logger.warn("Skipping bad record in %s: %s", self.path, e)
+
+        return sorted(results.iteritems())
+
+    def __rewrite(self):
+        """
+        Replace the journal with one holding only the pending
+        results, so it does not grow forever.
+        """
+        tmpPath = self.path + '.tmp'
+        with open(tmpPath, 'w') as fh:
+            for seq, result in self.__pending:
+                fh.write(json.dumps({'seq': seq, 'result': self.__toDict(result)}) + '\n')
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        os.rename(tmpPath, self.path)
+
+        if self.__journal is not None:
+            self.__journal.close()
+        self.__journal = open(self.path, 'a')
+
+    def __append(self, record, sync=False):
+        fh = self.__journal
+        if fh is None:
+            return
+
+        try:
+            fh.write(json.dumps(record) + '\n')
+            fh.flush()
+            # A lost ack only means the result is sent twice
+            if sync:
+                os.fsync(fh.fileno())
+        except (IOError, OSError), e:
+            logger.warn("Failed to write to result journal %s: %s", self.path, e)
@@ -86,12 +86,11 @@ class AbstractProfiler(object):
         logger.info("Sending ping with %d running tasks: %s", len(tasks), ping)
 
         ping.tasks = tasks
+        ping.hw.reservedRamMb = sum(t.reservedRamMb or 0 for t in tasks)
         logger.debug("Running tasks sent with ping: %s", tasks)
 
         try:
-            service, transport = client.getPlowConnection()
-            service.sendPing(ping)
-            transport.close()
+            client.getSharedConnection().sendPing(ping)
         except Exception, e:
             logger.warn("Unable to send ping to plow server, %s" % e)
 
@@ -166,6 +165,38 @@ class AbstractProfiler(object):
         """
         raise NotImplementedError("reboot() is an abstract method")
 
+    def getCpuGroups(self):
+        """
+        getCpuGroups() -> list
+
+        The core slots, 0 to physicalCpus - 1, as a list of 
+        lists grouped by the NUMA node or socket they are on.
+        """
+        return [range(self.physicalCpus)]
+
+    def setTaskAffinity(self, pids, cpus):
+        """
+        setTaskAffinity(list pids, list cpus) -> bool
+
+        Move every thread of the running processes onto the 
+        given core slots. Returns False if the platform does 
+        not support changing the affinity of a running task.
+        """
+        return False
+
+    def createTaskCgroup(self, name, ramMb=0):
+        """
+        createTaskCgroup(str name, int ramMb=0) -> TaskCgroup
+
+        Create a control group to run a task in, limited to
+        ramMb of memory if ramMb > 0. Pass it to getSubprocessOpts()
+        as the 'cgroup' keyword to start the task inside of it.
+
+        Returns None if the platform does not support task
+        cgroups, or they are not enabled.
+        """
+        return None
+
     def getSubprocessOpts(self, cmd, **kwargs):
         """
         getSubprocessOpts(list|str cmd, **kwargs) -> (cmd, dict)
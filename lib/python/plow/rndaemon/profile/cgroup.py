@@ -0,0 +1,383 @@
+"""
+Linux control groups for running tasks.
+
+Each task gets its own cgroup, which holds every process the
+task starts, even ones that double fork or re-parent themselves
+away from the task's process tree. Memory, cpu and io use are
+read from the cgroup counters, a memory ceiling can be enforced
+by the kernel, and the whole task can be killed at once.
+
+Both the unified (v2) hierarchy and the legacy (v1) memory,
+cpuacct and blkio hierarchies are supported.
+"""
+import os
+import time
+import errno
+import signal
+import logging
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['TaskCgroup', 'CgroupError']
+
+
+CGROUP_MOUNT = '/sys/fs/cgroup'
+
+_V1_CONTROLLERS = ('memory', 'cpuacct', 'blkio')
+
+
+class CgroupError(Exception):
+    pass
+
+
+def _read(path):
+    with open(path) as fh:
+        return fh.read()
+
+
+def _write(path, value):
+    with open(path, 'w') as fh:
+        fh.write(str(value))
+
+
+def _readInt(path, default=0):
+    try:
+        return int(_read(path).split()[0])
+    except (IOError, OSError, ValueError, IndexError):
+        return default
+
+
+def _readKeyed(path):
+    """
+    Parse a flat "key value" per line cgroup file
+    """
+    values = {}
+    try:
+        data = _read(path)
+    except (IOError, OSError):
+        return values
+
+    for line in data.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            try:
+                values[parts[0]] = int(parts[1])
+            except ValueError:
+                pass
+    return values
+
+
+class TaskCgroup(object):
+    """
+    A cgroup holding the processes of one task.
+
+    Use TaskCgroup.create() to make one, attach() from the
+    task process before exec'ing the command, and destroy()
+    once the task has finished.
+    """
+
+    def __init__(self, version, paths, ramMb=0):
+        self.version = version
+        self.paths = paths
+        self.ramMb = ramMb
+
+        self.__lastUsage = None
+        self.__lastTime = None
+
+    def __repr__(self):
+        return "<%s v%d: %s>" % (self.__class__.__name__, self.version, self.paths[0])
+
+    @staticmethod
+    def detect(mount=CGROUP_MOUNT):
+        """
+        detect(str mount) -> int
+
+        Return the cgroup version mounted at the given
+        path, 2 or 1, or 0 if cgroups are not available.
+        """
+        if os.path.exists(os.path.join(mount, 'cgroup.controllers')):
+            return 2
+        if all(os.path.isdir(os.path.join(mount, c)) for c in _V1_CONTROLLERS):
+            return 1
+        return 0
+
+    @classmethod
+    def create(cls, name, parent='plow', ramMb=0, mount=CGROUP_MOUNT):
+        """
+        create(str name, str parent='plow', int ramMb=0, str mount) -> TaskCgroup
+
+        Create a cgroup for a task under the parent cgroup.
+        If ramMb > 0, the task is limited to that much memory.
+
+        Raises CgroupError if the cgroup could not be created.
+        """
+        version = cls.detect(mount)
+
+        try:
+            if version == 2:
+                parentPath = os.path.join(mount, parent)
+                cls.__makeDir(parentPath)
+
+                # Controllers have to be enabled from the top down.
+                for path in (mount, parentPath):
+                    for ctrl in ('memory', 'cpu', 'io'):
+                        try:
+                            _write(os.path.join(path, 'cgroup.subtree_control'), '+%s' % ctrl)
+                        except (IOError, OSError), e:
+                            logger.debug("Could not enable the %s controller in %s: %s", ctrl, path, e)
+
+                paths = [os.path.join(parentPath, name)]
+
+            elif version == 1:
+                paths = [os.path.join(mount, c, parent, name) for c in _V1_CONTROLLERS]
+
+            else:
+                raise CgroupError("No cgroup filesystem found at %s" % mount)
+
+            for path in paths:
+                cls.__makeDir(path)
+
+            cgroup = cls(version, paths, ramMb)
+            if ramMb > 0:
+                cgroup.setMemoryLimit(ramMb)
+
+        except (IOError, OSError), e:
+            raise CgroupError("Failed to create cgroup %s: %s" % (name, e))
+
+        logger.debug("Created %r", cgroup)
+        return cgroup
+
+    @staticmethod
+    def __makeDir(path):
+        try:
+            os.makedirs(path)
+        except OSError, e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    @property
+    def memoryPath(self):
+        return self.paths[0]
+
+    def setMemoryLimit(self, ramMb):
+        """
+        setMemoryLimit(int ramMb)
+
+        Have the kernel oom kill the task if it goes over the limit
+        """
+        limit = ramMb * 1024 * 1024
+        if self.version == 2:
+            _write(os.path.join(self.memoryPath, 'memory.max'), limit)
+            # Keep a task that hits the limit from stalling in swap
+            try:
+                _write(os.path.join(self.memoryPath, 'memory.swap.max'), 0)
+            except (IOError, OSError):
+                pass
+        else:
+            _write(os.path.join(self.memoryPath, 'memory.limit_in_bytes'), limit)
+
+        self.ramMb = ramMb
+
+    def attach(self, pid=0):
+        """
+        attach(int pid=0)
+
+        Move a process into the cgroup. A pid of 0 moves
+        the calling process, i.e. from a subprocess preexec_fn,
+        so that everything the task starts lands in the cgroup.
+        """
+        pid = pid or os.getpid()
+        for path in self.paths:
+            _write(os.path.join(path, 'cgroup.procs'), pid)
+
+    def pids(self):
+        """
+        pids() -> list
+
+        Return the pids of every process in the cgroup
+        """
+        try:
+            data = _read(os.path.join(self.memoryPath, 'cgroup.procs'))
+        except (IOError, OSError):
+            return []
+        return [int(p) for p in data.split()]
+
+    def sample(self):
+        """
+        sample() -> (int rssBytes, float cpuPercent, tuple diskIO)
+
+        Read the current resource use of the whole task.
+
+        The rss is the anonymous and mapped file memory of the
+        cgroup, excluding the page cache. The cpu percent is
+        for the time since the previous sample, and is 0 on the
+        first one. diskIO is (readCount, writeCount, readBytes, writeBytes).
+        """
+        now = time.time()
+
+        if self.version == 2:
+            stat = _readKeyed(os.path.join(self.memoryPath, 'memory.stat'))
+            rss = stat.get('anon', 0) + stat.get('file_mapped', 0)
+
+            cpuStat = _readKeyed(os.path.join(self.memoryPath, 'cpu.stat'))
+            usageSecs = cpuStat.get('usage_usec', 0) / 1e6
+
+            diskIO = self.__readIOv2()
+
+        else:
+            memPath, cpuPath, blkioPath = self.paths
+
+            stat = _readKeyed(os.path.join(memPath, 'memory.stat'))
+            rss = stat.get('total_rss', 0) + stat.get('total_mapped_file', 0)
+
+            usageSecs = _readInt(os.path.join(cpuPath, 'cpuacct.usage')) / 1e9
+
+            ops = self.__readBlkio(os.path.join(blkioPath, 'blkio.throttle.io_serviced'))
+            nbytes = self.__readBlkio(os.path.join(blkioPath, 'blkio.throttle.io_service_bytes'))
+            diskIO = (ops[0], ops[1], nbytes[0], nbytes[1])
+
+        cpuPercent = 0.0
+        if self.__lastTime is not None and now > self.__lastTime:
+            cpuPercent = max(usageSecs - self.__lastUsage, 0) / (now - self.__lastTime) * 100
+
+        self.__lastUsage = usageSecs
+        self.__lastTime = now
+
+        return rss, cpuPercent, diskIO
+
+    def __readIOv2(self):
+        counters = [0, 0, 0, 0]
+        keys = ('rios', 'wios', 'rbytes', 'wbytes')
+
+        try:
+            data = _read(os.path.join(self.memoryPath, 'io.stat'))
+        except (IOError, OSError):
+            return tuple(counters)
+
+        # 8:0 rbytes=1024 wbytes=0 rios=1 wios=0 dbytes=0 dios=0
+        for line in data.splitlines():
+            for field in line.split()[1:]:
+                key, _, val = field.partition('=')
+                if key in keys:
+                    counters[keys.index(key)] += int(val)
+
+        return tuple(counters)
+
+    @staticmethod
+    def __readBlkio(path):
+        read = write = 0
+        try:
+            data = _read(path)
+        except (IOError, OSError):
+            return read, write
+
+        # 8:0 Read 1024
+        for line in data.splitlines():
+            parts = line.split()
+            if len(parts) != 3:
+                continue
+            if parts[1] == 'Read':
+                read += int(parts[2])
+            elif parts[1] == 'Write':
+                write += int(parts[2])
+
+        return read, write
+
+    def oomKills(self):
+        """
+        oomKills() -> int
+
+        Return the number of processes the kernel killed
+        for going over the memory limit.
+        """
+        if self.version == 2:
+            events = _readKeyed(os.path.join(self.memoryPath, 'memory.events'))
+            return events.get('oom_kill', 0)
+        return _readKeyed(os.path.join(self.memoryPath, 'memory.oom_control')).get('oom_kill', 0)
+
+    def kill(self, timeout=5):
+        """
+        kill(float timeout=5) -> (list killed_pids, list not_killed)
+
+        Stop every process in the cgroup. The processes are asked
+        to terminate first, and are killed if they have not all
+        exited after timeout seconds.
+        """
+        pids = self.pids()
+        if not pids:
+            return [], []
+
+        logger.info("Asking nicely for %d processes in %r to stop", len(pids), self)
+        self.sendSignal(signal.SIGTERM)
+
+        if not self.__waitEmpty(timeout):
+            logger.info("Killing all processes in %r", self)
+            self.__killAll()
+            self.__waitEmpty(1)
+
+        remaining = set(self.pids())
+        if remaining:
+            logger.warn("Failed to kill pids %s in %r", sorted(remaining), self)
+
+        killed = [p for p in pids if p not in remaining]
+        return killed, sorted(remaining)
+
+    def destroy(self):
+        """
+        destroy()
+
+        Kill anything left in the cgroup, such as
+        daemons the task left behind, and remove it.
+        """
+        if self.pids():
+            logger.info("Killing processes left behind in %r", self)
+            self.__killAll()
+            self.__waitEmpty(1)
+
+        for path in self.paths:
+            try:
+                os.rmdir(path)
+            except OSError, e:
+                if e.errno != errno.ENOENT:
+                    logger.warn("Failed to remove cgroup %s: %s", path, e)
+
+    def __killAll(self):
+        # cgroup.kill is only in kernels >= 5.14
+        killFile = os.path.join(self.memoryPath, 'cgroup.kill')
+        if self.version == 2 and os.path.exists(killFile):
+            try:
+                _write(killFile, 1)
+                return
+            except (IOError, OSError), e:
+                logger.debug("Failed to write %s: %s", killFile, e)
+
+        # Keep going until forking processes run out of children
+        for _ in xrange(10):
+            if not self.sendSignal(signal.SIGKILL):
+                break
+            time.sleep(.05)
+
+    def sendSignal(self, sig):
+        """
+        sendSignal(int sig) -> list
+
+        Send a signal to every process in the cgroup,
+        and return their pids.
+        """
+        pids = self.pids()
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except OSError, e:
+                if e.errno != errno.ESRCH:
+                    logger.debug("Failed to signal pid %d: %s", pid, e)
+        return pids
+
+    def __waitEmpty(self, timeout):
+        end = time.time() + timeout
+        while True:
+            if not self.pids():
+                return True
+            if time.time() >= end:
+                return False
+            time.sleep(.1)
@@ -4,12 +4,15 @@ System profile plugin for Linux.
 import os
 import re
 import logging
-import itertools
+import glob
 from functools import partial
+from distutils.spawn import find_executable
 
 import psutil
 
 from .posix import SystemProfiler as PosixSystemProfiler
+from .cgroup import TaskCgroup, CgroupError
+from .. import conf
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,67 @@ class SystemProfiler(PosixSystemProfiler):
     def __repr__(self):
         return "<%s: Linux>" % self.__class__.__name__
 
+    def createTaskCgroup(self, name, ramMb=0):
+        """
+        createTaskCgroup(str name, int ramMb=0) -> TaskCgroup
+
+        Create a control group to run a task in, if the 
+        cgroups option is enabled. Returns None if it is
+        disabled or the cgroup could not be created.
+        """
+        if not conf.TASK_CGROUPS:
+            return None
+
+        try:
+            return TaskCgroup.create(name, conf.TASK_CGROUP_PARENT, ramMb)
+        except CgroupError, e:
+            logger.warn("Running task without a cgroup: %s", e)
+            return None
+
+    def getCpuGroups(self):
+        """
+        getCpuGroups() -> list
+
+        The core slots grouped by NUMA node, or by 
+        socket where the NUMA layout is not known.
+        """
+        groups = {}
+        for slot, node in sorted(self.cpuprofile.slot_groups.iteritems()):
+            groups.setdefault(node, []).append(slot)
+        return [groups[n] for n in sorted(groups)]
+
+    def setTaskAffinity(self, pids, cpus):
+        """
+        setTaskAffinity(list pids, list cpus) -> bool
+
+        Move every thread of the running processes onto 
+        the logical processors of the given core slots.
+        """
+        logical_ids = set()
+        for slot in cpus:
+            logical_ids.update(self.cpuprofile.logical_cpus.get(slot, []))
+
+        if not logical_ids:
+            return False
+
+        logical_ids = sorted(logical_ids)
+
+        for pid in pids:
+            try:
+                tids = os.listdir('/proc/%d/task' % pid)
+            except OSError:
+                continue
+
+            # Affinity is per thread, and only new 
+            # threads inherit it from their parent
+            for tid in tids:
+                try:
+                    psutil.Process(int(tid)).cpu_affinity(logical_ids)
+                except (psutil.Error, OSError), e:
+                    logger.debug("Could not set the affinity of %s/%s: %s", pid, tid, e)
+
+        return True
+
     def _init_cpu_info(self):
         """Init CPU stats that don't change over time"""
 
@@ -66,12 +130,42 @@ class SystemProfiler(PosixSystemProfiler):
         # gid = env.get('PLOW_TASK_GID')
         cpus = kwargs.get('cpus', set())
 
+        # Keep the task's memory on the NUMA node its cores are on
+        policy = conf.TASK_NUMA_POLICY
+        if cpus and policy in ('preferred', 'bind'):
+            nodes = set(cpuprofile.slot_nodes.get(slot) for slot in cpus)
+            numactl = self._numactl()
+
+            if len(nodes) == 1 and None not in nodes and numactl:
+                opt = '--membind' if policy == 'bind' else '--preferred'
+                cmd[:0] = [numactl, '%s=%d' % (opt, nodes.pop()), '--']
+
+        if kwargs.get('launcher', False):
+            logical_ids = set()
+            for slot in cpus:
+                logical_ids.update(cpuprofile.logical_cpus.get(slot, []))
+
+            opts['cpus'] = logical_ids
+            opts['cgroup'] = kwargs.get('cgroup')
+            return cmd, opts
+
         opts['preexec_fn'] = partial(self._preexec_fn, 
                                      cpus=cpus, 
-                                     cpu_map=cpuprofile.logical_cpus)
+                                     cpu_map=cpuprofile.logical_cpus,
+                                     cgroup=kwargs.get('cgroup'))
 
         return cmd, opts
 
+    @staticmethod
+    def _numactl():
+        path = getattr(SystemProfiler, '_numactl_path', False)
+        if path is False:
+            path = find_executable('numactl')
+            if not path:
+                logger.warn("numactl not found. Not setting a NUMA memory policy for tasks")
+            SystemProfiler._numactl_path = path
+        return path
+
     @staticmethod
     def _preexec_fn(**kwargs):
         """
@@ -80,13 +174,22 @@ class SystemProfiler(PosixSystemProfiler):
         static method used for a subprocess.Popen call, 
         to be executed in the process right before calling the command.
 
+        Starts a new session for the process tree.
         Sets the process to the given uid and gid. 
         Locks hyperthreaded processors to the process tree
+        Moves the process into the task cgroup
         """
         uid = kwargs.get("uid")
         gid = kwargs.get("gid")
         cpus = kwargs.get("cpus")
         cpu_map = kwargs.get("cpu_map")
+        cgroup = kwargs.get("cgroup")
+
+        os.setsid()
+
+        # Must happen before dropping privileges
+        if cgroup is not None:
+            cgroup.attach()
 
         if gid is not None:
             os.setgid(int(gid))
@@ -116,10 +219,13 @@ class CpuProfile(object):
     """
 
     CPUINFO = '/proc/cpuinfo'
+    NODE_DIR = '/sys/devices/system/node'
 
     def __init__(self):
         self.physical_cpus = {}
         self.logical_cpus = {}
+        self.slot_nodes = {}
+        self.slot_groups = {}
         self.num_cpus = 0
         self.num_phys_cpus = 0
 
@@ -191,6 +297,48 @@ class CpuProfile(object):
         self.num_phys_cpus = sum(i['num_cores'] for i in cpus.itervalues())
         self.physical_cpus = cpus 
 
-        self.logical_cpus = dict(enumerate(itertools.chain.from_iterable(
-            cpu['processors'].itervalues() for cpu in cpus.itervalues() 
-        )))
+        slot_sockets = []
+        for phys_id, cpu in cpus.iteritems():
+            for procs in cpu['processors'].itervalues():
+                slot_sockets.append((procs, phys_id))
+
+        self.logical_cpus = dict(enumerate(procs for procs, _ in slot_sockets))
+
+        # Each core's NUMA node, as read from sysfs. Cores are 
+        # grouped by NUMA node, or by socket if the kernel does 
+        # not report the NUMA layout. A socket id is not a NUMA 
+        # node id, so it is never used as a memory policy.
+        proc_nodes = self.read_numa_nodes()
+        self.slot_nodes = {}
+        self.slot_groups = {}
+        for slot, (procs, phys_id) in enumerate(slot_sockets):
+            node = proc_nodes.get(min(procs))
+            if node is None:
+                self.slot_groups[slot] = ('socket', phys_id)
+            else:
+                self.slot_nodes[slot] = node
+                self.slot_groups[slot] = ('node', node)
+
+    def read_numa_nodes(self):
+        """
+        read_numa_nodes() -> dict
+
+        Map each logical processor to its NUMA node
+        """
+        proc_nodes = {}
+
+        for path in glob.glob(os.path.join(self.NODE_DIR, 'node[0-9]*', 'cpulist')):
+            node = int(os.path.basename(os.path.dirname(path))[4:])
+            try:
+                with open(path) as f:
+                    cpulist = f.read().strip()
+            except IOError:
+                continue
+
+            # 0-3,8-11
+            for part in filter(None, cpulist.split(',')):
+                lo, _, hi = part.partition('-')
+                for proc in xrange(int(lo), int(hi or lo) + 1):
+                    proc_nodes[proc] = node
+
+        return proc_nodes
@@ -6,6 +6,7 @@ import subprocess
 import os
 import shlex
 import pwd
+import resource
 import tempfile
 from functools import partial
 
@@ -45,6 +46,9 @@ class SystemProfiler(AbstractProfiler):
         Method for returning the appropriate subprocess.Popen 
         arguments and kw arguments for a POSIX platform. 
 
+        If launcher=True, the options are for Launcher.spawn()
+        instead, which switches to the task user itself rather
+        than going through sudo.
         """
         cmd, opts = super(SystemProfiler, self).getSubprocessOpts(cmd, **kwargs)
 
@@ -52,6 +56,14 @@ class SystemProfiler(AbstractProfiler):
             cmd = shlex.split(cmd)
 
         uid = kwargs.get('uid')
+        launcher = kwargs.get('launcher', False)
+
+        if launcher:
+            opts['rlimits'] = self.getTaskRlimits()
+        else:
+            # Start the task in its own session and process group
+            # so the whole group can be signaled at once.
+            opts['preexec_fn'] = os.setsid
 
         if os.geteuid() == 0:
             gid = None
@@ -91,9 +103,43 @@ class SystemProfiler(AbstractProfiler):
                 'PLOW_TASK_GID': str(gid),
             })
 
-            cmd[:0] = ["sudo", "-E", "-n", "-u", username, "--"]
+            if launcher:
+                opts.update(uid=uid, gid=gid, user=username)
+            else:
+                cmd[:0] = ["sudo", "-E", "-n", "-u", username, "--"]
+
             logger.debug("Switching user to %s (%d, %d)", username, uid, gid)
 
         return cmd, opts  
 
+    @staticmethod
+    def getTaskRlimits():
+        """
+        getTaskRlimits() -> list
+
+        Return the resource limits set for tasks in the 
+        [task_rlimits] config section, as a list of 
+        (resource, soft, hard) tuples.
+        """
+        rlimits = []
+
+        for name, value in conf.TASK_RLIMITS.iteritems():
+            res = getattr(resource, 'RLIMIT_%s' % name.upper(), None)
+            if res is None:
+                logger.warn("Unknown task rlimit '%s'", name)
+                continue
+
+            try:
+                limits = [resource.RLIM_INFINITY if v.strip() == 'unlimited' else int(v) 
+                          for v in value.split(',')]
+            except ValueError:
+                logger.warn("Bad value for task rlimit '%s': %s", name, value)
+                continue
+
+            soft = limits[0]
+            hard = limits[1] if len(limits) > 1 else resource.getrlimit(res)[1]
+            rlimits.append((res, soft, hard))
+
+        return rlimits
+
 
@@ -89,6 +89,7 @@ class SystemProfiler(AbstractProfiler):
         hw.cpuModel = self.cpuModel
         hw.platform = self.platform
         hw.load = self.load
+        hw.reservedRamMb = sum(t.reservedRamMb or 0 for t in tasks)
 
         # Create a ping
         ping = ttypes.Ping()
@@ -101,9 +102,7 @@ class SystemProfiler(AbstractProfiler):
 
         logger.info("Sending ping: %s", ping)
         try:
-            service, transport = client.getPlowConnection()
-            service.sendPing(ping)
-            transport.close()
+            client.getSharedConnection().sendPing(ping)
         except Exception, e:
             logger.exception("Unable to send ping to plow server, %s", e)
 
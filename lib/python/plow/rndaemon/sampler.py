@@ -0,0 +1,210 @@
+"""
+Batched resource sampling of running task process trees.
+
+Rather than walking each task's process tree with psutil, the
+ProcSampler reads /proc once per interval, builds a single
+pid -> children map, and sums the RSS, CPU and disk IO of every
+task's tree in one pass.
+"""
+import os
+import time
+import errno
+import logging
+
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['ProcSampler', 'TreeMetrics']
+
+
+# Resource totals for one process tree.
+#   rss:        resident memory in bytes
+#   cpuPercent: cpu use since the previous sample (100 == one core)
+#   diskIO:     (readCount, writeCount, readBytes, writeBytes), summed
+#               over the processes whose counters could be read,
+#               or None if io sampling is off
+#   numProcs:   live processes in the tree
+TreeMetrics = namedtuple("TreeMetrics", "rss cpuPercent diskIO numProcs")
+
+_ProcStat = namedtuple("_ProcStat", "ppid state cpuTicks startTime rssPages")
+
+
+class ProcSampler(object):
+    """
+    Samples the resource use of many process trees from
+    one scan of a /proc filesystem.
+
+    Not thread safe; a single sampler thread should own it.
+    """
+
+    def __init__(self, procfs='/proc'):
+        self.procfs = procfs
+
+        self._clockTicks = float(os.sysconf('SC_CLK_TCK'))
+        self._pageSize = os.sysconf('SC_PAGE_SIZE')
+
+        # pid -> (startTime, cpuTicks) from the previous sample,
+        # to work out cpu percentages
+        self._lastCpu = {}
+        self._lastTime = None
+
+    @classmethod
+    def isSupported(cls, procfs='/proc'):
+        """
+        Return True if the platform has a usable /proc
+        """
+        return os.path.exists(os.path.join(procfs, 'self', 'stat'))
+
+    def sample(self, rootPids, io=True):
+        """
+        sample(list rootPids, bool io=True) -> dict
+
+        Scan /proc and return a { rootPid: TreeMetrics } dict
+        for each of the given root pids that is still running.
+        The cpu percent of a process is 0 the first time it
+        is sampled. Set io=False to skip reading the disk
+        io counters.
+        """
+        now = time.time()
+        procs = self.scan()
+
+        children = {}
+        for pid, stat in procs.iteritems():
+            children.setdefault(stat.ppid, []).append(pid)
+
+        elapsed = (now - self._lastTime) if self._lastTime else 0
+        lastCpu = self._lastCpu
+        thisCpu = {}
+
+        results = {}
+
+        for root in rootPids:
+            if root not in procs:
+                continue
+
+            rss = 0
+            cpu = 0.0
+            diskIO = [0, 0, 0, 0] if io else None
+            numProcs = 0
+
+            stack = [root]
+            while stack:
+                pid = stack.pop()
+                stack.extend(children.get(pid, ()))
+
+                stat = procs[pid]
+                if stat.state == 'Z':
+                    continue
+
+                numProcs += 1
+                rss += stat.rssPages * self._pageSize
+
+                thisCpu[pid] = (stat.startTime, stat.cpuTicks)
+                last = lastCpu.get(pid)
+
+                # Make sure the pid was not reused since the last sample
+                if elapsed > 0 and last and last[0] == stat.startTime:
+                    cpu += (stat.cpuTicks - last[1]) / self._clockTicks / elapsed * 100
+
+                if diskIO is not None:
+                    counters = self.readIO(pid)
+                    if counters is not None:
+                        for i, val in enumerate(counters):
+                            diskIO[i] += val
+
+            results[root] = TreeMetrics(
+                rss,
+                max(cpu, 0.0),
+                tuple(diskIO) if diskIO is not None else None,
+                numProcs)
+
+        self._lastCpu = thisCpu
+        self._lastTime = now
+
+        return results
+
+    def scan(self):
+        """
+        scan() -> dict
+
+        Read the stat file of every process, and return
+        a { pid: _ProcStat } dict
+        """
+        procs = {}
+        readStat = self.readStat
+
+        try:
+            entries = os.listdir(self.procfs)
+        except OSError, e:
+            logger.warn("Could not list %s: %s", self.procfs, e)
+            return procs
+
+        for name in entries:
+            if not name.isdigit():
+                continue
+
+            stat = readStat(name)
+            if stat is not None:
+                procs[int(name)] = stat
+
+        return procs
+
+    def readStat(self, pid):
+        """
+        readStat(int|str pid) -> _ProcStat
+
+        Parse /proc/<pid>/stat, or return None if
+        the process has gone away.
+        """
+        try:
+            with open(os.path.join(self.procfs, str(pid), 'stat'), 'rb') as fh:
+                data = fh.read()
+        except (IOError, OSError), e:
+            if e.errno not in (errno.ENOENT, errno.ESRCH):
+                logger.debug("Error reading stat for pid %s: %s", pid, e)
+            return None
+
+        # The command name is in parens and may contain anything,
+        # so split on the last paren.
+        try:
+            fields = data[data.rindex(')') + 2:].split()
+            return _ProcStat(
+                ppid=int(fields[1]),
+                state=fields[0],
+                cpuTicks=int(fields[11]) + int(fields[12]),
+                startTime=int(fields[19]),
+                rssPages=int(fields[21]),
+            )
+        except (ValueError, IndexError), e:
+            logger.debug("Could not parse stat for pid %s: %s", pid, e)
+            return None
+
+    def readIO(self, pid):
+        """
+        readIO(int pid) -> (readCount, writeCount, readBytes, writeBytes)
+
+        Parse /proc/<pid>/io, or return None if it can't be
+        read, i.e. the process belongs to another user.
+        """
+        try:
+            with open(os.path.join(self.procfs, str(pid), 'io'), 'rb') as fh:
+                data = fh.read()
+        except (IOError, OSError), e:
+            if e.errno not in (errno.ENOENT, errno.ESRCH):
+                logger.debug("Error reading io for pid %s: %s", pid, e)
+            return None
+
+        counters = {}
+        for line in data.splitlines():
+            key, _, val = line.partition(':')
+            try:
+                counters[key] = int(val)
+            except ValueError:
+                pass
+
+        try:
+            return (counters['syscr'], counters['syscw'],
+                    counters['read_bytes'], counters['write_bytes'])
+        except KeyError:
+            return None
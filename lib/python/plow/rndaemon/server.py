@@ -34,12 +34,19 @@ class RndProcessHandler(object):
         logger.debug("finished core.ProcessMgr.getRunningTasks()")
         return tasks
 
+    def getLogBytes(self, procId, offset, maxBytes):
+        return core.ProcessMgr.getLogBytes(procId, offset, maxBytes)
+
+    def getTaskMetrics(self, procId):
+        return core.ProcessMgr.getTaskMetrics(procId)
+
     def reboot(self, now=False):
         core.ProcessMgr.reboot(now)
 
     def pingPong(self, withTasks=False):
         ping = core.Profiler.getPing() 
         ping.isReboot = core.ProcessMgr.isReboot
+        ping.hw.reservedRamMb = core.ResourceMgr.getReservedRam()
 
         if withTasks:
             ping.tasks = self.getRunningTasks()
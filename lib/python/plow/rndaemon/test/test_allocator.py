@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+import unittest
+
+from plow.rndaemon.allocator import CoreAllocator, AllocationError
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+class TestCoreAllocator(unittest.TestCase):
+
+    def setUp(self):
+        # 2 sockets of 4 cores
+        self.alloc = CoreAllocator([range(0, 4), range(4, 8)])
+
+    def testPackOneGroup(self):
+        alloc = self.alloc
+
+        a = alloc.checkout(2)
+        self.assertEqual(len(alloc.spanned(a)), 1)
+
+        # best fit fills the group already in use
+        b = alloc.checkout(2)
+        self.assertEqual(alloc.spanned(a), alloc.spanned(b))
+
+        # leaving the other socket whole
+        c = alloc.checkout(4)
+        self.assertEqual(len(alloc.spanned(c)), 1)
+        self.assertEqual(alloc.getFree(), [])
+
+        alloc.checkin(b)
+        self.assertEqual(alloc.getFree(), sorted(b))
+
+    def testSpread(self):
+        alloc = self.alloc
+
+        a = alloc.checkout(3)
+        b = alloc.checkout(1)
+        alloc.checkin(a)
+        # no single socket has 6 free
+        c = alloc.checkout(6)
+        self.assertEqual(len(c), 6)
+        self.assertEqual(len(alloc.spanned(c)), 2)
+        self.assertFalse(set(b) & set(c))
+
+    def testExhausted(self):
+        alloc = self.alloc
+        alloc.checkout(7)
+        self.assertRaises(AllocationError, alloc.checkout, 2)
+        self.assertEqual(len(alloc.checkout(1)), 1)
+        self.assertEqual(alloc.total, 8)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestCoreAllocator)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+
+from plow.rndaemon.blocklog import BlockLogWriter, BlockLogReader, INDEX_SUFFIX
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+class TestBlockLog(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'task.log.gz')
+
+        self._lines = ['line %d %s\n' % (i, 'x' * (i % 50)) for i in xrange(2000)]
+        self._data = ''.join(self._lines)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def writeLog(self, data, blockSize=4096):
+        log = BlockLogWriter(self._path, blockSize=blockSize)
+        for i in xrange(0, len(data), 1000):
+            log.write(data[i:i + 1000])
+        log.close()
+        return BlockLogReader(self._path)
+
+    def testGzipCompatible(self):
+        reader = self.writeLog(self._data)
+        self.assertTrue(reader.blockCount > 1)
+
+        fh = gzip.open(self._path)
+        try:
+            self.assertEqual(fh.read(), self._data)
+        finally:
+            fh.close()
+
+    def testRead(self):
+        reader = self.writeLog(self._data)
+
+        self.assertEqual(reader.size, len(self._data))
+        self.assertEqual(reader.read(0, 100), self._data[:100])
+        self.assertEqual(reader.read(4000, 10000), self._data[4000:14000])
+        self.assertEqual(reader.read(len(self._data) - 5, 100), self._data[-5:])
+        self.assertEqual(reader.read(len(self._data), 100), '')
+
+    def testLines(self):
+        reader = self.writeLog(self._data + 'no newline')
+
+        self.assertEqual(reader.lineCount, 2000)
+        self.assertEqual(reader.readLines(0, 3), self._lines[:3])
+        self.assertEqual(reader.readLines(1234, 100), self._lines[1234:1334])
+        self.assertEqual(reader.tail(3), self._lines[-2:] + ['no newline'])
+
+    def testLongLines(self):
+        lines = ['a' * 10000 + '\n', 'b\n', 'c' * 5000 + '\n']
+        reader = self.writeLog(''.join(lines), blockSize=1024)
+
+        self.assertEqual(reader.readLines(0, 3), lines)
+        self.assertEqual(reader.readLines(1, 2), lines[1:])
+
+    def testNoIndex(self):
+        self.writeLog(self._data)
+        os.unlink(self._path + INDEX_SUFFIX)
+
+        reader = BlockLogReader(self._path)
+        self.assertTrue(reader.blockCount > 1)
+        self.assertEqual(reader.readLines(1500, 2), self._lines[1500:1502])
+
+    def testLiveRefresh(self):
+        log = BlockLogWriter(self._path, blockSize=1024, maxDelay=0)
+        reader = BlockLogReader(self._path)
+        self.assertEqual(reader.size, 0)
+
+        log.write('one\n')
+        log.flush()
+        reader.refresh()
+        self.assertEqual(reader.read(0, 100), 'one\n')
+
+        log.write('two\n')
+        log.close()
+        reader.refresh()
+        self.assertEqual(reader.tail(1), ['two\n'])
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestBlockLog)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from plow.rndaemon.profile.cgroup import TaskCgroup, CgroupError
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+def writeFile(path, data):
+    with open(path, 'w') as fh:
+        fh.write(data)
+
+
+def readFile(path):
+    with open(path) as fh:
+        return fh.read()
+
+
+class TestTaskCgroup(unittest.TestCase):
+
+    def setUp(self):
+        self.mount = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.mount)
+
+    def testDetect(self):
+        self.assertEqual(TaskCgroup.detect(self.mount), 0)
+        self.assertRaises(CgroupError, TaskCgroup.create, 'task', mount=self.mount)
+
+        for c in ('memory', 'cpuacct', 'blkio'):
+            os.mkdir(os.path.join(self.mount, c))
+        self.assertEqual(TaskCgroup.detect(self.mount), 1)
+
+        writeFile(os.path.join(self.mount, 'cgroup.controllers'), 'cpu io memory')
+        self.assertEqual(TaskCgroup.detect(self.mount), 2)
+
+    def testV2(self):
+        writeFile(os.path.join(self.mount, 'cgroup.controllers'), 'cpu io memory')
+
+        cgroup = TaskCgroup.create('task1', 'plow', ramMb=512, mount=self.mount)
+        path = os.path.join(self.mount, 'plow', 'task1')
+
+        self.assertEqual(cgroup.version, 2)
+        self.assertEqual(cgroup.paths, [path])
+        self.assertEqual(readFile(os.path.join(path, 'memory.max')), str(512 * 1024 * 1024))
+
+        cgroup.attach(1234)
+        self.assertEqual(cgroup.pids(), [1234])
+
+        writeFile(os.path.join(path, 'memory.stat'), 'anon 1048576\nfile 99999999\nfile_mapped 1048576\n')
+        writeFile(os.path.join(path, 'cpu.stat'), 'usage_usec 1000000\nuser_usec 900000\n')
+        writeFile(os.path.join(path, 'io.stat'),
+            '8:0 rbytes=100 wbytes=200 rios=1 wios=2 dbytes=0 dios=0\n'
+            '8:16 rbytes=100 wbytes=200 rios=1 wios=2 dbytes=0 dios=0\n')
+        writeFile(os.path.join(path, 'memory.events'), 'low 0\nhigh 0\nmax 3\noom 1\noom_kill 1\n')
+
+        rss, cpu, diskIO = cgroup.sample()
+        self.assertEqual(rss, 2 * 1024 * 1024, "Page cache should not count as rss")
+        self.assertEqual(cpu, 0, "No cpu use on the first sample")
+        self.assertEqual(diskIO, (2, 4, 200, 400))
+
+        writeFile(os.path.join(path, 'cpu.stat'), 'usage_usec 900000000\n')
+        rss, cpu, diskIO = cgroup.sample()
+        self.assertTrue(cpu > 100, "Expected more than one core of cpu: %s" % cpu)
+
+        self.assertEqual(cgroup.oomKills(), 1)
+
+    def testV1(self):
+        for c in ('memory', 'cpuacct', 'blkio'):
+            os.mkdir(os.path.join(self.mount, c))
+
+        cgroup = TaskCgroup.create('task1', 'plow', ramMb=0, mount=self.mount)
+        memPath, cpuPath, blkioPath = cgroup.paths
+
+        self.assertEqual(cgroup.version, 1)
+        self.assertEqual(memPath, os.path.join(self.mount, 'memory', 'plow', 'task1'))
+        self.assertFalse(os.path.exists(os.path.join(memPath, 'memory.limit_in_bytes')),
+            "No memory limit should be set")
+
+        cgroup.attach(1234)
+        for path in cgroup.paths:
+            self.assertEqual(readFile(os.path.join(path, 'cgroup.procs')), '1234')
+
+        writeFile(os.path.join(memPath, 'memory.stat'),
+            'rss 1\ncache 99999999\ntotal_rss 1048576\ntotal_mapped_file 1048576\n')
+        writeFile(os.path.join(cpuPath, 'cpuacct.usage'), '1000000000\n')
+        writeFile(os.path.join(blkioPath, 'blkio.throttle.io_serviced'),
+            '8:0 Read 1\n8:0 Write 2\n8:0 Sync 3\n8:0 Total 3\nTotal 3\n')
+        writeFile(os.path.join(blkioPath, 'blkio.throttle.io_service_bytes'),
+            '8:0 Read 100\n8:0 Write 200\n8:0 Total 300\nTotal 300\n')
+
+        rss, cpu, diskIO = cgroup.sample()
+        self.assertEqual(rss, 2 * 1024 * 1024)
+        self.assertEqual(diskIO, (1, 2, 100, 200))
+
+    def testDestroy(self):
+        writeFile(os.path.join(self.mount, 'cgroup.controllers'), 'cpu io memory')
+
+        cgroup = TaskCgroup.create('task1', mount=self.mount)
+        self.assertEqual(cgroup.kill(), ([], []))
+
+        # A real cgroupfs does not have files to remove
+        path = cgroup.paths[0]
+        for name in os.listdir(path):
+            os.unlink(os.path.join(path, name))
+
+        cgroup.destroy()
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestTaskCgroup)
+    unittest.TextTestRunner(verbosity=2).run(suite)
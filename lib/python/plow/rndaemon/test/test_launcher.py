@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+import os
+import resource
+import threading
+import unittest
+
+from plow.rndaemon.launcher import Launcher, LauncherError, PIPE, STDOUT
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+class TestLauncher(unittest.TestCase):
+
+    def setUp(self):
+        self.exited = []
+        self.launcher = Launcher(onExit=self.exited.append)
+        self.launcher.start()
+
+    def tearDown(self):
+        self.launcher.stop()
+
+    def testSpawn(self):
+        env = {'PATH': os.environ['PATH'], 'PLOW_TEST': 'hello'}
+        p = self.launcher.spawn(['sh', '-c', 'echo $PLOW_TEST; pwd; echo err >&2; exit 3'],
+                                stdout=PIPE, stderr=STDOUT, env=env, cwd='/')
+
+        output = p.stdout.read()
+        self.assertEqual(output.split(), ['hello', '/', 'err'])
+
+        self.assertEqual(p.wait(10), 3)
+        self.assertEqual(p.poll(), 3)
+        self.assertTrue(p in self.exited)
+
+    def testSignaled(self):
+        p = self.launcher.spawn(['sleep', '30'])
+        os.kill(p.pid, 9)
+        self.assertEqual(p.wait(10), -9)
+
+    def testRlimits(self):
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        limit = min(soft, 256)
+
+        p = self.launcher.spawn(['sh', '-c', 'ulimit -n'], stdout=PIPE,
+                                rlimits=[(resource.RLIMIT_NOFILE, limit, hard)])
+        self.assertEqual(int(p.stdout.read()), limit)
+        self.assertEqual(p.wait(10), 0)
+
+    def testBadCommand(self):
+        self.assertRaises(OSError, self.launcher.spawn, ['/no/such/command'], stdout=PIPE)
+        self.assertRaises(ValueError, self.launcher.spawn, 'ls', shell=True)
+
+        # still usable after a failure
+        p = self.launcher.spawn(['true'])
+        self.assertEqual(p.wait(10), 0)
+
+    def testConcurrentSpawns(self):
+        procs = []
+
+        def spawn():
+            for _ in xrange(10):
+                procs.append(self.launcher.spawn(['echo', 'hi'], stdout=PIPE))
+
+        threads = [threading.Thread(target=spawn) for _ in xrange(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(procs), 40)
+        for p in procs:
+            self.assertEqual(p.stdout.read(), 'hi\n')
+            self.assertEqual(p.wait(10), 0)
+
+    def testStop(self):
+        p = self.launcher.spawn(['sleep', '30'])
+        try:
+            self.launcher.stop()
+            self.assertFalse(self.launcher.isAlive())
+            # launched processes keep running
+            os.kill(p.pid, 0)
+
+            # requests fail until it is started again
+            self.assertRaises(LauncherError, self.launcher._Launcher__request, {})
+
+            # starts again on demand
+            p2 = self.launcher.spawn(['true'])
+            self.assertEqual(p2.wait(10), 0)
+        finally:
+            os.kill(p.pid, 9)
+
+    def testLauncherKilled(self):
+        p = self.launcher.spawn(['sleep', '30'])
+        launcherProc = self.launcher._Launcher__proc
+        try:
+            os.kill(launcherProc.pid, 9)
+
+            # the task's exit is lost with the launcher
+            self.assertEqual(p.wait(10), 1)
+            self.assertTrue(p in self.exited)
+            self.assertFalse(self.launcher.isAlive())
+            self.assertEqual(launcherProc.poll(), -9)
+        finally:
+            os.kill(p.pid, 9)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestLauncher)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -2,12 +2,14 @@
 
 import os
 import pwd
+import threading
 import unittest
 import tempfile
 import uuid 
 
-from plow.rndaemon.utils import ProcessLog
+from plow.rndaemon.utils import ProcessLog, ProcessLogParser, LogWriter, LogTail, LogSpill, OutputTracker
 from plow.rndaemon.rpc.ttypes import RunTaskResult, RunTaskCommand
+from plow.rndaemon import conf
 
 import logging
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +30,63 @@ class TestProcessLog(unittest.TestCase):
         log.write("Foo\n")
         log.writeLogFooterAndClose(result)
 
+    def testReadBytes(self):
+        log = ProcessLog(self._logfile, tailBytes=16)
+        log.write('0123456789' * 5)
+        log.flush()
+
+        # the tail is in memory, the rest is read from the file
+        self.assertEqual(log.tail.start, 34)
+        self.assertEqual(log.readBytes(40, 100), ('0123456789', 50))
+        self.assertEqual(log.readBytes(0, 12), ('012345678901', 50))
+        self.assertEqual(log.readBytes(50, 10), ('', 50))
+        log.close()
+        os.unlink(self._logfile)
+
+    def testReadBytesCompressed(self):
+        log = ProcessLog(self._logfile, tailBytes=16, compress=True)
+        log.write('0123456789\n' * 5)
+        log.close()
+
+        # the start of the log is read from the compressed blocks
+        self.assertEqual(log.readBytes(0, 12), ('0123456789\n0', 55))
+
+        path = self._logfile + '.gz'
+        for p in (self._logfile, path, path + '.idx'):
+            os.unlink(p)
+
+    def testLogLimit(self):
+        task = self.getNewTaskCommand()
+        result = self.getResult(task)
+
+        lines = ['line %04d\n' % i for i in xrange(1000)]
+        log = ProcessLog(task.logFile, tailBytes=100, maxBytes=2000)
+        for line in lines:
+            log.write(line)
+        log.flush()
+
+        # only the head is in the log while the task runs
+        self.assertEqual(os.path.getsize(task.logFile), 1000)
+        self.assertEqual(log.readableOffset(5000), 9900)
+        self.assertEqual(log.readableOffset(500), 500)
+
+        log.writeLogFooterAndClose(result)
+        self.assertFalse(os.path.exists(task.logFile + '.spill0'))
+
+        with open(task.logFile) as f:
+            data = f.read()
+
+        # the first half, and the last whole lines of the second half
+        self.assertTrue(data.startswith(''.join(lines[:100])))
+        self.assertTrue(''.join(lines[-100:]) in data)
+        self.assertFalse(lines[-101] in data)
+
+        self.assertEqual(log.droppedLines, 800)
+        self.assertEqual(log.droppedBytes, 8000)
+        self.assertTrue("Dropped Lines: 800\n" in data)
+        self.assertTrue("Dropped Bytes: 8000\n" in data)
+        os.unlink(task.logFile)
+
     def testExtraAttributes(self):
         task = self.getNewTaskCommand()
         result = self.getResult(task)
@@ -82,6 +141,208 @@ class TestProcessLog(unittest.TestCase):
         return result
 
 
+class TestLogWriter(unittest.TestCase):
+
+    def testWriteAndClose(self):
+        logfile = tempfile.NamedTemporaryFile(prefix='plow-rndaemon-test', delete=False).name
+
+        with open(logfile, 'w') as fh:
+            writer = LogWriter(fh, maxBuffer=64, flushInterval=.1)
+            writer.start()
+
+            lines = ["line %d\n" % i for i in xrange(1000)]
+            for line in lines:
+                writer.write(line)
+
+            writer.close()
+            self.assertFalse(writer.isAlive())
+            self.assertEqual(writer.bytesWritten, len(''.join(lines)))
+
+        with open(logfile) as fh:
+            self.assertEqual(fh.readlines(), lines)
+
+        os.unlink(logfile)
+
+    def testStalledLog(self):
+        stalled = _StalledFile()
+        other = _StalledFile()
+        other.release.set()
+
+        writer = LogWriter(maxBuffer=64, flushInterval=.1, threads=2)
+        writer.start()
+
+        try:
+            # The first write is picked up by a writer thread, 
+            # which then hangs in the file's write()
+            writer.write("x" * 10, stalled, block=False)
+            self.assertTrue(stalled.writing.wait(5))
+            self.assertFalse(writer.write("y" * 100, stalled, block=False))
+            self.assertEqual(writer.pending(stalled), 100)
+
+            # Other logs keep flowing, without blocking
+            lines = ["line %d\n" % i for i in xrange(100)]
+            for line in lines:
+                writer.write(line, other, block=False)
+            self.assertTrue(writer.sync(other, timeout=5))
+            self.assertEqual(other.data, ''.join(lines))
+
+        finally:
+            stalled.release.set()
+
+        writer.close(5)
+        self.assertFalse(writer.isAlive())
+        self.assertEqual(stalled.data, "x" * 10 + "y" * 100)
+        self.assertEqual(writer.pending(stalled), 0)
+
+
+class _StalledFile(object):
+    """
+    A file whose writes hang until release is set,
+    like a log on a hung NFS mount.
+    """
+    def __init__(self):
+        self.data = ''
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, data):
+        self.writing.set()
+        self.release.wait()
+        self.data += data
+
+    def flush(self):
+        pass
+
+
+class TestLogTail(unittest.TestCase):
+
+    def testTail(self):
+        tail = LogTail(10)
+        for chunk in ('abcdef', 'ghijklmnop', 'q'):
+            tail.append(chunk)
+
+        self.assertEqual(tail.size, 17)
+        self.assertEqual(tail.start, 7)
+        self.assertEqual(tail.read(7, 100), 'hijklmnopq')
+        self.assertEqual(tail.read(9, 3), 'jkl')
+        self.assertEqual(tail.read(17, 5), '')
+        self.assertEqual(tail.read(6, 5), None)
+
+
+class TestLogSpill(unittest.TestCase):
+
+    def testKeepLast(self):
+        name = tempfile.NamedTemporaryFile(prefix='plow-rndaemon-test', delete=False).name
+        out = tempfile.TemporaryFile()
+
+        spill = LogSpill(name, 25)
+        for i in xrange(20):
+            spill.write('line %02d\n' % i)
+
+        # the last 25 bytes, from the first line break
+        spill.trim()
+        spill.drain(out)
+        out.seek(0)
+        self.assertEqual(out.read(), 'line 17\nline 18\nline 19\n')
+        self.assertEqual(spill.droppedLines, 17)
+        self.assertEqual(spill.droppedBytes, 17 * 8)
+        self.assertFalse(os.path.exists(name + '.spill0'))
+        os.unlink(name)
+
+
+class TestOutputTracker(unittest.TestCase):
+
+    def testLastLog(self):
+        tracker = OutputTracker()
+
+        tracker.feed("one\ntw")
+        self.assertEqual(tracker.lastLog, "one\n")
+
+        tracker.feed("o\nthr")
+        self.assertEqual(tracker.lastLog, "two\n")
+
+        tracker.feed("ee\n")
+        self.assertEqual(tracker.lastLog, "three\n")
+        self.assertEqual(tracker.progress, None)
+
+    def testProgress(self):
+        parser = ProcessLogParser([r'^Progress: ([\d.]+%)$'])
+        tracker = OutputTracker(parser)
+
+        tracker.feed("Progress: 10%\nfoo\nProgress: 2")
+        self.assertEqual(tracker.progress, .1)
+
+        tracker.feed("0%\r\nbar\n")
+        self.assertEqual(tracker.progress, .2)
+
+        tracker.feed("baz\n" * 100)
+        self.assertEqual(tracker.progress, .2)
+
+    def testProgressInterval(self):
+        parser = ProcessLogParser([r'^Progress: ([\d.]+%)$'])
+        tracker = OutputTracker(parser, progressInterval=60)
+
+        tracker.feed("Progress: 10%\n")
+        self.assertEqual(tracker.progress, .1)
+
+        # held back until the interval is up
+        tracker.feed("Progress: 20%\nfoo\n")
+        tracker.feed("bar\n")
+        self.assertEqual(tracker.progress, .1)
+        self.assertEqual(tracker.lastLog, "bar\n")
+
+        tracker.flushProgress()
+        self.assertEqual(tracker.progress, .2)
+
+
+class TestProcessLogParser(unittest.TestCase):
+
+    BLENDER = r'^Fra:\d+ .*? \| Rendering \| .*? (\d+/\d+)$'
+    MRAY = r'^JOB[\w. ]+:\s+([\d.]+%)\s+'
+
+    def testLiterals(self):
+        literals = ProcessLogParser([self.BLENDER, self.MRAY])._literals
+        self.assertEqual(sorted(literals), [' | Rendering | ', 'JOB'])
+
+        # no prefilter unless every pattern has plain text
+        self.assertEqual(ProcessLogParser([self.MRAY, r'(\d+/\d+)'])._literals, None)
+        self.assertEqual(ProcessLogParser([r'(?i)progress: (\d+%)'])._literals, None)
+        self.assertEqual(ProcessLogParser([r'done|progress (\d+%)'])._literals, None)
+
+    def testToProgress(self):
+        toProgress = ProcessLogParser._toProgress
+        self.assertEqual(toProgress('50%'), .5)
+        self.assertEqual(toProgress('0.25'), .25)
+        self.assertEqual(toProgress('25'), .25)
+        self.assertEqual(toProgress('3/4'), .75)
+        self.assertEqual(toProgress('1/0'), 0.0)
+        self.assertEqual(toProgress('abc%'), None)
+        self.assertEqual(toProgress('a/b'), None)
+
+    def testLastProgress(self):
+        parser = ProcessLogParser([self.BLENDER])
+        text = ("Fra:1 Mem:1M | Rendering | Path Tracing Tile 3/16\n"
+                "Fra:1 Mem:1M | Rendering | Path Tracing Tile 4/16\n"
+                "Fra:1 Mem:1M | Rendering | Denoising\n"
+                "Saved: foo.png\n")
+        self.assertEqual(parser.parseLastProgress(text), .25)
+        self.assertEqual(parser.parseLastProgress("Saved: foo.png\n"), None)
+
+    def testRegistry(self):
+        saved = conf.TASK_PROGRESS_PATTERNS
+        conf.TASK_PROGRESS_PATTERNS = {'blender': self.BLENDER, 'mray': self.MRAY}
+        try:
+            parser = ProcessLogParser.fromTaskTypes(['blender', 'mray'])
+            self.assertTrue(parser is ProcessLogParser.fromTaskTypes(['blender', 'mray', 'other']))
+            self.assertFalse(parser is ProcessLogParser.fromTaskTypes('blender'))
+            self.assertEqual(ProcessLogParser.fromTaskTypes('other').progress, None)
+        finally:
+            conf.TASK_PROGRESS_PATTERNS = saved
+
+
 if __name__ == "__main__":
-    suite = unittest.TestLoader().loadTestsFromTestCase(TestProcessLog)
+    suite = unittest.TestSuite()
+    for t in (TestProcessLog, TestLogWriter, TestLogTail, TestLogSpill, TestOutputTracker, 
+              TestProcessLogParser):
+        suite.addTest(unittest.TestLoader().loadTestsFromTestCase(t))
     unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+import unittest
+
+from plow.rndaemon.memguard import MemoryGuard, TaskSample, STOP, CONT, KILL
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+class TestMemoryGuard(unittest.TestCase):
+
+    def setUp(self):
+        # rss in MB, and start time
+        self.tasks = {
+            'old': [1000, 1],
+            'big': [4000, 2],
+            'new': [500, 3],
+        }
+
+    def samples(self):
+        return [TaskSample(k, rss, started) for k, (rss, started) in sorted(self.tasks.iteritems())]
+
+    def testPolicies(self):
+        guard = MemoryGuard(100, 'largest')
+        self.assertEqual(guard.check(50, self.samples()), [(KILL, 'big')])
+
+        guard = MemoryGuard(100, 'newest')
+        self.assertEqual(guard.check(50, self.samples()), [(KILL, 'new')])
+
+        guard = MemoryGuard(100, 'growth')
+        self.assertEqual(guard.check(500, self.samples()), [])
+        self.tasks['old'][0] = 3000
+        self.tasks['new'][0] = 600
+        self.assertEqual(guard.check(50, self.samples()), [(KILL, 'old')])
+
+        # growth is kept between checks that see the same sample
+        self.assertEqual(guard.check(50, self.samples()), [(KILL, 'old')])
+
+        self.assertRaises(ValueError, MemoryGuard, 100, 'priority')
+        self.assertRaises(ValueError, MemoryGuard, 100, 'growth', 'pause')
+
+    def testStopAndResume(self):
+        guard = MemoryGuard(100, 'largest', STOP)
+
+        self.assertEqual(guard.check(50, self.samples()), [(STOP, 'big')])
+        self.assertEqual(guard.check(50, self.samples()), [(STOP, 'old')])
+        self.assertEqual(guard.check(50, self.samples()), [(STOP, 'new')])
+
+        # every task is stopped, and memory is still low
+        self.assertEqual(guard.check(50, self.samples()), [(KILL, 'big')])
+        del self.tasks['big']
+
+        # not enough to resume yet
+        self.assertEqual(guard.check(150, self.samples()), [])
+        self.assertEqual(guard.stopped, set(['old', 'new']))
+
+        self.assertEqual(sorted(guard.check(200, self.samples())), [(CONT, 'new'), (CONT, 'old')])
+        self.assertEqual(guard.stopped, set())
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestMemoryGuard)
+    unittest.TextTestRunner(verbosity=2).run(suite)
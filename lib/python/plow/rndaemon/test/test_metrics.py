@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+import os
+import json
+import tempfile
+import unittest
+
+from plow.rndaemon.rpc import ttypes
+from plow.rndaemon.metrics import MetricsBuffer
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+class TestMetricsBuffer(unittest.TestCase):
+
+    def testRing(self):
+        buf = MetricsBuffer(4)
+        self.assertEqual(buf.samples(), [])
+        self.assertEqual(buf.summary(), {'samples': 0})
+
+        for i in xrange(10):
+            buf.add(100 * i, i, ttypes.DiskIO(0, 0, i, 2 * i), when=i)
+
+        # only the newest samples are kept
+        self.assertEqual(len(buf), 4)
+        self.assertEqual(buf.samples(), [(t, 100 * t, t, t, 2 * t) for t in xrange(6, 10)])
+
+        # but the summary covers all of them
+        summary = buf.summary()
+        self.assertEqual(summary['samples'], 10)
+        self.assertEqual(summary['start'], 0)
+        self.assertEqual(summary['end'], 9)
+        self.assertEqual(summary['maxRssMb'], 900)
+        self.assertEqual(summary['avgRssMb'], 450)
+
+    def testNoDiskIO(self):
+        buf = MetricsBuffer(2)
+        buf.add(10, 50, when=1)
+        self.assertEqual(buf.samples(), [(1, 10, 50, -1, -1)])
+
+    def testDump(self):
+        buf = MetricsBuffer(3)
+        for i in xrange(5):
+            buf.add(i, i, when=i)
+
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            buf.dump(path, procId='abc')
+            with open(path) as fh:
+                data = json.load(fh)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(data['procId'], 'abc')
+        self.assertEqual(data['summary']['samples'], 5)
+        self.assertEqual(data['samples']['rssMb'], [2, 3, 4])
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestMetricsBuffer)
+    unittest.TextTestRunner(verbosity=2).run(suite)
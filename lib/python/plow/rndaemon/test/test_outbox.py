@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from plow.rndaemon.rpc import ttypes
+from plow.rndaemon.outbox import ResultOutbox
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+class FakeServer(object):
+    """
+    Stands in for the server connection, failing
+    the first `failures` calls.
+    """
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.received = []
+
+    def taskComplete(self, result):
+        if self.failures > 0:
+            self.failures -= 1
+            raise IOError("No available Plow host")
+        self.received.append(result)
+
+
+class FastOutbox(ResultOutbox):
+    MIN_BACKOFF_SEC = .01
+    MAX_BACKOFF_SEC = .05
+
+
+def newResult(i):
+    return ttypes.RunTaskResult(procId='proc%d' % i, taskId='task%d' % i, jobId='job',
+                                maxRssMb=i, exitStatus=0, exitSignal=0)
+
+
+class TestResultOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'spool', 'results.journal')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def testSendWithRetries(self):
+        server = FakeServer(failures=3)
+        outbox = FastOutbox(self.path, service=server)
+        outbox.start()
+
+        for i in xrange(5):
+            outbox.put(newResult(i))
+
+        self.assertTrue(outbox.flush(10))
+        self.assertEqual([r.procId for r in server.received], ['proc%d' % i for i in xrange(5)])
+        self.assertEqual(len(outbox), 0)
+
+        # nothing is left to replay
+        self.assertEqual(len(FastOutbox(self.path, service=server)), 0)
+
+    def testReplay(self):
+        # The server is never reached before the "restart"
+        outbox = FastOutbox(self.path, service=FakeServer(failures=1000))
+        for i in xrange(3):
+            outbox.put(newResult(i))
+        self.assertEqual(len(outbox), 3)
+
+        # A crash can leave half a line at the end
+        with open(self.path, 'a') as fh:
+            fh.write('{"seq": 4, "res')
+
+        server = FakeServer()
+        outbox = FastOutbox(self.path, service=server)
+        self.assertEqual(len(outbox), 3)
+
+        outbox.start()
+        self.assertTrue(outbox.flush(10))
+
+        received = server.received
+        self.assertEqual([r.procId for r in received], ['proc0', 'proc1', 'proc2'])
+        self.assertEqual(received[2].maxRssMb, 2)
+        self.assertTrue(isinstance(received[0].taskId, str))
+
+        # Sequence numbers carry on after a restart
+        outbox.put(newResult(9))
+        self.assertTrue(outbox.flush(10))
+        self.assertEqual(len(FastOutbox(self.path, service=server)), 0)
+
+    def testNoJournal(self):
+        server = FakeServer()
+        outbox = FastOutbox(None, service=server)
+        outbox.start()
+        outbox.put(newResult(1))
+        self.assertTrue(outbox.flush(10))
+        self.assertEqual(len(server.received), 1)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestResultOutbox)
+    unittest.TextTestRunner(verbosity=2).run(suite)
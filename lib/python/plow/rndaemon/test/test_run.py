@@ -10,6 +10,8 @@ import platform
 import uuid 
 import pwd
 import signal 
+import threading
+import subprocess
 
 from functools import partial
 from multiprocessing import Process, Event 
@@ -68,6 +70,24 @@ class TestResourceManager(unittest.TestCase):
         openslots = len(manager.getOpenSlots())
         self.assertEqual(totalCores, openslots)
 
+    def testRamCheckout(self):
+        manager = core.ResourceMgr
+        bookable = manager.getBookableRam()
+        self.assertTrue(0 < bookable <= core.Profiler.totalRamMb)
+
+        half = bookable // 2
+        slots = manager.checkout(1, half)
+        self.assertEqual(manager.getReservedRam(), half)
+
+        # Overcommitting memory is refused, and no cores are taken
+        openslots = len(manager.getOpenSlots())
+        self.assertRaises(ttypes.RndException, manager.checkout, 1, bookable - half + 1)
+        self.assertEqual(len(manager.getOpenSlots()), openslots)
+        self.assertEqual(manager.getReservedRam(), half)
+
+        manager.checkin(slots, half)
+        self.assertEqual(manager.getReservedRam(), 0)
+
 
 class TestProcessManager(unittest.TestCase):
 
@@ -137,6 +157,13 @@ class TestProcessManager(unittest.TestCase):
         process.command = ["/bin/ls", self._logdir]
         self.assertRaises(ttypes.RndException, core.ProcessMgr.runProcess, process)
 
+    def testRunTaskCommandOutOfRam(self):
+        process = self.getNewTaskCommand()
+        process.reservedRamMb = core.ResourceMgr.getBookableRam() + 1
+        process.command = ["/bin/ls", self._logdir]
+        self.assertRaises(ttypes.RndException, core.ProcessMgr.runProcess, process)
+        self.assertEqual(len(core.ResourceMgr.getOpenSlots()), self._totalCores)
+
     def testKillRunningTask(self):
         process = self.getNewTaskCommand()
         process.command = [CMDS_UTIL, 'hard_to_kill']
@@ -149,7 +176,16 @@ class TestProcessManager(unittest.TestCase):
         self.assertEqual(total, 1, msg="Expected there to be one running task")
 
         task = runningTasks[0]
+        start = time.time()
         core.ProcessMgr.killRunningTask(task.procId, "Killing for testing reasons")
+        elapsed = time.time() - start
+
+        # Every process ignores SIGTERM, and should be killed 
+        # together rather than one wait at a time
+        maxWait = core._ProcessTask.KILL_WAIT_SEC + 2
+        self.assertTrue(elapsed < maxWait, 
+            "Killing the task tree took %.1f seconds" % elapsed)
+
         time.sleep(1)
 
         count = len(core.ProcessMgr.getRunningTasks())
@@ -168,6 +204,119 @@ class TestProcessManager(unittest.TestCase):
         assert abs(sig) in (signal.SIGTERM, signal.SIGKILL), "Expected a 9 or 15 Exit Signal, but got %s" % sig
 
 
+    @unittest.skipUnless(IS_LINUX and core.Profiler.physicalCpus > 1, "Requires more than one core")
+    def testShareIdleCores(self):
+        process = self.getNewTaskCommand()
+        process.command = ['sleep', '5']
+        process.threadable = True
+
+        task = core.ProcessMgr.runProcess(process, wait=5)
+        proc = psutil.Process(task.pid)
+
+        # Booked one core, but may use them all while they are idle
+        self.assertEqual(len(core.ResourceMgr.getOpenSlots()), self._totalCores - 1)
+        self.assertEqual(len(proc.cpu_affinity()), core.Profiler.logicalCpus)
+
+        # Until another task books them
+        other = self.getNewTaskCommand()
+        other.cores = self._totalCores - 1
+        other.command = ['sleep', '1']
+        core.ProcessMgr.runProcess(other, wait=5)
+        self.assertEqual(len(proc.cpu_affinity()), core.Profiler.hyperthread_factor)
+
+        core.ProcessMgr.killRunningTask(process.procId, "Done testing")
+
+    def testMemoryGuardActions(self):
+        process = self.getNewTaskCommand()
+        process.command = ['sleep', '30']
+
+        pthread = core._ProcessThread(process, core.ResourceMgr.checkout(1))
+        pthread.start()
+        self.assertTrue(pthread.getRunningTask(wait=5).pid > 0)
+
+        proc = psutil.Process(pthread.pid)
+        pthread.suspend()
+        time.sleep(.5)
+        self.assertEqual(proc.status(), psutil.STATUS_STOPPED)
+        pthread.resume()
+        time.sleep(.5)
+        self.assertNotEqual(proc.status(), psutil.STATUS_STOPPED)
+
+        pthread.killForMemory("Killed for testing reasons")
+        self.assertTrue(pthread.wait(10), "Task was not killed")
+
+        sig, status = self.getLogSignalStatus(process.logFile)
+        self.assertEqual(status, 1)
+        self.assertEqual(sig, core._ProcessTask.OOM_EXIT_SIGNAL)
+
+    def testTaskLogBytes(self):
+        process = self.getNewTaskCommand()
+        process.command = ['sh', '-c', 'echo hello-log; sleep 2']
+
+        core.ProcessMgr.runProcess(process, wait=5)
+        time.sleep(.5)
+
+        chunk = core.ProcessMgr.getLogBytes(process.procId, 0, 1024 * 1024)
+        self.assertEqual(chunk.offset, 0)
+        self.assertEqual(len(chunk.data), chunk.size)
+        self.assertTrue("Render Process Begin" in chunk.data)
+        self.assertTrue("hello-log" in chunk.data)
+
+        # from the end
+        tail = core.ProcessMgr.getLogBytes(process.procId, -10, 1024)
+        self.assertEqual(tail.offset, chunk.size - 10)
+        self.assertEqual(tail.data, chunk.data[-10:])
+
+        while core.ProcessMgr.getRunningTasks():
+            time.sleep(.1)
+
+        self.assertRaises(ttypes.RndException, core.ProcessMgr.getLogBytes, process.procId, 0, 1024)
+
+        with open(process.logFile) as fh:
+            self.assertTrue(fh.read().startswith(chunk.data))
+
+    def testTaskMetrics(self):
+        process = self.getNewTaskCommand()
+        process.command = ['sleep', '1']
+
+        core.ProcessMgr.runProcess(process, wait=5)
+        metrics = core.ProcessMgr.getTaskMetrics(process.procId)
+        self.assertEqual(metrics.procId, process.procId)
+        self.assertTrue(metrics.sampleCount >= 1)
+        self.assertEqual(len(metrics.samples), metrics.sampleCount)
+
+        while core.ProcessMgr.getRunningTasks():
+            time.sleep(.1)
+
+        self.assertRaises(ttypes.RndException, core.ProcessMgr.getTaskMetrics, process.procId)
+
+        path = process.logFile + '.metrics'
+        self.assertTrue(os.path.exists(path), "Expected metrics next to the task log")
+        os.remove(path)
+
+    def testTaskPings(self):
+        pings = []
+
+        def sendPing(tasks, isReboot=False):
+            pings.append(len(tasks))
+
+        core.Profiler.sendPing = sendPing
+        try:
+            process = self.getNewTaskCommand()
+            process.command = ['sleep', '2']
+            core.ProcessMgr.runProcess(process)
+
+            while core.ProcessMgr.getRunningTasks():
+                time.sleep(.1)
+            time.sleep(2)
+
+        finally:
+            del core.Profiler.sendPing
+
+        # Well before the next regular ping
+        self.assertTrue(1 in pings, "Expected a ping when the task started: %s" % pings)
+        self.assertEqual(pings[-1], 0, "Expected a ping when the task ended: %s" % pings)
+
     def testFailedTask(self):
         D = {'result': None}
 
@@ -359,6 +508,71 @@ class TestProcessManager(unittest.TestCase):
         return affinity
 
 
+class TestEventLoop(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = core._EventLoop()
+        self.loop.start()
+
+    def testTimers(self):
+        done = threading.Event()
+        calls = []
+
+        self.loop.callLater(.2, calls.append, 2)
+        self.loop.callLater(.1, calls.append, 1)
+        self.loop.callLater(.1, calls.append, 'cancelled').cancel()
+        self.loop.callLater(.3, done.set)
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(calls, [1, 2])
+
+    def testReaderAndChildWatcher(self):
+        done = threading.Event()
+        output = []
+
+        p = subprocess.Popen(['echo', 'hello'], stdout=subprocess.PIPE)
+        fd = p.stdout.fileno()
+
+        def onRead(fd):
+            data = os.read(fd, 1024)
+            output.append(data)
+            if not data:
+                self.loop.removeReader(fd)
+                self.loop.addChildWatcher(onExit)
+
+        def onExit():
+            if p.poll() is not None:
+                self.loop.removeChildWatcher(onExit)
+                done.set()
+
+        self.loop.addReader(fd, onRead)
+
+        self.assertTrue(done.wait(10))
+        self.assertEqual(''.join(output), 'hello\n')
+        self.assertEqual(p.returncode, 0)
+
+
+class TestPingScheduler(unittest.TestCase):
+
+    def testBackoff(self):
+        pinger = core._PingScheduler(10, 60)
+        pinger.JITTER = 0
+
+        delays = [pinger.nextDelay(idle=True) for _ in xrange(4)]
+        self.assertEqual(delays, [20, 40, 60, 60])
+
+        self.assertEqual(pinger.nextDelay(idle=False), 10)
+        self.assertEqual(pinger.nextDelay(idle=True), 20)
+
+    def testJitter(self):
+        pinger = core._PingScheduler(10, 60)
+        delays = set(pinger.nextDelay(idle=False) for _ in xrange(20))
+
+        self.assertTrue(len(delays) > 1, "Expected the delays to vary")
+        for d in delays:
+            self.assertTrue(8 <= d <= 12, "Delay out of the jitter range: %s" % d)
+
+
 class TestCommunications(unittest.TestCase):
     """
     Creates a mock server to accept communication tests 
@@ -407,6 +621,33 @@ class TestCommunications(unittest.TestCase):
 
         transport.close()
 
+    def testSharedConnection(self):
+        """
+        Pings sent over a PlowConnection should reuse one socket,
+        and fail over past a host that is down.
+        """
+        conn = client.PlowConnection(["localhost:1", "localhost:%d" % self.server_port])
+
+        for _ in xrange(3):
+            self.event.clear()
+
+            ping = ttypes.Ping()
+            ping.hw = ttypes.Hardware()
+            conn.sendPing(ping)
+            self.event.wait(3)
+
+            self.assertTrue(self.event.is_set(), 
+                msg="Server did not receive ping from client in reasonable time")
+
+        self.assertEqual(conn.host, ("localhost", self.server_port))
+
+        stats = conn.stats()
+        self.assertEqual(stats['connects'], 1)
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['reused'], 2)
+
+        conn.close()
+
 
 class _ServiceHandler(object):
 
@@ -454,6 +695,6 @@ class TestLogParser(unittest.TestCase):
 
 if __name__ == "__main__":
     suite = unittest.TestSuite()
-    for t in (TestCommunications, TestResourceManager, TestProcessManager):
+    for t in (TestCommunications, TestResourceManager, TestProcessManager, TestEventLoop, TestPingScheduler):
         suite.addTest(unittest.TestLoader().loadTestsFromTestCase(t))
     unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from plow.rndaemon.sampler import ProcSampler
+
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+
+
+STAT_FMT = "%(pid)d (%(comm)s) %(state)s %(ppid)d 1 1 0 -1 4202496 100 0 0 0 " \
+           "%(utime)d %(stime)d 0 0 20 0 1 0 %(start)d 1000000 %(rss)d 18446744073709551615"
+
+IO_FMT = "rchar: 0\nwchar: 0\nsyscr: %d\nsyscw: %d\n" \
+         "read_bytes: %d\nwrite_bytes: %d\ncancelled_write_bytes: 0\n"
+
+
+class TestProcSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.procfs = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.procfs)
+
+    def writeProc(self, pid, ppid, comm="sh", state="S", utime=0, stime=0,
+                  start=100, rss=10, io=(1, 2, 3, 4)):
+        path = os.path.join(self.procfs, str(pid))
+        if not os.path.isdir(path):
+            os.mkdir(path)
+
+        with open(os.path.join(path, 'stat'), 'w') as fh:
+            fh.write(STAT_FMT % locals())
+
+        if io:
+            with open(os.path.join(path, 'io'), 'w') as fh:
+                fh.write(IO_FMT % io)
+
+    def testTrees(self):
+        # two tasks, 10 and 20, and one unrelated process
+        self.writeProc(1, 0, comm="init")
+        self.writeProc(10, 1)
+        self.writeProc(11, 10, comm="a) (b")
+        self.writeProc(12, 11)
+        self.writeProc(13, 10, state="Z")
+        self.writeProc(20, 1, io=None)
+        self.writeProc(30, 1)
+
+        sampler = ProcSampler(self.procfs)
+        pageSize = os.sysconf('SC_PAGE_SIZE')
+
+        samples = sampler.sample([10, 20, 99])
+
+        self.assertEqual(sorted(samples), [10, 20])
+
+        m = samples[10]
+        self.assertEqual(m.numProcs, 3, "The zombie should not be counted")
+        self.assertEqual(m.rss, 30 * pageSize)
+        self.assertEqual(m.diskIO, (3, 6, 9, 12))
+        self.assertEqual(m.cpuPercent, 0, "No cpu use on the first sample")
+
+        m = samples[20]
+        self.assertEqual(m.numProcs, 1)
+        self.assertEqual(m.diskIO, (0, 0, 0, 0))
+
+        samples = sampler.sample([10], io=False)
+        self.assertEqual(samples[10].diskIO, None)
+
+    def testCpuPercent(self):
+        self.writeProc(10, 1, utime=0, stime=0)
+        self.writeProc(11, 10, utime=0, stime=0)
+
+        sampler = ProcSampler(self.procfs)
+        sampler.sample([10])
+
+        ticks = int(sampler._clockTicks)
+        time.sleep(.1)
+
+        # pid 11 used 1 sec of cpu, and pid 10 was replaced
+        # by a new process that should not count
+        self.writeProc(10, 1, utime=ticks * 5, start=200)
+        self.writeProc(11, 10, utime=ticks, stime=0)
+
+        cpu = sampler.sample([10])[10].cpuPercent
+        self.assertTrue(cpu > 100, "Expected more than one core of cpu: %s" % cpu)
+        self.assertTrue(cpu < 5 * 100 * 10, "Reused pid should be ignored: %s" % cpu)
+
+    @unittest.skipUnless(ProcSampler.isSupported(), "Requires /proc")
+    def testLiveTree(self):
+        code = "import subprocess,sys; subprocess.call([sys.executable, '-c', 'import time; time.sleep(5)'])"
+        p = subprocess.Popen([sys.executable, '-c', code])
+
+        try:
+            sampler = ProcSampler()
+
+            for _ in xrange(50):
+                m = sampler.sample([p.pid]).get(p.pid)
+                if m and m.numProcs == 2:
+                    break
+                time.sleep(.1)
+
+            self.assertEqual(m.numProcs, 2)
+            self.assertTrue(m.rss > 0)
+
+        finally:
+            p.kill()
+            p.wait()
+
+
+if __name__ == "__main__":
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestProcSampler)
+    unittest.TextTestRunner(verbosity=2).run(suite)
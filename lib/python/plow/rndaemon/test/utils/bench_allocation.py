@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+"""
+bench_allocation.py
+
+Simulates tasks of mixed sizes being booked onto and released
+from a node, and compares how the cores are handed out by the
+old policy, which pops the next free slot off a queue, against
+the NUMA aware CoreAllocator.
+
+For each policy it reports:
+
+    local    % of tasks that fit on one socket and were given one
+    spanned  average number of sockets a task was spread over
+    block    average size of the largest free block of cores on
+             one socket, seen each time a task is booked
+"""
+
+import sys
+import random
+
+from collections import deque
+
+from plow.rndaemon.allocator import CoreAllocator, AllocationError
+
+
+class DequeAllocator(object):
+    """ The allocation the rndaemon used before CoreAllocator """
+
+    def __init__(self, groups):
+        self.__slotGroup = dict((s, i) for i, g in enumerate(groups) for s in g)
+        self.__slots = deque(sorted(self.__slotGroup))
+        self.groups = groups
+
+    def getFree(self):
+        return sorted(self.__slots)
+
+    def checkout(self, numCores):
+        if numCores > len(self.__slots):
+            raise AllocationError()
+        return [self.__slots.pop() for _ in xrange(numCores)]
+
+    def checkin(self, slots):
+        self.__slots.extend(slots)
+
+    def spanned(self, slots):
+        return set(self.__slotGroup[s] for s in slots)
+
+
+def simulate(alloc, sizes, groupSize, steps, seed):
+    rnd = random.Random(seed)
+    running = []
+
+    fit = local = tasks = spanned = 0
+    blocks = 0
+
+    for _ in xrange(steps):
+        # finish some tasks
+        if running and rnd.random() < .5:
+            alloc.checkin(running.pop(rnd.randrange(len(running))))
+
+        size = rnd.choice(sizes)
+        free = set(alloc.getFree())
+        blocks += max(len(free.intersection(g)) for g in alloc.groups)
+
+        try:
+            slots = alloc.checkout(size)
+        except AllocationError:
+            continue
+
+        groups = alloc.spanned(slots)
+        tasks += 1
+        spanned += len(groups)
+        if size <= groupSize:
+            fit += 1
+            local += len(groups) == 1
+
+        running.append(slots)
+
+    return (100.0 * local / max(fit, 1), float(spanned) / max(tasks, 1), float(blocks) / steps)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Compare core allocation policies for locality and fragmentation',
+        usage='%(prog)s [opts]',
+    )
+
+    parser.add_argument("-sockets", type=int, default=2,
+        help="Number of sockets / NUMA nodes")
+
+    parser.add_argument("-cores", type=int, default=8,
+        help="Number of cores per socket")
+
+    parser.add_argument("-sizes", type=int, nargs='+', default=[1, 2, 4, 8],
+        help="Task sizes, in cores, to pick from")
+
+    parser.add_argument("-steps", type=int, default=100000,
+        help="Number of tasks to try to book")
+
+    parser.add_argument("-seed", type=int, default=0,
+        help="Random seed")
+
+    args = parser.parse_args()
+
+    groups = [range(i * args.cores, (i + 1) * args.cores) for i in xrange(args.sockets)]
+
+    print "%-10s %-10s %-10s %-10s" % ("policy", "local %", "spanned", "block")
+
+    for name, cls in (("deque", DequeAllocator), ("numa", CoreAllocator)):
+        local, spanned, block = simulate(cls(groups), args.sizes, args.cores, args.steps, args.seed)
+        print "%-10s %-10.1f %-10.2f %-10.2f" % (name, local, spanned, block)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+"""
+bench_logging.py
+
+Compares the rate at which task output can be logged by
+the old line by line path (readline, a line buffered log
+file and a progress regex on every line) against the
+streaming path (chunked reads, a background LogWriter
+and progress parsing on the newest lines only).
+
+A child process prints lines as fast as it can, with a
+progress line every so often. Use -latency to add a delay
+to every write and flush on the log file, to stand in for
+a log directory on a slow NFS mount.
+"""
+
+import os
+import sys
+import time
+import errno
+import tempfile
+import subprocess
+
+from plow.rndaemon.utils import ProcessLogParser, LogWriter, OutputTracker
+
+
+CHILD_CMD = """
+import sys
+out = sys.stdout
+for i in xrange(%d):
+    if i %% 100 == 0:
+        out.write("Progress: %%d/%%d\\n" %% (i, %d))
+    else:
+        out.write("Rendering tile %%d of a very chatty render with some detail\\n" %% i)
+"""
+
+PATTERN = r'^Progress: (\d+/\d+)$'
+
+
+class SlowFile(object):
+    """
+    File wrapper that sleeps on each write and flush
+    """
+    def __init__(self, fileObj, latency):
+        self._fileObj = fileObj
+        self._latency = latency
+
+    def write(self, data):
+        if self._latency:
+            time.sleep(self._latency)
+        self._fileObj.write(data)
+
+    def flush(self):
+        if self._latency:
+            time.sleep(self._latency)
+        self._fileObj.flush()
+
+
+def launch(num_lines):
+    code = CHILD_CMD % (num_lines, num_lines)
+    return subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE)
+
+
+def bench_lines(path, num_lines, latency):
+    """
+    The _ProcessThread.run() loop before the streaming pipeline
+    """
+    parser = ProcessLogParser([PATTERN])
+    progress = 0.0
+
+    with open(path, 'w', 1) as fh:
+        logfp = SlowFile(fh, latency)
+
+        start = time.time()
+        p = launch(num_lines)
+
+        for line in iter(p.stdout.readline, ""):
+            logfp.write(line)
+            lastLog = line
+            prog = parser.parseProgress(line)
+            if prog is not None:
+                progress = prog
+
+        p.wait()
+        elapsed = time.time() - start
+
+    return elapsed, progress
+
+
+def bench_stream(path, num_lines, latency):
+    """
+    The streaming _ProcessThread.run() loop
+    """
+    tracker = OutputTracker(ProcessLogParser([PATTERN]))
+
+    with open(path, 'w') as fh:
+        writer = LogWriter(SlowFile(fh, latency))
+        writer.start()
+
+        start = time.time()
+        p = launch(num_lines)
+        fd = p.stdout.fileno()
+
+        while True:
+            try:
+                chunk = os.read(fd, 64 * 1024)
+            except OSError, e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            if not chunk:
+                break
+            writer.write(chunk)
+            tracker.feed(chunk)
+
+        p.wait()
+        read_elapsed = time.time() - start
+
+        writer.close()
+        elapsed = time.time() - start
+
+    return read_elapsed, elapsed, tracker.progress
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark line by line task logging against the streaming log pipeline',
+        usage='%(prog)s [opts]',
+    )
+
+    parser.add_argument("-lines", type=int, default=200000,
+        help="Number of lines the task prints")
+
+    parser.add_argument("-latency", type=float, nargs='+', default=[0, 0.0001, 0.001],
+        help="Seconds of latency to add to each log write and flush")
+
+    parser.add_argument("-dir", default=None,
+        help="Directory to write the logs to (default: a temp dir)")
+
+    args = parser.parse_args()
+
+    path = tempfile.NamedTemporaryFile(prefix='plow-bench-log', dir=args.dir, delete=False).name
+
+    print "%-10s %-14s %-14s %-14s %-10s" % (
+        "latency", "lines/s", "stream lines/s", "incl. drain", "speedup")
+
+    try:
+        for latency in args.latency:
+            t_lines, prog_a = bench_lines(path, args.lines, latency)
+            t_read, t_stream, prog_b = bench_stream(path, args.lines, latency)
+
+            if round(prog_a, 3) != round(prog_b, 3):
+                print "Progress mismatch: %s != %s" % (prog_a, prog_b)
+
+            print "%-10g %-14.0f %-14.0f %-14.0f %-10.2f" % (
+                latency,
+                args.lines / t_lines,
+                args.lines / t_read,
+                args.lines / t_stream,
+                t_lines / t_read)
+    finally:
+        os.unlink(path)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
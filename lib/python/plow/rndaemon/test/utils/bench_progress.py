@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+"""
+bench_progress.py
+
+Times progress parsing over the recorded blender and mental
+ray logs in test/data, comparing the old ProcessLogParser,
+which compiled its patterns for every task and ran the regex
+and literal_eval on every line, against the current one, with
+its shared parsers, plain text prefilter and float parsing.
+
+For each log it reports the time taken to:
+
+    build    get a parser for a task, -tasks times
+    lines    parse every line of the log, one at a time
+    chunks   parse the last progress of each -chunk bytes
+             of output, as the rndaemon does
+"""
+
+import os
+import re
+import sys
+import time
+
+from ast import literal_eval
+
+from plow.rndaemon import conf
+from plow.rndaemon.utils import ProcessLogParser
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+CORPORA = {
+    'blender': ('blender.log', r'^Fra:\d+ .*? \| Rendering \| .*? (\d+/\d+)$'),
+    'mray': ('mentalRay.log', r'^JOB[\w. ]+:\s+([\d.]+%)\s+'),
+}
+
+
+class LegacyParser(object):
+    """ The ProcessLogParser before the registry and prefilter """
+
+    def __init__(self, progPatterns=None):
+        pattern = '|'.join('(?:%s)' % r for r in progPatterns if r)
+        self.progress = re.compile(pattern)
+        self._multiline = re.compile(pattern, re.MULTILINE)
+
+    def parseProgress(self, line):
+        match = re.search(self.progress, line.rstrip())
+        if not match:
+            return None
+        prog = next((i for i in match.groups() if i), None)
+        if not prog:
+            return None
+        return self._toProgress(prog)
+
+    def parseLastProgress(self, text):
+        if '\r' in text:
+            text = text.replace('\r\n', '\n')
+        match = None
+        for match in self._multiline.finditer(text):
+            pass
+        if match is None:
+            return None
+        prog = next((i for i in match.groups() if i), None)
+        if not prog:
+            return None
+        return self._toProgress(prog.rstrip())
+
+    @staticmethod
+    def _toProgress(prog):
+        if prog[-1] == '%':
+            try:
+                return literal_eval(prog[:-1]) / 100.0
+            except (ValueError, SyntaxError):
+                pass
+        try:
+            prog_val = literal_eval(prog)
+        except ValueError:
+            try:
+                a, b = prog.split('/', 1)
+                prog_val = float(a) / float(b)
+            except ValueError:
+                return None
+            except ZeroDivisionError:
+                prog_val = 0.0
+        if 1 < prog_val <= 100:
+            prog_val /= 100.0
+        return prog_val
+
+    @classmethod
+    def fromTaskTypes(cls, taskTypes):
+        return cls(progPatterns=[conf.TASK_PROGRESS_PATTERNS.get(t) for t in taskTypes])
+
+
+def timeit(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+
+def build(cls, taskType, tasks):
+    for _ in xrange(tasks):
+        parser = cls.fromTaskTypes([taskType])
+    return parser
+
+
+def parseLines(parser, lines):
+    found = 0
+    for line in lines:
+        if parser.parseProgress(line) is not None:
+            found += 1
+    return found
+
+
+def parseChunks(parser, data, size):
+    last = None
+    for i in xrange(0, len(data), size):
+        # like OutputTracker, parse up to the last line break
+        chunk = data[i:i + size]
+        prog = parser.parseLastProgress(chunk[:chunk.rfind('\n') + 1])
+        if prog is not None:
+            last = prog
+    return last
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Compare the speed of the old and new task progress parsers',
+        usage='%(prog)s [opts]',
+    )
+
+    parser.add_argument("-corpus", nargs='+', choices=sorted(CORPORA), default=sorted(CORPORA),
+        help="Recorded logs to parse")
+
+    parser.add_argument("-repeat", type=int, default=200,
+        help="Number of times to repeat each log, to make it larger")
+
+    parser.add_argument("-chunk", type=int, default=4096,
+        help="Size of the output chunks, in bytes")
+
+    parser.add_argument("-tasks", type=int, default=10000,
+        help="Number of tasks to get a parser for")
+
+    args = parser.parse_args()
+
+    conf.TASK_PROGRESS_PATTERNS = dict((name, pat) for name, (_, pat) in CORPORA.iteritems())
+
+    print "%-10s %-8s %-10s %-10s %-10s %-10s" % (
+        "log", "parser", "build (s)", "lines (s)", "chunks (s)", "progress")
+
+    for name in args.corpus:
+        filename, _ = CORPORA[name]
+        with open(os.path.join(DATA_DIR, filename)) as fh:
+            data = fh.read() * args.repeat
+        lines = data.splitlines(True)
+
+        for label, cls in (("old", LegacyParser), ("new", ProcessLogParser)):
+            buildTime, p = timeit(build, cls, name, args.tasks)
+            linesTime, found = timeit(parseLines, p, lines)
+            chunksTime, last = timeit(parseChunks, p, data, args.chunk)
+
+            print "%-10s %-8s %-10.3f %-10.3f %-10.3f %d / %s" % (
+                name, label, buildTime, linesTime, chunksTime, found, last)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
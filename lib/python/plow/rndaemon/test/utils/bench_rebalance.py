@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+"""
+bench_rebalance.py
+
+Simulates a node working through a queue of mixed tasks, and
+compares the makespan with each task held to its booked cores
+against letting threadable tasks share the cores no task has
+booked, as the rndaemon does with share_idle_cores.
+
+Tasks are booked first fit from the queue whenever enough
+cores are free. A task's work is in core seconds. Single
+threaded tasks book and use one core. Threadable tasks book
+one of -sizes cores, and run on those plus an equal share of
+the idle cores, each of which does -efficiency of the work
+of a booked core. Idle cores show up when nothing left in the
+queue fits, most of all as the queue drains.
+"""
+
+import sys
+import random
+
+
+class Task(object):
+
+    def __init__(self, cores, work, threadable):
+        self.cores = cores
+        self.work = work
+        self.threadable = threadable
+        self.remaining = work
+
+
+def makeWorkload(num, sizes, threadable, seed):
+    rnd = random.Random(seed)
+    tasks = []
+    for _ in xrange(num):
+        isThreadable = rnd.random() < threadable
+        cores = rnd.choice(sizes) if isThreadable else 1
+        work = rnd.lognormvariate(4, .75) * cores
+        tasks.append((cores, work, isThreadable))
+    return tasks
+
+
+def simulate(workload, totalCores, share, efficiency):
+    """
+    simulate(list workload, int totalCores, bool share, float efficiency)
+        -> (float makespan, float utilization)
+    """
+    queue = [Task(*t) for t in workload if t[0] <= totalCores]
+    running = []
+    now = 0.0
+    busy = 0.0
+
+    while queue or running:
+        # book tasks, first fit
+        free = totalCores - sum(t.cores for t in running)
+        for task in list(queue):
+            if task.cores <= free:
+                queue.remove(task)
+                running.append(task)
+                free -= task.cores
+
+        borrowers = [t for t in running if t.threadable]
+        extra = float(free) / len(borrowers) if (share and borrowers) else 0.0
+
+        rates = {}
+        for task in running:
+            rates[task] = task.cores
+            if task.threadable:
+                rates[task] += extra * efficiency
+
+        # cores kept busy
+        used = sum(t.cores + (extra if t.threadable else 0) for t in running)
+
+        step = min(t.remaining / rates[t] for t in running)
+        now += step
+        busy += step * used
+
+        for task in list(running):
+            task.remaining -= rates[task] * step
+            if task.remaining <= 1e-9:
+                running.remove(task)
+
+    return now, 100.0 * busy / (now * totalCores)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Compare the makespan of a mixed workload with and without sharing idle cores',
+        usage='%(prog)s [opts]',
+    )
+
+    parser.add_argument("-cores", type=int, default=16,
+        help="Number of physical cores on the node")
+
+    parser.add_argument("-tasks", type=int, default=200,
+        help="Number of tasks in the queue")
+
+    parser.add_argument("-sizes", type=int, nargs='+', default=[1, 2, 4, 8],
+        help="Booked core counts to pick from")
+
+    parser.add_argument("-threadable", type=float, nargs='+', default=[.25, .5, .75],
+        help="Fractions of the tasks that are threadable, one run each")
+
+    parser.add_argument("-efficiency", type=float, default=.8,
+        help="Work done by a borrowed core, relative to a booked one")
+
+    parser.add_argument("-seed", type=int, default=0,
+        help="Random seed")
+
+    args = parser.parse_args()
+
+    print "%-12s %-14s %-14s %-10s %-10s %-10s" % (
+        "threadable", "static (s)", "shared (s)", "speedup", "static %", "shared %")
+
+    for frac in args.threadable:
+        workload = makeWorkload(args.tasks, args.sizes, frac, args.seed)
+        static, staticUtil = simulate(workload, args.cores, False, args.efficiency)
+        shared, sharedUtil = simulate(workload, args.cores, True, args.efficiency)
+
+        print "%-12.2f %-14.1f %-14.1f %-10.2f %-10.1f %-10.1f" % (
+            frac, static, shared, static / shared, staticUtil, sharedUtil)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
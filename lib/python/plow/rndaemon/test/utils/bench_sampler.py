@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+"""
+bench_sampler.py
+
+Compares the cost of sampling the metrics of running tasks
+with a psutil walk of each task's process tree, against a
+single batched scan of /proc with the ProcSampler.
+
+Launches a number of fake "tasks", each being a process
+with a number of sleeping children, and times both
+approaches over several sampling passes.
+"""
+
+import sys
+import time
+import subprocess
+
+from itertools import chain
+
+import psutil
+
+from plow.rndaemon.sampler import ProcSampler
+
+
+CHILD_CMD = "import time; time.sleep(%d)"
+TASK_CMD = """
+import subprocess, sys, time
+procs = [subprocess.Popen([sys.executable, '-c', %r]) for _ in xrange(%d)]
+time.sleep(%d)
+"""
+
+
+def launch_tasks(num_tasks, num_children, secs):
+    """
+    launch_tasks(int num_tasks, int num_children, int secs) -> list Popen
+    """
+    child = CHILD_CMD % secs
+    code = TASK_CMD % (child, num_children, secs)
+    return [subprocess.Popen([sys.executable, '-c', code]) for _ in xrange(num_tasks)]
+
+
+def psutil_sample(pid):
+    """
+    The per-task sampling done by _ProcessThread.updateMetrics()
+    """
+    rss_bytes = 0
+    cpu_perc = 0
+    disk_io = [0, 0, 0, 0]
+
+    try:
+        p = psutil.Process(pid)
+
+        for proc in chain([p], p.children(True)):
+            if proc.status() == psutil.STATUS_ZOMBIE:
+                continue
+
+            try:
+                rss_bytes += proc.memory_info().rss
+            except psutil.Error:
+                pass
+
+            try:
+                cpu_perc += proc.cpu_percent(None)
+            except psutil.Error:
+                pass
+
+            try:
+                counters = proc.io_counters()
+            except (psutil.Error, AttributeError):
+                pass
+            else:
+                for i, val in enumerate(counters[:4]):
+                    disk_io[i] += val
+
+    except psutil.NoSuchProcess:
+        pass
+
+    return rss_bytes, cpu_perc, disk_io
+
+
+def bench_psutil(pids, passes):
+    start = time.time()
+    for _ in xrange(passes):
+        for pid in pids:
+            psutil_sample(pid)
+    return time.time() - start
+
+
+def bench_batched(pids, passes):
+    sampler = ProcSampler()
+    start = time.time()
+    for _ in xrange(passes):
+        sampler.sample(pids)
+    return time.time() - start
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark per-task psutil sampling against a batched /proc scan',
+        usage='%(prog)s [opts]',
+    )
+
+    parser.add_argument("-tasks", type=int, nargs='+', default=[1, 8, 32, 64],
+        help="Numbers of running tasks to benchmark")
+
+    parser.add_argument("-children", type=int, default=4,
+        help="Number of child processes in each task")
+
+    parser.add_argument("-passes", type=int, default=20,
+        help="Number of sampling passes to time")
+
+    args = parser.parse_args()
+
+    if not ProcSampler.isSupported():
+        print "This platform has no /proc filesystem"
+        sys.exit(1)
+
+    print "%-8s %-8s %-14s %-14s %-10s" % ("tasks", "procs", "psutil ms", "batched ms", "speedup")
+
+    for num in args.tasks:
+        tasks = launch_tasks(num, args.children, 600)
+
+        try:
+            pids = [t.pid for t in tasks]
+
+            # wait for the children to start
+            sampler = ProcSampler()
+            expected = num * (args.children + 1)
+            for _ in xrange(100):
+                samples = sampler.sample(pids, io=False)
+                if sum(m.numProcs for m in samples.itervalues()) >= expected:
+                    break
+                time.sleep(.1)
+
+            t_psutil = bench_psutil(pids, args.passes) / args.passes
+            t_batched = bench_batched(pids, args.passes) / args.passes
+
+            print "%-8d %-8d %-14.3f %-14.3f %-10.2f" % (
+                num, expected, t_psutil * 1000, t_batched * 1000, t_psutil / t_batched)
+
+        finally:
+            for t in tasks:
+                try:
+                    for p in psutil.Process(t.pid).children(True):
+                        p.kill()
+                except psutil.Error:
+                    pass
+                t.kill()
+                t.wait()
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
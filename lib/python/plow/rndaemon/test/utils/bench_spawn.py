@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+"""
+bench_spawn.py
+
+Compares the latency of starting a task by forking the daemon
+with subprocess.Popen and a preexec_fn, as the rndaemon does
+without the launcher, against asking the launcher process to
+start it.
+
+To stand in for a busy daemon, the benchmark process grows
+its memory by -mb and starts -threads busy threads before each
+round. The Popen path slows down as the daemon grows, while
+the launcher forks from its own small process.
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+
+from functools import partial
+
+from plow.rndaemon.launcher import Launcher, PIPE, STDOUT
+
+
+def _preexec_fn(cpus):
+    # What the Linux profiler does between fork and exec
+    import psutil
+    p = psutil.Process(os.getpid())
+    if cpus and hasattr(p, 'cpu_affinity'):
+        p.cpu_affinity(cpus)
+
+
+def spawn_popen(cmd, cpus):
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                         preexec_fn=partial(_preexec_fn, cpus))
+    return p
+
+
+def spawn_launcher(launcher, cmd, cpus):
+    return launcher.spawn(cmd, stdout=PIPE, stderr=STDOUT, cpus=cpus)
+
+
+def time_spawns(spawn, num):
+    """
+    time_spawns(callable spawn, int num) -> list float
+
+    Return the seconds taken by each call to spawn(),
+    which returns once the command has been exec'd.
+    """
+    times = []
+    for _ in xrange(num):
+        start = time.time()
+        p = spawn()
+        times.append(time.time() - start)
+
+        p.stdout.read()
+        p.stdout.close()
+        p.wait()
+    return times
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(xrange(1000))
+
+
+def stats(times):
+    times = sorted(times)
+    mean = sum(times) / len(times)
+    p95 = times[min(int(len(times) * .95), len(times) - 1)]
+    return mean * 1000, p95 * 1000
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark task spawn latency with and without the launcher process',
+        usage='%(prog)s [opts]',
+    )
+
+    parser.add_argument("-mb", type=int, nargs='+', default=[0, 512, 2048],
+        help="MB of memory to grow the daemon by, for each round")
+
+    parser.add_argument("-threads", type=int, default=16,
+        help="Number of busy threads to run in the daemon")
+
+    parser.add_argument("-spawns", type=int, default=50,
+        help="Number of tasks to start for each method")
+
+    args = parser.parse_args()
+
+    cmd = ['true']
+    cpus = [0]
+
+    launcher = Launcher()
+    launcher.start()
+
+    stop = threading.Event()
+    threads = [threading.Thread(target=busy_loop, args=(stop,)) for _ in xrange(args.threads)]
+    for t in threads:
+        t.daemon = True
+        t.start()
+
+    print "%-8s %-8s %-12s %-12s %-14s %-14s" % (
+        "rss mb", "threads", "popen ms", "popen p95", "launcher ms", "launcher p95")
+
+    ballast = []
+    grown = 0
+
+    try:
+        for mb in sorted(args.mb):
+            # touch every page so it is really mapped
+            while grown < mb:
+                ballast.append(bytearray(1024 * 1024))
+                grown += 1
+
+            t_popen = stats(time_spawns(partial(spawn_popen, cmd, cpus), args.spawns))
+            t_launch = stats(time_spawns(partial(spawn_launcher, launcher, cmd, cpus), args.spawns))
+
+            print "%-8d %-8d %-12.3f %-12.3f %-14.3f %-14.3f" % (
+                mb, args.threads, t_popen[0], t_popen[1], t_launch[0], t_launch[1])
+    finally:
+        stop.set()
+        launcher.stop()
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
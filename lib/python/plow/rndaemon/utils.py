@@ -3,11 +3,15 @@ import os
 import time
 import re
 import errno
+import sre_parse
+import sre_constants
 import logging
 import socket
-from ast import literal_eval
+import threading
+from collections import deque
 
 import conf
+import blocklog
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +27,40 @@ class ProcessLog(object):
     Writes headers and footers. 
 
     Passes all standard file methods through to the file 
-    object. 
+    object. The last tailBytes written are also kept in
+    memory, to serve readers of the live log.
+
+    If compress is True, the log is written block compressed
+    to name + '.gz', along with its block index.
+
+    If maxBytes is set, the log keeps the first and the last
+    maxBytes / 2 written to it. Once the first half is written,
+    output goes to a LogSpill beside the log, and the last half
+    is copied into the log when it is closed, along with the
+    number of lines and bytes dropped in between.
     """
-    def __init__(self, name, mode='w', buffering=-1, uid=None):
+    def __init__(self, name, mode='w', buffering=-1, uid=None, tailBytes=1024*1024, 
+                 compress=False, maxBytes=0):
         old_mask = os.umask(0)
         self.makeLogDir(name)
-        self._fileObj = open(name, mode, buffering)
+        if compress:
+            self._fileObj = blocklog.BlockLogWriter(name + blocklog.SUFFIX)
+        else:
+            self._fileObj = open(name, mode, buffering)
         os.umask(old_mask)
 
+        self.compressed = compress
+
+        self.tail = LogTail(tailBytes)
+
+        self.maxBytes = maxBytes
+        self.droppedLines = 0
+        self.droppedBytes = 0
+        self.__name = name
+        self.__headBytes = maxBytes / 2
+        self.__spill = None
+        self.__spilled = False
+
         self.__host = socket.getfqdn()
 
         if uid is None:
@@ -39,7 +69,11 @@ class ProcessLog(object):
         folder = os.path.dirname(name)
         gid = os.getgid()
 
-        for elem in (folder, name):
+        paths = [folder, self._fileObj.name]
+        if compress:
+            paths.append(self._fileObj.indexName)
+
+        for elem in paths:
             try:
                 os.chmod(elem, 0777)
             except Exception, e:
@@ -53,15 +87,93 @@ class ProcessLog(object):
 
     def __del__(self):
         try:
-            self._fileObj.close()
+            self.close()
         except:
             pass
 
     def __getattr__(self, name):
         return getattr(self._fileObj, name)
 
+    def write(self, data):
+        spill = self.__spill
+
+        if spill is None and self.maxBytes and not self.__spilled:
+            room = self.__headBytes - self.tail.size
+            if len(data) > room:
+                logger.warn("Log %s reached its limit of %d bytes, keeping only "
+                            "the end of the rest", self.__name, self.maxBytes)
+                room = max(room, 0)
+                self._fileObj.write(data[:room])
+                self.__spill = LogSpill(self.__name, self.maxBytes - self.__headBytes)
+                self.__spill.write(data[room:])
+                self.tail.append(data)
+                return
+
+        if spill is None:
+            self._fileObj.write(data)
+        else:
+            spill.write(data)
+
+        self.tail.append(data)
+
+    def close(self):
+        self.__closeSpill()
+        self._fileObj.close()
+
+    def __closeSpill(self):
+        # Copy the end of a log that reached its limit into the log
+        spill = self.__spill
+        if spill is None:
+            return
+
+        self.__spill = None
+        self.__spilled = True
+
+        spill.trim()
+        self.droppedLines = spill.droppedLines
+        self.droppedBytes = spill.droppedBytes
+
+        self._fileObj.write("\n\n[%s] Log limit of %d bytes reached, dropped %d lines (%d bytes)\n\n" 
+            % (time.strftime("%Y-%m-%d %H:%M:%S"), self.maxBytes, self.droppedLines, self.droppedBytes))
+
+        spill.drain(self._fileObj)
+
+    def readableOffset(self, offset):
+        """
+        readableOffset(int offset) -> int
+
+        The offset to read from in place of the given one. Once 
+        the log reaches its limit, the output past the first half 
+        can only be read from what is still held in memory.
+        """
+        if self.__spill is not None and self.__headBytes <= offset < self.tail.start:
+            return self.tail.start
+        return offset
+
+    def readBytes(self, offset, maxBytes):
+        """
+        readBytes(int offset, int maxBytes) -> (str data, int size)
+
+        Read up to maxBytes of the log from offset, along with the
+        number of bytes written to the log so far. Recent bytes come
+        from memory, and older ones from the file.
+        """
+        tail = self.tail
+        size = tail.size
+
+        data = tail.read(offset, maxBytes)
+        if data is None and self.compressed:
+            reader = blocklog.BlockLogReader(self._fileObj.name)
+            data = reader.read(offset, min(maxBytes, tail.start - offset))
+        elif data is None:
+            with open(self._fileObj.name, 'rb') as fh:
+                fh.seek(offset)
+                data = fh.read(min(maxBytes, tail.start - offset))
+
+        return data, size
+
     def writeLogHeader(self, rtc):
-        fileObj = self._fileObj
+        fileObj = self
 
         now = time.strftime("%Y-%m-%d %H:%M:%S")
         fileObj.write("[%s] Render Process Begin\n" \
@@ -86,12 +198,19 @@ class ProcessLog(object):
 
         Closes the log file when done.
         """
-        fileObj = self._fileObj
-        if not fileObj or fileObj.closed:
+        if not self._fileObj or self._fileObj.closed:
             return
 
+        fileObj = self
         fileObj.flush()
 
+        self.__closeSpill()
+
+        attrs = dict(attrs or {})
+        if self.droppedBytes:
+            attrs['Dropped Lines'] = self.droppedLines
+            attrs['Dropped Bytes'] = self.droppedBytes
+
         if attrs:
             extra = '\n'.join('%s: %s' % (k,v) for k,v in attrs.iteritems()) + "\n"
         else:
@@ -119,6 +238,28 @@ class ProcessLog(object):
 
         fileObj.close() 
 
+    @staticmethod
+    def limitForTaskTypes(taskTypes):
+        """
+        limitForTaskTypes(str|list taskTypes) -> int
+
+        The log limit in bytes for a task of the given types, 
+        from the task_log_limits section of the rndaemon config, 
+        or the max_log_mb task option. 0 means no limit.
+        """
+        if isinstance(taskTypes, (str, unicode)):
+            taskTypes = [taskTypes]
+
+        limits = [conf.TASK_LOG_LIMITS[t] for t in taskTypes or [] if t in conf.TASK_LOG_LIMITS]
+        if not limits:
+            limitMb = conf.TASK_MAX_LOG_MB
+        elif 0 in limits:
+            limitMb = 0
+        else:
+            limitMb = max(limits)
+
+        return limitMb * 1024 * 1024
+
     @staticmethod 
     def makeLogDir(path):
         """
@@ -157,19 +298,546 @@ class ProcessLog(object):
         logger.debug("Created log directory: %r", folder)
 
 
+class LogTail(object):
+    """
+    LogTail
+
+    Keeps the last maxBytes of the data appended to a log,
+    along with the total size of the log.
+    """
+
+    def __init__(self, maxBytes=1024*1024):
+        self.maxBytes = maxBytes
+        self.size = 0
+
+        self.__chunks = deque()
+        self.__len = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def start(self):
+        """
+        The log offset of the oldest byte still held
+        """
+        return self.size - self.__len
+
+    def append(self, data):
+        if not data:
+            return
+
+        with self.__lock:
+            self.__chunks.append(data)
+            self.__len += len(data)
+            self.size += len(data)
+
+            chunks = self.__chunks
+            excess = self.__len - self.maxBytes
+            while excess > 0:
+                first = chunks[0]
+                if len(first) <= excess:
+                    chunks.popleft()
+                    cut = len(first)
+                else:
+                    chunks[0] = first[excess:]
+                    cut = excess
+                self.__len -= cut
+                excess -= cut
+
+    def read(self, offset, maxBytes):
+        """
+        read(int offset, int maxBytes) -> str
+
+        Up to maxBytes from the log offset. Returns None 
+        if the offset is older than what is held.
+        """
+        with self.__lock:
+            skip = offset - (self.size - self.__len)
+            if skip < 0:
+                return None
+
+            out = []
+            for chunk in self.__chunks:
+                if maxBytes <= 0:
+                    break
+                if skip >= len(chunk):
+                    skip -= len(chunk)
+                    continue
+                piece = chunk[skip:skip + maxBytes]
+                skip = 0
+                out.append(piece)
+                maxBytes -= len(piece)
+
+            return ''.join(out)
+
+
+class LogSpill(object):
+    """
+    LogSpill
+
+    Keeps the last maxBytes written to it on disk, in two 
+    segment files beside the log that take turns, counting 
+    the lines and bytes that are dropped. Disk use is at most 
+    2 * maxBytes, and nothing is held in memory.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, name, maxBytes):
+        self.maxBytes = max(maxBytes, 1)
+        self.droppedLines = 0
+        self.droppedBytes = 0
+
+        self.__names = [name + '.spill0', name + '.spill1']
+        self.__files = [open(n, 'w+b') for n in self.__names]
+        self.__sizes = [0, 0]
+        self.__lines = [0, 0]
+        self.__current = 0
+        self.__skip = 0
+
+    def write(self, data):
+        while data:
+            cur = self.__current
+            room = self.maxBytes - self.__sizes[cur]
+            if room <= 0:
+                # The older segment is now more than 
+                # maxBytes behind, so drop it.
+                old = 1 - cur
+                self.droppedLines += self.__lines[old]
+                self.droppedBytes += self.__sizes[old]
+                self.__files[old].seek(0)
+                self.__files[old].truncate()
+                self.__sizes[old] = self.__lines[old] = 0
+                self.__current = old
+                continue
+
+            piece = data[:room]
+            self.__files[cur].write(piece)
+            self.__sizes[cur] += len(piece)
+            self.__lines[cur] += piece.count('\n')
+            data = data[room:]
+
+    def flush(self):
+        for fh in self.__files:
+            fh.flush()
+
+    def trim(self):
+        """
+        Drop the start of the older segment, past the last 
+        maxBytes, up to the next line break.
+        """
+        self.flush()
+
+        old = 1 - self.__current
+        excess = sum(self.__sizes) - self.maxBytes
+        if excess <= 0 or not self.__sizes[old]:
+            return
+
+        fh = self.__files[old]
+        fh.seek(0)
+        skip = 0
+        while skip < self.__sizes[old]:
+            chunk = fh.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            brk = chunk.find('\n', max(excess - skip, 0))
+            if brk != -1:
+                chunk = chunk[:brk + 1]
+            skip += len(chunk)
+            self.droppedLines += chunk.count('\n')
+            if brk != -1:
+                break
+
+        self.droppedBytes += skip
+        self.__skip = skip
+
+    def drain(self, fileObj):
+        """
+        drain(file fileObj)
+
+        Copy what is kept to fileObj, and remove the segments.
+        """
+        self.flush()
+
+        cur = self.__current
+        for i, skip in ((1 - cur, self.__skip), (cur, 0)):
+            fh = self.__files[i]
+            fh.seek(skip)
+            while True:
+                chunk = fh.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                fileObj.write(chunk)
+
+        for fh, name in zip(self.__files, self.__names):
+            fh.close()
+            try:
+                os.unlink(name)
+            except OSError, e:
+                logger.warn("Failed to remove log spill file %s: %s", name, e)
+
+
+class _PendingLog(object):
+    """
+    The output queued for one log by a LogWriter
+    """
+    __slots__ = ('fileObj', 'chunks', 'size', 'syncs', 
+                 'queued', 'busy', 'dirty', 'lastFlush')
+
+    def __init__(self, fileObj):
+        self.fileObj = fileObj
+        self.chunks = []
+        self.size = 0
+        self.syncs = []
+        self.queued = False
+        self.busy = False
+        self.dirty = False
+        self.lastFlush = time.time()
+
+
+class LogWriter(threading.Thread):
+    """
+    LogWriter
+
+    Writes task output to log files from background threads,
+    so that a slow log filesystem does not hold up the task.
+
+    Chunks passed to write() are queued in memory, and written 
+    out together in large writes. The files are flushed every 
+    flushInterval seconds. 
+
+    A writer can serve a single log given to the constructor,
+    or the logs of many tasks by passing the file to write(). 
+    Each log is written by one thread at a time, out of a pool 
+    of the given number of threads, so a log on a hung 
+    filesystem only holds up the logs queued behind it. 
+
+    Once a log has maxBuffer bytes waiting to be written, 
+    write() blocks until the writer catches up, or with 
+    block=False, takes the chunk and returns False so the 
+    caller can stop reading more output for that log.
+    """
+
+    def __init__(self, fileObj=None, maxBuffer=4*1024*1024, flushInterval=1.0, threads=1):
+        threading.Thread.__init__(self)
+        self.daemon = True
+
+        self.fileObj = fileObj
+        self.maxBuffer = maxBuffer
+        self.flushInterval = flushInterval
+        self.threads = max(int(threads), 1)
+
+        self.bytesWritten = 0
+
+        # fileObj -> _PendingLog
+        self.__logs = {}
+        self.__ready = deque()
+        self.__workers = []
+        self.__closed = False
+        self.__errors = {}
+        self.__cond = threading.Condition(threading.Lock())
+
+    @property
+    def error(self):
+        """
+        The write error of the constructor's log, if any
+        """
+        return self.__errors.get(self.fileObj)
+
+    def start(self):
+        threading.Thread.start(self)
+
+        for i in xrange(self.threads - 1):
+            t = threading.Thread(target=self.run, name="%s-%d" % (self.name, i+1))
+            t.daemon = True
+            t.start()
+            self.__workers.append(t)
+
+    def write(self, data, fileObj=None, block=True):
+        """
+        write(str data, file fileObj=None, bool block=True) -> bool
+
+        Queue data to be written to a log. Returns False if 
+        the log has maxBuffer bytes or more waiting. 
+        """
+        if not data:
+            return True
+
+        if fileObj is None:
+            fileObj = self.fileObj
+
+        with self.__cond:
+            while True:
+                log = self.__getLog(fileObj)
+                if not block or log.size < self.maxBuffer or self.__closed:
+                    break
+                self.__cond.wait()
+
+            log.chunks.append(data)
+            log.size += len(data)
+            self.__schedule(log)
+
+            return log.size < self.maxBuffer
+
+    def pending(self, fileObj=None):
+        """
+        pending(file fileObj=None) -> int
+
+        The number of bytes waiting to be written to a log
+        """
+        if fileObj is None:
+            fileObj = self.fileObj
+
+        with self.__cond:
+            log = self.__logs.get(fileObj)
+            return log.size if log is not None else 0
+
+    def sync(self, fileObj=None, timeout=None):
+        """
+        sync(file fileObj=None, float timeout=None) -> bool
+
+        Block until everything queued for a log has been 
+        written and flushed, after which the caller may use 
+        the file directly again. Returns False on a timeout.
+        """
+        if fileObj is None:
+            fileObj = self.fileObj
+
+        done = threading.Event()
+
+        with self.__cond:
+            if self.__closed or not self.isAlive():
+                return True
+            log = self.__getLog(fileObj)
+            log.syncs.append(done)
+            self.__schedule(log)
+
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """
+        close(float timeout=None)
+
+        Write out everything that is queued, flush the
+        files, and stop the writer threads. 
+        """
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
+
+        for t in [self] + self.__workers:
+            if t.isAlive():
+                t.join(timeout)
+
+    def run(self):
+        while True:
+            with self.__cond:
+                while True:
+                    self.__scheduleFlushes()
+                    if self.__ready:
+                        break
+                    if self.__closed and not self.__logs:
+                        return
+                    self.__cond.wait(self.flushInterval)
+
+                log = self.__ready.popleft()
+                log.queued = False
+                log.busy = True
+
+                chunks, log.chunks = log.chunks, []
+                syncs, log.syncs = log.syncs, []
+                log.size = 0
+
+                now = time.time()
+                flush = (chunks or log.dirty) and \
+                    (syncs or self.__closed or now - log.lastFlush >= self.flushInterval)
+
+                # Wake up writers waiting for room
+                self.__cond.notify_all()
+
+            fileObj = log.fileObj
+
+            written = 0
+            if chunks:
+                written = self.__write(fileObj, ''.join(chunks))
+
+            if flush:
+                self.__flush(fileObj)
+
+            with self.__cond:
+                self.bytesWritten += written
+                log.busy = False
+
+                if flush:
+                    log.dirty = False
+                    log.lastFlush = now
+                elif chunks:
+                    log.dirty = True
+
+                if syncs:
+                    self.__errors.pop(fileObj, None)
+                    for done in syncs:
+                        done.set()
+
+                if log.chunks or log.syncs:
+                    self.__schedule(log)
+                elif not log.dirty:
+                    del self.__logs[fileObj]
+
+                self.__cond.notify_all()
+
+    def __getLog(self, fileObj):
+        log = self.__logs.get(fileObj)
+        if log is None:
+            log = self.__logs[fileObj] = _PendingLog(fileObj)
+        return log
+
+    def __schedule(self, log):
+        if not log.queued and not log.busy:
+            log.queued = True
+            self.__ready.append(log)
+            self.__cond.notify()
+
+    def __scheduleFlushes(self):
+        now = time.time()
+        for log in self.__logs.itervalues():
+            if log.dirty and (self.__closed or now - log.lastFlush >= self.flushInterval):
+                self.__schedule(log)
+
+    def __write(self, fileObj, data):
+        if fileObj in self.__errors:
+            return 0
+        try:
+            fileObj.write(data)
+            return len(data)
+        except Exception, e:
+            # Keep draining, so the task is never blocked on us
+            logger.warn("Failed to write to task log: %s", e)
+            self.__errors[fileObj] = e
+            return 0
+
+    def __flush(self, fileObj):
+        if fileObj in self.__errors:
+            return
+        try:
+            fileObj.flush()
+        except Exception, e:
+            logger.warn("Failed to flush task log: %s", e)
+            self.__errors[fileObj] = e
+
+
+class OutputTracker(object):
+    """
+    OutputTracker
+
+    Follows chunks of task output, keeping track of the 
+    last complete line and the latest progress value. 
+    Progress is only parsed from the newest lines of 
+    each chunk, rather than every line.
+
+    If progressInterval is set, progress is parsed at most 
+    once in that many seconds. Lines that arrive in between 
+    are held, up to MAX_LINE bytes, until the next parse or 
+    a call to flushProgress(), which may come from another 
+    thread, such as on the next sample of the task.
+    """
+
+    MAX_LINE = 64 * 1024
+
+    def __init__(self, parser=None, progressInterval=0):
+        self.parser = parser
+        self.progressInterval = progressInterval
+        self.lastLog = ""
+        self.progress = None
+
+        self.__partial = ""
+        self.__unparsed = ""
+        self.__lastParse = 0
+        self.__lock = threading.Lock()
+
+    def feed(self, data):
+        """
+        feed(str data)
+
+        Process the next chunk of output
+        """
+        if self.__partial:
+            data = self.__partial + data
+
+        end = data.rfind('\n')
+        if end == -1:
+            self.__partial = data[-self.MAX_LINE:]
+            return
+
+        self.__partial = data[end+1:][-self.MAX_LINE:]
+        lines = data[:end]
+
+        start = lines.rfind('\n') + 1
+        self.lastLog = lines[start:] + '\n'
+
+        if not self.parser:
+            return
+
+        lines = lines[-self.MAX_LINE:]
+
+        with self.__lock:
+            if self.__unparsed:
+                lines = (self.__unparsed + '\n' + lines)[-self.MAX_LINE:]
+
+            now = time.time()
+            if now - self.__lastParse < self.progressInterval:
+                self.__unparsed = lines
+                return
+
+            self.__unparsed = ""
+            self.__lastParse = now
+            self.__parse(lines)
+
+    def flushProgress(self):
+        """
+        flushProgress()
+
+        Parse any lines held back by the progress interval
+        """
+        with self.__lock:
+            if self.__unparsed:
+                lines, self.__unparsed = self.__unparsed, ""
+                self.__lastParse = time.time()
+                self.__parse(lines)
+
+    def __parse(self, lines):
+        prog = self.parser.parseLastProgress(lines)
+        if prog is not None:
+            self.progress = prog
+
+
 class ProcessLogParser(object):
     """
     ProcessLogParser 
 
     Provides pattern matching operations on lines from log 
     files, matching a given set of regular expression. 
+
+    Each pattern's longest run of plain text, such as "JOB" 
+    or " | Rendering | ", is used as a cheap test before 
+    running the regular expression on a line. Parsers for a 
+    set of task types are built once, by fromTaskTypes().
     """
 
+    # parsers by pattern list
+    _registry = {}
+    _registryLock = threading.Lock()
+
     def __init__(self, progPatterns=None):
+        progPatterns = [r for r in progPatterns or [] if r]
         if progPatterns:
-            self.progress = re.compile('|'.join('(?:%s)' % r for r in progPatterns if r))
+            pattern = '|'.join('(?:%s)' % r for r in progPatterns)
+            self.progress = re.compile(pattern)
+            self._multiline = re.compile(pattern, re.MULTILINE)
+            self._literals = self._findLiterals(progPatterns)
         else:
             self.progress = None
+            self._multiline = None
+            self._literals = None
 
     def parseProgress(self, line):
         """
@@ -182,34 +850,134 @@ class ProcessLogParser(object):
         if not self.progress:
             return None 
 
+        literals = self._literals
+        if literals and not any(lit in line for lit in literals):
+            return None
+
         prog = self._parseLine(self.progress, line)
         if not prog:
             return None
 
-        prog_val = 0.0
+        return self._toProgress(prog)
 
-        if prog[-1] == '%':
-            try:
-                prog_val = literal_eval(prog[:-1])
-            except (ValueError, SyntaxError):
+    def parseLastProgress(self, text):
+        """
+        parseLastProgress(str text) -> float
+
+        Take a block of lines and return the progress value
+        of the last line that has one, as a float 0.0 - 1.0.
+        Otherwise return None
+        """
+        if not self._multiline:
+            return None
+
+        if '\r' in text:
+            text = text.replace('\r\n', '\n')
+
+        if self._literals:
+            match = self._searchBackwards(text)
+        else:
+            match = None
+            for match in self._multiline.finditer(text):
                 pass
-            else:
-                return prog_val / 100.0
 
-        try:
-            prog_val = literal_eval(prog)
+        if match is None:
+            return None
+
+        prog = next((i for i in match.groups() if i), None)
+        if not prog:
+            return None
+
+        return self._toProgress(prog.rstrip())
+
+    def _searchBackwards(self, text):
+        """
+        Match the lines that have one of the literals, 
+        newest first, and return the first match.
+        """
+        literals = self._literals
+        search = self.progress.search
+        end = len(text)
+
+        while end > 0:
+            pos = max(text.rfind(lit, 0, end) for lit in literals)
+            if pos == -1:
+                return None
+
+            lineStart = text.rfind('\n', 0, pos) + 1
+            lineEnd = text.find('\n', pos)
+            lineEnd = len(text) if lineEnd == -1 else lineEnd + 1
+
+            match = search(text[lineStart:lineEnd])
+            if match:
+                return match
+
+            end = lineStart
+
+        return None
+
+    @staticmethod
+    def _findLiterals(patterns):
+        """
+        _findLiterals(list patterns) -> tuple str
 
-        except ValueError:
+        The longest run of plain text each pattern needs in 
+        order to match, or None if any pattern has none.
+        """
+        literals = set()
 
+        for pattern in patterns:
             try:
-                a, b = prog.split('/', 1)
-                prog_val = float(a) / float(b)
+                parsed = sre_parse.parse(pattern)
+            except (re.error, TypeError):
+                return None
+
+            if parsed.pattern.flags & (re.IGNORECASE | re.VERBOSE):
+                return None
+
+            best = run = ''
+            for op, av in parsed:
+                if op == sre_constants.LITERAL and av < 128:
+                    run += chr(av)
+                    if len(run) > len(best):
+                        best = run
+                else:
+                    run = ''
+
+            if not best:
+                return None
+            literals.add(best)
+
+        return tuple(literals)
+
+    @staticmethod
+    def _toProgress(prog):
+        """
+        Convert a matched progress string to a float 0.0 - 1.0
+        """
+        prog = prog.strip()
+        if not prog:
+            return None
 
+        if prog[-1] == '%':
+            try:
+                return float(prog[:-1]) / 100.0
             except ValueError:
                 return None
 
+        if '/' in prog:
+            a, b = prog.split('/', 1)
+            try:
+                prog_val = float(a) / float(b)
+            except ValueError:
+                return None
             except ZeroDivisionError:
                 prog_val = 0.0
+        else:
+            try:
+                prog_val = float(prog)
+            except ValueError:
+                return None
 
         if 1 < prog_val <= 100:
             prog_val /= 100.0
@@ -227,12 +995,18 @@ class ProcessLogParser(object):
         `taskTypes` may be either a single string, or a list 
         of string task types. They are looked up in the rndaemon 
         config for matching defined regular expression patterns. 
+        Parsers hold no state, and one is shared by every task
+        with the same patterns.
         """
         if isinstance(taskTypes, (str, unicode)):
             taskTypes = [taskTypes]
 
-        progPatterns = filter(None, (conf.TASK_PROGRESS_PATTERNS.get(t) for t in taskTypes))
-        parser = cls(progPatterns=progPatterns)
+        progPatterns = tuple(filter(None, (conf.TASK_PROGRESS_PATTERNS.get(t) for t in taskTypes)))
+
+        with cls._registryLock:
+            parser = cls._registry.get(progPatterns)
+            if parser is None:
+                parser = cls._registry[progPatterns] = cls(progPatterns=progPatterns)
 
         return parser
 
@@ -241,7 +1015,7 @@ class ProcessLogParser(object):
         """
         Find the first capture group of the line
         """
-        match = re.search(pattern, line.rstrip())
+        match = pattern.search(line.rstrip())
         if match:
             return next((i for i in match.groups() if i), None)
 
@@ -307,6 +307,7 @@ setup(
         'PyYAML',
         'plow-blueprint>=0.1.1',
         'fileseq>=0.1',
+        'futures>=2.1',
     ],
 
     zip_safe = False,
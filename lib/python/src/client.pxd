@@ -1,6 +1,7 @@
 from libcpp.vector cimport vector
 from libcpp.string cimport string
 from libcpp.set cimport set as c_set
+from libcpp.map cimport map
 
 from plow_types cimport *
 
@@ -10,6 +11,7 @@ cdef extern from "rpc/RpcService.h" namespace "Plow" nogil:
     cdef cppclass RpcServiceClient:
 
         long getPlowTime() nogil except +
+        void getEvents(EventBatchT&, long lastEventId, int timeout) nogil except +
 
         void getServices(vector[ServiceT]&) nogil except +
         void createService(ServiceT&, ServiceT& svc) nogil except +
@@ -30,6 +32,7 @@ cdef extern from "rpc/RpcService.h" namespace "Plow" nogil:
         void pauseJob(Guid& jobId, bint paused) nogil except +
         void getJobs(vector[JobT]&, JobFilterT& filter) nogil except +
         void getJobOutputs(vector[OutputT]&,  Guid& jobId) nogil except +
+        void getOutputsForJobs(map[Guid, vector[OutputT]]&, vector[Guid]& jobIds) nogil except +
         void setJobMinCores(Guid& jobId, int value) nogil except +
         void setJobMaxCores(Guid& jobId, int value) nogil except +
         void getJobSpec(JobSpecT&, Guid& jobId) nogil except +
@@ -37,6 +40,7 @@ cdef extern from "rpc/RpcService.h" namespace "Plow" nogil:
         void createFolder(FolderT&, string& projectId, string& name) nogil except +
         void getFolder(FolderT&, string& id) nogil except +
         void getJobBoard(vector[FolderT]&,  Guid& project) nogil except + 
+        void getJobBoardDelta(JobBoardDeltaT&, Guid& project, Timestamp lastUpdateTime) nogil except +
         void getFolders(vector[FolderT]&, Guid& project) nogil except +
         void setFolderMinCores(Guid& folderId, int value) nogil except +
         void setFolderMaxCores(Guid& folderId, int value) nogil except +
@@ -46,6 +50,7 @@ cdef extern from "rpc/RpcService.h" namespace "Plow" nogil:
         void getLayerById(LayerT&,  Guid& layerId) nogil except +
         void getLayer(LayerT&,  Guid& jobID, string& name) nogil except +
         void getLayers(vector[LayerT]&,  Guid& layerId) nogil except +
+        void getLayersForJobs(map[Guid, vector[LayerT]]&, vector[Guid]& jobIds) nogil except +
         void getLayerOutputs(vector[OutputT]&, Guid& layerId) nogil except +
         void setLayerTags(Guid& guid, vector[string]& tags) nogil except +
         void setLayerMinCoresPerTask(Guid& guid, int minCores) nogil except +
@@ -66,6 +71,7 @@ cdef extern from "rpc/RpcService.h" namespace "Plow" nogil:
         void eatTasks(TaskFilterT& filter) nogil except +
         void killTasks(TaskFilterT& filter) nogil except +
         void getTaskStats(vector[TaskStatsT]&, Guid& taskId) nogil except +
+        void getTaskStatsBulk(map[Guid, vector[TaskStatsT]]&, vector[Guid]& taskIds) nogil except +
 
         void getNode(NodeT&, string& name) nogil except +
         void getNodes(vector[NodeT]&, NodeFilterT& filter) nogil except +
@@ -136,11 +142,36 @@ cdef extern from "client.h" namespace "Plow":
     cdef cppclass PlowClient:
         RpcServiceClient proxy() nogil 
         void reconnect() nogil except +
+        bint isHealthy() nogil
+        string& host() nogil
+        int port() nogil
+
+    cdef struct PoolStats:
+        int maxSize
+        int idleTimeout
+        int active
+        int idle
+        long long created
+        long long reused
+        long long evicted
+        long long discarded
+        long long failed
+        long long waits
+        vector[string] hosts
+        vector[int] hostPorts
+        vector[int] hostActive
+        vector[int] hostIdle
 
     cdef PlowClient* getClient() nogil except +
     cdef PlowClient* getClient(bint reset) nogil except +
     cdef PlowClient* getClient(string& host, int port) nogil except +
     cdef PlowClient* getClient(string& host, int port, bint reset) nogil except +
 
+    cdef void releaseClient() nogil except +
     cdef void resetClient() nogil except +
+
+    cdef void setHosts(vector[string]& hosts, vector[int]& ports) nogil except +
+    cdef void setPoolSize(int size) nogil except +
+    cdef void setPoolIdleTimeout(int seconds) nogil except +
+    cdef PoolStats getPoolStats() nogil except +
     
\ No newline at end of file
@@ -112,8 +112,13 @@ cdef class Cluster(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef ClusterT cluster
-        conn().proxy().getCluster(cluster, self._cluster.name)
+        cdef:
+            ClusterT cluster
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getCluster(cluster, self._cluster.name)
+
         self.setCluster(cluster)
 
     def delete(self):
@@ -183,7 +188,11 @@ def get_cluster(string name):
     cdef: 
         ClusterT clusterT 
         Cluster cluster 
-    conn().proxy().getCluster(clusterT, name)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getCluster(clusterT, name)
+
     cluster = initCluster(clusterT)
     return cluster
 
@@ -198,7 +207,11 @@ def get_clusters():
         ClusterT clusterT 
         vector[ClusterT] clusters 
         list ret = [] 
-    conn().proxy().getClusters(clusters)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getClusters(clusters)
+
     ret = [initCluster(clusterT) for clusterT in clusters]
     return ret    
 
@@ -214,7 +227,11 @@ def get_clusters_by_tag(string tag):
         ClusterT clusterT 
         vector[ClusterT] clusters 
         list ret = [] 
-    conn().proxy().getClustersByTag(clusters, tag)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getClustersByTag(clusters, tag)
+
     ret = [initCluster(clusterT) for clusterT in clusters]
     return ret    
 
@@ -229,8 +246,12 @@ def create_cluster(str name):
     cdef:
         ClusterT clusterT
         Cluster cluster 
+        string clusterName = name
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createCluster(clusterT, clusterName)
 
-    conn().proxy().createCluster(clusterT, name)
     cluster = initCluster(clusterT)
     return cluster
 
@@ -242,8 +263,14 @@ def delete_cluster(Cluster cluster):
     :param cluster: :class:`.Cluster`
     :returns: bool - True if deleted
     """
-    cdef bint ret
-    ret = conn().proxy().deleteCluster(cluster.id)
+    cdef:
+        bint ret
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        ret = c.proxy().deleteCluster(clusterId)
+
     return ret
 
 @reconnecting
@@ -255,8 +282,14 @@ def lock_cluster(Cluster cluster, bint locked):
     :param locked: bool - True to lock / False to unlock 
     :returns: bool - locked
     """
-    cdef bint ret
-    ret = conn().proxy().lockCluster(cluster.id, locked)
+    cdef:
+        bint ret
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        ret = c.proxy().lockCluster(clusterId, locked)
+
     return ret
 
 @reconnecting
@@ -267,7 +300,12 @@ def set_cluster_tags(Cluster cluster, c_set[string] tags):
     :param cluster: :class:`.Cluster`
     :param tags: set - A set of tags for the Cluster 
     """
-    conn().proxy().setClusterTags(cluster.id, tags)
+    cdef:
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setClusterTags(clusterId, tags)
 
 @reconnecting
 def set_cluster_name(Cluster cluster, string name):
@@ -277,7 +315,12 @@ def set_cluster_name(Cluster cluster, string name):
     :param cluster: :class:`.Cluster`
     :param name: str - Cluster name
     """
-    conn().proxy().setClusterName(cluster.id, name)
+    cdef:
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setClusterName(clusterId, name)
 
 @reconnecting
 def set_default_cluster(Cluster cluster):
@@ -287,7 +330,12 @@ def set_default_cluster(Cluster cluster):
     :param cluster: :class:`.Cluster`
     :returns: bool - True if deleted
     """
-    conn().proxy().setDefaultCluster(cluster.id)
+    cdef:
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setDefaultCluster(clusterId)
 
 
 
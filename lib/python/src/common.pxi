@@ -1,7 +1,12 @@
 cimport cython
+from cython.operator cimport dereference as deref, preincrement as inc
 
 from plow_types cimport *
-from client cimport getClient, resetClient, PlowClient
+from libcpp.vector cimport vector
+from libcpp.string cimport string
+
+from client cimport getClient, releaseClient, resetClient, PlowClient, \
+    PoolStats, setHosts, setPoolSize, setPoolIdleTimeout, getPoolStats
 
 #
 # Python imports
@@ -9,10 +14,10 @@ from client cimport getClient, resetClient, PlowClient
 import uuid
 import time
 import logging 
-import random
 
 __HOST = None
 __PORT = None
+__POOL_HOSTS = None
 
 PLOW_HOSTS = [("localhost", 11336)]
 
@@ -31,58 +36,64 @@ cdef class PlowBase:
 
 
 cdef PlowClient* conn(bint reset=0) except *:
+    """
+    Return the calling thread's connection to the Plow server,
+    checking one out of the shared connection pool if needed.
+    """
     cdef:
         PlowClient* c
         string host
         int port
-        tuple host_port
-        list available
-        bint is_custom = False
-        bint first_loop = True
-
-    global __HOST, __PORT
 
-    if __HOST is None or __PORT is None:
-        host_port = random.choice(PLOW_HOSTS)
-        host, port = host_port
-    else:
-        is_custom = True
+    if __HOST is not None and __PORT is not None:
         host, port = __HOST, __PORT
 
-    while True:
-
         try:
-            c = getClient(host, port, reset)
-        except RuntimeError:
-            try:
-                c = getClient(host, port, True)
-            except RuntimeError, e:
-                msg = "Failed to connect to Plow server %s:%s" % (host, port)
-                LOGGER.warn(msg)
-                if is_custom:
-                    raise PlowConnectionError(*e.args)
-            else:
-                break
-        else:
-            break
-        
-        if first_loop:
-            available = PLOW_HOSTS[:]
-            first_loop = False
+            with nogil:
+                c = getClient(host, port, reset)
+        except RuntimeError, e:
+            LOGGER.warn("Failed to connect to Plow server %s:%s", __HOST, __PORT)
+            raise PlowConnectionError(*e.args)
 
-        available.remove(host_port)
-        if not available:
-            raise PlowConnectionError("No available Plow host. Connection attempts all failed", 0)
+    else:
+        if __POOL_HOSTS != PLOW_HOSTS:
+            _set_pool_hosts(PLOW_HOSTS)
 
-        host_port = random.choice(available)
-        host, port = host_port
+        try:
+            with nogil:
+                c = getClient(reset)
+        except RuntimeError, e:
+            LOGGER.warn("Failed to connect to Plow servers %s", __POOL_HOSTS)
+            raise PlowConnectionError(str(e), 0)
 
-    LOGGER.debug("Connected to %s:%d", host, port)
-    __HOST, __PORT = host, port
+    LOGGER.debug("Connected to %s:%d", c.host(), c.port())
 
     return c
 
 
+cdef _set_pool_hosts(list hosts):
+    """
+    Hand the list of (host, port) Plow servers to the
+    connection pool, which balances new connections across them.
+    """
+    cdef:
+        vector[string] names
+        vector[int] ports
+        string name
+        int port
+
+    global __POOL_HOSTS
+
+    for name, port in hosts:
+        names.push_back(name)
+        ports.push_back(port)
+
+    with nogil:
+        setHosts(names, ports)
+
+    __POOL_HOSTS = list(hosts)
+
+
 def reconnect():
     """
     Re-establish the connection to the Plow server
@@ -91,8 +102,8 @@ def reconnect():
     __HOST = None
     __PORT = None
 
-    cdef PlowClient* c = conn(True)
-    c.reconnect()
+    # The connection is discarded and a fresh one checked out
+    conn(True)
 
 
 def set_host(str host="localhost", int port=11336):
@@ -110,13 +121,71 @@ def set_host(str host="localhost", int port=11336):
 
 def get_host():
     """
-    Get the current host and port of the Plow server
+    Get the current host and port of the Plow server, as set by
+    :func:`set_host`. Returns (None, None) when connections are
+    being balanced across the configured Plow hosts.
 
     :returns: (str host, int port)
     """
     return __HOST, __PORT
 
 
+def set_pool_size(int size, int idle_timeout=-1):
+    """
+    Set the maximum number of connections to the Plow server 
+    kept open by the client. Connections are shared by all threads,
+    and a thread waits for a free one once the limit is reached. 
+
+    :param size: int - max number of connections
+    :param idle_timeout: int - seconds an unused connection is kept open (-1 to leave unchanged)
+    """
+    with nogil:
+        setPoolSize(size)
+        if idle_timeout >= 0:
+            setPoolIdleTimeout(idle_timeout)
+
+
+def get_pool_stats():
+    """
+    Get the state of the client connection pool.
+
+    The returned dict contains the configured maxSize and idleTimeout, 
+    the number of active (checked out) and idle connections, counters 
+    for created, reused, evicted, discarded and failed connections, 
+    the number of times a thread had to wait for a connection, and 
+    a "hosts" dict of {"host:port": {"active": int, "idle": int}}
+
+    :returns: dict
+    """
+    cdef:
+        PoolStats stats
+        size_t i
+
+    with nogil:
+        stats = getPoolStats()
+
+    hosts = {}
+    for i in xrange(stats.hosts.size()):
+        hosts["%s:%d" % (stats.hosts[i], stats.hostPorts[i])] = {
+            "active": stats.hostActive[i],
+            "idle": stats.hostIdle[i],
+        }
+
+    return {
+        "maxSize": stats.maxSize,
+        "idleTimeout": stats.idleTimeout,
+        "active": stats.active,
+        "idle": stats.idle,
+        "created": stats.created,
+        "reused": stats.reused,
+        "evicted": stats.evicted,
+        "discarded": stats.discarded,
+        "failed": stats.failed,
+        "waits": stats.waits,
+        "hosts": hosts,
+    }
+
+
 def is_uuid(str identifier):
     """
     Test if a string is a valid UUID 
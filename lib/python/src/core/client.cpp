@@ -1,13 +1,22 @@
 #include <arpa/inet.h>
 #include <sys/socket.h>
+#include <poll.h>
+#include <time.h>
 
 #include <thrift/transport/TSocket.h>
 #include <thrift/transport/TBufferTransports.h>
 #include <thrift/protocol/TCompactProtocol.h>
 
 #include <boost/thread/tss.hpp>
+#include <boost/thread/mutex.hpp>
+#include <boost/thread/condition_variable.hpp>
+#include <boost/thread/thread_time.hpp>
 
+#include <algorithm>
+#include <deque>
 #include <iostream>
+#include <map>
+#include <stdexcept>
 #include <vector>
 
 #include "client.h"
@@ -16,14 +25,14 @@ using namespace apache::thrift;
 using namespace apache::thrift::protocol;
 using namespace apache::thrift::transport;
 
-namespace {
-    static boost::thread_specific_ptr<PLOW_NAMESPACE::PlowClient> CLIENT_INSTANCE;
-}
-
 PLOW_NAMESPACE_ENTER
 
 #define DEFAULT_HOST "localhost"
-#define DEFAULT_PORT 11336 
+#define DEFAULT_PORT 11336
+
+#define DEFAULT_POOL_SIZE 16
+#define DEFAULT_POOL_IDLE_TIMEOUT 60
+#define POOL_WAIT_TIMEOUT 30
 
 
 class PlowClient::Connection
@@ -34,7 +43,8 @@ class PlowClient::Connection
         void connect();
         void disconnect();
         void reconnect();
-        RpcServiceClient proxy();        
+        bool isHealthy();
+        RpcServiceClient proxy();
     private:
         boost::shared_ptr<TSocket> socket;
         boost::shared_ptr<TTransport> transport;
@@ -73,19 +83,41 @@ void PlowClient::Connection::reconnect()
     transport->open();
 }
 
+/*
+ * An idle connection should never have anything waiting to be read.
+ * If the socket polls as readable, the server has either closed it
+ * or left unread data behind, and it can't be safely reused.
+ */
+bool PlowClient::Connection::isHealthy()
+{
+    if (!transport->isOpen())
+        return false;
+
+    struct pollfd fds;
+    fds.fd = socket->getSocketFD();
+    fds.events = POLLIN;
+    fds.revents = 0;
+
+    return ::poll(&fds, 1, 0) == 0;
+}
+
 RpcServiceClient PlowClient::Connection::proxy()
 {
     return service;
 }
 
 PlowClient::PlowClient():
-    m_conn(new PlowClient::Connection)
+    m_conn(new PlowClient::Connection),
+    m_host(DEFAULT_HOST),
+    m_port(DEFAULT_PORT)
 {
     m_conn->connect();
 }
 
 PlowClient::PlowClient(const std::string& host, const int32_t port):
-    m_conn(new PlowClient::Connection(host, port))
+    m_conn(new PlowClient::Connection(host, port)),
+    m_host(host),
+    m_port(port)
 {
     m_conn->connect();
 }
@@ -93,6 +125,7 @@ PlowClient::PlowClient(const std::string& host, const int32_t port):
 PlowClient::~PlowClient()
 {
     m_conn->disconnect();
+    delete m_conn;
 }
 
 RpcServiceClient PlowClient::proxy()
@@ -105,34 +138,539 @@ void PlowClient::reconnect()
     m_conn->reconnect();
 }
 
+bool PlowClient::isHealthy()
+{
+    return m_conn->isHealthy();
+}
+
+const std::string& PlowClient::host() const
+{
+    return m_host;
+}
+
+int32_t PlowClient::port() const
+{
+    return m_port;
+}
+
+PoolStats::PoolStats():
+    maxSize(0),
+    idleTimeout(0),
+    active(0),
+    idle(0),
+    created(0),
+    reused(0),
+    evicted(0),
+    discarded(0),
+    failed(0),
+    waits(0)
+{}
+
+
+/*
+ * ClientPool
+ *
+ * A bounded set of connections shared by every thread. Threads
+ * check a connection out for the duration of a call and check it
+ * back in when they are done, so short lived threads reuse warm
+ * connections instead of paying for a new connect each time.
+ *
+ * Idle connections are closed after the idle timeout, and are
+ * health checked before being handed out again. New connections
+ * go to the configured host with the fewest connections open.
+ */
+class ClientPool
+{
+    public:
+        typedef std::pair<std::string, int32_t> HostPort;
+
+        ClientPool();
+        ~ClientPool();
+
+        PlowClient* checkout();
+        PlowClient* checkout(const std::string& host, const int32_t port);
+        void checkin(PlowClient* client);
+        void discard(PlowClient* client);
+        void clear();
+
+        void setHosts(const std::vector<HostPort>& hosts);
+        void setMaxSize(const int32_t size);
+        void setIdleTimeout(const int32_t seconds);
+        PoolStats stats();
+
+    private:
+        struct IdleClient
+        {
+            PlowClient* client;
+            time_t lastUsed;
+        };
+
+        typedef std::deque<IdleClient> IdleList;
+        typedef std::map<PlowClient*, unsigned int> LeaseMap;
+        typedef std::map<HostPort, int32_t> CountMap;
+
+        PlowClient* acquire(std::vector<HostPort> candidates);
+        PlowClient* takeIdle(const HostPort& host, std::vector<PlowClient*>& stale);
+        void lease(PlowClient* client);
+        void evictIdle(std::vector<PlowClient*>& stale);
+        int32_t size() const;
+
+        static void close(std::vector<PlowClient*>& clients);
+
+        boost::mutex m_mutex;
+        boost::condition_variable m_available;
+
+        std::vector<HostPort> m_hosts;
+        IdleList m_idle;
+        LeaseMap m_leases;
+        CountMap m_active;
+
+        int32_t m_maxSize;
+        int32_t m_idleTimeout;
+        int32_t m_connecting;
+        unsigned int m_generation;
+
+        PoolStats m_stats;
+};
+
+namespace {
+    ClientPool& pool()
+    {
+        static ClientPool instance;
+        return instance;
+    }
+
+    /*
+     * Runs when a thread releases its connection or exits,
+     * so connections go back to the pool instead of being closed.
+     */
+    void checkinClient(PlowClient* client)
+    {
+        pool().checkin(client);
+    }
+
+    static boost::thread_specific_ptr<PlowClient> CLIENT_INSTANCE(checkinClient);
+
+    /*
+     * Order the hosts so the least loaded ones are tried first.
+     * Shuffling first keeps ties from always landing on the same host.
+     */
+    struct ByActiveCount
+    {
+        ByActiveCount(const std::map<ClientPool::HostPort, int32_t>& active) : counts(active) {}
+
+        int32_t count(const ClientPool::HostPort& host) const
+        {
+            std::map<ClientPool::HostPort, int32_t>::const_iterator it = counts.find(host);
+            return it == counts.end() ? 0 : it->second;
+        }
+
+        bool operator()(const ClientPool::HostPort& a, const ClientPool::HostPort& b) const
+        {
+            return count(a) < count(b);
+        }
+
+        const std::map<ClientPool::HostPort, int32_t>& counts;
+    };
+}
+
+ClientPool::ClientPool():
+    m_maxSize(DEFAULT_POOL_SIZE),
+    m_idleTimeout(DEFAULT_POOL_IDLE_TIMEOUT),
+    m_connecting(0),
+    m_generation(0)
+{
+    m_hosts.push_back(HostPort(DEFAULT_HOST, DEFAULT_PORT));
+}
+
+ClientPool::~ClientPool()
+{
+    clear();
+}
+
+PlowClient* ClientPool::checkout()
+{
+    std::vector<HostPort> hosts;
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+        hosts = m_hosts;
+    }
+    return acquire(hosts);
+}
+
+PlowClient* ClientPool::checkout(const std::string& host, const int32_t port)
+{
+    return acquire(std::vector<HostPort>(1, HostPort(host, port)));
+}
+
+PlowClient* ClientPool::acquire(std::vector<HostPort> candidates)
+{
+    std::vector<PlowClient*> stale;
+    PlowClient* client = NULL;
+
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+        evictIdle(stale);
+
+        while (true)
+        {
+            std::random_shuffle(candidates.begin(), candidates.end());
+            std::stable_sort(candidates.begin(), candidates.end(), ByActiveCount(m_active));
+
+            for (size_t i = 0; i < candidates.size() && !client; ++i)
+                client = takeIdle(candidates[i], stale);
+
+            if (client)
+            {
+                lease(client);
+                m_stats.reused++;
+                break;
+            }
+
+            if (size() < m_maxSize)
+            {
+                // Reserve the slot while connecting outside of the lock
+                m_connecting++;
+                break;
+            }
+
+            if (!m_idle.empty())
+            {
+                // Make room by closing an idle connection to some other host
+                stale.push_back(m_idle.back().client);
+                m_idle.pop_back();
+                m_stats.evicted++;
+                continue;
+            }
+
+            m_stats.waits++;
+            boost::system_time const deadline = boost::get_system_time()
+                + boost::posix_time::seconds(POOL_WAIT_TIMEOUT);
+
+            if (!m_available.timed_wait(lock, deadline))
+            {
+                lock.unlock();
+                close(stale);
+                throw std::runtime_error("Timed out waiting for an available Plow connection");
+            }
+        }
+    }
+
+    close(stale);
+
+    if (client)
+        return client;
+
+    std::string error("No available Plow host. Connection attempts all failed");
+
+    for (size_t i = 0; i < candidates.size(); ++i)
+    {
+        try
+        {
+            client = new PlowClient(candidates[i].first, candidates[i].second);
+        }
+        catch (const std::exception& e)
+        {
+            boost::mutex::scoped_lock lock(m_mutex);
+            m_stats.failed++;
+            if (candidates.size() == 1)
+                error = e.what();
+            continue;
+        }
+
+        boost::mutex::scoped_lock lock(m_mutex);
+        m_connecting--;
+        m_stats.created++;
+        lease(client);
+        return client;
+    }
+
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+        m_connecting--;
+    }
+    m_available.notify_one();
+
+    throw std::runtime_error(error);
+}
+
+PlowClient* ClientPool::takeIdle(const HostPort& host, std::vector<PlowClient*>& stale)
+{
+    IdleList::iterator it = m_idle.begin();
+    while (it != m_idle.end())
+    {
+        PlowClient* client = it->client;
+        if (client->host() != host.first || client->port() != host.second)
+        {
+            ++it;
+            continue;
+        }
+
+        it = m_idle.erase(it);
+
+        if (client->isHealthy())
+            return client;
+
+        stale.push_back(client);
+        m_stats.discarded++;
+    }
+    return NULL;
+}
+
+void ClientPool::lease(PlowClient* client)
+{
+    m_leases[client] = m_generation;
+    m_active[HostPort(client->host(), client->port())]++;
+}
+
+void ClientPool::checkin(PlowClient* client)
+{
+    if (!client)
+        return;
+
+    std::vector<PlowClient*> stale;
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+
+        LeaseMap::iterator it = m_leases.find(client);
+        bool current = it != m_leases.end() && it->second == m_generation;
+        if (it != m_leases.end())
+        {
+            m_leases.erase(it);
+            m_active[HostPort(client->host(), client->port())]--;
+        }
+
+        if (current && size() < m_maxSize)
+        {
+            IdleClient idle;
+            idle.client = client;
+            idle.lastUsed = time(NULL);
+            m_idle.push_front(idle);
+        }
+        else
+        {
+            stale.push_back(client);
+            m_stats.evicted++;
+        }
+
+        evictIdle(stale);
+    }
+
+    m_available.notify_one();
+    close(stale);
+}
+
+void ClientPool::discard(PlowClient* client)
+{
+    if (!client)
+        return;
+
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+
+        LeaseMap::iterator it = m_leases.find(client);
+        if (it != m_leases.end())
+        {
+            m_leases.erase(it);
+            m_active[HostPort(client->host(), client->port())]--;
+        }
+        m_stats.discarded++;
+    }
+
+    m_available.notify_one();
+
+    std::vector<PlowClient*> stale(1, client);
+    close(stale);
+}
+
+void ClientPool::clear()
+{
+    std::vector<PlowClient*> stale;
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+
+        // Connections checked out now are closed when they come back
+        m_generation++;
+
+        for (IdleList::iterator it = m_idle.begin(); it != m_idle.end(); ++it)
+            stale.push_back(it->client);
+        m_idle.clear();
+    }
+
+    m_available.notify_all();
+    close(stale);
+}
+
+void ClientPool::evictIdle(std::vector<PlowClient*>& stale)
+{
+    time_t cutoff = time(NULL) - m_idleTimeout;
+
+    // The list is ordered by most recently used, so the
+    // expired connections are all at the back.
+    while (!m_idle.empty() && (m_idle.back().lastUsed < cutoff || size() > m_maxSize))
+    {
+        stale.push_back(m_idle.back().client);
+        m_idle.pop_back();
+        m_stats.evicted++;
+    }
+}
+
+int32_t ClientPool::size() const
+{
+    return static_cast<int32_t>(m_leases.size() + m_idle.size()) + m_connecting;
+}
+
+void ClientPool::close(std::vector<PlowClient*>& clients)
+{
+    for (size_t i = 0; i < clients.size(); ++i)
+    {
+        try
+        {
+            delete clients[i];
+        }
+        catch (const std::exception& e)
+        {
+            // Closing a dead socket can throw. Nothing to recover.
+        }
+    }
+    clients.clear();
+}
+
+void ClientPool::setHosts(const std::vector<HostPort>& hosts)
+{
+    boost::mutex::scoped_lock lock(m_mutex);
+    m_hosts = hosts;
+    if (m_hosts.empty())
+        m_hosts.push_back(HostPort(DEFAULT_HOST, DEFAULT_PORT));
+}
+
+void ClientPool::setMaxSize(const int32_t size)
+{
+    std::vector<PlowClient*> stale;
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+        m_maxSize = std::max(size, 1);
+        evictIdle(stale);
+    }
+    m_available.notify_all();
+    close(stale);
+}
+
+void ClientPool::setIdleTimeout(const int32_t seconds)
+{
+    std::vector<PlowClient*> stale;
+    {
+        boost::mutex::scoped_lock lock(m_mutex);
+        m_idleTimeout = std::max(seconds, 0);
+        evictIdle(stale);
+    }
+    close(stale);
+}
+
+PoolStats ClientPool::stats()
+{
+    boost::mutex::scoped_lock lock(m_mutex);
+
+    PoolStats stats = m_stats;
+    stats.maxSize = m_maxSize;
+    stats.idleTimeout = m_idleTimeout;
+    stats.active = static_cast<int32_t>(m_leases.size());
+    stats.idle = static_cast<int32_t>(m_idle.size());
+
+    CountMap idle;
+    for (IdleList::iterator it = m_idle.begin(); it != m_idle.end(); ++it)
+        idle[HostPort(it->client->host(), it->client->port())]++;
+
+    CountMap all(m_active);
+    for (CountMap::iterator it = idle.begin(); it != idle.end(); ++it)
+        all[it->first] += 0;
+
+    for (CountMap::iterator it = all.begin(); it != all.end(); ++it)
+    {
+        stats.hosts.push_back(it->first.first);
+        stats.hostPorts.push_back(it->first.second);
+        stats.hostActive.push_back(it->second);
+        stats.hostIdle.push_back(idle[it->first]);
+    }
+
+    return stats;
+}
+
+
 PlowClient* getClient()
 {
-    return getClient(DEFAULT_HOST, DEFAULT_PORT, false);
+    return getClient(false);
 }
 
 PlowClient* getClient(const bool reset)
 {
-    return getClient(DEFAULT_HOST, DEFAULT_PORT, reset);
+    PlowClient* client = CLIENT_INSTANCE.get();
+
+    if (client && !reset)
+        return client;
+
+    if (client)
+        pool().discard(CLIENT_INSTANCE.release());
+
+    CLIENT_INSTANCE.reset(pool().checkout());
+    return CLIENT_INSTANCE.get();
 }
 
 PlowClient* getClient(const std::string& host, const int32_t port, const bool reset)
 {
-    if ( reset || !CLIENT_INSTANCE.get() ) {
-        CLIENT_INSTANCE.reset(new PlowClient(host, port));
-    }
+    PlowClient* client = CLIENT_INSTANCE.get();
+
+    if (client && !reset && client->host() == host && client->port() == port)
+        return client;
+
+    if (client && reset)
+        pool().discard(CLIENT_INSTANCE.release());
+    else if (client)
+        CLIENT_INSTANCE.reset();
+
+    CLIENT_INSTANCE.reset(pool().checkout(host, port));
     return CLIENT_INSTANCE.get();
 }
 
-void resetClient()
+void releaseClient()
 {
-    if (CLIENT_INSTANCE.get()) 
+    if (CLIENT_INSTANCE.get())
     {
         CLIENT_INSTANCE.reset();
     }
 }
 
-PLOW_NAMESPACE_EXIT
+void resetClient()
+{
+    if (CLIENT_INSTANCE.get())
+    {
+        pool().discard(CLIENT_INSTANCE.release());
+    }
+    pool().clear();
+}
+
+void setHosts(const std::vector<std::string>& hosts, const std::vector<int32_t>& ports)
+{
+    std::vector<ClientPool::HostPort> hostPorts;
+    for (size_t i = 0; i < hosts.size() && i < ports.size(); ++i)
+        hostPorts.push_back(ClientPool::HostPort(hosts[i], ports[i]));
 
+    pool().setHosts(hostPorts);
+}
+
+void setPoolSize(const int32_t size)
+{
+    pool().setMaxSize(size);
+}
 
+void setPoolIdleTimeout(const int32_t seconds)
+{
+    pool().setIdleTimeout(seconds);
+}
 
+PoolStats getPoolStats()
+{
+    return pool().stats();
+}
 
+PLOW_NAMESPACE_EXIT
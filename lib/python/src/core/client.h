@@ -1,6 +1,9 @@
 #ifndef INCLUDED_PLOW_CLIENT_H
 #define INCLUDED_PLOW_CLIENT_H
 
+#include <string>
+#include <vector>
+
 #include "plow_abi.h"
 #include "rpc/RpcService.h"
 
@@ -14,19 +17,50 @@ class PLOWEXPORT PlowClient
         virtual ~PlowClient();
         RpcServiceClient proxy();
         void reconnect();
-    
+        bool isHealthy();
+        const std::string& host() const;
+        int32_t port() const;
+
     private:
         class Connection;
         friend class Connection;
         Connection * m_conn;
+        std::string m_host;
+        int32_t m_port;
+};
+
+struct PoolStats
+{
+    PoolStats();
+
+    int32_t maxSize;
+    int32_t idleTimeout;
+    int32_t active;
+    int32_t idle;
+    int64_t created;
+    int64_t reused;
+    int64_t evicted;
+    int64_t discarded;
+    int64_t failed;
+    int64_t waits;
+    std::vector<std::string> hosts;
+    std::vector<int32_t> hostPorts;
+    std::vector<int32_t> hostActive;
+    std::vector<int32_t> hostIdle;
 };
 
 extern PlowClient* getClient();
 extern PlowClient* getClient(const bool reset);
 extern PlowClient* getClient(const std::string& host, const int32_t port, const bool reset=0);
 
+extern void releaseClient();
 extern void resetClient();
 
+extern void setHosts(const std::vector<std::string>& hosts, const std::vector<int32_t>& ports);
+extern void setPoolSize(const int32_t size);
+extern void setPoolIdleTimeout(const int32_t seconds);
+extern PoolStats getPoolStats();
+
 PLOW_NAMESPACE_EXIT
 
-#endif
\ No newline at end of file
+#endif
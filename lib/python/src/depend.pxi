@@ -253,16 +253,23 @@ cdef class Depend(PlowBase):
     @reconnecting
     def drop(self):
         """Drop the dependency """
-        conn().proxy().dropDepend(self.id)
+        cdef PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().dropDepend(self._depend.id)
         self._depend.active = False
 
     @reconnecting
     def activate(self):
         """Activate the dependency """
-        conn().proxy().activateDepend(self.id)
+        cdef PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().activateDepend(self._depend.id)
         self._depend.active = True
 
 
+@releasing
 def create_depend(DependSpec spec):
     """
     Create a new dependency from a DependSpec
@@ -277,8 +284,12 @@ def create_depend(DependSpec spec):
     cdef:
         DependT depT
         Depend dep
+        DependSpecT specT = spec.toDependSpecT()
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createDepend(depT, specT)
 
-    conn().proxy().createDepend(depT, spec.toDependSpecT())
     dep = initDepend(depT)
     return dep
 
@@ -291,7 +302,13 @@ def create_job_on_job_depend(Job job, Job onJob):
     :param job: the :class:`.Job` which depends on another
     :param onJob: the :class:`.Job` which must finish first
     """   
-    conn().proxy().createJobOnJobDepend(job.id, onJob.id)
+    cdef:
+        Guid jobId = job.id
+        Guid onJobId = onJob.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createJobOnJobDepend(jobId, onJobId)
 
 @reconnecting
 def create_layer_on_layer_depend(Layer layer, Layer onLayer):
@@ -302,7 +319,13 @@ def create_layer_on_layer_depend(Layer layer, Layer onLayer):
     :param layer: the :class:`.Layer` which depends on another
     :param onLayer: the :class:`.Layer` which must finish first
     """   
-    conn().proxy().createLayerOnLayerDepend(layer.id, onLayer.id)
+    cdef:
+        Guid layerId = layer.id
+        Guid onLayerId = onLayer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createLayerOnLayerDepend(layerId, onLayerId)
 
 @reconnecting
 def create_layer_on_task_depend(Layer layer, Task onTask):
@@ -313,7 +336,13 @@ def create_layer_on_task_depend(Layer layer, Task onTask):
     :param layer: the :class:`.Layer` which depends on a task
     :param onTask: the :class:`.Task` which must finish first
     """   
-    conn().proxy().createLayerOnTaskDepend(layer.id, onTask.id)
+    cdef:
+        Guid layerId = layer.id
+        Guid onTaskId = onTask.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createLayerOnTaskDepend(layerId, onTaskId)
 
 @reconnecting
 def create_task_by_task_depend(Layer layer, Layer onLayer):
@@ -325,7 +354,13 @@ def create_task_by_task_depend(Layer layer, Layer onLayer):
     :param layer: the :class:`.Layer` which depends on another
     :param onLayer: the :class:`.Layer` which has tasks that must finish first
     """   
-    conn().proxy().createTaskByTaskDepend(layer.id, onLayer.id)
+    cdef:
+        Guid layerId = layer.id
+        Guid onLayerId = onLayer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createTaskByTaskDepend(layerId, onLayerId)
 
 @reconnecting
 def create_task_on_layer_depend(Task task, Layer onLayer):
@@ -336,7 +371,13 @@ def create_task_on_layer_depend(Task task, Layer onLayer):
     :param task: the :class:`.Task` which depends on a layer
     :param onLayer: the :class:`.Layer` which must finish first
     """   
-    conn().proxy().createTaskOnLayerDepend(task.id, onLayer.id)
+    cdef:
+        Guid taskId = task.id
+        Guid onLayerId = onLayer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createTaskOnLayerDepend(taskId, onLayerId)
 
 @reconnecting
 def create_task_on_task_depend(Task task, Task onTask):
@@ -347,7 +388,13 @@ def create_task_on_task_depend(Task task, Task onTask):
     :param task: the :class:`.Task` which depends on another
     :param onTask: the :class:`.Task` which must finish first
     """   
-    conn().proxy().createTaskOnTaskDepend(task.id, onTask.id)
+    cdef:
+        Guid taskId = task.id
+        Guid onTaskId = onTask.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createTaskOnTaskDepend(taskId, onTaskId)
 
 @reconnecting
 def get_depends_on_job(Job job):
@@ -362,8 +409,12 @@ def get_depends_on_job(Job job):
         DependT d
         vector[DependT] deps 
         list ret
+        Guid jobId = job.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getDependsOnJob(deps, jobId)
 
-    conn().proxy().getDependsOnJob(deps, job.id)
     ret = [initDepend(d) for d in deps]
     return ret 
 
@@ -380,8 +431,12 @@ def get_job_depends_on(Job job):
         DependT d
         vector[DependT] deps 
         list ret
+        Guid jobId = job.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getJobDependsOn(deps, jobId)
 
-    conn().proxy().getJobDependsOn(deps, job.id)
     ret = [initDepend(d) for d in deps]
     return ret  
 
@@ -398,8 +453,12 @@ def get_depends_on_layer(Layer layer):
         DependT d
         vector[DependT] deps 
         list ret
+        Guid layerId = layer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getDependsOnLayer(deps, layerId)
 
-    conn().proxy().getDependsOnLayer(deps, layer.id)
     ret = [initDepend(d) for d in deps]
     return ret 
 
@@ -416,8 +475,12 @@ def get_layer_depends_on(Layer layer):
         DependT d
         vector[DependT] deps 
         list ret
+        Guid layerId = layer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getLayerDependsOn(deps, layerId)
 
-    conn().proxy().getLayerDependsOn(deps, layer.id)
     ret = [initDepend(d) for d in deps]
     return ret   
 
@@ -435,8 +498,12 @@ def get_depends_on_task(Task task):
         DependT d
         vector[DependT] deps 
         list ret
+        Guid taskId = task.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getDependsOnTask(deps, taskId)
 
-    conn().proxy().getDependsOnTask(deps, task.id)
     ret = [initDepend(d) for d in deps]
     return ret    
 
@@ -453,8 +520,12 @@ def get_task_depends_on(Task task):
         DependT d
         vector[DependT] deps 
         list ret
+        Guid taskId = task.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getTaskDependsOn(deps, taskId)
 
-    conn().proxy().getTaskDependsOn(deps, task.id)
     ret = [initDepend(d) for d in deps]
     return ret 
 
@@ -465,7 +536,12 @@ def drop_depend(Depend dep):
 
     :param dep: :class:`.Depend` 
     """
-    conn().proxy().dropDepend(dep.id)
+    cdef:
+        Guid dependId = dep.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().dropDepend(dependId)
 
 @reconnecting
 def activate_depend(Depend dep):
@@ -474,7 +550,13 @@ def activate_depend(Depend dep):
 
     :param dep: :class:`.Depend` 
     """    
-    conn().proxy().activateDepend(dep.id)
+    cdef:
+        Guid dependId = dep.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().activateDepend(dependId)
+
 
 
 
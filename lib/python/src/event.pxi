@@ -0,0 +1,93 @@
+#######################
+# EventType
+#
+@cython.internal
+cdef class _EventType:
+    cdef:
+        readonly int RESYNC
+        readonly int JOB_LAUNCHED
+        readonly int JOB_UPDATED
+        readonly int JOB_FINISHED
+        readonly int TASK_UPDATED
+        readonly int NODE_UPDATED
+
+    def __cinit__(self):
+        self.RESYNC = EVENT_RESYNC
+        self.JOB_LAUNCHED = EVENT_JOB_LAUNCHED
+        self.JOB_UPDATED = EVENT_JOB_UPDATED
+        self.JOB_FINISHED = EVENT_JOB_FINISHED
+        self.TASK_UPDATED = EVENT_TASK_UPDATED
+        self.NODE_UPDATED = EVENT_NODE_UPDATED
+
+EventType = _EventType()
+
+
+#######################
+# Event
+#
+cdef inline Event initEvent(EventT& e):
+    cdef Event event = Event()
+    event.setEvent(e)
+    return event
+
+
+cdef class Event:
+    """
+    A change event pushed by the server 
+
+    :var id: long - increasing event id
+    :var type: :data:`.EventType`
+    :var time: long - msec epoch time the event was posted
+    :var objectId: str - id of the job, task or node that changed
+    :var jobId: str - id of the job, for job and task events
+    
+    """
+    cdef EventT event
+
+    def __repr__(self):
+        return "<Event: %d %d %s>" % (self.id, self.type, self.objectId)
+
+    cdef setEvent(self, EventT& e):
+        self.event = e
+
+    property id:
+        def __get__(self): return self.event.id
+
+    property type:
+        def __get__(self): return self.event.type
+
+    property time:
+        def __get__(self): return self.event.time
+
+    property objectId:
+        def __get__(self): return self.event.objectId
+
+    property jobId:
+        def __get__(self): return self.event.jobId
+
+
+@reconnecting
+def get_events(long lastEventId=-1, int timeout=10000):
+    """
+    Wait for the job, task and node change events posted after 
+    lastEventId. Blocks until an event arrives or the timeout 
+    expires. Pass the returned event id to the next call.
+    A negative lastEventId returns no events, just the id to 
+    start from. An :data:`.EventType.RESYNC` event means events 
+    were missed and everything should be reloaded.
+
+    :param lastEventId: long - the last event id seen 
+    :param timeout: int - max msec to wait (the server caps this)
+    :returns: (list[:class:`.Event`], long lastEventId)
+    """
+    cdef:
+        EventBatchT batch
+        EventT eventT
+        long since = lastEventId
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getEvents(batch, since, timeout)
+
+    cdef list events = [initEvent(eventT) for eventT in batch.events]
+    return events, long(batch.lastEventId)
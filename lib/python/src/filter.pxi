@@ -83,8 +83,13 @@ cdef class Matcher(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef MatcherT matcher 
-        conn().proxy().getMatcher(matcher, self.matcher.id)
+        cdef:
+            MatcherT matcher
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getMatcher(matcher, self.matcher.id)
+
         self.setMatcher(matcher)
 
     def delete(self):
@@ -92,6 +97,7 @@ cdef class Matcher(PlowBase):
         delete_matcher(self)
 
 
+@releasing
 def create_field_matcher(Filter filter, int field, int typ, string& value):
     """
     Create a field Matcher 
@@ -105,15 +111,20 @@ def create_field_matcher(Filter filter, int field, int typ, string& value):
     cdef:
         MatcherT matcher 
         Matcher ret 
+        Guid filterId = filter.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createFieldMatcher(matcher, 
+                                     filterId, 
+                                     <MatcherField_type>field, 
+                                     <MatcherType_type>typ, 
+                                     value)
 
-    conn().proxy().createFieldMatcher(matcher, 
-                                           filter.id, 
-                                           <MatcherField_type>field, 
-                                           <MatcherType_type>typ, 
-                                           value )
     ret = initMatcher(matcher)
     return ret
 
+@releasing
 def create_attr_matcher(Filter filter, int typ, string& attr, string& value):
     """
     Create an attribute Matcher 
@@ -127,12 +138,16 @@ def create_attr_matcher(Filter filter, int typ, string& attr, string& value):
     cdef:
         MatcherT matcher 
         Matcher ret 
+        Guid filterId = filter.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createAttrMatcher(matcher, 
+                                    filterId, 
+                                    <MatcherType_type>typ, 
+                                    attr,
+                                    value)
 
-    conn().proxy().createAttrMatcher(matcher, 
-                                          filter.id, 
-                                          <MatcherType_type>typ, 
-                                          attr,
-                                          value )
     ret = initMatcher(matcher)
     return ret
 
@@ -147,8 +162,11 @@ def get_matcher(Guid& matcherId):
     cdef:
         MatcherT matcher 
         Matcher ret 
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getMatcher(matcher, matcherId)
 
-    conn().proxy().getMatcher(matcher, matcherId)
     ret = initMatcher(matcher)
     return ret
 
@@ -164,8 +182,12 @@ def get_matchers(Filter filter):
         MatcherT m
         vector[MatcherT] matchers
         list ret
+        Guid filterId = filter.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getMatchers(matchers, filterId)
 
-    conn().proxy().getMatchers(matchers, filter.id)
     ret = [initMatcher(m) for m in matchers]
     return ret        
 
@@ -176,7 +198,13 @@ def delete_matcher(Matcher matcher):
 
     :param matcher: :class:`.Matcher`
     """
-    conn().proxy().deleteMatcher(matcher.id)
+    cdef:
+        Guid matcherId = matcher.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().deleteMatcher(matcherId)
+
     matcher.matcher.id = ''
 
  #######################
@@ -237,14 +265,20 @@ cdef class Action(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef ActionT action
-        conn().proxy().getAction(action, self.action.id)
+        cdef:
+            ActionT action
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getAction(action, self.action.id)
+
         self.setAction(action)
 
     def delete(self):
         """Delete the action"""
         delete_action(self)
 
+@releasing
 def create_action(Filter filter, int typ, string& value):
     """
     Create an action 
@@ -257,8 +291,12 @@ def create_action(Filter filter, int typ, string& value):
     cdef:
         ActionT action 
         Action ret 
+        Guid filterId = filter.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createAction(action, filterId, <ActionType_type>typ, value)
 
-    conn().proxy().createAction(action, filter.id, <ActionType_type>typ, value)
     ret = initAction(action)
     return ret
 
@@ -273,8 +311,11 @@ def get_action(Guid& actionId):
     cdef:
         ActionT action 
         Action ret 
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getAction(action, actionId)
 
-    conn().proxy().getAction(action, actionId)
     ret = initAction(action)
     return ret
 
@@ -290,8 +331,12 @@ def get_actions(Filter filter):
         ActionT a
         vector[ActionT] actions
         list ret
+        Guid filterId = filter.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getActions(actions, filterId)
 
-    conn().proxy().getActions(actions, filter.id)
     ret = [initAction(a) for a in actions]
     return ret        
 
@@ -302,7 +347,13 @@ def delete_action(Action action):
 
     :param action: :class:`.Action`
     """
-    conn().proxy().deleteAction(action.id)
+    cdef:
+        Guid actionId = action.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().deleteAction(actionId)
+
     action.action.id = ''
 
 #######################
@@ -355,8 +406,13 @@ cdef class Filter(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef FilterT filt
-        conn().proxy().getFilter(filt, self._filter.id)
+        cdef:
+            FilterT filt
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getFilter(filt, self._filter.id)
+
         self.setFilter(filt)
 
     def delete(self):
@@ -449,6 +505,7 @@ cdef class Filter(PlowBase):
         return action
 
 
+@releasing
 def create_filter(Project project, string& name):
     """
     Create a filter for a project 
@@ -460,8 +517,12 @@ def create_filter(Project project, string& name):
     cdef:
         FilterT filterT
         Filter ret 
+        Guid projectId = project.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createFilter(filterT, projectId, name)
 
-    conn().proxy().createFilter(filterT, project.id, name)
     ret = initFilter(filterT)
     return ret
 
@@ -477,8 +538,12 @@ def get_filters(Project project):
         FilterT f
         vector[FilterT] filters 
         list ret 
+        Guid projectId = project.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getFilters(filters, projectId)
 
-    conn().proxy().getFilters(filters, project.id)
     ret = [initFilter(f) for f in filters]
     return ret
 
@@ -493,8 +558,11 @@ def get_filter(Guid& filterId):
     cdef:
         FilterT filt 
         Filter ret 
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getFilter(filt, filterId)
 
-    conn().proxy().getFilter(filt, filterId)
     ret = initFilter(filt)
     return ret
 
@@ -505,7 +573,13 @@ def delete_filter(Filter filt):
 
     :param filt: :class:`.Filter`
     """
-    conn().proxy().deleteFilter(filt.id)
+    cdef:
+        Guid filterId = filt.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().deleteFilter(filterId)
+
     filt._filter.id = ''
 
 @reconnecting
@@ -516,7 +590,13 @@ def set_filter_name(Filter filt, string& name):
     :param filt: :class:`.Filter`
     :param name: str 
     """    
-    conn().proxy().setFilterName(filt.id, name)
+    cdef:
+        Guid filterId = filt.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setFilterName(filterId, name)
+
     filt._filter.name = name
 
 @reconnecting
@@ -527,24 +607,44 @@ def set_filter_order(Filter filt, int order):
     :param filt: :class:`.Filter`
     :param order: int
     """    
-    conn().proxy().setFilterOrder(filt.id, order)
+    cdef:
+        Guid filterId = filt.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setFilterOrder(filterId, order)
+
     filt._filter.order = order
 
+@releasing
 def increase_filter_order(Filter filt):
     """
     Increase the filter order
 
     :param filt: :class:`.Filter`
     """    
-    conn().proxy().increaseFilterOrder(filt.id)
+    cdef:
+        Guid filterId = filt.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().increaseFilterOrder(filterId)
+
     filt.refresh()
 
+@releasing
 def decrease_filter_order(Filter filt):
     """
     Decrease the filter order
 
     :param filt: :class:`.Filter`
     """    
-    conn().proxy().decreaseFilterOrder(filt.id) 
+    cdef:
+        Guid filterId = filt.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().decreaseFilterOrder(filterId)
+
     filt.refresh()
 
@@ -8,6 +8,11 @@ cdef inline Folder initFolder(FolderT& f):
     folder.setFolder(f)
     return folder
 
+cdef inline JobBoardDelta initJobBoardDelta(JobBoardDeltaT& d):
+    cdef JobBoardDelta delta = JobBoardDelta()
+    delta.setDelta(d)
+    return delta
+
 
 cdef class Folder(PlowBase):
     """
@@ -82,8 +87,13 @@ cdef class Folder(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef FolderT folder
-        conn().proxy().getFolder(folder, self.folder.id)
+        cdef:
+            FolderT folder
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getFolder(folder, self.folder.id)
+
         self.setFolder(folder)
 
     def set_min_cores(self, int value):
@@ -117,6 +127,43 @@ cdef class Folder(PlowBase):
         return get_procs(folderIds=[self.id])
 
 
+cdef class JobBoardDelta:
+    """
+    The changes to a project's job board since a point in time 
+
+    :var folders: list[:class:`.Folder`] - changed folders, holding only their changed jobs
+    :var removedFolders: list[str] - ids of deleted folders
+    :var removedJobs: list[str] - ids of jobs no longer on the board
+    :var updateTime: long - msec epoch time to pass to the next delta call
+    
+    """
+    cdef:
+        list _folders
+        list _removedFolders
+        list _removedJobs
+        public long updateTime
+
+    def __repr__(self):
+        return "<JobBoardDelta: %d folders, %d removed jobs>" % (
+            len(self._folders), len(self._removedJobs))
+
+    cdef setDelta(self, JobBoardDeltaT& d):
+        cdef FolderT folderT
+        self._folders = [initFolder(folderT) for folderT in d.folders]
+        self._removedFolders = d.removedFolders
+        self._removedJobs = d.removedJobs
+        self.updateTime = d.updateTime
+
+    property folders:
+        def __get__(self): return self._folders
+
+    property removedFolders:
+        def __get__(self): return self._removedFolders
+
+    property removedJobs:
+        def __get__(self): return self._removedJobs
+
+
 @reconnecting
 def get_folder(Guid& folderId):
     """
@@ -128,8 +175,11 @@ def get_folder(Guid& folderId):
     cdef:
         FolderT folderT
         Folder folder 
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getFolder(folderT, folderId)
 
-    conn().proxy().getFolder(folderT, folderId)
     folder = initFolder(folderT)
     return folder
 
@@ -144,6 +194,7 @@ def get_folders(Project project):
     cdef list folders = Project.get_folders(proj)
     return
 
+@releasing
 def create_folder(Project project, string name):
     """
     Create a folder 
@@ -152,8 +203,14 @@ def create_folder(Project project, string name):
     :param name: str - folder name 
     :returns: :class:`.Folder`
     """
-    cdef FolderT folderT 
-    conn().proxy().createFolder(folderT, project.id, name)
+    cdef:
+        FolderT folderT
+        Guid projectId = project.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createFolder(folderT, projectId, name)
+
     cdef Folder folder = initFolder(folderT)
     return folder
 
@@ -165,7 +222,12 @@ def set_folder_min_cores(Folder folder, int value):
     :param folder: :class:`.Folder`
     :param value: int - cores 
     """
-    conn().proxy().setFolderMinCores(folder.id, value)
+    cdef:
+        Guid folderId = folder.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setFolderMinCores(folderId, value)
 
 @reconnecting
 def set_folder_max_cores(Folder folder, int value):
@@ -175,7 +237,12 @@ def set_folder_max_cores(Folder folder, int value):
     :param folder: :class:`.Folder`
     :param value: int - cores 
     """
-    conn().proxy().setFolderMaxCores(folder.id, value)
+    cdef:
+        Guid folderId = folder.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setFolderMaxCores(folderId, value)
 
 @reconnecting
 def set_folder_name(Folder folder, string& name):
@@ -185,7 +252,12 @@ def set_folder_name(Folder folder, string& name):
     :param folder: :class:`.Folder`
     :param name: str  
     """
-    conn().proxy().setFolderName(folder.id, name)
+    cdef:
+        Guid folderId = folder.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setFolderName(folderId, name)
 
 @reconnecting
 def delete_folder(Folder folder):
@@ -194,6 +266,11 @@ def delete_folder(Folder folder):
 
     :param folder: :class:`.Folder`
     """
-    conn().proxy().deleteFolder(folder.id)
+    cdef:
+        Guid folderId = folder.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().deleteFolder(folderId)
 
 
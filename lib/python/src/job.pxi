@@ -77,6 +77,7 @@ cdef class JobFilter:
         self.value.matchingOnly = kwargs.get('matchingOnly', False)
         self.value.regex = kwargs.get('regex', '')
         self.value.jobIds = kwargs.get('jobIds', [])
+        self.value.lastUpdateTime = kwargs.get('lastUpdateTime', 0)
 
         project = kwargs.get('project', [])
         if isinstance(project, (str, unicode)):
@@ -206,6 +207,7 @@ cdef class JobSpec:
         def __get__(self): return self.env
         def __set__(self, val): self.env = val
 
+    @releasing
     def launch(self):
         """
         Launch this spec and return the Job 
@@ -216,9 +218,12 @@ cdef class JobSpec:
             JobT job
             JobSpecT spec
             Job ret 
+            PlowClient* c
 
         spec = self.toJobSpecT()
-        conn().proxy().launch(job, spec)
+        c = conn()
+        with nogil:
+            c.proxy().launch(job, spec)
 
         ret = initJob(job)
         return ret
@@ -236,8 +241,11 @@ def get_job_spec(Guid& jobId):
     cdef:
         JobSpecT specT
         JobSpec spec
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getJobSpec(specT, jobId)
 
-    conn().proxy().getJobSpec(specT, jobId)
     spec = initJobSpec(specT)
     return spec
 
@@ -343,8 +351,13 @@ cdef class Job(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef JobT job 
-        conn().proxy().getJob(job, self._job.id)
+        cdef:
+            JobT job
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getJob(job, self._job.id)
+
         self.setJob(job)
 
     def kill(self, string reason):
@@ -515,10 +528,13 @@ def get_job(Guid& id):
     :param id: str Job id
     :returns: :class:`.Job`
     """
-    cdef JobT jobT
-    cdef Job job
+    cdef:
+        JobT jobT
+        Job job
+        PlowClient* c = conn()
 
-    conn().proxy().getJob(jobT, id)
+    with nogil:
+        c.proxy().getJob(jobT, id)
 
     job = initJob(jobT)
     return job
@@ -531,10 +547,13 @@ def get_active_job(string name):
     :param id: str name
     :returns: :class:`.Job`
     """    
-    cdef JobT jobT
-    cdef Job job
+    cdef:
+        JobT jobT
+        Job job
+        PlowClient* c = conn()
 
-    conn().proxy().getActiveJob(jobT, name)
+    with nogil:
+        c.proxy().getActiveJob(jobT, name)
 
     job = initJob(jobT)
     return job
@@ -551,6 +570,8 @@ def get_jobs(**kwargs):
     :param jobIds: list[str] of matching job ids
     :param name: list[str] of matching job names
     :param states: list[:obj:`.JobState`] 
+    :param lastUpdateTime: long msec epoch timestamp. Only return jobs
+        changed since this time, including jobs that have left ``states``
 
     :returns: list[:class:`.Job`]
     """
@@ -560,11 +581,26 @@ def get_jobs(**kwargs):
         list ret 
         JobFilter filter = JobFilter(**kwargs)
         JobFilterT f = filter.value
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getJobs(jobs, f)
 
-    conn().proxy().getJobs(jobs, f)
     ret = [initJob(jobT) for jobT in jobs]
     return ret
 
+def get_jobs_by_ids(object jobIds):
+    """
+    Get a list of jobs by their ids, in one request.
+
+    :param jobIds: list[str] of job ids 
+    :returns: list[:class:`.Job`]
+    """
+    if not jobIds:
+        return []
+
+    return get_jobs(jobIds=list(jobIds))
+
 @reconnecting
 def kill_job(Job job, string reason):
     """
@@ -573,7 +609,13 @@ def kill_job(Job job, string reason):
     :param job: :class:`.Job`
     :param reason: str reason for killing the job 
     """
-    conn().proxy().killJob(job.id, reason)
+    cdef:
+        Guid jobId = job.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().killJob(jobId, reason)
+
     job.refresh()
 
 @reconnecting
@@ -584,7 +626,13 @@ def pause_job(Job job, bint paused):
     :param job: :class:`.Job`
     :param paused: bool pause state
     """
-    conn().proxy().pauseJob(job.id, paused)
+    cdef:
+        Guid jobId = job.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().pauseJob(jobId, paused)
+
     job.refresh()
 
 @reconnecting
@@ -595,7 +643,13 @@ def set_job_min_cores(Job job, int value):
     :param job: :class:`.Job`
     :param value: int number of cores
     """
-    conn().proxy().setJobMinCores(job.id, value)
+    cdef:
+        Guid jobId = job.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setJobMinCores(jobId, value)
+
     job.refresh()
 
 @reconnecting
@@ -606,7 +660,13 @@ def set_job_max_cores(Job job, int value):
     :param job: :class:`.Job`
     :param value: int number of cores
     """
-    conn().proxy().setJobMaxCores(job.id, value)
+    cdef:
+        Guid jobId = job.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setJobMaxCores(jobId, value)
+
     job.refresh()
 
 @reconnecting
@@ -622,15 +682,48 @@ def get_job_outputs(object job):
         vector[OutputT] outputs
         Guid jobId
         list ret
+        PlowClient* c
 
     if isinstance(job, Job):
         jobId = job.id
     else:
         jobId = job
 
-    conn().proxy().getJobOutputs(outputs, jobId)
+    c = conn()
+    with nogil:
+        c.proxy().getJobOutputs(outputs, jobId)
 
     ret = [initOutput(outT) for outT in outputs]
     return ret
 
+@reconnecting
+def get_outputs_for_jobs(object jobs):
+    """
+    Get the outputs of many jobs in one request.
+
+    :param jobs: list[:class:`.Job`] or list[str] job ids
+    :returns: dict{str job id: list[:class:`.Output`]}
+    """
+    cdef:
+        vector[Guid] jobIds = to_guids(jobs)
+        map[Guid, vector[OutputT]] outputs
+        map[Guid, vector[OutputT]].iterator it
+        OutputT outT
+        dict ret = {}
+        PlowClient* c
+
+    if jobIds.empty():
+        return ret
+
+    c = conn()
+    with nogil:
+        c.proxy().getOutputsForJobs(outputs, jobIds)
+
+    it = outputs.begin()
+    while it != outputs.end():
+        ret[deref(it).first] = [initOutput(outT) for outT in deref(it).second]
+        inc(it)
+
+    return ret
+
 
@@ -98,11 +98,15 @@ def get_services():
         ServiceT servT
         vector[ServiceT] vec
         list ret
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getServices(vec)
 
-    conn().proxy().getServices(vec)
     ret = [initService(servT) for servT in vec]
     return ret
 
+@releasing
 def create_service(Service src):
     """
     Create a new service. Updates the original
@@ -111,9 +115,13 @@ def create_service(Service src):
     :param src: :class:`.Service`
     :returns: :class:`.Service`
     """
-    cdef ServiceT created
+    cdef:
+        ServiceT created
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createService(created, src.servT)
 
-    conn().proxy().createService(created, src.servT)
     src.setService(created)    
 
     return src
@@ -125,8 +133,14 @@ def delete_service(Service src):
 
     :param src: :class:`.Service`
     """
-    cdef ServiceT empty
-    conn().proxy().deleteService(src.id)
+    cdef:
+        ServiceT empty
+        Guid serviceId = src.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().deleteService(serviceId)
+
     src.setService(empty)
 
 @reconnecting
@@ -137,7 +151,10 @@ def update_service(Service src):
 
     :param src: :class:`.Service`  
     """
-    conn().proxy().updateService(src.servT)
+    cdef PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().updateService(src.servT)
 
 
 #######################
@@ -532,8 +549,13 @@ cdef class Layer(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef LayerT layer 
-        conn().proxy().getLayerById(layer, self._layer.id)
+        cdef:
+            LayerT layer
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getLayerById(layer, self._layer.id)
+
         self.setLayer(layer)
 
     def get_job(self):
@@ -642,9 +664,12 @@ def get_layer_by_id(Guid& layerId):
     cdef:
         LayerT layerT 
         Layer layer
+        PlowClient* c
 
     try:
-        conn().proxy().getLayerById(layerT, layerId)
+        c = conn()
+        with nogil:
+            c.proxy().getLayerById(layerT, layerId)
     except RuntimeError:
         return None 
 
@@ -664,13 +689,17 @@ def get_layer(object job, string name):
         LayerT layerT 
         Layer layer
         Guid jobId
+        PlowClient* c
 
     if isinstance(job, Job):
         jobId = job.id
     else:
         jobId = job
         
-    conn().proxy().getLayer(layerT, jobId, name)
+    c = conn()
+    with nogil:
+        c.proxy().getLayer(layerT, jobId, name)
+
     layer = initLayer(layerT)
     return layer
 
@@ -688,16 +717,51 @@ def get_layers(object job):
         vector[LayerT] layers 
         Guid jobId
         list ret
+        PlowClient* c
 
     if isinstance(job, Job):
         jobId = job.id
     else:
         jobId = job
 
-    conn().proxy().getLayers(layers, jobId)
+    c = conn()
+    with nogil:
+        c.proxy().getLayers(layers, jobId)
+
     ret = [initLayer(layerT) for layerT in layers]
     return ret
 
+@reconnecting
+def get_layers_for_jobs(object jobs):
+    """
+    Get the layers of many jobs in one request.
+
+    :param jobs: list[:class:`.Job`] or list[str] job ids
+    :returns: dict{str job id: list[:class:`.Layer`]}
+    """
+    cdef:
+        vector[Guid] jobIds = to_guids(jobs)
+        map[Guid, vector[LayerT]] layers
+        map[Guid, vector[LayerT]].iterator it
+        LayerT layerT
+        dict ret = {}
+        PlowClient* c
+
+    if jobIds.empty():
+        return ret
+
+    c = conn()
+    with nogil:
+        c.proxy().getLayersForJobs(layers, jobIds)
+
+    it = layers.begin()
+    while it != layers.end():
+        ret[deref(it).first] = [initLayer(layerT) for layerT in deref(it).second]
+        inc(it)
+
+    return ret
+
+@releasing
 def add_layer_output(Layer layer, string path, dict attrs):
     """
     A an output to a layer 
@@ -710,8 +774,13 @@ def add_layer_output(Layer layer, string path, dict attrs):
     cdef:
         OutputT outT
         Output out
+        Guid layerId = layer.id
+        Attrs outAttrs = dict_to_attrs(attrs)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().addOutput(outT, layerId, path, outAttrs)
 
-    conn().proxy().addOutput(outT, layer.id, path, dict_to_attrs(attrs))
     out = initOutput(outT)
     return out
 
@@ -729,13 +798,17 @@ def get_layer_outputs(object layer):
         Output output 
         Guid layerId
         list ret
+        PlowClient* c
 
     if isinstance(layer, Layer):
         layerId = layer.id
     else:
         layerId = layer
 
-    conn().proxy().getLayerOutputs(outputs, layerId)
+    c = conn()
+    with nogil:
+        c.proxy().getLayerOutputs(outputs, layerId)
+
     ret = [initOutput(outT) for outT in outputs]
     return ret
 
@@ -745,7 +818,12 @@ def set_layer_tags(Layer layer, vector[string]& tags):
     :param layer: :class:`.Layer`
     :param tags: list(str) 
     """
-    conn().proxy().setLayerTags(layer.id, tags)
+    cdef:
+        Guid layerId = layer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setLayerTags(layerId, tags)
 
 @reconnecting
 def set_layer_min_cores_per_task(Layer layer, int minCores):
@@ -753,7 +831,12 @@ def set_layer_min_cores_per_task(Layer layer, int minCores):
     :param layer: :class:`.Layer`
     :param minCores: int 
     """
-    conn().proxy().setLayerMinRamPerTask(layer.id, minCores)
+    cdef:
+        Guid layerId = layer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setLayerMinRamPerTask(layerId, minCores)
 
 @reconnecting
 def set_layer_max_cores_per_task(Layer layer, int maxCores):
@@ -761,7 +844,12 @@ def set_layer_max_cores_per_task(Layer layer, int maxCores):
     :param layer: :class:`.Layer`
     :param maxCores: int 
     """
-    conn().proxy().setLayerMaxCoresPerTask(layer.id, maxCores)
+    cdef:
+        Guid layerId = layer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setLayerMaxCoresPerTask(layerId, maxCores)
 
 @reconnecting
 def set_layer_min_ram_per_task(Layer layer, int minRam):
@@ -769,7 +857,12 @@ def set_layer_min_ram_per_task(Layer layer, int minRam):
     :param layer: :class:`.Layer`
     :param minRam: int 
     """
-    conn().proxy().setLayerMinRamPerTask(layer.id, minRam)
+    cdef:
+        Guid layerId = layer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setLayerMinRamPerTask(layerId, minRam)
 
 @reconnecting
 def set_layer_threadable(Layer layer, bint threadable):
@@ -777,6 +870,11 @@ def set_layer_threadable(Layer layer, bint threadable):
     :param layer: :class:`.Layer`
     :param threadable: bool
     """
-    conn().proxy().setLayerThreadable(layer.id, threadable)
+    cdef:
+        Guid layerId = layer.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setLayerThreadable(layerId, threadable)
 
 
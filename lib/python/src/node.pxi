@@ -54,6 +54,7 @@ cdef class NodeFilter:
         self.value.regex = kwargs.get('regex', '')
         self.value.hostnames = kwargs.get('hostnames', [])
         self.value.locked = kwargs.get('locked', False)
+        self.value.lastUpdateTime = kwargs.get('lastUpdateTime', 0)
 
         cdef NodeState_type i
         for i in kwargs.get('states', []):
@@ -211,8 +212,13 @@ cdef class Node(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef NodeT node 
-        conn().proxy().getNode(node, self.node.name)
+        cdef:
+            NodeT node
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getNode(node, self.node.name)
+
         self.setNode(node)
 
     def lock(self, bint locked):
@@ -282,8 +288,11 @@ def get_node(string name):
     cdef: 
         NodeT nodeT
         Node node 
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getNode(nodeT, name)
 
-    conn().proxy().getNode(nodeT, name)
     node = initNode(nodeT)
     return node
 
@@ -297,6 +306,7 @@ def get_nodes(**kwargs):
     :param regex: str 
     :param hostnames: list[str]
     :param locked: bool
+    :param lastUpdateTime: long msec epoch timestamp. Only return nodes changed since this time
     :returns: list[:class:`.Node`]
     """
     cdef:
@@ -305,13 +315,17 @@ def get_nodes(**kwargs):
         list ret
         NodeFilter filter = NodeFilter(**kwargs)
         NodeFilterT f = filter.value
+        PlowClient* c
 
     try:
-        kwargs['cluster'] = [c.id for c in kwargs['cluster']]
+        kwargs['cluster'] = [cl.id for cl in kwargs['cluster']]
     except:
         pass
 
-    conn().proxy().getNodes(nodes, f)
+    c = conn()
+    with nogil:
+        c.proxy().getNodes(nodes, f)
+
     ret = [initNode(nodeT) for nodeT in nodes]
     return ret
 
@@ -323,7 +337,13 @@ def set_node_locked(Node node, bint locked):
     :param node: :class:`.Node`
     :param locked: bool 
     """
-    conn().proxy().setNodeLocked(node.id, locked)
+    cdef:
+        Guid nodeId = node.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setNodeLocked(nodeId, locked)
+
     node.node.locked = locked
 
 @reconnecting
@@ -334,7 +354,14 @@ def set_node_cluster(Node node, Cluster cluster):
     :param node: :class:`.Node`
     :param cluster: :class:`.Cluster`
     """
-    conn().proxy().setNodeCluster(node.id, cluster.id)
+    cdef:
+        Guid nodeId = node.id
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setNodeCluster(nodeId, clusterId)
+
     node.node.clusterId = cluster.id
     node.node.clusterName = cluster.name
 
@@ -346,7 +373,13 @@ def set_node_tags(Node node, c_set[string] tags):
     :param node: :class:`.Node`
     :param tags: set(str) 
     """
-    conn().proxy().setNodeTags(node.id, tags)
+    cdef:
+        Guid nodeId = node.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setNodeTags(nodeId, tags)
+
     node.node.tags = tags
 
 @reconnecting
@@ -359,8 +392,14 @@ def set_node_slot_mode(Node node, int mode, int cores, int ram):
     :param cores: int number of cores
     :param ram: int ram in MB
     """
-    cdef SlotMode_type typ = <SlotMode_type>mode
-    conn().proxy().setNodeSlotMode(node.id, typ, cores, ram)
+    cdef:
+        SlotMode_type typ = <SlotMode_type>mode
+        Guid nodeId = node.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setNodeSlotMode(nodeId, typ, cores, ram)
+
     node.node.mode = typ
     node.node.slotCores = cores
     node.node.slotRam = ram
@@ -494,8 +533,11 @@ def get_proc(Guid& id):
     cdef: 
         ProcT procT
         Proc proc
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getProc(procT, id)
 
-    conn().proxy().getProc(procT, id)
     proc = initProc(procT)
     return proc
 
@@ -523,8 +565,11 @@ def get_procs(**kwargs):
         list ret 
         ProcFilter filter = ProcFilter(**kwargs)
         ProcFilterT f = filter.value
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getProcs(procs, f)
 
-    conn().proxy().getProcs(procs, f)
     ret = [initProc(procT) for procT in procs]
     return ret
 
@@ -58,8 +58,12 @@ def update_output_attrs(Guid& outputId, dict attrs):
     :param outputId: str :class:`.Output` id
     :param attrs: dict
     """
+    cdef:
+        Attrs outAttrs = dict_to_attrs(attrs)
+        PlowClient* c = conn()
 
-    conn().proxy().updateOutputAttrs(outputId, dict_to_attrs(attrs))
+    with nogil:
+        c.proxy().updateOutputAttrs(outputId, outAttrs)
 
 @reconnecting
 def set_output_attrs(Guid& outputId, dict attrs):
@@ -69,7 +73,12 @@ def set_output_attrs(Guid& outputId, dict attrs):
     :param outputId: str :class:`.Output` id
     :param attrs: dict
     """
-    conn().proxy().setOutputAttrs(outputId, dict_to_attrs(attrs))    
+    cdef:
+        Attrs outAttrs = dict_to_attrs(attrs)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setOutputAttrs(outputId, outAttrs)
 
 @reconnecting
 def get_output_attrs(Guid& outputId):
@@ -79,7 +88,12 @@ def get_output_attrs(Guid& outputId):
     :param outputId: str :class:`.Output` id
     :returns: dict
     """
-    cdef Attrs attrs
-    conn().proxy().getOutputAttrs(attrs, outputId)
+    cdef:
+        Attrs attrs
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getOutputAttrs(attrs, outputId)
+
     return attrs 
 
@@ -13,6 +13,7 @@ include "filter.pxi"
 include "quota.pxi"
 include "depend.pxi"
 include "output.pxi"
+include "event.pxi"
 
 #
 # Module Init
@@ -29,6 +30,11 @@ def get_plow_time():
 
     :returns: long - msec since epoch
     """
-    cdef long epoch
-    epoch = conn().proxy().getPlowTime()
+    cdef:
+        long epoch
+        PlowClient* c = conn()
+
+    with nogil:
+        epoch = c.proxy().getPlowTime()
+
     return long(epoch)
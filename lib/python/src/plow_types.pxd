@@ -66,6 +66,14 @@ cdef extern from "rpc/plow_types.h" namespace "Plow":
         SLOTMODE_SINGLE "Plow::SlotMode::SINGLE"
         SLOTMODE_SLOTS "Plow::SlotMode::SLOTS" 
 
+    ctypedef enum EventType_type "Plow::EventType::type":
+        EVENT_RESYNC "Plow::EventType::RESYNC"
+        EVENT_JOB_LAUNCHED "Plow::EventType::JOB_LAUNCHED"
+        EVENT_JOB_UPDATED "Plow::EventType::JOB_UPDATED"
+        EVENT_JOB_FINISHED "Plow::EventType::JOB_FINISHED"
+        EVENT_TASK_UPDATED "Plow::EventType::TASK_UPDATED"
+        EVENT_NODE_UPDATED "Plow::EventType::NODE_UPDATED"
+
     cdef cppclass MatcherT:
         Guid id
         MatcherType_type type
@@ -260,6 +268,23 @@ cdef extern from "rpc/plow_types.h" namespace "Plow":
         TaskTotalsT totals
         vector[JobT] jobs
 
+    cdef cppclass JobBoardDeltaT:
+        vector[FolderT] folders
+        vector[Guid] removedFolders
+        vector[Guid] removedJobs
+        Timestamp updateTime
+
+    cdef cppclass EventT:
+        long id
+        EventType_type type
+        Timestamp time
+        Guid objectId
+        Guid jobId
+
+    cdef cppclass EventBatchT:
+        vector[EventT] events
+        long lastEventId
+
     cdef struct _DependSpecT__isset:
         bint dependentJob
         bint dependOnJob        
@@ -390,6 +415,7 @@ cdef extern from "rpc/plow_types.h" namespace "Plow":
         vector[JobState_type] states 
         vector[Guid] jobIds
         vector[string] name 
+        Timestamp lastUpdateTime
 
     cdef cppclass JobStatsT:
         int highRam
@@ -428,6 +454,7 @@ cdef extern from "rpc/plow_types.h" namespace "Plow":
         vector[string] hostnames
         vector[NodeState_type] states
         bint locked
+        Timestamp lastUpdateTime
 
     cdef cppclass QuotaFilterT:
         vector[Guid] project
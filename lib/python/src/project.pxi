@@ -40,7 +40,10 @@ cdef class Project(PlowBase):
         """
         Refresh the attributes from the server
         """
-        conn().proxy().getProject(self.project, self.project.id)
+        cdef PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getProject(self.project, self.project.id)
 
     @reconnecting
     def get_folders(self):
@@ -53,8 +56,11 @@ cdef class Project(PlowBase):
             vector[FolderT] folders
             FolderT foldT 
             list results
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getFolders(folders, self.project.id)
 
-        conn().proxy().getFolders(folders, self.project.id)
         results = [initFolder(foldT) for foldT in folders]
         return results
 
@@ -76,6 +82,16 @@ cdef class Project(PlowBase):
         cdef list board = get_job_board(self)
         return board
 
+    def get_job_board_delta(self, long lastUpdateTime=0):
+        """
+        Get the changes to this project's job board since
+        the given time 
+
+        :param lastUpdateTime: long msec epoch timestamp
+        :returns: :class:`.JobBoardDelta`
+        """
+        return get_job_board_delta(self, lastUpdateTime)
+
     def get_procs(self):
         """
         Get current procs 
@@ -106,8 +122,11 @@ def get_project(Guid& guid):
     cdef: 
         ProjectT projT 
         Project project
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getProject(projT, guid)
 
-    conn().proxy().getProject(projT, guid)
     project = initProject(projT)
     return project
 
@@ -123,8 +142,11 @@ def get_project_by_code(string code):
     cdef: 
         ProjectT projT 
         Project project
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getProjectByCode(projT, code)
 
-    conn().proxy().getProjectByCode(projT, code)
     project = initProject(projT)
     return project
 
@@ -140,8 +162,11 @@ def get_projects():
         vector[ProjectT] projects 
         ProjectT projT
         list results
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getProjects(projects)
 
-    conn().proxy().getProjects(projects)
     results = [initProject(projT) for projT in projects] 
     return results
 
@@ -156,11 +181,15 @@ def get_active_projects():
         vector[ProjectT] projects 
         ProjectT projT
         list results
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getActiveProjects(projects)
 
-    conn().proxy().getActiveProjects(projects)
     results = [initProject(projT) for projT in projects] 
     return results    
 
+@releasing
 def create_project(string title, string code):
     """
     Create a new Project with a title and code 
@@ -169,9 +198,14 @@ def create_project(string title, string code):
     :param code: str - A short code to indentify the project 
     :returns: :class:`.Project`
     """
-    cdef ProjectT projT
-    cdef Project proj 
-    conn().proxy().createProject(projT, title, code)
+    cdef:
+        ProjectT projT
+        Project proj
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createProject(projT, title, code)
+
     proj = initProject(projT)
     return proj
 
@@ -183,7 +217,12 @@ def set_project_active(Project project, bint active):
     :param project: :class:`.Project`
     :param active: bool 
     """
-    conn().proxy().setProjectActive(project.id, active)
+    cdef:
+        Guid projectId = project.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setProjectActive(projectId, active)
 
 @reconnecting
 def get_job_board(Project project):
@@ -197,7 +236,33 @@ def get_job_board(Project project):
     cdef: 
         FolderT folderT 
         vector[FolderT] folders
+        Guid projectId = project.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getJobBoard(folders, projectId)
 
-    conn().proxy().getJobBoard(folders, project.id)
     cdef list ret = [initFolder(folderT) for folderT in folders]
-    return ret
\ No newline at end of file
+    return ret
+
+@reconnecting
+def get_job_board_delta(Project project, long lastUpdateTime=0):
+    """
+    Get the changes to a project's job board since the 
+    given time. Pass the updateTime of the returned delta
+    as the lastUpdateTime of the next call.
+
+    :param project: :class:`.Project`
+    :param lastUpdateTime: long msec epoch timestamp (0 for everything)
+    :returns: :class:`.JobBoardDelta`
+    """
+    cdef: 
+        JobBoardDeltaT deltaT
+        Guid projectId = project.id
+        Timestamp since = lastUpdateTime
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getJobBoardDelta(deltaT, projectId, since)
+
+    return initJobBoardDelta(deltaT)
\ No newline at end of file
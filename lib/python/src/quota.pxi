@@ -81,7 +81,10 @@ cdef class Quota(PlowBase):
         """
         Refresh the attributes from the server
         """
-        conn().proxy().getQuota(self._quota, self._quota.id)
+        cdef PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getQuota(self._quota, self._quota.id)
 
     def set_size(self, int size):
         """ :param size: int """
@@ -122,8 +125,11 @@ def get_quota(Guid& id):
     cdef: 
         QuotaT qT
         Quota q 
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getQuota(qT, id)
 
-    conn().proxy().getQuota(qT, id)
     q = initQuota(qT)
     return q
 
@@ -141,13 +147,18 @@ def get_quotas(**kwargs):
         vector[QuotaT] quotas 
         QuotaFilter filt
         list ret
+        PlowClient* c
 
     filt = QuotaFilter(**kwargs)
 
-    conn().proxy().getQuotas(quotas, filt.value)
+    c = conn()
+    with nogil:
+        c.proxy().getQuotas(quotas, filt.value)
+
     ret = [initQuota(qT) for qT in quotas]
     return ret
 
+@releasing
 def create_quota(Project project,  Cluster cluster, int size, int burst):
     """
     Create a quota for a project and cluster 
@@ -161,8 +172,13 @@ def create_quota(Project project,  Cluster cluster, int size, int burst):
     cdef:
         QuotaT qT
         Quota q 
+        Guid projectId = project.id
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().createQuota(qT, projectId, clusterId, size, burst)
 
-    conn().proxy().createQuota(qT, project.id, cluster.id, size, burst)
     q = initQuota(qT)
     return q
 
@@ -174,7 +190,13 @@ def set_quota_size(Cluster cluster, int size):
     :param cluster: :class:`.Quota` 
     :param size: int 
     """
-    conn().proxy().setQuotaSize(cluster.id, size)
+    cdef:
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setQuotaSize(clusterId, size)
+
 @reconnecting
 def set_quota_burst(Cluster cluster, int burst):
     """
@@ -183,7 +205,13 @@ def set_quota_burst(Cluster cluster, int burst):
     :param cluster: :class:`.Quota` 
     :param burst: int 
     """
-    conn().proxy().setQuotaBurst(cluster.id, burst)
+    cdef:
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setQuotaBurst(clusterId, burst)
+
 @reconnecting
 def set_quota_locked(Cluster cluster, bint locked):
     """
@@ -192,5 +220,10 @@ def set_quota_locked(Cluster cluster, bint locked):
     :param cluster: :class:`.Quota` 
     :param locked: bool 
     """
-    conn().proxy().setQuotaLocked(cluster.id, locked)
+    cdef:
+        Guid clusterId = cluster.id
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().setQuotaLocked(clusterId, locked)
 
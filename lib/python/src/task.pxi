@@ -93,12 +93,44 @@ def get_task_stats(Guid& taskId):
         vector[TaskStatsT] vec
         TaskStatsT statsT
         list ret
+        PlowClient* c = conn()
 
-    conn().proxy().getTaskStats(vec, taskId) 
+    with nogil:
+        c.proxy().getTaskStats(vec, taskId)
 
     ret = [initTaskStats(statsT) for statsT in vec]
     return ret
 
+@reconnecting
+def get_task_stats_bulk(object tasks):
+    """
+    Get the task stats of many tasks in one request.
+
+    :param tasks: list[:class:`.Task`] or list[str] task ids
+    :returns: dict{str task id: list[:class:`.TaskStats`]}
+    """
+    cdef:
+        vector[Guid] taskIds = to_guids(tasks)
+        map[Guid, vector[TaskStatsT]] stats
+        map[Guid, vector[TaskStatsT]].iterator it
+        TaskStatsT statsT
+        dict ret = {}
+        PlowClient* c
+
+    if taskIds.empty():
+        return ret
+
+    c = conn()
+    with nogil:
+        c.proxy().getTaskStatsBulk(stats, taskIds)
+
+    it = stats.begin()
+    while it != stats.end():
+        ret[deref(it).first] = [initTaskStats(statsT) for statsT in deref(it).second]
+        inc(it)
+
+    return ret
+
 
 #######################
 # TaskState
@@ -294,8 +326,13 @@ cdef class Task(PlowBase):
         """
         Refresh the attributes from the server
         """
-        cdef TaskT task
-        conn().proxy().getTask(task, self._task.id)
+        cdef:
+            TaskT task
+            PlowClient* c = conn()
+
+        with nogil:
+            c.proxy().getTask(task, self._task.id)
+
         self.setTask(task)
 
     def get_log_path(self, retryNum=-1):
@@ -418,8 +455,11 @@ def get_task(Guid& taskId):
     cdef:
         TaskT taskT 
         Task task 
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().getTask(taskT, taskId)
 
-    conn().proxy().getTask(taskT, taskId)
     task = initTask(taskT)
     return task
 
@@ -445,10 +485,14 @@ def get_tasks(**kwargs):
         vector[TaskT] tasks 
         TaskFilterT f
         list ret 
+        PlowClient* c
 
     f = dict_to_taskFilter(kwargs)
 
-    conn().proxy().getTasks(tasks, f)
+    c = conn()
+    with nogil:
+        c.proxy().getTasks(tasks, f)
+
     ret = [initTask(taskT) for taskT in tasks]
     return ret
 
@@ -473,12 +517,16 @@ def get_task_log_path(Task task, int retryNum=-1):
         string path
         int retries, i, logNum
         list tokens
+        Guid taskId = task.id
+        PlowClient* c
 
     if not task.id:
         return path
 
     try:
-        conn().proxy().getTaskLogPath(path, task.id)
+        c = conn()
+        with nogil:
+            c.proxy().getTaskLogPath(path, taskId)
     except RuntimeError:
         return path
 
@@ -492,6 +540,7 @@ def get_task_log_path(Task task, int retryNum=-1):
 
     return path
 
+@releasing
 def retry_tasks(**kwargs):
     """
     Retry tasks matching various keyword filter params 
@@ -506,8 +555,12 @@ def retry_tasks(**kwargs):
     :param lastUpdateTime: long msec epoch timestamp 
 
     """
-    cdef TaskFilterT f = dict_to_taskFilter(kwargs)
-    conn().proxy().retryTasks(f)
+    cdef:
+        TaskFilterT f = dict_to_taskFilter(kwargs)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().retryTasks(f)
 
 @reconnecting
 def eat_tasks(**kwargs):
@@ -523,8 +576,12 @@ def eat_tasks(**kwargs):
     :param states: list[:obj:`.TaskState`]
     :param lastUpdateTime: long msec epoch timestamp 
     """
-    cdef TaskFilterT f = dict_to_taskFilter(kwargs)
-    conn().proxy().eatTasks(f)
+    cdef:
+        TaskFilterT f = dict_to_taskFilter(kwargs)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().eatTasks(f)
 
 @reconnecting
 def kill_tasks(**kwargs):
@@ -540,8 +597,12 @@ def kill_tasks(**kwargs):
     :param states: list[:obj:`.TaskState`]
     :param lastUpdateTime: long msec epoch timestamp 
     """
-    cdef TaskFilterT f = dict_to_taskFilter(kwargs)
-    conn().proxy().killTasks(f)
+    cdef:
+        TaskFilterT f = dict_to_taskFilter(kwargs)
+        PlowClient* c = conn()
+
+    with nogil:
+        c.proxy().killTasks(f)
 
 
 #######################
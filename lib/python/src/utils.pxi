@@ -36,6 +36,31 @@ def reconnecting(object func):
             else:
                 raise PlowConnectionError(*e.args)
 
+        finally:
+            # hand the connection back to the pool for other threads
+            releaseClient()
+
+    _copy_attrs(wrapper, func)
+    return wrapper
+
+
+# A decorator that returns the connection used by the
+# function to the pool once it is done, without retrying
+# the call. For calls that are not safe to run twice.
+def releasing(object func):
+
+    @functools.wraps(func, ('__name__', '__doc__'), ('__dict__',))
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            releaseClient()
+
+    _copy_attrs(wrapper, func)
+    return wrapper
+
+
+cdef _copy_attrs(object wrapper, object func):
     cdef str attr
     for attr in ('__qualname__', '__module__', '__repr__'):
         try:
@@ -43,7 +68,20 @@ def reconnecting(object func):
         except AttributeError:
             pass
 
-    return wrapper
+
+cdef vector[Guid] to_guids(object items):
+    """
+    Convert a sequence of plow objects, or
+    their string ids, to a vector of Guids
+    """
+    cdef vector[Guid] ids
+    for item in items:
+        if isinstance(item, PlowBase):
+            ids.push_back(item.id)
+        else:
+            ids.push_back(item)
+
+    return ids
 
 
 cdef Attrs dict_to_attrs(dict d):
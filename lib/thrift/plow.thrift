@@ -348,6 +348,39 @@ struct FolderT {
     9:optional list<JobT> jobs
 }
 
+struct JobBoardDeltaT {
+    1:list<FolderT> folders,
+    2:list<common.Guid> removedFolders,
+    3:list<common.Guid> removedJobs,
+    4:common.Timestamp updateTime
+}
+
+/**
+* Server event types, see getEvents.
+**/
+enum EventType {
+    // Events were missed, reload everything.
+    RESYNC,
+    JOB_LAUNCHED,
+    JOB_UPDATED,
+    JOB_FINISHED,
+    TASK_UPDATED,
+    NODE_UPDATED
+}
+
+struct EventT {
+    1:i64 id,
+    2:EventType type,
+    3:common.Timestamp time,
+    4:common.Guid objectId,
+    5:common.Guid jobId
+}
+
+struct EventBatchT {
+    1:list<EventT> events,
+    2:i64 lastEventId
+}
+
 enum MatcherType {
     CONTAINS,
     NOT_CONTAINS,
@@ -449,7 +482,8 @@ struct JobFilterT {
     4:string regex,
     5:list<JobState> states,
     6:list<common.Guid> jobIds,
-    7:list<string> name
+    7:list<string> name,
+    8:common.Timestamp lastUpdateTime = 0
 }
 
 struct TaskFilterT {
@@ -469,7 +503,8 @@ struct NodeFilterT {
     3:string regex,
     4:list<string> hostnames,
     5:list<NodeState> states,
-    6:optional bool locked
+    6:optional bool locked,
+    7:common.Timestamp lastUpdateTime = 0
 }
 
 struct QuotaFilterT {
@@ -486,6 +521,7 @@ struct OutputT {
 service RpcService {
     
     i64 getPlowTime() throws (1:PlowException e),
+    EventBatchT getEvents(1:i64 lastEventId, 2:i32 timeout) throws (1:PlowException e),
 
     list<ServiceT> getServices() throws (1:PlowException e),
     ServiceT createService(1:ServiceT svc) throws (1:PlowException e),
@@ -506,6 +542,7 @@ service RpcService {
     void pauseJob(1:common.Guid jobId, 2:bool paused) throws (1:PlowException e),
     list<JobT> getJobs(1:JobFilterT filter) throws (1:PlowException e),
     list<OutputT> getJobOutputs(1:common.Guid jobId) throws (1:PlowException e),
+    map<common.Guid, list<OutputT>> getOutputsForJobs(1:list<common.Guid> jobIds) throws (1:PlowException e),
     void setJobMinCores(1:common.Guid jobId, 2:i32 value) throws (1:PlowException e),
     void setJobMaxCores(1:common.Guid jobId, 2:i32 value) throws (1:PlowException e),
     void setJobAttrs(1:common.Guid jobId, 2:Attrs attrs) throws (1:PlowException e),
@@ -521,6 +558,7 @@ service RpcService {
     FolderT createFolder(1:string projectId, 2:string name) throws (1:PlowException e),
     FolderT getFolder(1:string id) throws (1:PlowException e),
     list<FolderT> getJobBoard(1:common.Guid project) throws (1:PlowException e),
+    JobBoardDeltaT getJobBoardDelta(1:common.Guid project, 2:common.Timestamp lastUpdateTime) throws (1:PlowException e),
     list<FolderT> getFolders(1:common.Guid project) throws (1:PlowException e),
     void setFolderMinCores(1:common.Guid folderId, 2:i32 value) throws (1:PlowException e),
     void setFolderMaxCores(1:common.Guid folderId, 2:i32 value) throws (1:PlowException e),
@@ -530,6 +568,7 @@ service RpcService {
     LayerT getLayerById(1:common.Guid layerId) throws (1:PlowException e),
     LayerT getLayer(1:common.Guid jobId, 2:string name) throws (1:PlowException e),
     list<LayerT> getLayers(1:common.Guid jobId) throws (1:PlowException e),
+    map<common.Guid, list<LayerT>> getLayersForJobs(1:list<common.Guid> jobIds) throws (1:PlowException e),
     OutputT addOutput(1:common.Guid layerId, 2:string path, 3:common.Attrs attrs) throws (1:PlowException e)
     list<OutputT> getLayerOutputs(1:common.Guid layerId) throws (1:PlowException e),
     void setLayerTags(1:common.Guid guid, 2:list<string> tags) throws (1:PlowException e),
@@ -552,6 +591,7 @@ service RpcService {
     list<DependT> getDependsOnTask(1:common.Guid taskId) throws (1:PlowException e),
     list<DependT> getTaskDependsOn(1:common.Guid taskId) throws (1:PlowException e),
     list<TaskStatsT> getTaskStats(1:common.Guid taskId) throws (1:PlowException e),
+    map<common.Guid, list<TaskStatsT>> getTaskStatsBulk(1:list<common.Guid> taskIds) throws (1:PlowException e),
     void createTaskOnLayerDepend(1:common.Guid taskId, 2:common.Guid onLayerId) throws (1:PlowException e),
     void createTaskOnTaskDepend(1:common.Guid taskId, 2:common.Guid onTaskId) throws (1:PlowException e),
 
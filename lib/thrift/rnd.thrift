@@ -32,7 +32,10 @@ struct RunTaskCommand {
     8:string logFile,
     9:i32 uid,
     10:string username,
-    11:optional list<string> taskTypes
+    11:optional list<string> taskTypes,
+    12:optional i32 ramMb,
+    13:optional i32 reservedRamMb,
+    14:optional bool threadable
 }
 
 struct RunningTask {
@@ -45,7 +48,8 @@ struct RunningTask {
     7:optional double progress = 0.0,
     8:optional string lastLog = "",
     9:i16 cpuPercent,
-    10:DiskIO diskIO
+    10:DiskIO diskIO,
+    11:optional i32 reservedRamMb
 }
 
 struct RunTaskResult {
@@ -57,6 +61,31 @@ struct RunTaskResult {
     6:optional byte exitSignal
 }
 
+struct LogChunk {
+    1:i64 offset,
+    2:binary data,
+    3:i64 size
+}
+
+struct TaskMetricSample {
+    1:i64 time,
+    2:i32 rssMb,
+    3:i16 cpuPercent,
+    4:i64 readBytes = -1,
+    5:i64 writeBytes = -1
+}
+
+struct TaskMetrics {
+    1:common.Guid procId,
+    2:list<TaskMetricSample> samples,
+    3:i32 sampleCount,
+    4:i64 startTime,
+    5:i32 maxRssMb,
+    6:i32 avgRssMb,
+    7:i16 maxCpuPercent,
+    8:i16 avgCpuPercent
+}
+
 struct Hardware {
     1:i16 physicalCpus,
     2:i16 logicalCpus
@@ -66,7 +95,8 @@ struct Hardware {
     6:i32 freeSwapMb,
     7:string cpuModel,
     8:string platform,
-    9:list<double> load
+    9:list<double> load,
+    10:optional i32 reservedRamMb
 }
 
 struct Ping {
@@ -91,4 +121,6 @@ service RndNodeApi {
     void reboot(1: bool now) throws (1:RndException e),
     list<RunningTask> getRunningTasks() throws (1:RndException e),
     Ping pingPong(1: bool withTasks = false) throws (1:RndException e),
+    TaskMetrics getTaskMetrics(1:common.Guid procId) throws (1:RndException e),
+    LogChunk getLogBytes(1:common.Guid procId, 2:i64 offset, 3:i32 maxBytes) throws (1:RndException e),
 }
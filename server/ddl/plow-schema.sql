@@ -29,6 +29,27 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+---
+--- Returns a safe cursor for incremental reads, in millis.
+---
+--- Rows are stamped with the start time of the transaction that
+--- updated them, so a transaction still open now can commit rows
+--- stamped earlier than NOW().  The cursor is the start of the oldest
+--- open transaction, less a second of overlap, so the next read sees
+--- them.  Transactions left open for more than 5 minutes are ignored
+--- so they don't hold the cursor back.
+---
+CREATE OR REPLACE FUNCTION plow.deltaTimeMillis() RETURNS BIGINT AS $$
+DECLARE
+    oldest TIMESTAMP WITH TIME ZONE;
+BEGIN
+    SELECT MIN(xact_start) INTO oldest FROM pg_stat_activity
+        WHERE datname = current_database() AND xact_start IS NOT NULL;
+    oldest := GREATEST(LEAST(COALESCE(oldest, NOW()), NOW()), NOW() - interval '5 minutes');
+    return (EXTRACT(EPOCH FROM oldest) * 1000)::bigint - 1000;
+END;
+$$ LANGUAGE plpgsql;
+
 ---
 --- Cronds
 ---
@@ -100,7 +121,8 @@ CREATE TABLE plow.folder (
   pk_project UUID NOT NULL,
   str_name VARCHAR(128) NOT NULL,
   int_order SMALLINT NOT NULL,
-  time_created TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+  time_created TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  time_updated BIGINT NOT NULL DEFAULT plow.txTimeMillis()
 ) WITHOUT OIDS;
 
 
@@ -116,7 +138,8 @@ CREATE TABLE plow.folder_dsp (
   int_cores_min INTEGER NOT NULL DEFAULT 0,
   int_cores_run INTEGER NOT NULL DEFAULT 0,
   float_tier REAL NOT NULL DEFAULT 0.0,
-  int_procs_run INTEGER NOT NULL DEFAULT 0
+  int_procs_run INTEGER NOT NULL DEFAULT 0,
+  time_updated BIGINT NOT NULL DEFAULT plow.txTimeMillis()
 ) WITHOUT OIDS;
 
 CREATE INDEX folder_dsp_float_tier_idx ON plow.folder_dsp (float_tier);
@@ -143,7 +166,8 @@ CREATE TABLE plow.job (
   time_started BIGINT NOT NULL DEFAULT plow.txTimeMillis(),
   time_stopped BIGINT DEFAULT 0,
   hstore_attrs hstore,
-  hstore_env hstore
+  hstore_env hstore,
+  time_updated BIGINT NOT NULL DEFAULT plow.txTimeMillis()
 ) WITHOUT OIDS;
 
 CREATE UNIQUE INDEX job_str_active_name_uniq_idx ON plow.job (str_active_name);
@@ -159,7 +183,8 @@ CREATE TABLE plow.job_dsp (
   int_cores_min INTEGER NOT NULL DEFAULT 0,
   int_cores_run INTEGER NOT NULL DEFAULT 0,
   float_tier REAL NOT NULL DEFAULT 0.0,
-  int_procs_run INTEGER NOT NULL DEFAULT 0
+  int_procs_run INTEGER NOT NULL DEFAULT 0,
+  time_updated BIGINT NOT NULL DEFAULT plow.txTimeMillis()
 );
 
 CREATE INDEX job_dsp_float_tier_idx ON plow.job_dsp (float_tier);
@@ -175,7 +200,8 @@ CREATE TABLE plow.job_count (
   int_dead INTEGER NOT NULL DEFAULT 0,
   int_eaten INTEGER NOT NULL DEFAULT 0,
   int_waiting INTEGER NOT NULL DEFAULT 0,
-  int_depend INTEGER NOT NULL DEFAULT 0
+  int_depend INTEGER NOT NULL DEFAULT 0,
+  time_updated BIGINT NOT NULL DEFAULT plow.txTimeMillis()
 ) WITHOUT OIDS;
 
 CREATE INDEX job_count_int_waiting_idx ON plow.job_count (int_waiting DESC);
@@ -190,7 +216,8 @@ CREATE TABLE plow.job_stat (
   int_core_time_high BIGINT NOT NULL DEFAULT 0,
   int_total_core_time_success BIGINT NOT NULL DEFAULT 0,
   int_total_core_time_fail BIGINT NOT NULL DEFAULT 0,
-  int_clock_time_high BIGINT NOT NULL DEFAULT 0
+  int_clock_time_high BIGINT NOT NULL DEFAULT 0,
+  time_updated BIGINT NOT NULL DEFAULT plow.txTimeMillis()
 );
 
 ---
@@ -466,7 +493,8 @@ CREATE TABLE plow.node_dsp (
   int_cores SMALLINT NOT NULL,
   int_ram INTEGER NOT NULL,
   int_idle_cores SMALLINT NOT NULL CHECK (int_idle_cores >= 0),
-  int_free_ram INTEGER NOT NULL CHECK (int_free_ram >= 0)
+  int_free_ram INTEGER NOT NULL CHECK (int_free_ram >= 0),
+  time_updated BIGINT NOT NULL DEFAULT plow.txTimeMillis()
 ) WITHOUT OIDS;
 
 ---
@@ -576,6 +604,21 @@ CREATE INDEX action_pk_filter_idx ON plow.action (pk_filter);
 
 ----------------------------------------------------------
 
+---
+--- plow.tombstone - records of deleted objects
+---
+CREATE TABLE plow.tombstone (
+  pk_tombstone BIGSERIAL NOT NULL PRIMARY KEY,
+  pk_object UUID NOT NULL,
+  pk_project UUID,
+  str_type VARCHAR(16) NOT NULL,
+  time_removed BIGINT NOT NULL DEFAULT plow.txTimeMillis()
+) WITHOUT OIDS;
+
+CREATE INDEX tombstone_time_removed_idx ON plow.tombstone (time_removed);
+
+----------------------------------------------------------
+
 ---
 --- plow.job_history
 ---
@@ -1230,6 +1273,62 @@ CREATE TRIGGER trig_before_update_set_waiting BEFORE UPDATE ON plow.task
     FOR EACH ROW WHEN (NEW.int_depend_count=0 AND NEW.int_state=5)
     EXECUTE PROCEDURE plow.before_update_set_waiting();
 
+---
+--- plow.before_update_set_time_updated()
+---
+--- Stamps rows with the time they were last changed, so clients
+--- can ask for only the jobs, folders and nodes changed since
+--- their last refresh.
+---
+CREATE OR REPLACE FUNCTION plow.before_update_set_time_updated() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.time_updated := txTimeMillis();
+  RETURN NEW;
+END
+$$
+LANGUAGE plpgsql;
+
+CREATE TRIGGER trig_before_job_set_time_updated BEFORE UPDATE ON plow.job
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+CREATE TRIGGER trig_before_job_dsp_set_time_updated BEFORE UPDATE ON plow.job_dsp
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+CREATE TRIGGER trig_before_job_count_set_time_updated BEFORE UPDATE ON plow.job_count
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+CREATE TRIGGER trig_before_job_stat_set_time_updated BEFORE UPDATE ON plow.job_stat
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+CREATE TRIGGER trig_before_folder_set_time_updated BEFORE UPDATE ON plow.folder
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+CREATE TRIGGER trig_before_folder_dsp_set_time_updated BEFORE UPDATE ON plow.folder_dsp
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+CREATE TRIGGER trig_before_node_set_time_updated BEFORE UPDATE ON plow.node
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+CREATE TRIGGER trig_before_node_dsp_set_time_updated BEFORE UPDATE ON plow.node_dsp
+    FOR EACH ROW EXECUTE PROCEDURE plow.before_update_set_time_updated();
+
+---
+--- plow.after_folder_delete()
+---
+--- Leave a tombstone for deleted folders so incremental
+--- job board refreshes know to drop them.
+---
+CREATE OR REPLACE FUNCTION plow.after_folder_delete() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO plow.tombstone (pk_object, pk_project, str_type) VALUES (OLD.pk_folder, OLD.pk_project, 'folder');
+  RETURN OLD;
+END
+$$
+LANGUAGE plpgsql;
+
+CREATE TRIGGER trig_after_folder_delete AFTER DELETE ON plow.folder
+    FOR EACH ROW EXECUTE PROCEDURE plow.after_folder_delete();
+
 ----------------------------------------------------------
 
 ---
@@ -1269,6 +1368,7 @@ AS
 INSERT INTO plow.crond (str_name) VALUES ('ORPHAN_PROC_CHECK');
 INSERT INTO plow.crond (str_name) VALUES ('DOWN_NODE_CHECK');
 INSERT INTO plow.crond (str_name) VALUES ('DEALLOC_PROC_CHECK');
+INSERT INTO plow.crond (str_name) VALUES ('TOMBSTONE_CLEANUP');
 
 ---
 --- Test Project
@@ -74,4 +74,8 @@ public final class Defaults {
     // Amount of time a Node can go without communication before
     // plow determines the node is down.
     public static long NODE_UNRESPONSIVE_MS = 60000 * 5;
+
+    // How long records of deleted objects are kept for incremental
+    // job board refreshes.
+    public static long TOMBSTONE_RETENTION_MS = 86400000;
 }
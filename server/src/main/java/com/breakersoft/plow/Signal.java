@@ -12,6 +12,11 @@ public class Signal {
      */
     public static final int NODE_SHUTDOWN = 86;
 
+    /**
+     * Exit signal when the rndaemon kills a task to free up memory.
+     */
+    public static final int NODE_OUT_OF_MEMORY = 87;
+
     /**
      * Exit signal for an aborted dispatch.
      */
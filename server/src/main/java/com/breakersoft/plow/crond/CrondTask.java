@@ -4,5 +4,6 @@ public enum CrondTask {
 
     ORPHAN_PROC_CHECK,
     DOWN_NODE_CHECK,
-    DEALLOC_PROC_CHECK
+    DEALLOC_PROC_CHECK,
+    TOMBSTONE_CLEANUP
 }
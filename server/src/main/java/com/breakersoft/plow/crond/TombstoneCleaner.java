@@ -0,0 +1,25 @@
+package com.breakersoft.plow.crond;
+
+import org.springframework.beans.factory.annotation.Autowired;
+
+import com.breakersoft.plow.Defaults;
+import com.breakersoft.plow.service.ProjectService;
+
+/**
+ * Deletes tombstones older than Defaults.TOMBSTONE_RETENTION_MS.
+ */
+public class TombstoneCleaner extends AbstractCrondTask {
+
+    @Autowired
+    ProjectService projectService;
+
+    public TombstoneCleaner() {
+        super(CrondTask.TOMBSTONE_CLEANUP);
+    }
+
+    protected void run() {
+        int count = projectService.deleteTombstones(
+                System.currentTimeMillis() - Defaults.TOMBSTONE_RETENTION_MS);
+        logger.info("Deleted {} tombstones.", count);
+    }
+}
@@ -20,4 +20,13 @@ public interface FolderDao {
 	void setName(Folder folder, String name);
 
 	void delete(Folder folder);
+
+	/**
+	 * Delete the tombstones of objects removed before
+	 * the given time.  Returns the number deleted.
+	 *
+	 * @param time
+	 * @return
+	 */
+	int deleteTombstones(long time);
 }
@@ -22,9 +22,17 @@ public interface NodeDao {
 
     void free(Node node, int cores, int memory);
 
-    void update(Node node, Ping ping);
-
-    void setLocked(Node node, boolean locked);
+    /**
+     * Update a node from a ping.  Return true if the
+     * node was down and is now back up.
+     *
+     * @param node
+     * @param ping
+     * @return
+     */
+    boolean update(Node node, Ping ping);
+
+    boolean setLocked(Node node, boolean locked);
 
     void setCluster(Node node, Cluster cluster);
 
@@ -119,4 +119,9 @@ public class FolderDaoImpl extends AbstractDao implements FolderDao {
         jdbc.update("DELETE FROM plow.folder WHERE pk_folder=?", folder.getFolderId());
     }
 
+    @Override
+    public int deleteTombstones(long time) {
+        return jdbc.update("DELETE FROM plow.tombstone WHERE time_removed < ?", time);
+    }
+
 }
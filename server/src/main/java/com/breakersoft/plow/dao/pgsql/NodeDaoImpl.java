@@ -133,14 +133,14 @@ public class NodeDaoImpl extends AbstractDao implements NodeDao {
             "str_platform");
 
     @Override
-    public void update(Node node, Ping ping) {
+    public boolean update(Node node, Ping ping) {
 
         jdbc.update("UPDATE plow.node SET " +
                 "time_updated=plow.txTimeMillis() WHERE pk_node=?", node.getNodeId());
 
-        jdbc.update("UPDATE plow.node SET " +
+        final boolean up = jdbc.update("UPDATE plow.node SET " +
                 "int_state=? WHERE pk_node=? AND int_state=?",
-                NodeState.UP.ordinal(), node.getNodeId(), NodeState.DOWN.ordinal());
+                NodeState.UP.ordinal(), node.getNodeId(), NodeState.DOWN.ordinal()) == 1;
 
         jdbc.update(FULL_UPDATE,
                 ping.hw.physicalCpus,
@@ -153,6 +153,8 @@ public class NodeDaoImpl extends AbstractDao implements NodeDao {
                 ping.hw.cpuModel,
                 ping.hw.platform,
                 node.getNodeId());
+
+        return up;
     }
 
     public static final RowMapper<Node> MAPPER = new RowMapper<Node>() {
@@ -246,8 +248,9 @@ public class NodeDaoImpl extends AbstractDao implements NodeDao {
     }
 
     @Override
-    public void setLocked(Node node, boolean locked) {
-        jdbc.update("UPDATE plow.node SET bool_locked=? WHERE pk_node=?", locked, node.getNodeId());
+    public boolean setLocked(Node node, boolean locked) {
+        return jdbc.update("UPDATE plow.node SET bool_locked=? WHERE pk_node=? AND bool_locked=?",
+                locked, node.getNodeId(), !locked) == 1;
     }
 
     @Override
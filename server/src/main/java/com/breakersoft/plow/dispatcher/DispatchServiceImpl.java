@@ -24,6 +24,7 @@ import com.breakersoft.plow.dispatcher.domain.DispatchProject;
 import com.breakersoft.plow.dispatcher.domain.DispatchResource;
 import com.breakersoft.plow.dispatcher.domain.DispatchTask;
 import com.breakersoft.plow.event.EventManager;
+import com.breakersoft.plow.event.TaskUpdatedEvent;
 import com.breakersoft.plow.exceptions.PlowDispatcherException;
 import com.breakersoft.plow.monitor.PlowStats;
 import com.breakersoft.plow.rnd.thrift.RunTaskCommand;
@@ -113,6 +114,7 @@ public class DispatchServiceImpl implements DispatchService {
     public boolean startTask(DispatchTask task, DispatchProc proc) {
         if (dispatchTaskDao.start(task, proc)) {
             task.started = true;
+            eventManager.post(new TaskUpdatedEvent(task, TaskState.RUNNING));
             return true;
         }
         return false;
@@ -121,6 +123,7 @@ public class DispatchServiceImpl implements DispatchService {
     @Override
     public boolean stopTask(Task task, TaskState state, int exitStatus, int exitSignal) {
         if (dispatchTaskDao.stop(task, state, exitStatus, exitSignal)) {
+            eventManager.post(new TaskUpdatedEvent(task, state));
             return true;
         }
         return false;
@@ -206,6 +206,8 @@ public class DispatchTaskDaoImpl extends AbstractDao implements DispatchTaskDao
             "layer.str_name AS layer_name, " +
             "layer.hstore_env AS layer_env, " +
             "layer.int_chunk_size, " +
+            "layer.int_ram_max, " +
+            "layer.bool_threadable, " +
             "task.int_number, " +
             "task.pk_task,"+
             "task.pk_layer,"+
@@ -213,7 +215,8 @@ public class DispatchTaskDaoImpl extends AbstractDao implements DispatchTaskDao
             "task.str_name AS task_name, " +
             "task.int_retry, " +
             "proc.pk_proc,"+
-            "proc.int_cores " +
+            "proc.int_cores, " +
+            "proc.int_ram " +
         "FROM " +
             "plow.task " +
                 "INNER JOIN plow.proc ON task.pk_task = proc.pk_task " +
@@ -236,6 +239,21 @@ public class DispatchTaskDaoImpl extends AbstractDao implements DispatchTaskDao
             task.procId = rs.getString("pk_proc");
             task.cores = rs.getInt("int_cores");
 
+            // The rndaemon enforces this as a hard memory limit.
+            int ramMax = rs.getInt("int_ram_max");
+            if (ramMax > 0) {
+                task.setRamMb(ramMax);
+            }
+
+            // The rndaemon reserves the booked ram for the task.
+            int ram = rs.getInt("int_ram");
+            if (ram > 0) {
+                task.setReservedRamMb(ram);
+            }
+
+            // The rndaemon lets threadable tasks use idle cores.
+            task.setThreadable(rs.getBoolean("bool_threadable"));
+
             task.logFile = String.format("%s/%s.%d.log",
                     rs.getString("str_log_path"), rs.getString("task_name"),
                     rs.getInt("int_retry"));
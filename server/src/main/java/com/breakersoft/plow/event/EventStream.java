@@ -0,0 +1,22 @@
+package com.breakersoft.plow.event;
+
+import com.breakersoft.plow.thrift.EventBatchT;
+
+/**
+ * Buffers job, task and node change events so clients can
+ * long-poll for them instead of re-querying on a timer.
+ */
+public interface EventStream {
+
+    /**
+     * Return the events posted after lastEventId, waiting up to timeout
+     * milliseconds for one to arrive.  A negative lastEventId returns no
+     * events, just the id to start streaming from.
+     *
+     * @param lastEventId
+     * @param timeout
+     * @return
+     */
+    EventBatchT getEvents(long lastEventId, int timeout);
+
+}
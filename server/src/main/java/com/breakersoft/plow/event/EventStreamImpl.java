@@ -0,0 +1,185 @@
+package com.breakersoft.plow.event;
+
+import java.util.ArrayDeque;
+import java.util.Collections;
+import java.util.Iterator;
+import java.util.UUID;
+
+import javax.annotation.PostConstruct;
+
+import org.slf4j.Logger;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.stereotype.Component;
+import org.springframework.transaction.support.TransactionSynchronizationAdapter;
+import org.springframework.transaction.support.TransactionSynchronizationManager;
+
+import com.breakersoft.plow.Defaults;
+import com.breakersoft.plow.PlowCfg;
+import com.breakersoft.plow.thrift.EventBatchT;
+import com.breakersoft.plow.thrift.EventT;
+import com.breakersoft.plow.thrift.EventType;
+import com.google.common.collect.Lists;
+import com.google.common.eventbus.Subscribe;
+
+@Component
+public final class EventStreamImpl implements EventStream {
+
+    private static final Logger logger =
+            org.slf4j.LoggerFactory.getLogger(EventStreamImpl.class);
+
+    /**
+     * The number of events kept for clients that fall behind.
+     */
+    private static final int MAX_EVENTS = 10000;
+
+    /**
+     * The longest a client can block waiting for events.
+     */
+    private static final int MAX_TIMEOUT = 10000;
+
+    @Autowired
+    private EventManager eventManager;
+
+    @Autowired
+    private PlowCfg plowCfg;
+
+    private final ArrayDeque<EventT> events = new ArrayDeque<EventT>(MAX_EVENTS);
+    private long lastEventId = 0;
+
+    /**
+     * Clients waiting for events hold an RPC thread, so
+     * at most half of them can wait at once.
+     */
+    private int maxWaiters;
+    private int waiters = 0;
+
+    @PostConstruct
+    public void init() {
+        maxWaiters = Math.max(plowCfg.get("plow.rpc.network.threads",
+                Defaults.RPC_NETWORK_THREADS) / 2, 1);
+        eventManager.register(this);
+    }
+
+    @Subscribe
+    public void handleJobLaunchEvent(JobLaunchEvent event) {
+        final UUID jobId = event.getJob().getJobId();
+        add(EventType.JOB_LAUNCHED, jobId, jobId);
+    }
+
+    @Subscribe
+    public void handleJobFinishedEvent(JobFinishedEvent event) {
+        final UUID jobId = event.getJob().getJobId();
+        add(EventType.JOB_FINISHED, jobId, jobId);
+    }
+
+    @Subscribe
+    public void handleJobUpdatedEvent(JobUpdatedEvent event) {
+        final UUID jobId = event.getJob().getJobId();
+        add(EventType.JOB_UPDATED, jobId, jobId);
+    }
+
+    @Subscribe
+    public void handleTaskUpdatedEvent(TaskUpdatedEvent event) {
+        add(EventType.TASK_UPDATED, event.getTask().getTaskId(), event.getTask().getJobId());
+    }
+
+    @Subscribe
+    public void handleNodeUpdatedEvent(NodeUpdatedEvent event) {
+        add(EventType.NODE_UPDATED, event.getNode().getNodeId(), null);
+    }
+
+    /**
+     * Events posted in a transaction are added once it commits, so
+     * clients don't re-read before the change is visible, and
+     * never see changes that are rolled back.
+     */
+    private void add(final EventType type, final UUID objectId, final UUID jobId) {
+        if (!TransactionSynchronizationManager.isSynchronizationActive()) {
+            append(type, objectId, jobId);
+            return;
+        }
+
+        TransactionSynchronizationManager.registerSynchronization(
+                new TransactionSynchronizationAdapter() {
+            @Override
+            public void afterCommit() {
+                append(type, objectId, jobId);
+            }
+        });
+    }
+
+    private synchronized void append(EventType type, UUID objectId, UUID jobId) {
+        final EventT event = new EventT();
+        event.setId(++lastEventId);
+        event.setType(type);
+        event.setTime(System.currentTimeMillis());
+        event.setObjectId(objectId.toString());
+        event.setJobId(jobId == null ? "" : jobId.toString());
+
+        if (events.size() >= MAX_EVENTS) {
+            events.removeFirst();
+        }
+        events.addLast(event);
+        notifyAll();
+    }
+
+    @Override
+    public synchronized EventBatchT getEvents(long since, int timeout) {
+
+        // Too many clients waiting returns right away, the
+        // client backs off and polls again.
+        if (since >= 0 && since == lastEventId && waiters < maxWaiters) {
+            final long deadline = System.currentTimeMillis() +
+                    Math.min(Math.max(timeout, 0), MAX_TIMEOUT);
+            long wait;
+            waiters++;
+            try {
+                while (since == lastEventId &&
+                        (wait = deadline - System.currentTimeMillis()) > 0) {
+                    try {
+                        wait(wait);
+                    } catch (InterruptedException e) {
+                        Thread.currentThread().interrupt();
+                        break;
+                    }
+                }
+            }
+            finally {
+                waiters--;
+            }
+        }
+
+        final EventBatchT batch = new EventBatchT();
+        batch.setEvents(Lists.<EventT>newArrayList());
+        batch.setLastEventId(lastEventId);
+
+        if (since < 0 || since == lastEventId) {
+            return batch;
+        }
+
+        // The client is from before a server restart, or fell behind
+        // far enough that events were dropped.
+        if (since > lastEventId || since < events.getFirst().getId() - 1) {
+            logger.info("Event stream client at {} must resync, last event {}", since, lastEventId);
+            final EventT resync = new EventT();
+            resync.setId(lastEventId);
+            resync.setType(EventType.RESYNC);
+            resync.setTime(System.currentTimeMillis());
+            resync.setObjectId("");
+            resync.setJobId("");
+            batch.events.add(resync);
+            return batch;
+        }
+
+        final Iterator<EventT> it = events.descendingIterator();
+        while (it.hasNext()) {
+            final EventT event = it.next();
+            if (event.getId() <= since) {
+                break;
+            }
+            batch.events.add(event);
+        }
+        Collections.reverse(batch.events);
+        return batch;
+    }
+}
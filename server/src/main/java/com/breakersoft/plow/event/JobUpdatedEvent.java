@@ -0,0 +1,16 @@
+package com.breakersoft.plow.event;
+
+import com.breakersoft.plow.JobId;
+
+public class JobUpdatedEvent implements Event {
+
+    private final JobId job;
+
+    public JobUpdatedEvent(JobId job) {
+        this.job = job;
+    }
+
+    public JobId getJob() {
+        return job;
+    }
+}
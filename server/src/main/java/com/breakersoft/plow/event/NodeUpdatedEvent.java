@@ -0,0 +1,16 @@
+package com.breakersoft.plow.event;
+
+import com.breakersoft.plow.Node;
+
+public class NodeUpdatedEvent implements Event {
+
+    private final Node node;
+
+    public NodeUpdatedEvent(Node node) {
+        this.node = node;
+    }
+
+    public Node getNode() {
+        return node;
+    }
+}
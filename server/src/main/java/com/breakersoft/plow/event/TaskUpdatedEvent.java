@@ -0,0 +1,23 @@
+package com.breakersoft.plow.event;
+
+import com.breakersoft.plow.Task;
+import com.breakersoft.plow.thrift.TaskState;
+
+public class TaskUpdatedEvent implements Event {
+
+    private final Task task;
+    private final TaskState state;
+
+    public TaskUpdatedEvent(Task task, TaskState state) {
+        this.task = task;
+        this.state = state;
+    }
+
+    public Task getTask() {
+        return task;
+    }
+
+    public TaskState getState() {
+        return state;
+    }
+}
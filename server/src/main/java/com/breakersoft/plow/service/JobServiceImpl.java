@@ -30,6 +30,8 @@ import com.breakersoft.plow.dao.ServiceDao;
 import com.breakersoft.plow.dao.TaskDao;
 import com.breakersoft.plow.event.EventManager;
 import com.breakersoft.plow.event.JobLaunchEvent;
+import com.breakersoft.plow.event.JobUpdatedEvent;
+import com.breakersoft.plow.event.TaskUpdatedEvent;
 import com.breakersoft.plow.exceptions.JobSpecException;
 import com.breakersoft.plow.monitor.PlowStats;
 import com.breakersoft.plow.thrift.DependSpecT;
@@ -324,11 +326,13 @@ public class JobServiceImpl implements JobService {
     @Override
     public void setJobMinCores(Job job, int value) {
         jobDao.setMinCores(job, value);
+        eventManager.post(new JobUpdatedEvent(job));
     }
 
     @Override
     public void setJobMaxCores(Job job, int value) {
         jobDao.setMaxCores(job, value);
+        eventManager.post(new JobUpdatedEvent(job));
     }
 
     @Override
@@ -372,7 +376,11 @@ public class JobServiceImpl implements JobService {
 
     @Override
     public boolean setTaskState(Task task, TaskState currentState, TaskState newState) {
-        return taskDao.updateState(task, currentState, newState);
+        if (taskDao.updateState(task, currentState, newState)) {
+            eventManager.post(new TaskUpdatedEvent(task, newState));
+            return true;
+        }
+        return false;
     }
 
     @Override
@@ -414,6 +422,7 @@ public class JobServiceImpl implements JobService {
     @Override
     public void setJobPaused(Job job, boolean value) {
         jobDao.setPaused(job, value);
+        eventManager.post(new JobUpdatedEvent(job));
     }
 
     @Override
@@ -429,7 +438,11 @@ public class JobServiceImpl implements JobService {
 
     @Override
     public boolean setTaskState(Task task, TaskState state) {
-        return taskDao.setTaskState(task, state);
+        if (taskDao.setTaskState(task, state)) {
+            eventManager.post(new TaskUpdatedEvent(task, state));
+            return true;
+        }
+        return false;
     }
 
     @Override
@@ -20,6 +20,8 @@ import com.breakersoft.plow.dao.ClusterDao;
 import com.breakersoft.plow.dao.NodeDao;
 import com.breakersoft.plow.dao.QuotaDao;
 import com.breakersoft.plow.dispatcher.dao.ProcDao;
+import com.breakersoft.plow.event.EventManager;
+import com.breakersoft.plow.event.NodeUpdatedEvent;
 import com.breakersoft.plow.exceptions.PlowWriteException;
 import com.breakersoft.plow.rnd.thrift.Ping;
 import com.breakersoft.plow.thrift.NodeState;
@@ -41,6 +43,9 @@ public class NodeServiceImpl implements NodeService {
     @Autowired
     QuotaDao quotaDao;
 
+    @Autowired
+    EventManager eventManager;
+
     @Override
     public Node createNode(Ping ping) {
         Cluster cluster = clusterDao.getDefault();
@@ -54,12 +59,20 @@ public class NodeServiceImpl implements NodeService {
 
     @Override
     public void updateNode(Node node, Ping ping) {
-        nodeDao.update(node, ping);
+        // Pings only change resource counts, which panels poll
+        // for, so only post an event when the node comes back up.
+        if (nodeDao.update(node, ping)) {
+            eventManager.post(new NodeUpdatedEvent(node));
+        }
     }
 
     @Override
     public boolean setNodeState(Node node, NodeState state) {
-        return nodeDao.setState(node, state);
+        if (nodeDao.setState(node, state)) {
+            eventManager.post(new NodeUpdatedEvent(node));
+            return true;
+        }
+        return false;
     }
 
     @Override
@@ -167,7 +180,9 @@ public class NodeServiceImpl implements NodeService {
 
     @Override
     public void setNodeLocked(Node node, boolean locked) {
-        nodeDao.setLocked(node, locked);
+        if (nodeDao.setLocked(node, locked)) {
+            eventManager.post(new NodeUpdatedEvent(node));
+        }
     }
 
     @Override
@@ -28,4 +28,6 @@ public interface ProjectService {
 
 	Folder getFolder(UUID id);
 
+	int deleteTombstones(long time);
+
 }
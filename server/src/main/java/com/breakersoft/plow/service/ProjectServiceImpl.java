@@ -80,4 +80,9 @@ public class ProjectServiceImpl implements ProjectService {
     public void deleteFolder(Folder folder) {
         folderDao.delete(folder);
     }
+
+    @Override
+    public int deleteTombstones(long time) {
+        return folderDao.deleteTombstones(time);
+    }
 }
@@ -22,6 +22,7 @@ import com.breakersoft.plow.Project;
 import com.breakersoft.plow.Quota;
 import com.breakersoft.plow.Service;
 import com.breakersoft.plow.Task;
+import com.breakersoft.plow.event.EventStream;
 import com.breakersoft.plow.event.JobLaunchEvent;
 import com.breakersoft.plow.service.DependService;
 import com.breakersoft.plow.service.FilterService;
@@ -46,6 +47,7 @@ import com.breakersoft.plow.thrift.dao.ThriftProjectDao;
 import com.breakersoft.plow.thrift.dao.ThriftQuotaDao;
 import com.breakersoft.plow.thrift.dao.ThriftServiceDao;
 import com.breakersoft.plow.thrift.dao.ThriftTaskDao;
+import com.google.common.collect.Lists;
 
 @ThriftService
 public class RpcThriftServiceImpl implements RpcService.Iface {
@@ -119,6 +121,9 @@ public class RpcThriftServiceImpl implements RpcService.Iface {
     @Autowired
     StateManager stateManager;
 
+    @Autowired
+    EventStream eventStream;
+
     @Override
     public JobT launch(JobSpecT spec) throws PlowException {
         JobLaunchEvent event =  jobService.launch(spec);
@@ -145,6 +150,11 @@ public class RpcThriftServiceImpl implements RpcService.Iface {
         return thriftLayerDao.getLayers(UUID.fromString(jobId));
     }
 
+    @Override
+    public Map<String, List<LayerT>> getLayersForJobs(List<String> jobIds) throws PlowException {
+        return thriftLayerDao.getLayers(toUUIDs(jobIds));
+    }
+
     @Override
     public TaskT getTask(String id) throws PlowException {
         return thriftTaskDao.getTask(UUID.fromString(id));
@@ -188,6 +198,12 @@ public class RpcThriftServiceImpl implements RpcService.Iface {
         return thriftOutputDao.getJobOutputs(UUID.fromString(jobId));
     }
 
+    @Override
+    public Map<String, List<OutputT>> getOutputsForJobs(List<String> jobIds) throws PlowException,
+            TException {
+        return thriftOutputDao.getJobOutputs(toUUIDs(jobIds));
+    }
+
     @Override
     public List<OutputT> getLayerOutputs(String layerId) throws PlowException,
             TException {
@@ -234,6 +250,11 @@ public class RpcThriftServiceImpl implements RpcService.Iface {
         return thriftJobBoardDao.getJobBoard(UUID.fromString(project));
     }
 
+    @Override
+    public JobBoardDeltaT getJobBoardDelta(String project, long lastUpdateTime) throws PlowException {
+        return thriftJobBoardDao.getJobBoardDelta(UUID.fromString(project), lastUpdateTime);
+    }
+
     @Override
     public FolderT createFolder(String projectId, String name) throws PlowException {
         Project project = projectService.getProject(UUID.fromString(projectId));
@@ -262,6 +283,11 @@ public class RpcThriftServiceImpl implements RpcService.Iface {
         return thriftProjectDao.getPlowTime();
     }
 
+    @Override
+    public EventBatchT getEvents(long lastEventId, int timeout) throws PlowException {
+        return eventStream.getEvents(lastEventId, timeout);
+    }
+
     @Override
     public String getTaskLogPath(String id) throws PlowException {
         return thriftTaskDao.getLogPath(UUID.fromString(id));
@@ -633,6 +659,12 @@ public class RpcThriftServiceImpl implements RpcService.Iface {
         return thriftTaskDao.getTaskStats(UUID.fromString(taskId));
     }
 
+    @Override
+    public Map<String, List<TaskStatsT>> getTaskStatsBulk(List<String> taskIds) throws PlowException,
+            TException {
+        return thriftTaskDao.getTaskStats(toUUIDs(taskIds));
+    }
+
     @Override
     public JobSpecT getJobSpec(String jobId) throws PlowException, TException {
         return thriftJobDao.getJobSpec(UUID.fromString(jobId));
@@ -809,4 +841,12 @@ public class RpcThriftServiceImpl implements RpcService.Iface {
     public void updateOutputAttrs(String id, Map<String, String> attrs) throws PlowException {
         jobService.updateOutputAttrs(UUID.fromString(id), attrs);
     }
+
+    private static List<UUID> toUUIDs(List<String> ids) {
+        final List<UUID> result = Lists.newArrayListWithCapacity(ids.size());
+        for (String id: ids) {
+            result.add(UUID.fromString(id));
+        }
+        return result;
+    }
 }
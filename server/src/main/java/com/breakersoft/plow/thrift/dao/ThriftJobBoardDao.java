@@ -4,9 +4,12 @@ import java.util.List;
 import java.util.UUID;
 
 import com.breakersoft.plow.thrift.FolderT;
+import com.breakersoft.plow.thrift.JobBoardDeltaT;
 
 public interface ThriftJobBoardDao {
 
     List<FolderT> getJobBoard(UUID projectId);
 
+    JobBoardDeltaT getJobBoardDelta(UUID projectId, long lastUpdateTime);
+
 }
@@ -1,6 +1,7 @@
 package com.breakersoft.plow.thrift.dao;
 
 import java.util.List;
+import java.util.Map;
 import java.util.UUID;
 
 import com.breakersoft.plow.thrift.LayerT;
@@ -12,6 +13,8 @@ public interface ThriftLayerDao {
 
     List<LayerT> getLayers(UUID jobId);
 
+    Map<String, List<LayerT>> getLayers(List<UUID> jobIds);
+
     LayerT getLayer(UUID jobId, String name);
 
 }
@@ -1,6 +1,7 @@
 package com.breakersoft.plow.thrift.dao;
 
 import java.util.List;
+import java.util.Map;
 import java.util.UUID;
 
 import com.breakersoft.plow.Job;
@@ -17,5 +18,7 @@ public interface ThriftOutputDao {
 
     List<OutputT> getJobOutputs(UUID jobId);
 
+    Map<String, List<OutputT>> getJobOutputs(List<UUID> jobIds);
+
     OutputT getOutput(UUID id);
 }
@@ -1,6 +1,7 @@
 package com.breakersoft.plow.thrift.dao;
 
 import java.util.List;
+import java.util.Map;
 import java.util.UUID;
 
 import com.breakersoft.plow.thrift.TaskFilterT;
@@ -17,4 +18,6 @@ public interface ThriftTaskDao {
 
     List<TaskStatsT> getTaskStats(UUID taskId);
 
+    Map<String, List<TaskStatsT>> getTaskStats(List<UUID> taskIds);
+
 }
@@ -7,14 +7,17 @@ import java.util.Collections;
 import java.util.Comparator;
 import java.util.List;
 import java.util.Map;
+import java.util.Set;
 import java.util.UUID;
 
 import org.springframework.jdbc.core.RowCallbackHandler;
+import org.springframework.jdbc.core.RowMapper;
 import org.springframework.stereotype.Repository;
 import org.springframework.transaction.annotation.Transactional;
 
 import com.breakersoft.plow.dao.AbstractDao;
 import com.breakersoft.plow.thrift.FolderT;
+import com.breakersoft.plow.thrift.JobBoardDeltaT;
 import com.breakersoft.plow.thrift.JobState;
 import com.breakersoft.plow.thrift.JobStatsT;
 import com.breakersoft.plow.thrift.JobT;
@@ -23,6 +26,7 @@ import com.breakersoft.plow.thrift.dao.ThriftJobBoardDao;
 import com.breakersoft.plow.util.JdbcUtils;
 import com.google.common.collect.Lists;
 import com.google.common.collect.Maps;
+import com.google.common.collect.Sets;
 
 @Repository
 @Transactional(readOnly=true)
@@ -77,7 +81,8 @@ public class ThriftJobBoardImpl extends AbstractDao implements ThriftJobBoardDao
                 "folder_dsp.int_cores_max, " +
                 "folder_dsp.int_cores_min, " +
                 "folder_dsp.int_cores_run,  " +
-                "folder_dsp.int_procs_run " +
+                "folder_dsp.int_procs_run, " +
+                "GREATEST(folder.time_updated, folder_dsp.time_updated) AS time_updated " +
             "FROM " +
                 "folder " +
             "INNER JOIN folder_dsp ON folder.pk_folder = folder_dsp.pk_folder " +
@@ -86,14 +91,149 @@ public class ThriftJobBoardImpl extends AbstractDao implements ThriftJobBoardDao
             "ORDER BY " +
                 "int_order ASC ";
 
+    private static final String GET_UPDATED_JOBS =
+            GET_JOBS + " AND GREATEST(job.time_updated, job_dsp.time_updated, " +
+                "job_count.time_updated, job_stat.time_updated) >= ?";
+
+    private static final String GET_FOLDER_TOTALS =
+            "SELECT " +
+                "job.pk_folder, " +
+                "SUM(job_count.int_total) AS int_total, " +
+                "SUM(job_count.int_succeeded) AS int_succeeded, " +
+                "SUM(job_count.int_running) AS int_running, " +
+                "SUM(job_count.int_dead) AS int_dead, " +
+                "SUM(job_count.int_eaten) AS int_eaten, " +
+                "SUM(job_count.int_waiting) AS int_waiting, " +
+                "SUM(job_count.int_depend) AS int_depend " +
+            "FROM " +
+                "job " +
+            "INNER JOIN " +
+                "job_count ON job.pk_job = job_count.pk_job " +
+            "WHERE " +
+                "job.int_state = ? " +
+            "AND " +
+                "job.pk_project = ? " +
+            "GROUP BY " +
+                "job.pk_folder";
+
+    private static final String GET_REMOVED_JOBS =
+            "SELECT " +
+                "pk_job " +
+            "FROM " +
+                "job " +
+            "WHERE " +
+                "job.pk_project = ? " +
+            "AND " +
+                "job.int_state != ? " +
+            "AND " +
+                "job.time_updated >= ?";
+
+    private static final String GET_REMOVED_FOLDERS =
+            "SELECT " +
+                "pk_object " +
+            "FROM " +
+                "tombstone " +
+            "WHERE " +
+                "str_type = 'folder' " +
+            "AND " +
+                "pk_project = ? " +
+            "AND " +
+                "time_removed >= ?";
+
+    // Overlaps the previous delta so writers that were
+    // still open at the time of the read are not missed.
+    private static final String GET_TIME =
+            "SELECT plow.deltaTimeMillis()";
+
     @Override
     public List<FolderT> getJobBoard(UUID projectId) {
         final List<FolderT> result = Lists.newArrayList();
         final Map<String, FolderT> folders = Maps.newHashMap();
 
-        jdbc.query(GET_FOLDERS, new RowCallbackHandler() {
+        for (FolderT folder: getFolders(projectId, null)) {
+            result.add(folder);
+            folders.put(folder.getId(), folder);
+        }
+
+        jdbc.query(GET_JOBS, new RowCallbackHandler() {
+            @Override
+            public void processRow(ResultSet rs) throws SQLException {
+                final FolderT folder = folders.get(rs.getString("pk_folder"));
+                final JobT job = mapJob(rs);
+
+                folder.totals.deadTaskCount += job.totals.deadTaskCount;
+                folder.totals.dependTaskCount += job.totals.dependTaskCount;
+                folder.totals.eatenTaskCount += job.totals.eatenTaskCount;
+                folder.totals.runningTaskCount += job.totals.runningTaskCount;
+                folder.totals.succeededTaskCount += job.totals.succeededTaskCount;
+                folder.totals.totalTaskCount += job.totals.totalTaskCount;
+                folder.totals.waitingTaskCount += job.totals.waitingTaskCount;
+
+                folder.jobs.add(job);
+            }
+        }, JobState.RUNNING.ordinal(), projectId);
+
+        sortByName(result);
+        return result;
+    }
+
+    @Override
+    public JobBoardDeltaT getJobBoardDelta(UUID projectId, long lastUpdateTime) {
+        final JobBoardDeltaT delta = new JobBoardDeltaT();
+        delta.setUpdateTime(jdbc.queryForObject(GET_TIME, Long.class));
+        delta.setFolders(new ArrayList<FolderT>());
+
+        final Map<String, FolderT> folders = Maps.newHashMap();
+        final Map<String, Long> updateTimes = Maps.newHashMap();
+        final Set<String> changed = Sets.newHashSet();
+
+        for (FolderT folder: getFolders(projectId, updateTimes)) {
+            folders.put(folder.getId(), folder);
+            if (updateTimes.get(folder.getId()) >= lastUpdateTime) {
+                changed.add(folder.getId());
+            }
+        }
+
+        // Changed jobs, placed in their folders.
+        jdbc.query(GET_UPDATED_JOBS, new RowCallbackHandler() {
             @Override
             public void processRow(ResultSet rs) throws SQLException {
+                final FolderT folder = folders.get(rs.getString("pk_folder"));
+                folder.jobs.add(mapJob(rs));
+                changed.add(folder.getId());
+            }
+        }, JobState.RUNNING.ordinal(), projectId, lastUpdateTime);
+
+        // The delta only holds the changed jobs, so total up the
+        // tasks of all running jobs for each folder being sent.
+        jdbc.query(GET_FOLDER_TOTALS, new RowCallbackHandler() {
+            @Override
+            public void processRow(ResultSet rs) throws SQLException {
+                final String folderId = rs.getString("pk_folder");
+                if (changed.contains(folderId)) {
+                    folders.get(folderId).setTotals(JdbcUtils.getTaskTotals(rs));
+                }
+            }
+        }, JobState.RUNNING.ordinal(), projectId);
+
+        for (String folderId: changed) {
+            delta.folders.add(folders.get(folderId));
+        }
+        sortByName(delta.folders);
+
+        delta.setRemovedJobs(jdbc.queryForList(GET_REMOVED_JOBS, String.class,
+                projectId, JobState.RUNNING.ordinal(), lastUpdateTime));
+
+        delta.setRemovedFolders(jdbc.queryForList(GET_REMOVED_FOLDERS, String.class,
+                projectId, lastUpdateTime));
+
+        return delta;
+    }
+
+    private List<FolderT> getFolders(UUID projectId, final Map<String, Long> updateTimes) {
+        return jdbc.query(GET_FOLDERS, new RowMapper<FolderT>() {
+            @Override
+            public FolderT mapRow(ResultSet rs, int rowNum) throws SQLException {
                 // Empty folder
                 FolderT folder = new FolderT();
                 folder.setId(rs.getString("pk_folder"));
@@ -105,63 +245,51 @@ public class ThriftJobBoardImpl extends AbstractDao implements ThriftJobBoardDao
                 folder.setMinCores(rs.getInt("int_cores_min"));
                 folder.setRunCores(rs.getInt("int_cores_run"));
                 folder.setRunProcs(rs.getInt("int_procs_run"));
-                result.add(folder);
-                folders.put(folder.getId(), folder);
 
+                if (updateTimes != null) {
+                    updateTimes.put(folder.getId(), rs.getLong("time_updated"));
+                }
+                return folder;
             }
         }, projectId);
+    }
 
-        jdbc.query(GET_JOBS, new RowCallbackHandler() {
-            @Override
-            public void processRow(ResultSet rs) throws SQLException {
-
-                final FolderT folder = folders.get(rs.getString("pk_folder"));
+    private static JobT mapJob(ResultSet rs) throws SQLException {
+        JobStatsT stats = new JobStatsT();
+        stats.highRam = rs.getInt("int_ram_high");
+        stats.highCores = rs.getDouble("flt_cores_high");
+        stats.highCoreTime = rs.getInt("int_core_time_high");
+        stats.totalSuccessCoreTime = rs.getLong("int_total_core_time_success");
+        stats.totalFailCoreTime = rs.getLong("int_total_core_time_fail");
+        stats.highClockTime = rs.getLong("int_clock_time_high");
+        stats.totalCoreTime = stats.totalSuccessCoreTime + stats.totalFailCoreTime;
 
-                JobStatsT stats = new JobStatsT();
-                stats.highRam = rs.getInt("int_ram_high");
-                stats.highCores = rs.getDouble("flt_cores_high");
-                stats.highCoreTime = rs.getInt("int_core_time_high");
-                stats.totalSuccessCoreTime = rs.getLong("int_total_core_time_success");
-                stats.totalFailCoreTime = rs.getLong("int_total_core_time_fail");
-                stats.highClockTime = rs.getLong("int_clock_time_high");
-                stats.totalCoreTime = stats.totalSuccessCoreTime + stats.totalFailCoreTime;
-
-                final JobT job = new JobT();
-                job.id = rs.getString("pk_job");
-                job.setFolderId(rs.getString("pk_folder"));
-                job.setName(rs.getString("str_name"));
-                job.setUid(rs.getInt("int_uid"));
-                job.setUsername(rs.getString("str_username"));
-                job.setPaused(rs.getBoolean("bool_paused"));
-                job.setRunCores(rs.getInt("int_cores_run"));
-                job.setRunProcs(rs.getInt("int_procs_run"));
-                job.setMaxCores(rs.getInt("int_cores_max"));
-                job.setMinCores(rs.getInt("int_cores_min"));
-                job.setStartTime(rs.getLong("time_started"));
-                job.setStopTime(rs.getLong("time_stopped"));
-                job.setState(JobState.findByValue(rs.getInt("int_state")));
-
-                job.setTotals(JdbcUtils.getTaskTotals(rs));
-                job.setStats(stats);
+        final JobT job = new JobT();
+        job.id = rs.getString("pk_job");
+        job.setFolderId(rs.getString("pk_folder"));
+        job.setName(rs.getString("str_name"));
+        job.setUid(rs.getInt("int_uid"));
+        job.setUsername(rs.getString("str_username"));
+        job.setPaused(rs.getBoolean("bool_paused"));
+        job.setRunCores(rs.getInt("int_cores_run"));
+        job.setRunProcs(rs.getInt("int_procs_run"));
+        job.setMaxCores(rs.getInt("int_cores_max"));
+        job.setMinCores(rs.getInt("int_cores_min"));
+        job.setStartTime(rs.getLong("time_started"));
+        job.setStopTime(rs.getLong("time_stopped"));
+        job.setState(JobState.findByValue(rs.getInt("int_state")));
 
-                folder.totals.deadTaskCount += job.totals.deadTaskCount;
-                folder.totals.dependTaskCount += job.totals.dependTaskCount;
-                folder.totals.eatenTaskCount += job.totals.eatenTaskCount;
-                folder.totals.runningTaskCount += job.totals.runningTaskCount;
-                folder.totals.succeededTaskCount += job.totals.succeededTaskCount;
-                folder.totals.totalTaskCount += job.totals.totalTaskCount;
-                folder.totals.waitingTaskCount += job.totals.waitingTaskCount;
-
-                folder.jobs.add(job);
-            }
-        }, JobState.RUNNING.ordinal(), projectId);
+        job.setTotals(JdbcUtils.getTaskTotals(rs));
+        job.setStats(stats);
+        return job;
+    }
 
-        Collections.sort(result, new Comparator<FolderT>() {
+    private static void sortByName(List<FolderT> folders) {
+        Collections.sort(folders, new Comparator<FolderT>() {
             @Override
             public int compare(FolderT o1, FolderT o2) {
                 return o1.name.compareTo(o2.name);
             }
         });
-        return result;
     }
 }
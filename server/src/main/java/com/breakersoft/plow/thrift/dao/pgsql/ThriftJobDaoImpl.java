@@ -140,7 +140,9 @@ public class ThriftJobDaoImpl extends AbstractDao implements ThriftJobDao {
             values.add(filter.regex);
         }
 
-        if (PlowUtils.isValid(filter.states)) {
+        // With lastUpdateTime, jobs that changed out of the requested
+        // states are returned too, so callers know to drop them.
+        if (PlowUtils.isValid(filter.states) && filter.getLastUpdateTime() == 0) {
             clauses.add(JdbcUtils.In(
                     "job.int_state", filter.states.size()));
             for (JobState state: filter.states) {
@@ -154,6 +156,16 @@ public class ThriftJobDaoImpl extends AbstractDao implements ThriftJobDao {
             values.addAll(filter.jobIds);
         }
 
+        if (filter.matchingOnly && values.isEmpty() && !PlowUtils.isValid(filter.states)) {
+            return new ArrayList<JobT>(0);
+        }
+
+        if (filter.getLastUpdateTime() > 0) {
+            clauses.add("GREATEST(job.time_updated, job_dsp.time_updated, " +
+                    "job_count.time_updated, job_stat.time_updated) >= ?");
+            values.add(filter.getLastUpdateTime());
+        }
+
         final StringBuilder sb = new StringBuilder(512);
         sb.append(GET);
         if (!values.isEmpty()) {
@@ -161,10 +173,6 @@ public class ThriftJobDaoImpl extends AbstractDao implements ThriftJobDao {
             sb.append(StringUtils.join(clauses, " AND "));
         }
 
-        if (filter.matchingOnly && values.isEmpty()) {
-            return new ArrayList<JobT>(0);
-        }
-
         return jdbc.query(sb.toString(), MAPPER, values.toArray());
     }
 
@@ -2,9 +2,12 @@ package com.breakersoft.plow.thrift.dao.pgsql;
 
 import java.sql.ResultSet;
 import java.sql.SQLException;
+import java.util.ArrayList;
 import java.util.List;
+import java.util.Map;
 import java.util.UUID;
 
+import org.springframework.jdbc.core.RowCallbackHandler;
 import org.springframework.jdbc.core.RowMapper;
 import org.springframework.stereotype.Repository;
 import org.springframework.transaction.annotation.Transactional;
@@ -14,6 +17,7 @@ import com.breakersoft.plow.thrift.LayerStatsT;
 import com.breakersoft.plow.thrift.LayerT;
 import com.breakersoft.plow.thrift.dao.ThriftLayerDao;
 import com.breakersoft.plow.util.JdbcUtils;
+import com.google.common.collect.Maps;
 
 @Repository
 @Transactional(readOnly=true)
@@ -144,4 +148,28 @@ public class ThriftLayerDaoImpl extends AbstractDao implements ThriftLayerDao {
     public List<LayerT> getLayers(UUID jobId) {
         return jdbc.query(GET_BY_JOB, MAPPER, jobId);
     }
+
+    @Override
+    public Map<String, List<LayerT>> getLayers(List<UUID> jobIds) {
+        final Map<String, List<LayerT>> result = Maps.newHashMapWithExpectedSize(jobIds.size());
+        for (UUID jobId: jobIds) {
+            result.put(jobId.toString(), new ArrayList<LayerT>());
+        }
+
+        if (jobIds.isEmpty()) {
+            return result;
+        }
+
+        final String query = GET + " WHERE " + JdbcUtils.In("layer.pk_job", jobIds.size()) +
+                " ORDER BY layer.int_order ASC";
+
+        jdbc.query(query, new RowCallbackHandler() {
+            @Override
+            public void processRow(ResultSet rs) throws SQLException {
+                result.get(rs.getString("pk_job")).add(MAPPER.mapRow(rs, 0));
+            }
+        }, jobIds.toArray());
+
+        return result;
+    }
 }
@@ -118,9 +118,15 @@ public class ThriftNodeDaoImpl extends AbstractDao implements ThriftNodeDao {
 
     @Override
     public List<NodeT> getNodes(NodeFilterT filter) {
+        if (filter.getLastUpdateTime() > 0) {
+            return jdbc.query(GET_UPDATED, MAPPER, filter.getLastUpdateTime());
+        }
         return jdbc.query(GET, MAPPER);
     }
 
+    private static final String GET_UPDATED =
+            GET + " WHERE GREATEST(node.time_updated, node_dsp.time_updated) >= ?";
+
     private final String GET_BY_ID = GET + " WHERE node.pk_node=?";
     private final String GET_BY_NAME = GET + " WHERE node.str_name=?";
 
@@ -2,10 +2,12 @@ package com.breakersoft.plow.thrift.dao.pgsql;
 
 import java.sql.ResultSet;
 import java.sql.SQLException;
+import java.util.ArrayList;
 import java.util.List;
 import java.util.Map;
 import java.util.UUID;
 
+import org.springframework.jdbc.core.RowCallbackHandler;
 import org.springframework.jdbc.core.simple.ParameterizedRowMapper;
 import org.springframework.stereotype.Repository;
 import org.springframework.transaction.annotation.Transactional;
@@ -15,6 +17,8 @@ import com.breakersoft.plow.Layer;
 import com.breakersoft.plow.dao.AbstractDao;
 import com.breakersoft.plow.thrift.OutputT;
 import com.breakersoft.plow.thrift.dao.ThriftOutputDao;
+import com.breakersoft.plow.util.JdbcUtils;
+import com.google.common.collect.Maps;
 
 @Repository
 @Transactional(readOnly=true)
@@ -57,6 +61,27 @@ public class ThriftOutputDaoImpl extends AbstractDao implements ThriftOutputDao
         return jdbc.query(GET + " WHERE output.pk_job=?", MAPPER, jobId);
     }
 
+    @Override
+    public Map<String, List<OutputT>> getJobOutputs(List<UUID> jobIds) {
+        final Map<String, List<OutputT>> result = Maps.newHashMapWithExpectedSize(jobIds.size());
+        for (UUID jobId: jobIds) {
+            result.put(jobId.toString(), new ArrayList<OutputT>());
+        }
+
+        if (jobIds.isEmpty()) {
+            return result;
+        }
+
+        jdbc.query(GET + " WHERE " + JdbcUtils.In("output.pk_job", jobIds.size()), new RowCallbackHandler() {
+            @Override
+            public void processRow(ResultSet rs) throws SQLException {
+                result.get(rs.getString("pk_job")).add(MAPPER.mapRow(rs, 0));
+            }
+        }, jobIds.toArray());
+
+        return result;
+    }
+
     @Override
     public List<OutputT> getOutputs(Layer layer) {
         return getLayerOutputs(layer.getLayerId());
@@ -2,10 +2,13 @@ package com.breakersoft.plow.thrift.dao.pgsql;
 
 import java.sql.ResultSet;
 import java.sql.SQLException;
+import java.util.ArrayList;
 import java.util.List;
+import java.util.Map;
 import java.util.UUID;
 
 import org.apache.commons.lang.StringUtils;
+import org.springframework.jdbc.core.RowCallbackHandler;
 import org.springframework.jdbc.core.RowMapper;
 import org.springframework.stereotype.Repository;
 import org.springframework.transaction.annotation.Transactional;
@@ -19,6 +22,7 @@ import com.breakersoft.plow.thrift.dao.ThriftTaskDao;
 import com.breakersoft.plow.util.JdbcUtils;
 import com.breakersoft.plow.util.PlowUtils;
 import com.google.common.collect.Lists;
+import com.google.common.collect.Maps;
 
 @Repository
 @Transactional(readOnly=true)
@@ -212,8 +216,9 @@ public class ThriftTaskDaoImpl extends AbstractDao implements ThriftTaskDao {
         }
     };
 
-    private static final String TASK_HISTORY =
+    private static final String GET_TASK_HISTORY =
         "SELECT " +
+            "pk_task,"+
             "int_cores,"+
             "int_cores,"+
             "flt_cores_high,"+
@@ -226,12 +231,34 @@ public class ThriftTaskDaoImpl extends AbstractDao implements ThriftTaskDao {
             "int_exit_signal,"+
             "int_exit_status "+
        "FROM " +
-            "task_history " +
-       "WHERE " +
-            "pk_task = ?";
+            "task_history ";
+
+    private static final String TASK_HISTORY =
+        GET_TASK_HISTORY + "WHERE pk_task = ?";
 
     @Override
     public List<TaskStatsT> getTaskStats(UUID taskId) {
         return jdbc.query(TASK_HISTORY, STATS_MAPPER, taskId);
     }
+
+    @Override
+    public Map<String, List<TaskStatsT>> getTaskStats(List<UUID> taskIds) {
+        final Map<String, List<TaskStatsT>> result = Maps.newHashMapWithExpectedSize(taskIds.size());
+        for (UUID taskId: taskIds) {
+            result.put(taskId.toString(), new ArrayList<TaskStatsT>());
+        }
+
+        if (taskIds.isEmpty()) {
+            return result;
+        }
+
+        jdbc.query(GET_TASK_HISTORY + "WHERE " + JdbcUtils.In("pk_task", taskIds.size()), new RowCallbackHandler() {
+            @Override
+            public void processRow(ResultSet rs) throws SQLException {
+                result.get(rs.getString("pk_task")).add(STATS_MAPPER.mapRow(rs, 0));
+            }
+        }, taskIds.toArray());
+
+        return result;
+    }
 }
@@ -63,6 +63,16 @@ public class FolderDaoTests extends AbstractTest {
         assertEquals("bar", name);
     }
 
+    @Test
+    public void testDeleteTombstones() {
+        Folder folder1 = folderDao.createFolder(TEST_PROJECT, "foo");
+        folderDao.delete(folder1);
+
+        long now = jdbc().queryForLong("SELECT plow.txTimeMillis()");
+        assertEquals(0, folderDao.deleteTombstones(now));
+        assertEquals(1, folderDao.deleteTombstones(now + 1));
+    }
+
     @Test
     public void testSet() {
         Folder folder1 = folderDao.createFolder(TEST_PROJECT, "foo");
@@ -48,7 +48,8 @@ public class NodeDaoTests extends AbstractTest {
         Ping ping = getTestNodePing();
         Cluster cluster = clusterDao.create("test", TAGS);
         Node node = nodeDao.create(cluster, ping);
-        nodeDao.setLocked(node, true);
+        assertTrue(nodeDao.setLocked(node, true));
+        assertFalse(nodeDao.setLocked(node, true));
 
         boolean locked = jdbc().queryForObject(
                 "SELECT bool_locked FROM plow.node WHERE pk_node=?", Boolean.class, node.getNodeId());
@@ -128,7 +129,7 @@ public class NodeDaoTests extends AbstractTest {
         Ping ping = getTestNodePing();
         Cluster cluster = clusterDao.create("test", TAGS);
         Node node = nodeDao.create(cluster, ping);
-        nodeDao.update(node, ping);
+        assertFalse(nodeDao.update(node, ping));
 
         int swap = simpleJdbcTemplate.queryForInt("SELECT int_swap FROM node_sys WHERE pk_node=?",
                 node.getNodeId());
@@ -116,6 +116,10 @@ public class DispatchTaskDaoTests extends AbstractTest {
         assertEquals(command.procId, proc.getProcId().toString());
         assertEquals(command.taskId, proc.getTaskId().toString());
         assertEquals(command.cores, proc.getIdleCores());
+        assertTrue(command.isSetRamMb());
+        assertTrue(command.ramMb > 0);
+        assertEquals(command.reservedRamMb, proc.getIdleRam());
+        assertTrue(command.isSetThreadable());
     }
 
 
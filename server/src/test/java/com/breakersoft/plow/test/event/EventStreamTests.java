@@ -0,0 +1,90 @@
+package com.breakersoft.plow.test.event;
+
+import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertTrue;
+
+import javax.annotation.Resource;
+
+import org.junit.Before;
+import org.junit.Test;
+import org.springframework.transaction.support.TransactionSynchronization;
+import org.springframework.transaction.support.TransactionSynchronizationManager;
+
+import com.breakersoft.plow.event.EventManager;
+import com.breakersoft.plow.event.EventManagerImpl;
+import com.breakersoft.plow.event.EventStream;
+import com.breakersoft.plow.event.JobLaunchEvent;
+import com.breakersoft.plow.test.AbstractTest;
+import com.breakersoft.plow.thrift.EventBatchT;
+import com.breakersoft.plow.thrift.EventT;
+import com.breakersoft.plow.thrift.EventType;
+
+public class EventStreamTests extends AbstractTest {
+
+    @Resource
+    EventManager eventManager;
+
+    @Resource
+    EventStream eventStream;
+
+    @Before
+    public void reset() {
+        ((EventManagerImpl) eventManager).setEnabled(true);
+    }
+
+    @Test
+    public void testGetEventsStart() {
+        EventBatchT batch = eventStream.getEvents(-1, 1000);
+        assertTrue(batch.events.isEmpty());
+        assertTrue(batch.lastEventId >= 0);
+    }
+
+    @Test
+    public void testGetEventsTimeout() {
+        EventBatchT start = eventStream.getEvents(-1, 0);
+        long time = System.currentTimeMillis();
+        EventBatchT batch = eventStream.getEvents(start.lastEventId, 100);
+        assertTrue(System.currentTimeMillis() - time >= 100);
+        assertTrue(batch.events.isEmpty());
+        assertEquals(start.lastEventId, batch.lastEventId);
+    }
+
+    @Test
+    public void testGetEvents() {
+        EventBatchT start = eventStream.getEvents(-1, 0);
+        JobLaunchEvent event = jobService.launch(getTestJobSpec());
+
+        // Nothing is sent until the transaction commits.
+        EventBatchT batch = eventStream.getEvents(start.lastEventId, 0);
+        assertTrue(batch.events.isEmpty());
+        for (TransactionSynchronization sync:
+                TransactionSynchronizationManager.getSynchronizations()) {
+            sync.afterCommit();
+        }
+
+        batch = eventStream.getEvents(start.lastEventId, 1000);
+        assertTrue(batch.lastEventId > start.lastEventId);
+
+        boolean launched = false;
+        for (EventT e: batch.events) {
+            assertTrue(e.id > start.lastEventId);
+            if (e.type == EventType.JOB_LAUNCHED) {
+                assertEquals(event.getJob().getJobId().toString(), e.objectId);
+                launched = true;
+            }
+        }
+        assertTrue(launched);
+
+        // Nothing new since the last batch.
+        batch = eventStream.getEvents(batch.lastEventId, 0);
+        assertTrue(batch.events.isEmpty());
+    }
+
+    @Test
+    public void testGetEventsResync() {
+        EventBatchT start = eventStream.getEvents(-1, 0);
+        EventBatchT batch = eventStream.getEvents(start.lastEventId + 100, 0);
+        assertEquals(1, batch.events.size());
+        assertEquals(EventType.RESYNC, batch.events.get(0).type);
+    }
+}
@@ -1,6 +1,7 @@
 package com.breakersoft.plow.test.thrift.dao;
 
 import static org.junit.Assert.assertEquals;
+import static org.junit.Assert.assertTrue;
 
 import java.util.List;
 
@@ -10,6 +11,7 @@ import org.junit.Test;
 
 import com.breakersoft.plow.test.AbstractTest;
 import com.breakersoft.plow.thrift.FolderT;
+import com.breakersoft.plow.thrift.JobBoardDeltaT;
 import com.breakersoft.plow.thrift.JobSpecT;
 import com.breakersoft.plow.thrift.dao.ThriftJobBoardDao;
 
@@ -29,4 +31,29 @@ public class ThriftJobBoardTests extends AbstractTest {
         assertEquals(1, result.size());
         assertEquals(1, result.get(0).jobs.size());
     }
+
+    @Test
+    public void testGetJobBoardDelta() {
+        JobSpecT spec = getTestJobSpec();
+        jobService.launch(spec);
+
+        JobBoardDeltaT delta = thriftJobBoard.getJobBoardDelta(
+                TEST_PROJECT.getProjectId(), 0);
+
+        assertEquals(1, delta.folders.size());
+        assertEquals(1, delta.folders.get(0).jobs.size());
+        assertEquals(0, delta.removedJobs.size());
+        assertEquals(0, delta.removedFolders.size());
+
+        // The cursor overlaps this transaction, so
+        // the job is sent again.
+        assertTrue(delta.updateTime < jdbc().queryForLong("SELECT plow.txTimeMillis()"));
+        delta = thriftJobBoard.getJobBoardDelta(
+                TEST_PROJECT.getProjectId(), delta.updateTime);
+        assertEquals(1, delta.folders.size());
+
+        delta = thriftJobBoard.getJobBoardDelta(
+                TEST_PROJECT.getProjectId(), Long.MAX_VALUE);
+        assertEquals(0, delta.folders.size());
+    }
 }
@@ -34,6 +34,23 @@ public class ThriftJobDaoTests extends AbstractTest {
         assertEquals(1, thriftJobDao.getJobs(f).size());
     }
 
+    @Test
+    public void getJobsUpdatedSince() {
+        JobSpecT spec = getTestJobSpec();
+        jobService.launch(spec);
+
+        @SuppressWarnings("deprecation")
+        long now = simpleJdbcTemplate.queryForLong("SELECT plow.txTimeMillis()");
+
+        JobFilterT f = new JobFilterT();
+        f.addToUser("stella");
+        f.setLastUpdateTime(now);
+        assertEquals(1, thriftJobDao.getJobs(f).size());
+
+        f.setLastUpdateTime(now + 1);
+        assertEquals(0, thriftJobDao.getJobs(f).size());
+    }
+
     @Test
     public void getJobsByProject() {
         JobSpecT spec = getTestJobSpec();
@@ -2,6 +2,10 @@ package com.breakersoft.plow.test.thrift.dao;
 
 import static org.junit.Assert.assertEquals;
 
+import java.util.List;
+import java.util.Map;
+import java.util.UUID;
+
 import javax.annotation.Resource;
 
 import org.junit.Test;
@@ -13,6 +17,7 @@ import com.breakersoft.plow.test.AbstractTest;
 import com.breakersoft.plow.thrift.JobSpecT;
 import com.breakersoft.plow.thrift.LayerT;
 import com.breakersoft.plow.thrift.dao.ThriftLayerDao;
+import com.google.common.collect.Lists;
 
 public class ThriftLayerDaoTests extends AbstractTest {
 
@@ -29,6 +34,20 @@ public class ThriftLayerDaoTests extends AbstractTest {
         assertEquals(1, thriftLayerDao.getLayers(event.getJob().getJobId()).size());
     }
 
+    @Test
+    public void getLayersForJobs() {
+        JobLaunchEvent event1 = jobService.launch(getTestJobSpec("layers_1"));
+        JobLaunchEvent event2 = jobService.launch(getTestJobSpec("layers_2"));
+
+        List<UUID> jobIds = Lists.newArrayList(
+                event1.getJob().getJobId(), event2.getJob().getJobId());
+
+        Map<String, List<LayerT>> layers = thriftLayerDao.getLayers(jobIds);
+        assertEquals(2, layers.size());
+        assertEquals(1, layers.get(event1.getJob().getJobId().toString()).size());
+        assertEquals(1, layers.get(event2.getJob().getJobId().toString()).size());
+    }
+
     @Test
     public void getLayerByJobAndName() {
         JobSpecT jobSpec = getTestJobSpec();
@@ -2,6 +2,7 @@ package com.breakersoft.plow.test.thrift.dao;
 
 import static org.junit.Assert.assertEquals;
 
+import java.util.List;
 import java.util.Map;
 
 import javax.annotation.Resource;
@@ -12,7 +13,9 @@ import com.breakersoft.plow.Layer;
 import com.breakersoft.plow.event.JobLaunchEvent;
 import com.breakersoft.plow.test.AbstractTest;
 import com.breakersoft.plow.thrift.JobSpecT;
+import com.breakersoft.plow.thrift.OutputT;
 import com.breakersoft.plow.thrift.dao.ThriftOutputDao;
+import com.google.common.collect.Lists;
 import com.google.common.collect.Maps;
 
 public class ThriftOutputDaoTests extends AbstractTest {
@@ -32,6 +35,21 @@ public class ThriftOutputDaoTests extends AbstractTest {
         assertEquals(1, thriftOutputDao.getOutputs(event.getJob()).size());
     }
 
+    @Test
+    public void getJobOutputsBulk() {
+        JobSpecT spec = getTestJobSpec();
+        JobLaunchEvent event = jobService.launch(spec);
+
+        Layer layer = jobService.getLayer(event.getJob(), 0);
+        Map<String,String> attrs = Maps.newHashMap();
+        jobService.addLayerOutput(layer, "/foo/bar.#.exr", attrs);
+        jobService.addLayerOutput(layer, "/foo/bing.#.exr", attrs);
+
+        Map<String, List<OutputT>> outputs = thriftOutputDao.getJobOutputs(
+                Lists.newArrayList(event.getJob().getJobId()));
+        assertEquals(2, outputs.get(event.getJob().getJobId().toString()).size());
+    }
+
     @Test
     public void getOutputs() {
         JobSpecT spec = getTestJobSpec();
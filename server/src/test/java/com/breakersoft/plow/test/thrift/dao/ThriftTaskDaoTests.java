@@ -4,6 +4,7 @@ import static org.junit.Assert.assertEquals;
 import static org.junit.Assert.assertTrue;
 
 import java.util.List;
+import java.util.Map;
 import java.util.UUID;
 
 import javax.annotation.Resource;
@@ -30,6 +31,7 @@ import com.breakersoft.plow.thrift.TaskState;
 import com.breakersoft.plow.thrift.TaskStatsT;
 import com.breakersoft.plow.thrift.TaskT;
 import com.breakersoft.plow.thrift.dao.ThriftTaskDao;
+import com.google.common.collect.Lists;
 
 public class ThriftTaskDaoTests extends AbstractTest {
 
@@ -152,6 +154,12 @@ public class ThriftTaskDaoTests extends AbstractTest {
 
         stats = thriftTaskDao.getTaskStats(tasks.get(0).getTaskId());
         assertEquals(1, stats.size());
+
+        Map<String, List<TaskStatsT>> bulk = thriftTaskDao.getTaskStats(
+                Lists.newArrayList(tasks.get(0).getTaskId(), tasks.get(1).getTaskId()));
+        assertEquals(2, bulk.size());
+        assertEquals(1, bulk.get(tasks.get(0).getTaskId().toString()).size());
+        assertEquals(0, bulk.get(tasks.get(1).getTaskId().toString()).size());
     }
 
     @Test